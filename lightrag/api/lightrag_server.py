@@ -868,6 +868,7 @@ def create_app(args):
             func=optimized_embedding_function,
             max_token_size=final_max_token_size,
             send_dimensions=False,  # Will be set later based on binding requirements
+            model_name=f"{binding}/{model}" if model else binding,
         )
 
         # Log final embedding configuration
@@ -1002,7 +1003,11 @@ def create_app(args):
                     args.rerank_binding_host = default_base_url
 
         async def server_rerank_func(
-            query: str, documents: list, top_n: int = None, extra_body: dict = None
+            query: str,
+            documents: list,
+            top_n: int = None,
+            extra_body: dict = None,
+            token_counts: list = None,
         ):
             """Server rerank function with configuration from environment variables"""
             # Prepare kwargs for rerank function
@@ -1024,6 +1029,7 @@ def create_app(args):
                 kwargs["max_tokens_per_doc"] = int(
                     os.getenv("RERANK_MAX_TOKENS_PER_DOC", "4096")
                 )
+                kwargs["token_counts"] = token_counts
 
             return await selected_rerank_func(**kwargs, extra_body=extra_body)
 
@@ -1784,6 +1784,95 @@ async def run_scanning_process(
         logger.error(traceback.format_exc())
 
 
+async def _delete_document_file(
+    doc_manager: DocumentManager,
+    file_path: str,
+    pipeline_status: dict,
+    pipeline_status_lock,
+):
+    """Delete the input_dir and __enqueued__ files of a deleted document"""
+    try:
+        deleted_files = []
+        # SECURITY FIX: Use secure path validation to prevent arbitrary file deletion
+        safe_file_path = validate_file_path_security(file_path, doc_manager.input_dir)
+
+        if safe_file_path is None:
+            # Security violation detected - log and skip file deletion
+            security_msg = f"Security violation: Unsafe file path detected for deletion - {file_path}"
+            logger.warning(security_msg)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = security_msg
+                pipeline_status["history_messages"].append(security_msg)
+        else:
+            # check and delete files from input_dir directory
+            if safe_file_path.exists():
+                try:
+                    safe_file_path.unlink()
+                    deleted_files.append(safe_file_path.name)
+                    file_delete_msg = (
+                        f"Successfully deleted input_dir file: {file_path}"
+                    )
+                    logger.info(file_delete_msg)
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = file_delete_msg
+                        pipeline_status["history_messages"].append(file_delete_msg)
+                except Exception as file_error:
+                    file_error_msg = f"Failed to delete input_dir file {file_path}: {str(file_error)}"
+                    logger.debug(file_error_msg)
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = file_error_msg
+                        pipeline_status["history_messages"].append(file_error_msg)
+
+            # Also check and delete files from __enqueued__ directory
+            enqueued_dir = doc_manager.input_dir / "__enqueued__"
+            if enqueued_dir.exists():
+                # SECURITY FIX: Validate that the file path is safe before processing
+                # Only proceed if the original path validation passed
+                base_name = Path(file_path).stem
+                extension = Path(file_path).suffix
+
+                # Search for exact match and files with numeric suffixes
+                for enqueued_file in enqueued_dir.glob(f"{base_name}*{extension}"):
+                    # Additional security check: ensure enqueued file is within enqueued directory
+                    safe_enqueued_path = validate_file_path_security(
+                        enqueued_file.name, enqueued_dir
+                    )
+                    if safe_enqueued_path is not None:
+                        try:
+                            enqueued_file.unlink()
+                            deleted_files.append(enqueued_file.name)
+                            logger.info(
+                                f"Successfully deleted enqueued file: {enqueued_file.name}"
+                            )
+                        except Exception as enqueued_error:
+                            file_error_msg = f"Failed to delete enqueued file {enqueued_file.name}: {str(enqueued_error)}"
+                            logger.debug(file_error_msg)
+                            async with pipeline_status_lock:
+                                pipeline_status["latest_message"] = file_error_msg
+                                pipeline_status["history_messages"].append(
+                                    file_error_msg
+                                )
+                    else:
+                        security_msg = f"Security violation: Unsafe enqueued file path detected - {enqueued_file.name}"
+                        logger.warning(security_msg)
+
+        if deleted_files == []:
+            file_error_msg = (
+                f"File deletion skipped, missing or unsafe file: {file_path}"
+            )
+            logger.warning(file_error_msg)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = file_error_msg
+                pipeline_status["history_messages"].append(file_error_msg)
+
+    except Exception as file_error:
+        file_error_msg = f"Failed to delete file {file_path}: {str(file_error)}"
+        logger.error(file_error_msg)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = file_error_msg
+            pipeline_status["history_messages"].append(file_error_msg)
+
+
 async def background_delete_documents(
     rag: LightRAG,
     doc_manager: DocumentManager,
@@ -1804,6 +1893,8 @@ async def background_delete_documents(
         "pipeline_status", workspace=rag.workspace
     )
 
+    # adelete_by_doc_ids returns one result per unique id
+    doc_ids = list(dict.fromkeys(doc_ids))
     total_docs = len(doc_ids)
     successful_deletions = []
     failed_deletions = []
@@ -1818,11 +1909,12 @@ async def background_delete_documents(
         pipeline_status.update(
             {
                 "busy": True,
-                # Job name can not be changed, it's verified in adelete_by_doc_id()
+                # Job name can not be changed, it's verified in adelete_by_doc_ids()
                 "job_name": f"Deleting {total_docs} Documents",
                 "job_start": datetime.now().isoformat(),
                 "docs": total_docs,
-                "batchs": total_docs,
+                # Progress is reported by adelete_by_doc_ids in phases
+                "batchs": 1,
                 "cur_batch": 0,
                 "latest_message": "Starting document deletion process",
             }
@@ -1835,169 +1927,62 @@ async def background_delete_documents(
             )
 
     try:
-        # Loop through each document ID and delete them one by one
-        for i, doc_id in enumerate(doc_ids, 1):
-            # Check for cancellation at the start of each document deletion
-            async with pipeline_status_lock:
-                if pipeline_status.get("cancellation_requested", False):
-                    cancel_msg = f"Deletion cancelled by user at document {i}/{total_docs}. {len(successful_deletions)} deleted, {total_docs - i + 1} remaining."
-                    logger.info(cancel_msg)
-                    pipeline_status["latest_message"] = cancel_msg
-                    pipeline_status["history_messages"].append(cancel_msg)
-                    # Add remaining documents to failed list with cancellation reason
-                    failed_deletions.extend(
-                        doc_ids[i - 1 :]
-                    )  # i-1 because enumerate starts at 1
-                    break  # Exit the loop, remaining documents unchanged
-
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
-                logger.info(start_msg)
-                pipeline_status["cur_batch"] = i
-                pipeline_status["latest_message"] = start_msg
-                pipeline_status["history_messages"].append(start_msg)
-
-            file_path = "#"
-            try:
-                result = await rag.adelete_by_doc_id(
-                    doc_id, delete_llm_cache=delete_llm_cache
-                )
-                file_path = (
-                    getattr(result, "file_path", "-") if "result" in locals() else "-"
+        # Nothing has been deleted yet, honour a cancellation requested in the meantime
+        async with pipeline_status_lock:
+            if pipeline_status.get("cancellation_requested", False):
+                cancel_msg = (
+                    f"Deletion cancelled by user before start. {total_docs} remaining."
                 )
-                if result.status == "success":
-                    successful_deletions.append(doc_id)
-                    success_msg = (
-                        f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
-                    )
-                    logger.info(success_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["history_messages"].append(success_msg)
+                logger.info(cancel_msg)
+                pipeline_status["latest_message"] = cancel_msg
+                pipeline_status["history_messages"].append(cancel_msg)
+                failed_deletions.extend(doc_ids)
+                return
 
-                    # Handle file deletion if requested and file_path is available
-                    if (
-                        delete_file
-                        and result.file_path
-                        and result.file_path != "unknown_source"
-                    ):
-                        try:
-                            deleted_files = []
-                            # SECURITY FIX: Use secure path validation to prevent arbitrary file deletion
-                            safe_file_path = validate_file_path_security(
-                                result.file_path, doc_manager.input_dir
-                            )
+            start_msg = f"Deleting {total_docs} documents in one bulk operation"
+            logger.info(start_msg)
+            pipeline_status["latest_message"] = start_msg
+            pipeline_status["history_messages"].append(start_msg)
 
-                            if safe_file_path is None:
-                                # Security violation detected - log and skip file deletion
-                                security_msg = f"Security violation: Unsafe file path detected for deletion - {result.file_path}"
-                                logger.warning(security_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = security_msg
-                                    pipeline_status["history_messages"].append(
-                                        security_msg
-                                    )
-                            else:
-                                # check and delete files from input_dir directory
-                                if safe_file_path.exists():
-                                    try:
-                                        safe_file_path.unlink()
-                                        deleted_files.append(safe_file_path.name)
-                                        file_delete_msg = f"Successfully deleted input_dir file: {result.file_path}"
-                                        logger.info(file_delete_msg)
-                                        async with pipeline_status_lock:
-                                            pipeline_status["latest_message"] = (
-                                                file_delete_msg
-                                            )
-                                            pipeline_status["history_messages"].append(
-                                                file_delete_msg
-                                            )
-                                    except Exception as file_error:
-                                        file_error_msg = f"Failed to delete input_dir file {result.file_path}: {str(file_error)}"
-                                        logger.debug(file_error_msg)
-                                        async with pipeline_status_lock:
-                                            pipeline_status["latest_message"] = (
-                                                file_error_msg
-                                            )
-                                            pipeline_status["history_messages"].append(
-                                                file_error_msg
-                                            )
-
-                                # Also check and delete files from __enqueued__ directory
-                                enqueued_dir = doc_manager.input_dir / "__enqueued__"
-                                if enqueued_dir.exists():
-                                    # SECURITY FIX: Validate that the file path is safe before processing
-                                    # Only proceed if the original path validation passed
-                                    base_name = Path(result.file_path).stem
-                                    extension = Path(result.file_path).suffix
-
-                                    # Search for exact match and files with numeric suffixes
-                                    for enqueued_file in enqueued_dir.glob(
-                                        f"{base_name}*{extension}"
-                                    ):
-                                        # Additional security check: ensure enqueued file is within enqueued directory
-                                        safe_enqueued_path = (
-                                            validate_file_path_security(
-                                                enqueued_file.name, enqueued_dir
-                                            )
-                                        )
-                                        if safe_enqueued_path is not None:
-                                            try:
-                                                enqueued_file.unlink()
-                                                deleted_files.append(enqueued_file.name)
-                                                logger.info(
-                                                    f"Successfully deleted enqueued file: {enqueued_file.name}"
-                                                )
-                                            except Exception as enqueued_error:
-                                                file_error_msg = f"Failed to delete enqueued file {enqueued_file.name}: {str(enqueued_error)}"
-                                                logger.debug(file_error_msg)
-                                                async with pipeline_status_lock:
-                                                    pipeline_status[
-                                                        "latest_message"
-                                                    ] = file_error_msg
-                                                    pipeline_status[
-                                                        "history_messages"
-                                                    ].append(file_error_msg)
-                                        else:
-                                            security_msg = f"Security violation: Unsafe enqueued file path detected - {enqueued_file.name}"
-                                            logger.warning(security_msg)
-
-                            if deleted_files == []:
-                                file_error_msg = f"File deletion skipped, missing or unsafe file: {result.file_path}"
-                                logger.warning(file_error_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = file_error_msg
-                                    pipeline_status["history_messages"].append(
-                                        file_error_msg
-                                    )
-
-                        except Exception as file_error:
-                            file_error_msg = f"Failed to delete file {result.file_path}: {str(file_error)}"
-                            logger.error(file_error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = file_error_msg
-                                pipeline_status["history_messages"].append(
-                                    file_error_msg
-                                )
-                    elif delete_file:
-                        no_file_msg = (
-                            f"File deletion skipped, missing file path: {doc_id}"
-                        )
-                        logger.warning(no_file_msg)
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = no_file_msg
-                            pipeline_status["history_messages"].append(no_file_msg)
-                else:
-                    failed_deletions.append(doc_id)
-                    error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
-                    logger.error(error_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["latest_message"] = error_msg
-                        pipeline_status["history_messages"].append(error_msg)
+        # Affected entities and relations are computed and rebuilt once for all documents
+        results = await rag.adelete_by_doc_ids(
+            doc_ids, delete_llm_cache=delete_llm_cache
+        )
 
-            except Exception as e:
+        for i, result in enumerate(results, 1):
+            doc_id = result.doc_id
+            file_path = result.file_path or "-"
+            if result.status == "success":
+                successful_deletions.append(doc_id)
+                success_msg = (
+                    f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
+                )
+                logger.info(success_msg)
+                async with pipeline_status_lock:
+                    pipeline_status["history_messages"].append(success_msg)
+
+                # Handle file deletion if requested and file_path is available
+                if (
+                    delete_file
+                    and result.file_path
+                    and result.file_path != "unknown_source"
+                ):
+                    await _delete_document_file(
+                        doc_manager,
+                        result.file_path,
+                        pipeline_status,
+                        pipeline_status_lock,
+                    )
+                elif delete_file:
+                    no_file_msg = f"File deletion skipped, missing file path: {doc_id}"
+                    logger.warning(no_file_msg)
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = no_file_msg
+                        pipeline_status["history_messages"].append(no_file_msg)
+            else:
                 failed_deletions.append(doc_id)
-                error_msg = f"Error deleting document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
+                error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
                 logger.error(error_msg)
-                logger.error(traceback.format_exc())
                 async with pipeline_status_lock:
                     pipeline_status["latest_message"] = error_msg
                     pipeline_status["history_messages"].append(error_msg)
@@ -2326,6 +2311,7 @@ def create_document_routes(
                           with status code 500 and error details in the detail field.
         """
         from lightrag.kg.shared_storage import (
+            bump_data_version,
             get_namespace_data,
             get_namespace_lock,
         )
@@ -2394,6 +2380,9 @@ def create_document_routes(
             # Wait for all drop tasks to complete
             drop_results = await asyncio.gather(*drop_tasks, return_exceptions=True)
 
+            # Invalidate query results cached from the dropped data in every worker
+            await bump_data_version(rag.workspace)
+
             # Check for errors and log results
             errors = []
             storage_success_count = 0
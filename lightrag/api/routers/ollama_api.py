@@ -9,7 +9,7 @@ from enum import Enum
 from fastapi.responses import StreamingResponse
 import asyncio
 from lightrag import LightRAG, QueryParam
-from lightrag.utils import TiktokenTokenizer
+from lightrag.utils import get_shared_tokenizer
 from lightrag.api.utils_api import get_combined_auth_dependency
 from fastapi import Depends
 
@@ -158,7 +158,7 @@ async def parse_request_body(
 
 def estimate_tokens(text: str) -> int:
     """Estimate the number of tokens in text using tiktoken"""
-    tokens = TiktokenTokenizer().encode(text)
+    tokens = get_shared_tokenizer().encode(text)
     return len(tokens)
 
 
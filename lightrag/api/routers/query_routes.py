@@ -162,6 +162,10 @@ class QueryResponse(BaseModel):
         default=None,
         description="Reference list (Disabled when include_references=False, /query/data always includes references.)",
     )
+    semantic_cache_hit: bool = Field(
+        default=False,
+        description="True if the response was served from the semantic query cache (answer of a similar earlier query)",
+    )
 
 
 class QueryDataResponse(BaseModel):
@@ -225,6 +229,10 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
                                     },
                                     "description": "Reference list (only included when include_references=True)",
                                 },
+                                "semantic_cache_hit": {
+                                    "type": "boolean",
+                                    "description": "True if the response was served from the semantic query cache",
+                                },
                             },
                             "required": ["response"],
                         },
@@ -444,11 +452,23 @@ def create_query_routes(rag, api_key: Optional[str] = None, top_k: int = 60):
                     enriched_references.append(ref_copy)
                 references = enriched_references
 
+            semantic_cache_hit = bool(
+                result.get("metadata", {}).get("semantic_cache_hit", False)
+            )
+
             # Return response with or without references based on request
             if request.include_references:
-                return QueryResponse(response=response_content, references=references)
+                return QueryResponse(
+                    response=response_content,
+                    references=references,
+                    semantic_cache_hit=semantic_cache_hit,
+                )
             else:
-                return QueryResponse(response=response_content, references=None)
+                return QueryResponse(
+                    response=response_content,
+                    references=None,
+                    semantic_cache_hit=semantic_cache_hit,
+                )
         except Exception as e:
             logger.error(f"Error processing query: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail=str(e))
@@ -16,7 +16,7 @@ from typing import (
     List,
     AsyncIterator,
 )
-from .utils import EmbeddingFunc
+from .utils import EmbeddingFunc, batch_cosine_similarity
 from .types import KnowledgeGraph
 from .constants import (
     DEFAULT_TOP_K,
@@ -313,6 +313,70 @@ class BaseVectorStorage(StorageNameSpace, ABC):
         """
         pass
 
+    @abstractmethod
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        """Iterate over the IDs of all vectors in batches
+
+        Backends page through their IDs with a server-side cursor (or a
+        snapshot of the ID list for in-memory storage), so callers only hold
+        one batch at a time. Vectors written or deleted during the iteration
+        may or may not be included.
+
+        Args:
+            batch_size: Maximum number of IDs per batch
+
+        Yields:
+            Lists of vector IDs
+        """
+
+    async def iter_items(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[dict[str, dict[str, Any]]]:
+        """Iterate over all vector records in batches
+
+        Default implementation pages iter_keys and fetches each batch with
+        get_by_ids. Records have the same shape as get_by_ids results.
+
+        Args:
+            batch_size: Maximum number of records per batch
+
+        Yields:
+            Dictionaries mapping vector ID to its record
+        """
+        async for keys in self.iter_keys(batch_size):
+            records = await self.get_by_ids(keys)
+            batch = {
+                key: record for key, record in zip(keys, records) if record is not None
+            }
+            if batch:
+                yield batch
+
+    async def get_similarities_by_ids(
+        self, ids: list[str], query_embedding: list[float]
+    ) -> dict[str, float]:
+        """Get the cosine similarity between a query embedding and the vectors of the given IDs
+
+        The default implementation fetches the vectors with get_vectors_by_ids and scores
+        them locally in a single batch. Backends that can score server-side should override
+        it so that vectors are not shipped back to the client.
+
+        Args:
+            ids: List of unique identifiers
+            query_embedding: Query embedding to compare against
+
+        Returns:
+            Dictionary mapping IDs that have a stored vector to their similarity
+            Format: {id: similarity, ...}
+        """
+        vectors = await self.get_vectors_by_ids(ids)
+        found_ids = [id for id in ids if id in vectors]
+        if not found_ids:
+            return {}
+        scores = batch_cosine_similarity(
+            query_embedding, [vectors[id] for id in found_ids]
+        )
+        return dict(zip(found_ids, scores.tolist()))
+
 
 @dataclass
 class BaseKVStorage(StorageNameSpace, ABC):
@@ -362,6 +426,45 @@ class BaseKVStorage(StorageNameSpace, ABC):
             bool: True if storage contains no data, False otherwise
         """
 
+    @abstractmethod
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        """Iterate over all keys in the storage in batches
+
+        Backends page through their keys with a server-side cursor (or a
+        snapshot of the key list for in-memory storage), so callers only hold
+        one batch at a time. Keys written or deleted during the iteration may
+        or may not be included.
+
+        Args:
+            batch_size: Maximum number of keys per batch
+
+        Yields:
+            Lists of keys
+        """
+
+    async def iter_items(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[dict[str, dict[str, Any]]]:
+        """Iterate over all key-value pairs in the storage in batches
+
+        Default implementation pages iter_keys and fetches each batch with
+        get_by_ids. Override this method when the backend can return values
+        together with the keys.
+
+        Args:
+            batch_size: Maximum number of records per batch
+
+        Yields:
+            Dictionaries mapping key to value, in the same format accepted by upsert
+        """
+        async for keys in self.iter_keys(batch_size):
+            values = await self.get_by_ids(keys)
+            batch = {
+                key: value for key, value in zip(keys, values) if value is not None
+            }
+            if batch:
+                yield batch
+
 
 @dataclass
 class BaseGraphStorage(StorageNameSpace, ABC):
@@ -558,6 +661,32 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Insert or update multiple nodes in the graph.
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: Mapping of node ID to node properties
+        """
+        for node_id, node_data in nodes.items():
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges(self, edges: list[tuple[str, str, dict[str, str]]]) -> None:
+        """Insert or update multiple edges in the graph.
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations. Both endpoint nodes must exist.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -640,6 +769,51 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             A list of all edges, where each edge is a dictionary of its properties
         """
 
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all nodes in the graph in batches.
+
+        Default implementation slices the result of get_all_nodes.
+        Override this method in storage backends that support server-side
+        paging, so that callers only hold one batch in memory at a time.
+
+        Args:
+            batch_size: Maximum number of nodes per batch
+
+        Yields:
+            Lists of node property dictionaries, each including the node "id"
+        """
+        all_nodes = await self.get_all_nodes()
+        for start in range(0, len(all_nodes), batch_size):
+            yield all_nodes[start : start + batch_size]
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all edges in the graph in batches.
+
+        Each stored edge is yielded once. Default implementation slices the
+        result of get_all_edges and drops the reverse duplicates some backends
+        report for undirected edges. Override this method in storage backends
+        that support server-side paging.
+
+        Args:
+            batch_size: Maximum number of edges per batch
+
+        Yields:
+            Lists of edge property dictionaries, each including "source" and "target"
+        """
+        seen: set[tuple[str, str]] = set()
+        batch: list[dict] = []
+        for edge in await self.get_all_edges():
+            pair = tuple(sorted((edge["source"], edge["target"])))
+            if pair in seen:
+                continue
+            seen.add(pair)
+            batch.append(edge)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     @abstractmethod
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """Get popular labels by node degree (most connected entities)
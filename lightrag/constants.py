@@ -23,6 +23,8 @@ DEFAULT_SUMMARY_MAX_TOKENS = 1200
 DEFAULT_SUMMARY_LENGTH_RECOMMENDED = 600
 # Maximum token size sent to LLM for summary
 DEFAULT_SUMMARY_CONTEXT_SIZE = 12000
+# Source chunks per partial-summary bucket (0 summarizes the whole description list)
+DEFAULT_SUMMARY_BUCKET_SIZE = 0
 # Default entities to extract if ENTITY_TYPES is not specified in .env
 DEFAULT_ENTITY_TYPES = [
     "Person",
@@ -87,9 +89,46 @@ DEFAULT_TEMPERATURE = 1.0
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
 
+# Chunking executor defaults
+# none: run chunking_func inline on the event loop
+# thread / process: run chunking_func in a thread / process pool
+DEFAULT_CHUNKING_EXECUTOR = "none"
+DEFAULT_CHUNKING_EXECUTOR_WORKERS = 4
+DEFAULT_CHUNKING_BATCH_SIZE = 4  # Documents chunked per worker call
+
+# In-process LLM response cache tier (0 disables the tier)
+DEFAULT_LLM_CACHE_MEMORY_MAX_BYTES = 0
+DEFAULT_LLM_CACHE_MEMORY_TTL = 0  # Seconds, 0 means entries never expire
+
+# In-process cache of query retrieval results (entries, 0 disables the cache)
+DEFAULT_QUERY_CONTEXT_CACHE_SIZE = 0
+
+# Semantic (embedding similarity) query answer cache
+DEFAULT_SEMANTIC_CACHE_ENABLED = False
+DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES = 1000
+DEFAULT_SEMANTIC_CACHE_TTL = 0  # Seconds, 0 means entries never expire
+
+# Merge all entities/relations of a document with bulk storage reads and writes
+DEFAULT_BATCH_MERGE = False
+
+# Entities/relations rebuilt per batch after deletion (bulk prefetch and write back)
+DEFAULT_REBUILD_BATCH_SIZE = 100
+
+# Seconds finished extractions wait to be merged together with other documents (0 disables)
+DEFAULT_MERGE_COALESCE_WINDOW = 0.0
+
+# Token counts memoized per tokenizer, keyed by content digest
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 100000
+
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
+# Seconds small concurrent embedding requests wait to be coalesced (0 disables it)
+DEFAULT_EMBEDDING_BATCH_WINDOW = 0.0
+# Persistent embedding cache: none, kv (configured KV storage) or mmap (local file)
+DEFAULT_EMBEDDING_CACHE_STORAGE = "none"
+DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES = 0  # 0 means unbounded
 
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
@@ -127,6 +127,13 @@ class ChunkTokenLimitExceededError(ValueError):
         self.chunk_token_limit = chunk_token_limit
         self.chunk_preview = truncated_preview
 
+    def __reduce__(self):
+        # Keep the error picklable so it can be raised from chunking worker processes
+        return (
+            self.__class__,
+            (self.chunk_tokens, self.chunk_token_limit, self.chunk_preview),
+        )
+
 
 class QdrantMigrationError(Exception):
     """Raised when Qdrant data migration from legacy collections fails."""
@@ -41,6 +41,9 @@ STORAGE_IMPLEMENTATIONS = {
     },
 }
 
+# KV storage implementations without a table/collection for the embedding_cache namespace
+EMBEDDING_CACHE_UNSUPPORTED_KV_STORAGES = {"PGKVStorage"}
+
 # Storage implementation environment variable without default value
 STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
     # KV Storage Implementations
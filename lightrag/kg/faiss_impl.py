@@ -1,7 +1,7 @@
 import os
 import time
 import asyncio
-from typing import Any, final
+from typing import Any, AsyncIterator, final
 import json
 import numpy as np
 from dataclasses import dataclass
@@ -472,6 +472,13 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         return results
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        """Iterate over a snapshot of the vector IDs in batches"""
+        await self._get_index()
+        ids = [meta["__id__"] for meta in self._id_to_meta.values()]
+        for start in range(0, len(ids), batch_size):
+            yield ids[start : start + batch_size]
+
     async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
         """Get vectors by their IDs, returning only ID and vector data for efficiency
 
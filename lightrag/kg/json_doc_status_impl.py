@@ -1,6 +1,7 @@
+from bisect import bisect_left, insort
 from dataclasses import dataclass
 import os
-from typing import Any, Union, final
+from typing import Any, AsyncIterator, Union, final
 
 from lightrag.base import (
     DocProcessingStatus,
@@ -25,6 +26,101 @@ from .shared_storage import (
 )
 
 
+DOC_SORT_FIELDS = ("created_at", "updated_at", "id", "file_path")
+
+
+class DocStatusIndex:
+    """Sorted secondary indexes over the document status records
+
+    For every sort field a sorted list of (sort_key, doc_id) is kept for all documents
+    and one per status, so a page is sliced directly from the matching list and status
+    counts are list lengths. Indexes are updated incrementally on upsert/delete.
+    """
+
+    def __init__(self):
+        # doc_id -> (status, {sort_field: sort_key})
+        self._entries: dict[str, tuple[str, dict[str, str]]] = {}
+        # (status or None for all documents, sort_field) -> sorted [(sort_key, doc_id)]
+        self._sorted: dict[tuple[str | None, str], list[tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _sort_keys(doc_id: str, doc_data: dict[str, Any]) -> dict[str, str]:
+        keys = {}
+        for field_name in ("created_at", "updated_at"):
+            value = doc_data.get(field_name)
+            keys[field_name] = "" if value is None else str(value)
+        keys["id"] = doc_id
+        # Use pinyin sorting for file_path field to support Chinese characters
+        keys["file_path"] = get_pinyin_sort_key(
+            doc_data.get("file_path", "no-file-path")
+        )
+        return keys
+
+    def add(self, doc_id: str, doc_data: dict[str, Any]) -> None:
+        self.remove(doc_id)
+        status = doc_data.get("status")
+        keys = self._sort_keys(doc_id, doc_data)
+        self._entries[doc_id] = (status, keys)
+        for field_name, key in keys.items():
+            for group in (None, status):
+                insort(self._sorted.setdefault((group, field_name), []), (key, doc_id))
+
+    def remove(self, doc_id: str) -> None:
+        entry = self._entries.pop(doc_id, None)
+        if entry is None:
+            return
+        status, keys = entry
+        for field_name, key in keys.items():
+            for group in (None, status):
+                items = self._sorted[(group, field_name)]
+                pos = bisect_left(items, (key, doc_id))
+                if pos < len(items) and items[pos] == (key, doc_id):
+                    del items[pos]
+
+    def rebuild(self, data) -> None:
+        """Rebuild all indexes from the records (sorting once instead of inserting)"""
+        self._entries = {}
+        self._sorted = {}
+        for doc_id, doc_data in data.items():
+            status = doc_data.get("status")
+            keys = self._sort_keys(doc_id, doc_data)
+            self._entries[doc_id] = (status, keys)
+            for field_name, key in keys.items():
+                for group in (None, status):
+                    self._sorted.setdefault((group, field_name), []).append(
+                        (key, doc_id)
+                    )
+        for items in self._sorted.values():
+            items.sort()
+
+    def count(self, status: str | None = None) -> int:
+        if status is None:
+            return len(self._entries)
+        return len(self._sorted.get((status, "id"), ()))
+
+    def page(
+        self,
+        status: str | None,
+        sort_field: str,
+        descending: bool,
+        offset: int,
+        limit: int,
+    ) -> tuple[list[str], int]:
+        """Return (doc ids of the requested page, total number of matching documents)"""
+        items = self._sorted.get((status, sort_field), [])
+        total = len(items)
+        if descending:
+            end = max(total - offset, 0)
+            start = max(end - limit, 0)
+            page_items = items[start:end][::-1]
+        else:
+            page_items = items[offset : offset + limit]
+        return [doc_id for _, doc_id in page_items], total
+
+
 @final
 @dataclass
 class JsonDocStatusStorage(DocStatusStorage):
@@ -45,6 +141,11 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Sorted indexes for pagination and status counts, built on first use
+        self._index: DocStatusIndex | None = None
+        self._index_version = -1
+        # Change counter shared by all processes, a mismatch triggers an index rebuild
+        self._data_version = None
 
     async def initialize(self):
         """Initialize storage data"""
@@ -62,6 +163,9 @@ class JsonDocStatusStorage(DocStatusStorage):
             self._data = await get_namespace_data(
                 self.namespace, workspace=self.workspace
             )
+            self._data_version = await get_namespace_data(
+                f"{self.namespace}_version", workspace=self.workspace
+            )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
@@ -70,6 +174,52 @@ class JsonDocStatusStorage(DocStatusStorage):
                         f"[{self.workspace}] Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
                     )
 
+    def _get_index(self) -> DocStatusIndex:
+        """Return the up-to-date secondary indexes (caller must hold the storage lock)"""
+        version = self._data_version.get("version", 0)
+        if self._index is None or self._index_version != version:
+            index = DocStatusIndex()
+            index.rebuild(self._data)
+            self._index = index
+            self._index_version = version
+        return self._index
+
+    def _record_change(self, added: dict[str, dict[str, Any]], removed: list[str]):
+        """Update the indexes and bump the shared data version (caller must hold the storage lock)"""
+        up_to_date = (
+            self._index is not None
+            and self._index_version == self._data_version.get("version", 0)
+        )
+        version = self._data_version.get("version", 0) + 1
+        self._data_version["version"] = version
+        if not up_to_date:
+            # Rebuilt from the records on next use
+            self._index = None
+            return
+        for doc_id in removed:
+            self._index.remove(doc_id)
+        for doc_id, doc_data in added.items():
+            self._index.add(doc_id, doc_data)
+        self._index_version = version
+
+    def _to_doc_status(
+        self, doc_id: str, doc_data: dict[str, Any]
+    ) -> DocProcessingStatus | None:
+        try:
+            # Prepare document data
+            data = doc_data.copy()
+            data.pop("content", None)
+            if "file_path" not in data:
+                data["file_path"] = "no-file-path"
+            if "metadata" not in data:
+                data["metadata"] = {}
+            if "error_msg" not in data:
+                data["error_msg"] = None
+            return DocProcessingStatus(**data)
+        except KeyError as e:
+            logger.error(f"[{self.workspace}] Error processing document {doc_id}: {e}")
+            return None
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
         if self._storage_lock is None:
@@ -77,6 +227,19 @@ class JsonDocStatusStorage(DocStatusStorage):
         async with self._storage_lock:
             return set(keys) - set(self._data.keys())
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        """Iterate over a snapshot of the document IDs in batches
+
+        The lock is only held while taking the snapshot, so callers may write
+        to this storage between batches.
+        """
+        if self._storage_lock is None:
+            raise StorageNotInitializedError("JsonDocStatusStorage")
+        async with self._storage_lock:
+            keys = list(self._data.keys())
+        for start in range(0, len(keys), batch_size):
+            yield keys[start : start + batch_size]
+
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         ordered_results: list[dict[str, Any] | None] = []
         if self._storage_lock is None:
@@ -96,8 +259,9 @@ class JsonDocStatusStorage(DocStatusStorage):
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
+            index = self._get_index()
+            for status in counts:
+                counts[status] = index.count(status)
         return counts
 
     async def get_docs_by_status(
@@ -180,6 +344,9 @@ class JsonDocStatusStorage(DocStatusStorage):
                     if cleaned_data is not None:
                         self._data.clear()
                         self._data.update(cleaned_data)
+                        self._data_version["version"] = (
+                            self._data_version.get("version", 0) + 1
+                        )
 
                 await clear_all_update_flags(self.namespace, workspace=self.workspace)
 
@@ -202,6 +369,7 @@ class JsonDocStatusStorage(DocStatusStorage):
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
             self._data.update(data)
+            self._record_change(data, [])
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
         await self.index_done_callback()
@@ -252,72 +420,27 @@ class JsonDocStatusStorage(DocStatusStorage):
         elif page_size > 200:
             page_size = 200
 
-        if sort_field not in ["created_at", "updated_at", "id", "file_path"]:
+        if sort_field not in DOC_SORT_FIELDS:
             sort_field = "updated_at"
 
         if sort_direction.lower() not in ["asc", "desc"]:
             sort_direction = "desc"
 
-        # For JSON storage, we load all data and sort/filter in memory
-        all_docs = []
-
+        # Slice the page from the sorted indexes, only page rows are materialized
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                # Apply status filter
-                if (
-                    status_filter is not None
-                    and doc_data.get("status") != status_filter.value
-                ):
-                    continue
-
-                try:
-                    # Prepare document data
-                    data = doc_data.copy()
-                    data.pop("content", None)
-                    if "file_path" not in data:
-                        data["file_path"] = "no-file-path"
-                    if "metadata" not in data:
-                        data["metadata"] = {}
-                    if "error_msg" not in data:
-                        data["error_msg"] = None
-
-                    doc_status = DocProcessingStatus(**data)
-
-                    # Add sort key for sorting
-                    if sort_field == "id":
-                        doc_status._sort_key = doc_id
-                    elif sort_field == "file_path":
-                        # Use pinyin sorting for file_path field to support Chinese characters
-                        file_path_value = getattr(doc_status, sort_field, "")
-                        doc_status._sort_key = get_pinyin_sort_key(file_path_value)
-                    else:
-                        doc_status._sort_key = getattr(doc_status, sort_field, "")
-
-                    all_docs.append((doc_id, doc_status))
-
-                except KeyError as e:
-                    logger.error(
-                        f"[{self.workspace}] Error processing document {doc_id}: {e}"
-                    )
-                    continue
-
-        # Sort documents
-        reverse_sort = sort_direction.lower() == "desc"
-        all_docs.sort(
-            key=lambda x: getattr(x[1], "_sort_key", ""), reverse=reverse_sort
-        )
-
-        # Remove sort key from documents
-        for doc_id, doc in all_docs:
-            if hasattr(doc, "_sort_key"):
-                delattr(doc, "_sort_key")
-
-        total_count = len(all_docs)
-
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_docs = all_docs[start_idx:end_idx]
+            doc_ids, total_count = self._get_index().page(
+                status_filter.value if status_filter is not None else None,
+                sort_field,
+                sort_direction.lower() == "desc",
+                (page - 1) * page_size,
+                page_size,
+            )
+            paginated_docs = []
+            for doc_id in doc_ids:
+                doc_data = self._data.get(doc_id)
+                doc_status = self._to_doc_status(doc_id, doc_data) if doc_data else None
+                if doc_status is not None:
+                    paginated_docs.append((doc_id, doc_status))
 
         return paginated_docs, total_count
 
@@ -349,13 +472,14 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
+            deleted_ids = []
             for doc_id in doc_ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
-                    any_deleted = True
+                    deleted_ids.append(doc_id)
 
-            if any_deleted:
+            if deleted_ids:
+                self._record_change({}, deleted_ids)
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
     async def get_doc_by_file_path(self, file_path: str) -> Union[dict[str, Any], None]:
@@ -395,6 +519,7 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                self._data_version["version"] = self._data_version.get("version", 0) + 1
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
             await self.index_done_callback()
@@ -1,11 +1,13 @@
+import json
 import os
 from dataclasses import dataclass
-from typing import Any, final
+from typing import Any, AsyncIterator, final
 
 from lightrag.base import (
     BaseKVStorage,
 )
 from lightrag.utils import (
+    SanitizingJSONEncoder,
     load_json,
     logger,
     write_json,
@@ -22,6 +24,105 @@ from .shared_storage import (
 )
 
 
+STORAGE_MODE_JSON = "json"
+STORAGE_MODE_WAL = "wal"
+
+# Do not compact write-ahead logs smaller than this
+WAL_COMPACTION_MIN_BYTES = 4 * 1024 * 1024
+
+
+class JsonKVWriteAheadLog:
+    """Append-only JSONL log of KV changes on top of a JSON snapshot file
+
+    Each line is {"op": "upsert", "key": ..., "value": ...} or {"op": "delete", "key": ...}.
+    Replaying the log over the snapshot is idempotent, so a crash between writing a new
+    snapshot and truncating the log is harmless. A torn last line (crash while appending)
+    is dropped and truncated away on replay.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+
+    @property
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.file_name)
+        except FileNotFoundError:
+            return 0
+
+    def replay(self, data: dict[str, Any]) -> int:
+        """Apply logged changes to data in order, returns the number of records applied"""
+        if not os.path.exists(self.file_name):
+            return 0
+        applied = 0
+        valid_size = 0
+        with open(self.file_name, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        f"Ignoring torn write-ahead log tail at byte {valid_size}: {self.file_name}"
+                    )
+                    break
+                if record["op"] == "delete":
+                    data.pop(record["key"], None)
+                else:
+                    data[record["key"]] = record["value"]
+                applied += 1
+                valid_size += len(line)
+        if valid_size < self.size:
+            with open(self.file_name, "r+b") as f:
+                f.truncate(valid_size)
+        return applied
+
+    @staticmethod
+    def _encode(record: dict[str, Any]) -> tuple[bytes, bool]:
+        """Encode a record as one JSONL line, returns (line, sanitized)"""
+        try:
+            line = json.dumps(record, ensure_ascii=False).encode("utf-8")
+            return line + b"\n", False
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            line = json.dumps(
+                record, ensure_ascii=False, cls=SanitizingJSONEncoder
+            ).encode("utf-8")
+            return line + b"\n", True
+
+    def append(
+        self, upserts: dict[str, Any], deletes: list[str]
+    ) -> dict[str, Any] | None:
+        """Append changes and fsync the log
+
+        Returns:
+            Sanitized values of upserted keys that contained invalid characters (the
+            caller should update shared memory with them), or None
+        """
+        lines = []
+        sanitized_values = {}
+        for key, value in upserts.items():
+            line, sanitized = self._encode({"op": "upsert", "key": key, "value": value})
+            if sanitized:
+                sanitized_values[key] = json.loads(line)["value"]
+            lines.append(line)
+        for key in deletes:
+            lines.append(self._encode({"op": "delete", "key": key})[0])
+        if lines:
+            with open(self.file_name, "ab") as f:
+                f.write(b"".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+        return sanitized_values or None
+
+    def reset(self) -> None:
+        """Drop all logged changes (after they were written to a snapshot)"""
+        if os.path.exists(self.file_name):
+            with open(self.file_name, "wb") as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+
 @final
 @dataclass
 class JsonKVStorage(BaseKVStorage):
@@ -38,7 +139,25 @@ class JsonKVStorage(BaseKVStorage):
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
 
+        # Storage mode: "json" (rewrite the whole file) or "wal" (JSON snapshot plus
+        # append-only change log, compacted into the snapshot periodically)
+        self._storage_mode = os.getenv(
+            "JSON_KV_STORAGE_MODE", STORAGE_MODE_JSON
+        ).lower()
+        if self._storage_mode not in (STORAGE_MODE_JSON, STORAGE_MODE_WAL):
+            raise ValueError(
+                f"Invalid JsonKVStorage storage mode: {self._storage_mode}"
+            )
+        self._wal_compaction_ratio = float(
+            os.getenv("JSON_KV_WAL_COMPACTION_RATIO", 0.5)
+        )
+        self._wal = JsonKVWriteAheadLog(
+            os.path.join(workspace_dir, f"kv_store_{self.namespace}.wal.jsonl")
+        )
+
         self._data = None
+        # Keys changed since the last persist, shared by all processes (wal mode only)
+        self._pending_keys = None
         self._storage_lock = None
         self.storage_updated = None
 
@@ -58,6 +177,10 @@ class JsonKVStorage(BaseKVStorage):
             self._data = await get_namespace_data(
                 self.namespace, workspace=self.workspace
             )
+            if self._storage_mode == STORAGE_MODE_WAL:
+                self._pending_keys = await get_namespace_data(
+                    f"{self.namespace}_wal_pending", workspace=self.workspace
+                )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
@@ -67,6 +190,17 @@ class JsonKVStorage(BaseKVStorage):
                             loaded_data
                         )
 
+                    # Replay changes logged after the last snapshot
+                    replayed = self._wal.replay(loaded_data)
+                    if replayed:
+                        logger.info(
+                            f"[{self.workspace}] Replayed {replayed} write-ahead log records for {self.namespace}"
+                        )
+                        if self._storage_mode == STORAGE_MODE_JSON:
+                            # Fold the log of a previous wal-mode run into the JSON file
+                            write_json(loaded_data, self._file_name)
+                            self._wal.reset()
+
                     self._data.update(loaded_data)
                     data_count = len(loaded_data)
 
@@ -75,6 +209,10 @@ class JsonKVStorage(BaseKVStorage):
                     )
 
     async def index_done_callback(self) -> None:
+        if self._storage_mode == STORAGE_MODE_WAL:
+            await self._persist_wal()
+            return
+
         async with self._storage_lock:
             if self.storage_updated.value:
                 data_dict = (
@@ -103,6 +241,66 @@ class JsonKVStorage(BaseKVStorage):
 
                 await clear_all_update_flags(self.namespace, workspace=self.workspace)
 
+    async def _persist_wal(self) -> None:
+        """Append pending changes to the write-ahead log, compacting it when it grows too large"""
+        async with self._storage_lock:
+            if not self.storage_updated.value:
+                return
+
+            changed_keys = list(self._pending_keys.keys())
+            upserts = {}
+            deletes = []
+            for key in changed_keys:
+                value = self._data.get(key)
+                if value is None:
+                    deletes.append(key)
+                else:
+                    upserts[key] = value
+
+            logger.debug(
+                f"[{self.workspace}] Process {os.getpid()} KV appending {len(upserts)} upserts and {len(deletes)} deletes to {self.namespace} log"
+            )
+            sanitized_values = self._wal.append(upserts, deletes)
+            if sanitized_values:
+                logger.info(
+                    f"[{self.workspace}] Updating {len(sanitized_values)} sanitized records in shared memory for {self.namespace}"
+                )
+                self._data.update(sanitized_values)
+            for key in changed_keys:
+                self._pending_keys.pop(key, None)
+
+            wal_size = self._wal.size
+            snapshot_size = (
+                os.path.getsize(self._file_name)
+                if os.path.exists(self._file_name)
+                else 0
+            )
+            if (
+                wal_size > WAL_COMPACTION_MIN_BYTES
+                and wal_size > snapshot_size * self._wal_compaction_ratio
+            ):
+                self._write_snapshot()
+
+            await clear_all_update_flags(self.namespace, workspace=self.workspace)
+
+    def _write_snapshot(self) -> None:
+        """Write all data to the JSON snapshot atomically and truncate the write-ahead log"""
+        data_dict = dict(self._data) if hasattr(self._data, "_getvalue") else self._data
+        logger.info(
+            f"[{self.workspace}] Compacting {self.namespace} write-ahead log into snapshot ({len(data_dict)} records)"
+        )
+        tmp_file = f"{self._file_name}.tmp"
+        needs_reload = write_json(data_dict, tmp_file)
+        with open(tmp_file, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._file_name)
+        self._wal.reset()
+        if needs_reload:
+            cleaned_data = load_json(self._file_name)
+            if cleaned_data is not None:
+                self._data.clear()
+                self._data.update(cleaned_data)
+
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
         async with self._storage_lock:
             result = self._data.get(id)
@@ -138,6 +336,17 @@ class JsonKVStorage(BaseKVStorage):
         async with self._storage_lock:
             return set(keys) - set(self._data.keys())
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        """Iterate over a snapshot of the keys in batches
+
+        The lock is only held while taking the snapshot, so callers may write
+        to this storage between batches.
+        """
+        async with self._storage_lock:
+            keys = list(self._data.keys())
+        for start in range(0, len(keys), batch_size):
+            yield keys[start : start + batch_size]
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Importance notes for in-memory storage:
@@ -174,6 +383,8 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            if self._pending_keys is not None:
+                self._pending_keys.update(dict.fromkeys(data))
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -195,6 +406,8 @@ class JsonKVStorage(BaseKVStorage):
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    if self._pending_keys is not None:
+                        self._pending_keys[doc_id] = None
 
             if any_deleted:
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -225,6 +438,10 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                if self._pending_keys is not None:
+                    # Replace snapshot and log right away instead of logging every delete
+                    self._pending_keys.clear()
+                    self._write_snapshot()
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
             await self.index_done_callback()
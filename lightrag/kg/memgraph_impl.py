@@ -2,7 +2,7 @@ import os
 import asyncio
 import random
 from dataclasses import dataclass
-from typing import final
+from typing import AsyncIterator, final
 import configparser
 
 from ..utils import logger
@@ -473,6 +473,216 @@ class MemgraphStorage(BaseGraphStorage):
                     )  # Ensure the result is consumed even on error
                 raise
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        """Retrieve multiple nodes in one query using UNWIND.
+
+        Args:
+            node_ids: List of node entity IDs to fetch
+
+        Returns:
+            dict: Mapping of each found node_id to its node properties
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            result = None
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})
+                RETURN id AS entity_id, n
+                """
+                result = await session.run(query, node_ids=node_ids)
+                nodes = {}
+                async for record in result:
+                    entity_id = record["entity_id"]
+                    if entity_id in nodes:
+                        # Keep the first node, as get_node does for duplicates
+                        continue
+                    node_dict = dict(record["n"])
+                    # Remove workspace label from labels list if it exists
+                    if "labels" in node_dict:
+                        node_dict["labels"] = [
+                            label
+                            for label in node_dict["labels"]
+                            if label != workspace_label
+                        ]
+                    nodes[entity_id] = node_dict
+                await result.consume()
+                return nodes
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error getting nodes in batch: {str(e)}"
+                )
+                if result is not None:
+                    await (
+                        result.consume()
+                    )  # Ensure the result is consumed even on error
+                raise
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        """Retrieve the degrees of multiple nodes in one query using UNWIND.
+
+        Args:
+            node_ids: List of node entity IDs
+
+        Returns:
+            dict: Mapping of each node_id to its degree, 0 for nodes not found
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            result = None
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})
+                OPTIONAL MATCH (n)-[r]-()
+                RETURN id AS entity_id, COUNT(r) AS degree
+                """
+                result = await session.run(query, node_ids=node_ids)
+                degrees = {}
+                async for record in result:
+                    degrees.setdefault(record["entity_id"], record["degree"])
+                await result.consume()
+
+                for node_id in node_ids:
+                    if node_id not in degrees:
+                        logger.warning(
+                            f"[{self.workspace}] No node found with label '{node_id}'"
+                        )
+                        degrees[node_id] = 0
+                return degrees
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error getting node degrees in batch: {str(e)}"
+                )
+                if result is not None:
+                    await (
+                        result.consume()
+                    )  # Ensure the result is consumed even on error
+                raise
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """Retrieve edge properties for multiple (src, tgt) pairs in one query using UNWIND.
+
+        Args:
+            pairs: List of dictionaries, e.g. [{"src": "node1", "tgt": "node2"}, ...]
+
+        Returns:
+            dict: Mapping of each found (src, tgt) tuple to its edge properties
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            result = None
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $pairs AS pair
+                MATCH (start:`{workspace_label}` {{entity_id: pair.src}})-[r]-(end:`{workspace_label}` {{entity_id: pair.tgt}})
+                RETURN pair.src AS src_id, pair.tgt AS tgt_id, collect(properties(r)) AS edges
+                """
+                result = await session.run(query, pairs=pairs)
+                edges_dict = {}
+                async for record in result:
+                    edges = record["edges"]
+                    if not edges:
+                        continue
+                    edge_result = dict(edges[0])  # choose the first if multiple exist
+                    for key, default_value in {
+                        "weight": 1.0,
+                        "source_id": None,
+                        "description": None,
+                        "keywords": None,
+                    }.items():
+                        if key not in edge_result:
+                            edge_result[key] = default_value
+                    edges_dict[(record["src_id"], record["tgt_id"])] = edge_result
+                await result.consume()
+                return edges_dict
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error getting edges in batch: {str(e)}"
+                )
+                if result is not None:
+                    await (
+                        result.consume()
+                    )  # Ensure the result is consumed even on error
+                raise
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Retrieve the edges of multiple nodes in one query using UNWIND.
+
+        Args:
+            node_ids: List of node entity IDs
+
+        Returns:
+            dict: Mapping of each node_id to its (source, target) edge tuples, oriented
+                  as stored: outgoing edges as (node, connected), incoming edges as
+                  (connected, node)
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            result = None
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})
+                OPTIONAL MATCH (n)-[r]-(connected:`{workspace_label}`)
+                WHERE connected.entity_id IS NOT NULL
+                RETURN id AS queried_id, n.entity_id AS node_entity_id,
+                       connected.entity_id AS connected_entity_id,
+                       startNode(r).entity_id AS start_entity_id
+                """
+                result = await session.run(query, node_ids=node_ids)
+                edges_dict = {node_id: [] for node_id in node_ids}
+                async for record in result:
+                    node_entity_id = record["node_entity_id"]
+                    connected_entity_id = record["connected_entity_id"]
+                    if not node_entity_id or not connected_entity_id:
+                        continue
+                    if record["start_entity_id"] == node_entity_id:
+                        edge = (node_entity_id, connected_entity_id)
+                    else:
+                        edge = (connected_entity_id, node_entity_id)
+                    edges_dict[record["queried_id"]].append(edge)
+                await result.consume()
+                return edges_dict
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error getting node edges in batch: {str(e)}"
+                )
+                if result is not None:
+                    await (
+                        result.consume()
+                    )  # Ensure the result is consumed even on error
+                raise
+
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """
         Upsert a node in the Memgraph database with manual transaction-level retry logic for transient errors.
@@ -801,6 +1011,25 @@ class MemgraphStorage(BaseGraphStorage):
         degrees = int(src_degree) + int(trg_degree)
         return degrees
 
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Combined degree (source degree + target degree) of multiple edges,
+        computed from one node_degrees_batch query over all endpoints.
+
+        Args:
+            edge_pairs: List of (src, tgt) tuples
+
+        Returns:
+            dict: Mapping of each (src, tgt) tuple to the sum of both node degrees
+        """
+        node_ids = list({node_id for pair in edge_pairs for node_id in pair})
+        degrees = await self.node_degrees_batch(node_ids)
+        return {
+            (src, tgt): degrees.get(src, 0) + degrees.get(tgt, 0)
+            for src, tgt in edge_pairs
+        }
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -1034,6 +1263,86 @@ class MemgraphStorage(BaseGraphStorage):
             await result.consume()
             return edges
 
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all nodes in batches
+
+        Pages by entity_id (keyset pagination on the entity_id index) with one
+        short read session per batch, so no transaction is held open while the
+        caller processes a batch.
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        workspace_label = self._get_workspace_label()
+        query = f"""
+        MATCH (n:`{workspace_label}`)
+        WHERE n.entity_id > $after
+        RETURN n
+        ORDER BY n.entity_id
+        LIMIT $limit
+        """
+        after = ""
+        while True:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                result = await session.run(query, after=after, limit=batch_size)
+                batch = []
+                async for record in result:
+                    node_dict = dict(record["n"])
+                    node_dict["id"] = node_dict.get("entity_id")
+                    batch.append(node_dict)
+                await result.consume()
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            after = batch[-1]["id"]
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all edges in batches
+
+        Pages source nodes by entity_id and returns their outgoing
+        relationships, so each stored relationship is yielded exactly once.
+        A batch may exceed batch_size when a page of nodes has many edges.
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        workspace_label = self._get_workspace_label()
+        query = f"""
+        MATCH (a:`{workspace_label}`)
+        WHERE a.entity_id > $after
+        WITH a ORDER BY a.entity_id LIMIT $limit
+        OPTIONAL MATCH (a)-[r]->(b:`{workspace_label}`)
+        RETURN a.entity_id AS source, b.entity_id AS target, properties(r) AS properties
+        """
+        after = ""
+        while True:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                result = await session.run(query, after=after, limit=batch_size)
+                sources = set()
+                batch = []
+                async for record in result:
+                    sources.add(record["source"])
+                    if record["target"] is None:
+                        continue
+                    edge_properties = dict(record["properties"] or {})
+                    edge_properties["source"] = record["source"]
+                    edge_properties["target"] = record["target"]
+                    batch.append(edge_properties)
+                await result.consume()
+            if batch:
+                yield batch
+            if len(sources) < batch_size:
+                return
+            after = max(sources)
+
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """Get popular labels by node degree (most connected entities)
 
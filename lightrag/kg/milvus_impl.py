@@ -1,6 +1,6 @@
 import asyncio
 import os
-from typing import Any, final
+from typing import Any, AsyncIterator, final
 from dataclasses import dataclass
 import numpy as np
 from lightrag.utils import logger, compute_mdhash_id
@@ -1297,6 +1297,37 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             )
             return []
 
+    async def _query_pages(
+        self, batch_size: int, output_fields: list[str]
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Page through the collection with a Milvus query iterator"""
+        self._ensure_collection_loaded()
+        iterator = self._client.query_iterator(
+            collection_name=self.final_namespace,
+            batch_size=batch_size,
+            output_fields=output_fields,
+        )
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    return
+                yield rows
+        finally:
+            iterator.close()
+
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        async for rows in self._query_pages(batch_size, ["id"]):
+            yield [row["id"] for row in rows]
+
+    async def iter_items(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[dict[str, dict[str, Any]]]:
+        """Iterate over records, fetched with the same query iterator as the IDs"""
+        output_fields = list(self.meta_fields) + ["id"]
+        async for rows in self._query_pages(batch_size, output_fields):
+            yield {row["id"]: dict(row) for row in rows}
+
     async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
         """Get vectors by their IDs, returning only ID and vector data for efficiency
 
@@ -6,7 +6,7 @@ import numpy as np
 import configparser
 import asyncio
 
-from typing import Any, Union, final
+from typing import Any, AsyncIterator, Union, final
 
 from ..base import (
     BaseGraphStorage,
@@ -174,6 +174,20 @@ class MongoKVStorage(BaseKVStorage):
         existing_ids = {str(x["_id"]) async for x in cursor}
         return keys - existing_ids
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        async for docs in iter_collection_pages(self._data, batch_size, {"_id": 1}):
+            yield [str(doc["_id"]) for doc in docs]
+
+    async def iter_items(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[dict[str, dict[str, Any]]]:
+        """Iterate over full documents, fetched with the same cursor as the keys"""
+        async for docs in iter_collection_pages(self._data, batch_size):
+            for doc in docs:
+                doc.setdefault("create_time", 0)
+                doc.setdefault("update_time", 0)
+            yield {str(doc["_id"]): doc for doc in docs}
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
         if not data:
@@ -396,6 +410,10 @@ class MongoDocStatusStorage(DocStatusStorage):
         existing_ids = {str(x["_id"]) async for x in cursor}
         return data - existing_ids
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        async for docs in iter_collection_pages(self._data, batch_size, {"_id": 1}):
+            yield [str(doc["_id"]) for doc in docs]
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
         if not data:
@@ -959,36 +977,88 @@ class MongoGraphStorage(BaseGraphStorage):
         return result
 
     async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
-        # merge the outbound and inbound results with the same "_id" and sum the "degree"
-        merged_results = {}
+        """
+        Degrees of multiple nodes in a single aggregation.
+
+        Every edge touching a requested node is expanded into its distinct endpoints,
+        so a self-loop counts once, as in node_degree. Nodes without edges get 0.
+        """
+        degrees = {node_id: 0 for node_id in node_ids}
+        if not node_ids:
+            return degrees
 
-        # Outbound degrees
-        outbound_pipeline = [
-            {"$match": {"source_node_id": {"$in": node_ids}}},
-            {"$group": {"_id": "$source_node_id", "degree": {"$sum": 1}}},
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"source_node_id": {"$in": node_ids}},
+                        {"target_node_id": {"$in": node_ids}},
+                    ]
+                }
+            },
+            {
+                "$project": {
+                    "endpoints": {
+                        "$setUnion": [["$source_node_id"], ["$target_node_id"]]
+                    }
+                }
+            },
+            {"$unwind": "$endpoints"},
+            {"$match": {"endpoints": {"$in": node_ids}}},
+            {"$group": {"_id": "$endpoints", "degree": {"$sum": 1}}},
         ]
 
-        cursor = await self.edge_collection.aggregate(
-            outbound_pipeline, allowDiskUse=True
-        )
+        cursor = await self.edge_collection.aggregate(pipeline, allowDiskUse=True)
         async for doc in cursor:
-            merged_results[doc.get("_id")] = doc.get("degree")
+            degrees[doc.get("_id")] = doc.get("degree")
 
-        # Inbound degrees
-        inbound_pipeline = [
-            {"$match": {"target_node_id": {"$in": node_ids}}},
-            {"$group": {"_id": "$target_node_id", "degree": {"$sum": 1}}},
-        ]
+        return degrees
 
-        cursor = await self.edge_collection.aggregate(
-            inbound_pipeline, allowDiskUse=True
-        )
-        async for doc in cursor:
-            merged_results[doc.get("_id")] = merged_results.get(
-                doc.get("_id"), 0
-            ) + doc.get("degree")
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """
+        Combined degree (source degree + target degree) of multiple edges,
+        computed from one node_degrees_batch aggregation over all endpoints.
+        """
+        node_ids = list({node_id for pair in edge_pairs for node_id in pair})
+        degrees = await self.node_degrees_batch(node_ids)
+        return {
+            (src, tgt): degrees.get(src, 0) + degrees.get(tgt, 0)
+            for src, tgt in edge_pairs
+        }
 
-        return merged_results
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """
+        Retrieve multiple edges in one query, matching each pair in either direction.
+
+        Args:
+            pairs: List of dictionaries, e.g. [{"src": "node1", "tgt": "node2"}, ...]
+
+        Returns:
+            A dictionary mapping found (src, tgt) tuples to their edge documents.
+        """
+        if not pairs:
+            return {}
+
+        requested = {(pair["src"], pair["tgt"]) for pair in pairs}
+        conditions = []
+        for src, tgt in requested:
+            conditions.append({"source_node_id": src, "target_node_id": tgt})
+            if src != tgt:
+                conditions.append({"source_node_id": tgt, "target_node_id": src})
+
+        result = {}
+        async for edge in self.edge_collection.find({"$or": conditions}):
+            source = edge.get("source_node_id")
+            target = edge.get("target_node_id")
+            # An edge answers the pair in its own direction and the reversed one
+            for key in ((source, target), (target, source)):
+                if key in requested and key not in result:
+                    result[key] = edge
+        return result
 
     async def get_nodes_edges_batch(
         self, node_ids: list[str]
@@ -1009,25 +1079,23 @@ class MongoGraphStorage(BaseGraphStorage):
         """
         result = {node_id: [] for node_id in node_ids}
 
-        # Query outgoing edges (where node is the source)
-        outgoing_cursor = self.edge_collection.find(
-            {"source_node_id": {"$in": node_ids}},
-            {"source_node_id": 1, "target_node_id": 1},
-        )
-        async for edge in outgoing_cursor:
-            source = edge["source_node_id"]
-            target = edge["target_node_id"]
-            result[source].append((source, target))
-
-        # Query incoming edges (where node is the target)
-        incoming_cursor = self.edge_collection.find(
-            {"target_node_id": {"$in": node_ids}},
+        # Outgoing and incoming edges in one query
+        cursor = self.edge_collection.find(
+            {
+                "$or": [
+                    {"source_node_id": {"$in": node_ids}},
+                    {"target_node_id": {"$in": node_ids}},
+                ]
+            },
             {"source_node_id": 1, "target_node_id": 1},
         )
-        async for edge in incoming_cursor:
+        async for edge in cursor:
             source = edge["source_node_id"]
             target = edge["target_node_id"]
-            result[target].append((source, target))
+            if source in result:
+                result[source].append((source, target))
+            if target in result and target != source:
+                result[target].append((source, target))
 
         return result
 
@@ -1607,6 +1675,24 @@ class MongoGraphStorage(BaseGraphStorage):
             edges.append(edge_dict)
         return edges
 
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all nodes in batches, paging the node collection by _id"""
+        async for docs in iter_collection_pages(self.collection, batch_size):
+            for node_dict in docs:
+                node_dict["id"] = node_dict.get("_id")
+            yield docs
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all edges in batches, paging the edge collection by _id
+
+        Edges are stored once per node pair, so no deduplication is needed.
+        """
+        async for docs in iter_collection_pages(self.edge_collection, batch_size):
+            for edge_dict in docs:
+                edge_dict["source"] = edge_dict.get("source_node_id")
+                edge_dict["target"] = edge_dict.get("target_node_id")
+            yield docs
+
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """Get popular labels by node degree (most connected entities)
 
@@ -2408,6 +2494,10 @@ class MongoVectorDBStorage(BaseVectorStorage):
             )
             return []
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        async for docs in iter_collection_pages(self._data, batch_size, {"_id": 1}):
+            yield [str(doc["_id"]) for doc in docs]
+
     async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
         """Get vectors by their IDs, returning only ID and vector data for efficiency
 
@@ -2477,3 +2567,26 @@ async def get_or_create_collection(db: AsyncDatabase, collection_name: str):
     else:
         logger.debug(f"Collection '{collection_name}' already exists.")
         return db.get_collection(collection_name)
+
+
+async def iter_collection_pages(
+    collection: AsyncCollection,
+    batch_size: int,
+    projection: dict[str, Any] | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Page through a collection in _id order using keyset pagination.
+
+    Each page is a separate indexed range query, so no server cursor is kept
+    open while the caller processes a batch and cursor timeouts cannot occur.
+    """
+    last_id = None
+    while True:
+        query = {} if last_id is None else {"_id": {"$gt": last_id}}
+        cursor = collection.find(query, projection).sort("_id", 1).limit(batch_size)
+        docs = await cursor.to_list(length=None)
+        if not docs:
+            return
+        yield docs
+        if len(docs) < batch_size:
+            return
+        last_id = docs[-1]["_id"]
@@ -1,8 +1,9 @@
 import asyncio
 import base64
+import json
 import os
 import zlib
-from typing import Any, final
+from typing import Any, AsyncIterator, final
 from dataclasses import dataclass
 import numpy as np
 import time
@@ -10,16 +11,358 @@ import time
 from lightrag.utils import (
     logger,
     compute_mdhash_id,
+    batch_cosine_similarity,
 )
 
 from lightrag.base import BaseVectorStorage
 from nano_vectordb import NanoVectorDB
 from .shared_storage import (
+    get_data_init_lock,
     get_namespace_lock,
     get_update_flag,
     set_all_update_flags,
 )
 
+# Storage modes of NanoVectorDBStorage
+STORAGE_MODE_JSON = "json"  # NanoVectorDB JSON file, rewritten on every save
+STORAGE_MODE_MMAP = "mmap"  # Memory-mapped float32 matrix + append-only JSONL index
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector, axis=-1, keepdims=True)
+    return vector / np.where(norm == 0, 1, norm)
+
+
+class MmapVectorDB:
+    """
+    Append-only vector store backed by a memory-mapped float32 matrix.
+
+    Files (for prefix ``vdb_<namespace>``):
+    - ``<prefix>.mmap.json``: manifest with embedding_dim and the current generation
+    - ``<prefix>.<gen>.f32``: contiguous row-major float32 matrix of normalized vectors
+    - ``<prefix>.<gen>.jsonl``: id/metadata index, one upsert or delete record per line
+
+    Upserts append a new row and tombstone the previous row of the same id, deletes only
+    tombstone. Saving appends the pending rows and index records, so the write cost is
+    proportional to the change. The matrix is mapped read-only, so loading does not
+    decode any vector and processes sharing the files share their pages.
+    When tombstones exceed `compaction_ratio`, `compact` rewrites the live rows into a
+    new generation and switches the manifest atomically.
+
+    Exposes the subset of the NanoVectorDB API used by NanoVectorDBStorage.
+    With `normalize=False` vectors are stored as given (e.g. as an embedding cache);
+    `query` assumes normalized vectors.
+    """
+
+    def __init__(
+        self,
+        embedding_dim: int,
+        storage_prefix: str,
+        compaction_ratio: float = 0.3,
+        compaction_min_rows: int = 1000,
+        normalize: bool = True,
+    ):
+        self.embedding_dim = embedding_dim
+        self.storage_prefix = storage_prefix
+        self.compaction_ratio = compaction_ratio
+        self.compaction_min_rows = compaction_min_rows
+        self.normalize = normalize
+        self._manifest_file = f"{storage_prefix}.mmap.json"
+        self._load()
+
+    def _vector_file(self, generation: int) -> str:
+        return f"{self.storage_prefix}.{generation}.f32"
+
+    def _index_file(self, generation: int) -> str:
+        return f"{self.storage_prefix}.{generation}.jsonl"
+
+    def _reset(self, generation: int = 0) -> None:
+        self._generation = generation
+        self._matrix = np.empty((0, self.embedding_dim), dtype=np.float32)
+        self._rows: list[dict[str, Any] | None] = []
+        self._id_to_row: dict[str, int] = {}
+        self._alive = bytearray()
+        self._dead_count = 0
+        self._pending_vectors: list[np.ndarray] = []
+        self._pending_ops: list[dict[str, Any]] = []
+        self._index_valid_size = 0
+
+    def _load(self) -> None:
+        if not os.path.exists(self._manifest_file):
+            self._reset()
+            return
+
+        with open(self._manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["embedding_dim"] != self.embedding_dim:
+            raise ValueError(
+                f"Embedding dim mismatch, expected: {self.embedding_dim}, but loaded: {manifest['embedding_dim']}"
+            )
+        self._reset(manifest["generation"])
+
+        vector_file = self._vector_file(self._generation)
+        row_bytes = self.embedding_dim * np.dtype(np.float32).itemsize
+        persisted_rows = (
+            os.path.getsize(vector_file) // row_bytes
+            if os.path.exists(vector_file)
+            else 0
+        )
+        self._map_matrix(persisted_rows)
+        self._rows = [None] * persisted_rows
+        self._alive = bytearray(persisted_rows)
+
+        index_file = self._index_file(self._generation)
+        if os.path.exists(index_file):
+            with open(index_file, "rb") as f:
+                for line in f:
+                    # A torn last line (crash during append) ends the replay
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self._index_valid_size += len(line)
+                    self._replay(record, persisted_rows)
+        self._dead_count = persisted_rows - len(self._id_to_row)
+
+    def _replay(self, record: dict[str, Any], persisted_rows: int) -> None:
+        if record["op"] == "upsert":
+            row = record["row"]
+            if row >= persisted_rows:
+                # Vector row never reached the disk
+                return
+            data = record["data"]
+            self._tombstone(data["__id__"])
+            self._rows[row] = data
+            self._alive[row] = 1
+            self._id_to_row[data["__id__"]] = row
+        elif record["op"] == "delete":
+            self._tombstone(record["id"])
+
+    def _map_matrix(self, rows: int) -> None:
+        if rows:
+            self._matrix = np.memmap(
+                self._vector_file(self._generation),
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, self.embedding_dim),
+            )
+        else:
+            self._matrix = np.empty((0, self.embedding_dim), dtype=np.float32)
+
+    def _tombstone(self, id: str) -> bool:
+        row = self._id_to_row.pop(id, None)
+        if row is None:
+            return False
+        self._rows[row] = None
+        self._alive[row] = 0
+        return True
+
+    def __len__(self) -> int:
+        return len(self._id_to_row)
+
+    @property
+    def storage(self) -> dict[str, Any]:
+        """Live records in NanoVectorDB storage layout (without the matrix)."""
+        return {
+            "embedding_dim": self.embedding_dim,
+            "data": [self._rows[row] for row in self._id_to_row.values()],
+        }
+
+    @property
+    def needs_compaction(self) -> bool:
+        total_rows = len(self._rows)
+        return (
+            total_rows >= self.compaction_min_rows
+            and self._dead_count > total_rows * self.compaction_ratio
+        )
+
+    def upsert(self, datas: list[dict[str, Any]]) -> dict[str, list[str]]:
+        report_return = {"update": [], "insert": []}
+        for data in datas:
+            vector = np.asarray(data.pop("__vector__"), dtype=np.float32)
+            if self.normalize:
+                vector = _normalize(vector)
+            data_id = data["__id__"]
+            if self._tombstone(data_id):
+                self._dead_count += 1
+                report_return["update"].append(data_id)
+            else:
+                report_return["insert"].append(data_id)
+            row = len(self._rows)
+            self._rows.append(data)
+            self._alive.append(1)
+            self._id_to_row[data_id] = row
+            self._pending_vectors.append(vector)
+            self._pending_ops.append({"op": "upsert", "row": row, "data": data})
+        return report_return
+
+    def get(self, ids: list[str]) -> list[dict[str, Any]]:
+        rows = (self._id_to_row.get(id) for id in ids)
+        return [self._rows[row] for row in rows if row is not None]
+
+    def get_vectors(self, ids: list[str]) -> dict[str, np.ndarray]:
+        vectors = {}
+        persisted_rows = len(self._matrix)
+        for id in ids:
+            row = self._id_to_row.get(id)
+            if row is None:
+                continue
+            if row < persisted_rows:
+                vectors[id] = np.asarray(self._matrix[row])
+            else:
+                vectors[id] = self._pending_vectors[row - persisted_rows]
+        return vectors
+
+    def ids(self) -> list[str]:
+        """Ids of the live records, least recently written first."""
+        return list(self._id_to_row)
+
+    def delete(self, ids: list[str]) -> None:
+        for id in ids:
+            if self._tombstone(id):
+                self._dead_count += 1
+                self._pending_ops.append({"op": "delete", "id": id})
+
+    def query(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        better_than_threshold: float | None = None,
+    ) -> list[dict[str, Any]]:
+        if not self._id_to_row:
+            return []
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        scores = self._matrix @ query
+        if self._pending_vectors:
+            scores = np.concatenate([scores, np.stack(self._pending_vectors) @ query])
+        if self._dead_count:
+            scores[np.frombuffer(self._alive, dtype=np.bool_) == 0] = -np.inf
+
+        top_k = min(top_k, len(self._id_to_row))
+        top_index = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_index = top_index[np.argsort(-scores[top_index])]
+
+        results = []
+        for row in top_index:
+            score = float(scores[row])
+            if better_than_threshold is not None and score < better_than_threshold:
+                break
+            results.append({**self._rows[row], "__metrics__": score})
+        return results
+
+    @staticmethod
+    def _fsync_append(path: str, payload: bytes, truncate_to: int | None = None):
+        with open(path, "ab") as f:
+            if truncate_to is not None and f.tell() > truncate_to:
+                f.truncate(truncate_to)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_manifest(self, generation: int) -> None:
+        tmp_file = f"{self._manifest_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {"embedding_dim": self.embedding_dim, "generation": generation}, f
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._manifest_file)
+
+    def save(self) -> None:
+        """Append pending rows and index records to the current generation."""
+        if not self._pending_ops and os.path.exists(self._manifest_file):
+            return
+
+        persisted_rows = len(self._matrix)
+        # Vectors first: index records never reference rows missing on disk
+        if self._pending_vectors:
+            # Drop a torn row left by a crash so new rows stay row-aligned
+            row_bytes = self.embedding_dim * np.dtype(np.float32).itemsize
+            self._fsync_append(
+                self._vector_file(self._generation),
+                np.stack(self._pending_vectors).astype(np.float32).tobytes(),
+                truncate_to=persisted_rows * row_bytes,
+            )
+        payload = "".join(
+            json.dumps(op, ensure_ascii=False) + "\n" for op in self._pending_ops
+        ).encode("utf-8")
+        self._fsync_append(
+            self._index_file(self._generation),
+            payload,
+            truncate_to=self._index_valid_size,
+        )
+        self._index_valid_size += len(payload)
+        if not os.path.exists(self._manifest_file):
+            self._write_manifest(self._generation)
+
+        self._map_matrix(persisted_rows + len(self._pending_vectors))
+        self._pending_vectors = []
+        self._pending_ops = []
+
+    def compact(self) -> None:
+        """Rewrite live rows into a new generation, dropping tombstoned rows."""
+        self.save()
+        old_generation = self._generation
+        new_generation = old_generation + 1
+        live_rows = sorted(self._id_to_row.values())
+
+        vector_file = self._vector_file(new_generation)
+        index_file = self._index_file(new_generation)
+        with open(f"{vector_file}.tmp", "wb") as f:
+            for start in range(0, len(live_rows), 4096):
+                f.write(
+                    np.ascontiguousarray(
+                        self._matrix[live_rows[start : start + 4096]]
+                    ).tobytes()
+                )
+            f.flush()
+            os.fsync(f.fileno())
+        with open(f"{index_file}.tmp", "w", encoding="utf-8") as f:
+            for new_row, row in enumerate(live_rows):
+                f.write(
+                    json.dumps(
+                        {"op": "upsert", "row": new_row, "data": self._rows[row]},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{vector_file}.tmp", vector_file)
+        os.replace(f"{index_file}.tmp", index_file)
+        # Switching the manifest is the commit point of the compaction
+        self._write_manifest(new_generation)
+
+        # Processes still mapping the old generation keep reading it until they reload
+        for old_file in (
+            self._vector_file(old_generation),
+            self._index_file(old_generation),
+        ):
+            if os.path.exists(old_file):
+                os.remove(old_file)
+        self._load()
+
+    def import_records(self, datas: list[dict[str, Any]], matrix: np.ndarray) -> None:
+        """Bulk load records with their vectors, e.g. for migration."""
+        self.upsert(
+            [{**data, "__vector__": vector} for data, vector in zip(datas, matrix)]
+        )
+        self.save()
+
+    def drop_files(self) -> None:
+        """Remove all files of this store and reset it to empty."""
+        for file in (
+            self._vector_file(self._generation),
+            self._index_file(self._generation),
+            self._manifest_file,
+        ):
+            if os.path.exists(file):
+                os.remove(file)
+        self._reset()
+
 
 @final
 @dataclass
@@ -54,14 +397,77 @@ class NanoVectorDBStorage(BaseVectorStorage):
         self._client_file_name = os.path.join(
             workspace_dir, f"vdb_{self.namespace}.json"
         )
+        self._mmap_storage_prefix = os.path.join(workspace_dir, f"vdb_{self.namespace}")
+
+        # Storage mode: "json" (NanoVectorDB file) or "mmap" (memory-mapped matrix)
+        self._storage_mode = (
+            kwargs.get("storage_mode")
+            or os.getenv("NANO_VECTOR_STORAGE_MODE", STORAGE_MODE_JSON)
+        ).lower()
+        if self._storage_mode not in (STORAGE_MODE_JSON, STORAGE_MODE_MMAP):
+            raise ValueError(
+                f"Invalid NanoVectorDBStorage storage_mode: {self._storage_mode}"
+            )
+        self._compaction_ratio = float(
+            kwargs.get(
+                "compaction_ratio", os.getenv("NANO_VECTOR_COMPACTION_RATIO", 0.3)
+            )
+        )
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
 
-        self._client = NanoVectorDB(
+        self._client = self._create_client()
+        # The JSON -> mmap import runs in initialize() under the data init lock
+        self._legacy_json_pending = self._storage_mode == STORAGE_MODE_MMAP and (
+            os.path.exists(self._client_file_name)
+        )
+
+    def _create_client(self) -> NanoVectorDB | MmapVectorDB:
+        """Create the vector client for the configured storage mode, loading persisted data"""
+        if self._storage_mode == STORAGE_MODE_MMAP:
+            return MmapVectorDB(
+                self.embedding_func.embedding_dim,
+                storage_prefix=self._mmap_storage_prefix,
+                compaction_ratio=self._compaction_ratio,
+            )
+        return NanoVectorDB(
             self.embedding_func.embedding_dim,
             storage_file=self._client_file_name,
         )
 
+    def _migrate_json_to_mmap(self) -> None:
+        """Import an existing NanoVectorDB JSON file into an empty mmap store
+
+        Must run under the data init lock. The legacy file is renamed to `*.migrated`
+        once the import is saved, so it is imported exactly once.
+        """
+        # Reload: another process may have migrated or written meanwhile
+        self._client = self._create_client()
+        if not os.path.exists(self._client_file_name):
+            return
+        if not len(self._client):
+            legacy_client = NanoVectorDB(
+                self.embedding_func.embedding_dim,
+                storage_file=self._client_file_name,
+            )
+            legacy_storage = getattr(legacy_client, "_NanoVectorDB__storage")
+            records = [
+                {k: v for k, v in dp.items() if k != "vector"}
+                for dp in legacy_storage["data"]
+            ]
+            if records:
+                self._client.import_records(records, legacy_storage["matrix"])
+                logger.info(
+                    f"[{self.workspace}] Migrated {len(records)} vectors of {self.namespace} from {self._client_file_name} to mmap storage"
+                )
+        os.replace(self._client_file_name, f"{self._client_file_name}.migrated")
+
+    @staticmethod
+    def _client_storage(client: NanoVectorDB | MmapVectorDB) -> dict[str, Any]:
+        if isinstance(client, MmapVectorDB):
+            return client.storage
+        return getattr(client, "_NanoVectorDB__storage")
+
     async def initialize(self):
         """Initialize storage data"""
         # Get the update flag for cross-process update notification
@@ -72,6 +478,10 @@ class NanoVectorDBStorage(BaseVectorStorage):
         self._storage_lock = get_namespace_lock(
             self.namespace, workspace=self.workspace
         )
+        if self._legacy_json_pending:
+            async with get_data_init_lock():
+                self._migrate_json_to_mmap()
+            self._legacy_json_pending = False
 
     async def _get_client(self):
         """Check if the storage should be reloaded"""
@@ -83,10 +493,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._client = self._create_client()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -125,11 +532,12 @@ class NanoVectorDBStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         if len(embeddings) == len(list_data):
             for i, d in enumerate(list_data):
-                # Compress vector using Float16 + zlib + Base64 for storage optimization
-                vector_f16 = embeddings[i].astype(np.float16)
-                compressed_vector = zlib.compress(vector_f16.tobytes())
-                encoded_vector = base64.b64encode(compressed_vector).decode("utf-8")
-                d["vector"] = encoded_vector
+                if self._storage_mode == STORAGE_MODE_JSON:
+                    # Compress vector using Float16 + zlib + Base64 for storage optimization
+                    vector_f16 = embeddings[i].astype(np.float16)
+                    compressed_vector = zlib.compress(vector_f16.tobytes())
+                    encoded_vector = base64.b64encode(compressed_vector).decode("utf-8")
+                    d["vector"] = encoded_vector
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
             results = client.upsert(datas=list_data)
@@ -173,7 +581,14 @@ class NanoVectorDBStorage(BaseVectorStorage):
     @property
     async def client_storage(self):
         client = await self._get_client()
-        return getattr(client, "_NanoVectorDB__storage")
+        return self._client_storage(client)
+
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        """Iterate over a snapshot of the vector IDs in batches"""
+        client = await self._get_client()
+        ids = [dp["__id__"] for dp in self._client_storage(client)["data"]]
+        for start in range(0, len(ids), batch_size):
+            yield ids[start : start + batch_size]
 
     async def delete(self, ids: list[str]):
         """Delete vectors with specified IDs
@@ -243,7 +658,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         try:
             client = await self._get_client()
-            storage = getattr(client, "_NanoVectorDB__storage")
+            storage = self._client_storage(client)
             relations = [
                 dp
                 for dp in storage["data"]
@@ -278,10 +693,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
                 )
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._client = self._create_client()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -291,6 +703,15 @@ class NanoVectorDBStorage(BaseVectorStorage):
             try:
                 # Save data to disk
                 self._client.save()
+                if (
+                    self._storage_mode == STORAGE_MODE_MMAP
+                    and self._client.needs_compaction
+                ):
+                    # Rewrite live rows off the event loop
+                    logger.info(
+                        f"[{self.workspace}] Compacting {self.namespace} vector storage"
+                    )
+                    await asyncio.to_thread(self._client.compact)
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -372,6 +793,12 @@ class NanoVectorDBStorage(BaseVectorStorage):
             return {}
 
         client = await self._get_client()
+        if isinstance(client, MmapVectorDB):
+            return {
+                id: vector.astype(np.float32).tolist()
+                for id, vector in client.get_vectors(ids).items()
+            }
+
         results = client.get(ids)
 
         vectors_dict = {}
@@ -386,6 +813,41 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         return vectors_dict
 
+    async def get_similarities_by_ids(
+        self, ids: list[str], query_embedding: list[float]
+    ) -> dict[str, float]:
+        """Score stored vectors against a query embedding without converting them to lists
+
+        Args:
+            ids: List of unique identifiers
+            query_embedding: Query embedding to compare against
+
+        Returns:
+            Dictionary mapping IDs to their cosine similarity
+            Format: {id: similarity, ...}
+        """
+        if not ids:
+            return {}
+
+        client = await self._get_client()
+        if isinstance(client, MmapVectorDB):
+            vectors = client.get_vectors(ids)
+        else:
+            vectors = {}
+            for result in client.get(ids):
+                if result and "vector" in result and "__id__" in result:
+                    decompressed = zlib.decompress(base64.b64decode(result["vector"]))
+                    vectors[result["__id__"]] = np.frombuffer(
+                        decompressed, dtype=np.float16
+                    )
+        found_ids = [id for id in ids if id in vectors]
+        if not found_ids:
+            return {}
+        scores = batch_cosine_similarity(
+            query_embedding, np.stack([vectors[id] for id in found_ids])
+        )
+        return dict(zip(found_ids, scores.tolist()))
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -407,11 +869,10 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 # delete _client_file_name
                 if os.path.exists(self._client_file_name):
                     os.remove(self._client_file_name)
+                if isinstance(self._client, MmapVectorDB):
+                    self._client.drop_files()
 
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._client = self._create_client()
 
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
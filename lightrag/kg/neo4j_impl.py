@@ -1,7 +1,7 @@
 import os
 import re
 from dataclasses import dataclass
-from typing import final
+from typing import AsyncIterator, final
 import configparser
 
 
@@ -1047,6 +1047,109 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(f"[{self.workspace}] Error during edge upsert: {str(e)}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_nodes(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Upsert multiple nodes with one UNWIND query per entity type.
+
+        Args:
+            nodes: Mapping of node ID to node properties
+        """
+        workspace_label = self._get_workspace_label()
+        rows_by_type: dict[str, list[dict]] = {}
+        for node_id, properties in nodes.items():
+            if "entity_id" not in properties:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type.setdefault(properties["entity_type"], []).append(
+                {"entity_id": node_id, "properties": properties}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                # The entity type label can not be parameterized
+                for entity_type, rows in rows_by_type.items():
+
+                    async def execute_upsert(
+                        tx: AsyncManagedTransaction, entity_type=entity_type, rows=rows
+                    ):
+                        query = f"""
+                        UNWIND $rows AS row
+                        MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                        SET n += row.properties
+                        SET n:`{entity_type}`
+                        """
+                        result = await tx.run(query, rows=rows)
+                        await result.consume()
+
+                    await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+                neo4jExceptions.SessionExpired,
+                ConnectionResetError,
+                OSError,
+            )
+        ),
+    )
+    async def upsert_edges(self, edges: list[tuple[str, str, dict[str, str]]]) -> None:
+        """
+        Upsert multiple edges with a single UNWIND query.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        if not edges:
+            return
+        rows = [
+            {"source": source, "target": target, "properties": properties}
+            for source, target, properties in edges
+        ]
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    workspace_label = self._get_workspace_label()
+                    query = f"""
+                    UNWIND $rows AS row
+                    MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+                    MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+                    MERGE (source)-[r:DIRECTED]-(target)
+                    SET r += row.properties
+                    """
+                    result = await tx.run(query, rows=rows)
+                    await result.consume()
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error during batch edge upsert: {str(e)}")
+            raise
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -1614,6 +1717,78 @@ class Neo4JStorage(BaseGraphStorage):
             await result.consume()
             return edges
 
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all nodes in batches
+
+        Pages by entity_id (keyset pagination on the entity_id index) with one
+        short read session per batch, so no transaction is held open while the
+        caller processes a batch.
+        """
+        workspace_label = self._get_workspace_label()
+        query = f"""
+        MATCH (n:`{workspace_label}`)
+        WHERE n.entity_id > $after
+        RETURN n
+        ORDER BY n.entity_id
+        LIMIT $limit
+        """
+        after = ""
+        while True:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                result = await session.run(query, after=after, limit=batch_size)
+                batch = []
+                async for record in result:
+                    node_dict = dict(record["n"])
+                    node_dict["id"] = node_dict.get("entity_id")
+                    batch.append(node_dict)
+                await result.consume()
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            after = batch[-1]["id"]
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all edges in batches
+
+        Pages source nodes by entity_id and returns their outgoing
+        relationships, so each stored relationship is yielded exactly once.
+        A batch may exceed batch_size when a page of nodes has many edges.
+        """
+        workspace_label = self._get_workspace_label()
+        query = f"""
+        MATCH (a:`{workspace_label}`)
+        WHERE a.entity_id > $after
+        WITH a ORDER BY a.entity_id LIMIT $limit
+        OPTIONAL MATCH (a)-[r]->(b:`{workspace_label}`)
+        RETURN a.entity_id AS source, b.entity_id AS target, properties(r) AS properties
+        """
+        after = ""
+        while True:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                result = await session.run(query, after=after, limit=batch_size)
+                sources = set()
+                batch = []
+                async for record in result:
+                    sources.add(record["source"])
+                    if record["target"] is None:
+                        continue
+                    edge_properties = dict(record["properties"] or {})
+                    edge_properties["source"] = record["source"]
+                    edge_properties["target"] = record["target"]
+                    batch.append(edge_properties)
+                await result.consume()
+            if batch:
+                yield batch
+            if len(sources) < batch_size:
+                return
+            after = max(sources)
+
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """Get popular labels by node degree (most connected entities)
 
@@ -1,12 +1,17 @@
+import heapq
 import os
+import pickle
+from bisect import bisect_left, insort
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import final
+from typing import Any, AsyncIterator, final
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from lightrag.utils import logger
 from lightrag.base import BaseGraphStorage
 import networkx as nx
 from .shared_storage import (
+    get_data_init_lock,
     get_namespace_lock,
     get_update_flag,
     set_all_update_flags,
@@ -19,6 +24,155 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+GRAPH_FORMAT_GRAPHML = "graphml"
+GRAPH_FORMAT_PICKLE = "pickle"
+
+# Do not compact delta files smaller than this
+DELTA_COMPACTION_MIN_BYTES = 1024 * 1024
+
+
+def _label_ngrams(text: str) -> set[str]:
+    """Bigrams and trigrams of a lowercased label"""
+    grams = set()
+    for n in (2, 3):
+        grams.update(text[i : i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+def _label_match_score(label: str, label_lower: str, query_lower: str) -> int:
+    """Relevance of a label containing query_lower (exact > prefix > contains)"""
+    if label_lower == query_lower:
+        return 1000
+    if label_lower.startswith(query_lower):
+        return 500
+    # Shorter strings with matches are more relevant
+    score = 100 - len(label)
+    # Bonus for word boundary matches
+    if f" {query_lower}" in label_lower or f"_{query_lower}" in label_lower:
+        score += 50
+    return score
+
+
+class LabelIndex:
+    """In-memory index of node labels for typeahead search and popular labels
+
+    Keeps an n-gram (2/3-gram) posting map and a sorted list of lowercased labels for
+    search_labels, and a lazily cleaned max-heap of (degree, label) for get_popular_labels.
+    Built once from the graph and updated incrementally on node/edge changes.
+    """
+
+    def __init__(self, graph: nx.Graph):
+        self._lower: dict[str, str] = {}
+        self._ngrams: dict[str, set[str]] = defaultdict(set)
+        self._degrees: dict[str, int] = {}
+        for node, degree in graph.degree():
+            label = str(node)
+            label_lower = label.lower()
+            self._lower[label] = label_lower
+            self._degrees[label] = degree
+            for gram in _label_ngrams(label_lower):
+                self._ngrams[gram].add(label)
+        self._sorted = sorted((lower, label) for label, lower in self._lower.items())
+        self._heap = [(-degree, label) for label, degree in self._degrees.items()]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._lower)
+
+    def add(self, label: str, degree: int = 0) -> None:
+        if label not in self._lower:
+            label_lower = label.lower()
+            self._lower[label] = label_lower
+            for gram in _label_ngrams(label_lower):
+                self._ngrams[gram].add(label)
+            insort(self._sorted, (label_lower, label))
+        self.set_degree(label, degree)
+
+    def remove(self, label: str) -> None:
+        label_lower = self._lower.pop(label, None)
+        if label_lower is None:
+            return
+        for gram in _label_ngrams(label_lower):
+            postings = self._ngrams.get(gram)
+            if postings is not None:
+                postings.discard(label)
+                if not postings:
+                    del self._ngrams[gram]
+        pos = bisect_left(self._sorted, (label_lower, label))
+        if pos < len(self._sorted) and self._sorted[pos] == (label_lower, label):
+            del self._sorted[pos]
+        # Heap entries of removed labels are dropped lazily
+        self._degrees.pop(label, None)
+
+    def set_degree(self, label: str, degree: int) -> None:
+        if label not in self._lower or self._degrees.get(label) == degree:
+            return
+        self._degrees[label] = degree
+        heapq.heappush(self._heap, (-degree, label))
+        # Rebuild the heap when stale entries dominate
+        if len(self._heap) > 2 * len(self._degrees) + 1024:
+            self._heap = [(-d, label) for label, d in self._degrees.items()]
+            heapq.heapify(self._heap)
+
+    def popular(self, limit: int) -> list[str]:
+        """Labels with the highest degree, highest first"""
+        result: list[tuple[int, str]] = []
+        seen = set()
+        while self._heap and len(result) < limit:
+            neg_degree, label = heapq.heappop(self._heap)
+            if label in seen or self._degrees.get(label) != -neg_degree:
+                continue  # stale entry
+            seen.add(label)
+            result.append((neg_degree, label))
+        for entry in result:
+            heapq.heappush(self._heap, entry)
+        return [label for _, label in result]
+
+    def _candidates(self, query_lower: str) -> list[str]:
+        """Labels that may contain query_lower"""
+        if len(query_lower) == 1:
+            return [
+                label for label, lower in self._lower.items() if query_lower in lower
+            ]
+        n = 3 if len(query_lower) >= 3 else 2
+        postings = []
+        for i in range(len(query_lower) - n + 1):
+            labels = self._ngrams.get(query_lower[i : i + n])
+            if not labels:
+                return []
+            postings.append(labels)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for labels in postings[1:]:
+            candidates &= labels
+            if not candidates:
+                break
+        return list(candidates)
+
+    def search(self, query_lower: str, limit: int) -> list[str]:
+        """Labels containing query_lower ranked by relevance, then alphabetically"""
+        # Exact and prefix matches (score >= 500) come straight from the sorted list
+        prefix_matches = []
+        pos = bisect_left(self._sorted, (query_lower, ""))
+        while pos < len(self._sorted) and self._sorted[pos][0].startswith(query_lower):
+            prefix_matches.append(self._sorted[pos][1])
+            pos += 1
+        if len(prefix_matches) >= limit:
+            matches = [
+                (_label_match_score(label, self._lower[label], query_lower), label)
+                for label in prefix_matches
+            ]
+        else:
+            matches = []
+            for label in self._candidates(query_lower):
+                label_lower = self._lower[label]
+                if query_lower in label_lower:
+                    matches.append(
+                        (_label_match_score(label, label_lower, query_lower), label)
+                    )
+        matches = heapq.nsmallest(limit, matches, key=lambda x: (-x[0], x[1]))
+        return [label for _, label in matches]
+
 
 @final
 @dataclass
@@ -36,6 +190,81 @@ class NetworkXStorage(BaseGraphStorage):
         )
         nx.write_graphml(graph, file_name)
 
+    @staticmethod
+    def load_nx_graph_snapshot(file_name) -> nx.Graph | None:
+        """Load a pickle (protocol 5) graph snapshot"""
+        if os.path.exists(file_name):
+            with open(file_name, "rb") as f:
+                return pickle.load(f)
+        return None
+
+    @staticmethod
+    def write_nx_graph_snapshot(graph: nx.Graph, file_name, workspace="_"):
+        """Write a pickle (protocol 5) graph snapshot atomically"""
+        logger.info(
+            f"[{workspace}] Writing graph snapshot with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+        )
+        tmp_file = f"{file_name}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump(graph, f, protocol=5)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, file_name)
+
+    @staticmethod
+    def append_nx_graph_delta(ops: list[tuple], file_name):
+        """Append one batch of node/edge operations to the delta file"""
+        with open(file_name, "ab") as f:
+            pickle.dump(ops, f, protocol=5)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def replay_nx_graph_delta(graph: nx.Graph, file_name) -> int:
+        """Apply delta batches to graph in order, returns the number of batches applied
+
+        A torn last batch (crash while appending) is dropped and truncated away.
+        """
+        if not os.path.exists(file_name):
+            return 0
+        batches = 0
+        valid_size = 0
+        with open(file_name, "rb") as f:
+            while True:
+                try:
+                    ops = pickle.load(f)
+                except EOFError:
+                    break
+                except Exception:
+                    logger.warning(
+                        f"Ignoring torn graph delta tail at byte {valid_size}: {file_name}"
+                    )
+                    break
+                for op in ops:
+                    kind = op[0]
+                    if kind == "node":
+                        graph.add_node(op[1])
+                        attrs = graph.nodes[op[1]]
+                        attrs.clear()
+                        attrs.update(op[2])
+                    elif kind == "edge":
+                        graph.add_edge(op[1], op[2])
+                        attrs = graph.edges[op[1], op[2]]
+                        attrs.clear()
+                        attrs.update(op[3])
+                    elif kind == "edge_del":
+                        if graph.has_edge(op[1], op[2]):
+                            graph.remove_edge(op[1], op[2])
+                    elif kind == "node_del":
+                        if graph.has_node(op[1]):
+                            graph.remove_node(op[1])
+                batches += 1
+                valid_size = f.tell()
+        if valid_size < os.path.getsize(file_name):
+            with open(file_name, "r+b") as f:
+                f.truncate(valid_size)
+        return batches
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -50,22 +279,188 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        self._snapshot_file = os.path.join(workspace_dir, f"graph_{self.namespace}.pkl")
+        self._delta_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.delta.pkl"
+        )
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
 
+        # On-disk format: "graphml" (rewrite the whole GraphML file) or "pickle"
+        # (pickle snapshot plus append-only delta file of changed nodes/edges)
+        self._graph_format = os.getenv(
+            "NETWORKX_GRAPH_FORMAT", GRAPH_FORMAT_GRAPHML
+        ).lower()
+        if self._graph_format not in (GRAPH_FORMAT_GRAPHML, GRAPH_FORMAT_PICKLE):
+            raise ValueError(f"Invalid NetworkXStorage format: {self._graph_format}")
+        self._delta_compaction_ratio = float(
+            os.getenv("NETWORKX_DELTA_COMPACTION_RATIO", 0.5)
+        )
+        # Nodes/edges changed since the last persist (pickle format only)
+        self._dirty_nodes: set[str] = set()
+        self._dirty_edges: set[tuple[str, str]] = set()
+        # Label search/popularity index, built on first use
+        self._label_index: LabelIndex | None = None
+
+        # Format migration runs in initialize() under the data init lock
+        self._format_migration_pending = self._needs_format_migration()
+
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        preloaded_graph = self._load_graph()
+        graph_file = (
+            self._snapshot_file
+            if self._graph_format == GRAPH_FORMAT_PICKLE
+            else self._graphml_xml_file
+        )
         if preloaded_graph is not None:
             logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                f"[{self.workspace}] Loaded graph from {graph_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
             )
         else:
             logger.info(
-                f"[{self.workspace}] Created new empty graph file: {self._graphml_xml_file}"
+                f"[{self.workspace}] Created new empty graph file: {graph_file}"
             )
         self._graph = preloaded_graph or nx.Graph()
 
+    def _load_graph(self) -> nx.Graph | None:
+        """Load the graph in the configured format (snapshot plus deltas for pickle)"""
+        if self._graph_format == GRAPH_FORMAT_GRAPHML:
+            return NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+
+        graph = NetworkXStorage.load_nx_graph_snapshot(self._snapshot_file)
+        if graph is None and os.path.exists(self._delta_file):
+            graph = nx.Graph()
+        if graph is not None:
+            NetworkXStorage.replay_nx_graph_delta(graph, self._delta_file)
+        return graph
+
+    def _needs_format_migration(self) -> bool:
+        """Whether graph files exist only in the other format"""
+        if self._graph_format == GRAPH_FORMAT_PICKLE:
+            return not os.path.exists(self._snapshot_file) and os.path.exists(
+                self._graphml_xml_file
+            )
+        return os.path.exists(self._snapshot_file) or os.path.exists(self._delta_file)
+
+    def _migrate_graph_format(self):
+        """Convert graph files written in the other format to the configured one
+
+        Must run under the data init lock, after _needs_format_migration().
+        """
+        if self._graph_format == GRAPH_FORMAT_PICKLE:
+            graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+            NetworkXStorage.write_nx_graph_snapshot(
+                graph, self._snapshot_file, self.workspace
+            )
+            # Keep the GraphML file as a backup, it is not updated any more
+            os.replace(self._graphml_xml_file, f"{self._graphml_xml_file}.bak")
+            logger.info(
+                f"[{self.workspace}] Migrated graph from {self._graphml_xml_file} to {self._snapshot_file}"
+            )
+        else:
+            graph = NetworkXStorage.load_nx_graph_snapshot(self._snapshot_file)
+            graph = graph if graph is not None else nx.Graph()
+            NetworkXStorage.replay_nx_graph_delta(graph, self._delta_file)
+            NetworkXStorage.write_nx_graph(
+                graph, self._graphml_xml_file, self.workspace
+            )
+            for file_name in (self._snapshot_file, self._delta_file):
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+            logger.info(
+                f"[{self.workspace}] Migrated graph from {self._snapshot_file} to {self._graphml_xml_file}"
+            )
+
+    def _persist_graph(self):
+        """Write the graph in the configured format
+
+        For the pickle format only nodes/edges changed since the last persist are appended
+        to the delta file; a new snapshot is written when the deltas grow too large.
+        """
+        if self._graph_format == GRAPH_FORMAT_GRAPHML:
+            NetworkXStorage.write_nx_graph(
+                self._graph, self._graphml_xml_file, self.workspace
+            )
+            return
+
+        if not os.path.exists(self._snapshot_file):
+            self._write_graph_snapshot()
+            return
+
+        ops: list[tuple[Any, ...]] = []
+        node_deletes = []
+        for node_id in self._dirty_nodes:
+            if self._graph.has_node(node_id):
+                ops.append(("node", node_id, dict(self._graph.nodes[node_id])))
+            else:
+                node_deletes.append(("node_del", node_id))
+        for src, tgt in self._dirty_edges:
+            if self._graph.has_edge(src, tgt):
+                ops.append(("edge", src, tgt, dict(self._graph.edges[src, tgt])))
+            else:
+                ops.append(("edge_del", src, tgt))
+        ops.extend(node_deletes)
+
+        if ops:
+            logger.debug(
+                f"[{self.workspace}] Appending {len(self._dirty_nodes)} nodes and {len(self._dirty_edges)} edges to graph delta"
+            )
+            NetworkXStorage.append_nx_graph_delta(ops, self._delta_file)
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+
+        delta_size = (
+            os.path.getsize(self._delta_file) if os.path.exists(self._delta_file) else 0
+        )
+        if (
+            delta_size > DELTA_COMPACTION_MIN_BYTES
+            and delta_size
+            > os.path.getsize(self._snapshot_file) * self._delta_compaction_ratio
+        ):
+            self._write_graph_snapshot()
+
+    def _write_graph_snapshot(self):
+        """Write a full pickle snapshot and drop the deltas it contains"""
+        NetworkXStorage.write_nx_graph_snapshot(
+            self._graph, self._snapshot_file, self.workspace
+        )
+        if os.path.exists(self._delta_file):
+            os.remove(self._delta_file)
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+
+    def _reload_graph(self):
+        """Replace the in-memory graph with the persisted one, dropping local changes"""
+        self._graph = self._load_graph() or nx.Graph()
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+        self._label_index = None
+
+    def _get_label_index(self, graph: nx.Graph) -> LabelIndex:
+        if self._label_index is None:
+            self._label_index = LabelIndex(graph)
+            logger.debug(
+                f"[{self.workspace}] Built label index with {len(self._label_index)} labels"
+            )
+        return self._label_index
+
+    def _update_label_degrees(self, graph: nx.Graph, node_ids):
+        """Refresh indexed labels/degrees of the given nodes after a graph change"""
+        if self._label_index is None:
+            return
+        for node_id in node_ids:
+            if graph.has_node(node_id):
+                self._label_index.add(str(node_id), graph.degree(node_id))
+            else:
+                self._label_index.remove(str(node_id))
+
+    def _mark_node_deleted(self, graph: nx.Graph, node_id: str):
+        """Record a node deletion, including its edges, for the delta file"""
+        if self._graph_format == GRAPH_FORMAT_PICKLE:
+            self._dirty_nodes.add(node_id)
+            self._dirty_edges.update(graph.edges(node_id))
+
     async def initialize(self):
         """Initialize storage data"""
         # Get the update flag for cross-process update notification
@@ -76,6 +471,14 @@ class NetworkXStorage(BaseGraphStorage):
         self._storage_lock = get_namespace_lock(
             self.namespace, workspace=self.workspace
         )
+        if self._format_migration_pending:
+            async with get_data_init_lock():
+                # Re-check under the lock: another process may have migrated already
+                if self._needs_format_migration():
+                    self._migrate_graph_format()
+                self._graph = self._load_graph() or nx.Graph()
+            self._label_index = None
+            self._format_migration_pending = False
 
     async def _get_graph(self):
         """Check if the storage should be reloaded"""
@@ -87,9 +490,7 @@ class NetworkXStorage(BaseGraphStorage):
                     f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
                 )
                 # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -138,6 +539,9 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        if self._graph_format == GRAPH_FORMAT_PICKLE:
+            self._dirty_nodes.add(node_id)
+        self._update_label_degrees(graph, (node_id,))
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -150,6 +554,29 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        if self._graph_format == GRAPH_FORMAT_PICKLE:
+            self._dirty_edges.add((source_node_id, target_node_id))
+        self._update_label_degrees(graph, (source_node_id, target_node_id))
+
+    async def upsert_nodes(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Insert or update multiple nodes with a single graph access"""
+        graph = await self._get_graph()
+        for node_id, node_data in nodes.items():
+            graph.add_node(node_id, **node_data)
+        if self._graph_format == GRAPH_FORMAT_PICKLE:
+            self._dirty_nodes.update(nodes)
+        self._update_label_degrees(graph, nodes)
+
+    async def upsert_edges(self, edges: list[tuple[str, str, dict[str, str]]]) -> None:
+        """Insert or update multiple edges with a single graph access"""
+        graph = await self._get_graph()
+        touched_nodes = set()
+        for source_node_id, target_node_id, edge_data in edges:
+            graph.add_edge(source_node_id, target_node_id, **edge_data)
+            touched_nodes.update((source_node_id, target_node_id))
+            if self._graph_format == GRAPH_FORMAT_PICKLE:
+                self._dirty_edges.add((source_node_id, target_node_id))
+        self._update_label_degrees(graph, touched_nodes)
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -160,7 +587,10 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
+            self._mark_node_deleted(graph, node_id)
+            neighbors = list(graph.neighbors(node_id))
             graph.remove_node(node_id)
+            self._update_label_degrees(graph, [node_id, *neighbors])
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -181,7 +611,10 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for node in nodes:
             if graph.has_node(node):
+                self._mark_node_deleted(graph, node)
+                neighbors = list(graph.neighbors(node))
                 graph.remove_node(node)
+                self._update_label_degrees(graph, [node, *neighbors])
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -198,6 +631,9 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+                if self._graph_format == GRAPH_FORMAT_PICKLE:
+                    self._dirty_edges.add((source, target))
+                self._update_label_degrees(graph, (source, target))
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -225,12 +661,8 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
 
-        # Get degrees of all nodes and sort by degree descending
-        degrees = dict(graph.degree())
-        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
-        # Return top labels limited by the specified limit
-        popular_labels = [str(node) for node, _ in sorted_nodes[:limit]]
+        # Top labels by degree from the degree-ordered heap of the label index
+        popular_labels = self._get_label_index(graph).popular(limit)
 
         logger.debug(
             f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
@@ -255,38 +687,9 @@ class NetworkXStorage(BaseGraphStorage):
         if not query_lower:
             return []
 
-        # Collect matching nodes with relevance scores
-        matches = []
-        for node in graph.nodes():
-            node_str = str(node)
-            node_lower = node_str.lower()
-
-            # Skip if no match
-            if query_lower not in node_lower:
-                continue
-
-            # Calculate relevance score
-            # Exact match gets highest score
-            if node_lower == query_lower:
-                score = 1000
-            # Prefix match gets high score
-            elif node_lower.startswith(query_lower):
-                score = 500
-            # Contains match gets base score, with bonus for shorter strings
-            else:
-                # Shorter strings with matches are more relevant
-                score = 100 - len(node_str)
-                # Bonus for word boundary matches
-                if f" {query_lower}" in node_lower or f"_{query_lower}" in node_lower:
-                    score += 50
-
-            matches.append((node_str, score))
-
-        # Sort by relevance score (desc) then alphabetically
-        matches.sort(key=lambda x: (-x[1], x[0]))
-
-        # Return top matches limited by the specified limit
-        search_results = [match[0] for match in matches[:limit]]
+        # Candidates come from the n-gram/prefix label index, sorted by relevance
+        # score (desc) then alphabetically
+        search_results = self._get_label_index(graph).search(query_lower, limit)
 
         logger.debug(
             f"[{self.workspace}] Search query '{query}' returned {len(search_results)} results (limit: {limit})"
@@ -500,6 +903,40 @@ class NetworkXStorage(BaseGraphStorage):
             all_edges.append(edge_data_with_nodes)
         return all_edges
 
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all nodes in batches
+
+        Only the node IDs are snapshotted up front; property copies are built
+        one batch at a time, and nodes removed in between are skipped.
+        """
+        graph = await self._get_graph()
+        node_ids = list(graph.nodes)
+        for start in range(0, len(node_ids), batch_size):
+            batch = []
+            for node_id in node_ids[start : start + batch_size]:
+                node_data = graph.nodes.get(node_id)
+                if node_data is not None:
+                    batch.append({**node_data, "id": node_id})
+            if batch:
+                yield batch
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all edges in batches
+
+        Only the endpoint pairs are snapshotted up front; property copies are
+        built one batch at a time, and edges removed in between are skipped.
+        """
+        graph = await self._get_graph()
+        edge_pairs = list(graph.edges)
+        for start in range(0, len(edge_pairs), batch_size):
+            batch = []
+            for u, v in edge_pairs[start : start + batch_size]:
+                edge_data = graph.edges.get((u, v))
+                if edge_data is not None:
+                    batch.append({**edge_data, "source": u, "target": v})
+            if batch:
+                yield batch
+
     async def index_done_callback(self) -> bool:
         """Save data to disk"""
         async with self._storage_lock:
@@ -509,9 +946,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -520,9 +955,7 @@ class NetworkXStorage(BaseGraphStorage):
         async with self._storage_lock:
             try:
                 # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
+                self._persist_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -550,10 +983,18 @@ class NetworkXStorage(BaseGraphStorage):
         """
         try:
             async with self._storage_lock:
-                # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
+                # delete graph files of all formats
+                for file_name in (
+                    self._graphml_xml_file,
+                    self._snapshot_file,
+                    self._delta_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
                 self._graph = nx.Graph()
+                self._dirty_nodes.clear()
+                self._dirty_edges.clear()
+                self._label_index = None
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
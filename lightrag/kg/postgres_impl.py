@@ -5,7 +5,7 @@ import re
 import datetime
 from datetime import timezone
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, TypeVar, Union, final
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar, Union, final
 import numpy as np
 import configparser
 import ssl
@@ -1990,6 +1990,15 @@ class PGKVStorage(BaseKVStorage):
             )
             raise
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        table_name = namespace_to_table_name(self.namespace)
+        if not table_name:
+            raise ValueError(f"Unknown namespace for key iteration: {self.namespace}")
+        async for ids in iter_table_ids(
+            self.db, table_name, self.workspace, batch_size
+        ):
+            yield ids
+
     ################ INSERT METHODS ################
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
@@ -2496,6 +2505,15 @@ class PGVectorStorage(BaseVectorStorage):
             )
             return []
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        table_name = namespace_to_table_name(self.namespace)
+        if not table_name:
+            raise ValueError(f"Unknown namespace for key iteration: {self.namespace}")
+        async for ids in iter_table_ids(
+            self.db, table_name, self.workspace, batch_size
+        ):
+            yield ids
+
     async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
         """Get vectors by their IDs, returning only ID and vector data for efficiency
 
@@ -2543,6 +2561,47 @@ class PGVectorStorage(BaseVectorStorage):
             )
             return {}
 
+    async def get_similarities_by_ids(
+        self, ids: list[str], query_embedding: list[float]
+    ) -> dict[str, float]:
+        """Score vectors server-side with pgvector instead of returning them
+
+        Args:
+            ids: List of unique identifiers
+            query_embedding: Query embedding to compare against
+
+        Returns:
+            Dictionary mapping IDs to their cosine similarity
+            Format: {id: similarity, ...}
+        """
+        if not ids:
+            return {}
+
+        table_name = namespace_to_table_name(self.namespace)
+        if not table_name:
+            logger.error(
+                f"[{self.workspace}] Unknown namespace for similarity lookup: {self.namespace}"
+            )
+            return {}
+
+        embedding_string = ",".join(map(str, query_embedding))
+        query = f"""SELECT id, 1 - (content_vector <=> '[{embedding_string}]'::vector) AS similarity
+                    FROM {table_name} WHERE workspace=$1 AND id = ANY($2)"""
+        params = {"workspace": self.workspace, "ids": list(ids)}
+
+        try:
+            results = await self.db.query(query, list(params.values()), multirows=True)
+            return {
+                result["id"]: float(result["similarity"])
+                for result in results or []
+                if result and result.get("similarity") is not None
+            }
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error scoring vectors by IDs from {self.namespace}: {e}"
+            )
+            return {}
+
     async def drop(self) -> dict[str, str]:
         """Drop the storage"""
         try:
@@ -2622,6 +2681,15 @@ class PGDocStatusStorage(DocStatusStorage):
             )
             raise
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        table_name = namespace_to_table_name(self.namespace)
+        if not table_name:
+            raise ValueError(f"Unknown namespace for key iteration: {self.namespace}")
+        async for ids in iter_table_ids(
+            self.db, table_name, self.workspace, batch_size
+        ):
+            yield ids
+
     async def get_by_id(self, id: str) -> Union[dict[str, Any], None]:
         sql = "select * from LIGHTRAG_DOC_STATUS where workspace=$1 and id=$2"
         params = {"workspace": self.workspace, "id": id}
@@ -4610,6 +4678,93 @@ class PGGraphStorage(BaseGraphStorage):
             edges.append(edge_properties)
         return edges
 
+    @staticmethod
+    def _parse_properties(properties: Any) -> dict | None:
+        if isinstance(properties, str):
+            try:
+                return json.loads(properties)
+            except json.JSONDecodeError:
+                return None
+        return properties
+
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all nodes in batches
+
+        Pages the AGE vertex table by graphid (keyset pagination), so each
+        batch is an independent range query.
+        """
+        query = f"""
+            SELECT id::text AS cursor, properties
+            FROM {self.graph_name}.base
+            WHERE id > $1::text::graphid
+            ORDER BY id
+            LIMIT $2
+        """
+        after = "0"
+        while True:
+            results = await self._query(
+                query, params={"after": after, "limit": batch_size}
+            )
+            if not results:
+                return
+            batch = []
+            for result in results:
+                node_dict = self._parse_properties(result.get("properties"))
+                if not node_dict:
+                    continue
+                node_dict["id"] = node_dict.get("entity_id")
+                batch.append(node_dict)
+            if batch:
+                yield batch
+            if len(results) < batch_size:
+                return
+            after = results[-1]["cursor"]
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all edges in batches
+
+        Pages the AGE edge table by graphid (keyset pagination) and joins only
+        the endpoint vertices of each page.
+        """
+        query = f"""
+            SELECT
+                r.id::text AS cursor,
+                (ag_catalog.agtype_access_operator(VARIADIC ARRAY[a.properties, '"entity_id"'::agtype]))::text AS source,
+                (ag_catalog.agtype_access_operator(VARIADIC ARRAY[b.properties, '"entity_id"'::agtype]))::text AS target,
+                r.properties
+            FROM (
+                SELECT id, start_id, end_id, properties
+                FROM {self.graph_name}."DIRECTED"
+                WHERE id > $1::text::graphid
+                ORDER BY id
+                LIMIT $2
+            ) r
+            LEFT JOIN {self.graph_name}.base a ON r.start_id = a.id
+            LEFT JOIN {self.graph_name}.base b ON r.end_id = b.id
+            ORDER BY r.id
+        """
+        after = "0"
+        while True:
+            results = await self._query(
+                query, params={"after": after, "limit": batch_size}
+            )
+            if not results:
+                return
+            batch = []
+            for result in results:
+                # LEFT JOIN keeps page sizes exact; skip edges with a missing endpoint
+                if result["source"] is None or result["target"] is None:
+                    continue
+                edge_properties = self._parse_properties(result["properties"]) or {}
+                edge_properties["source"] = result["source"]
+                edge_properties["target"] = result["target"]
+                batch.append(edge_properties)
+            if batch:
+                yield batch
+            if len(results) < batch_size:
+                return
+            after = results[-1]["cursor"]
+
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """Get popular labels by node degree (most connected entities) using native SQL for performance."""
         try:
@@ -4758,6 +4913,27 @@ def namespace_to_table_name(namespace: str) -> str:
             return v
 
 
+async def iter_table_ids(
+    db: PostgreSQLDB, table_name: str, workspace: str, batch_size: int
+) -> AsyncIterator[list[str]]:
+    """Page through the ids of a workspace using keyset pagination.
+
+    Every page is an index range scan on the (workspace, id) primary key, so
+    no server-side cursor or transaction is held between batches.
+    """
+    sql = f"SELECT id FROM {table_name} WHERE workspace=$1 AND id > $2 ORDER BY id LIMIT $3"
+    last_id = ""
+    while True:
+        rows = await db.query(sql, [workspace, last_id, batch_size], multirows=True)
+        if not rows:
+            return
+        ids = [row["id"] for row in rows]
+        yield ids
+        if len(ids) < batch_size:
+            return
+        last_id = ids[-1]
+
+
 TABLES = {
     "LIGHTRAG_DOC_FULL": {
         "ddl": """CREATE TABLE LIGHTRAG_DOC_FULL (
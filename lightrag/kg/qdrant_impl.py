@@ -4,7 +4,7 @@ import hashlib
 import os
 import uuid
 from dataclasses import dataclass
-from typing import Any, List, final
+from typing import Any, AsyncIterator, List, final
 
 import numpy as np
 import pipmaster as pm
@@ -641,6 +641,46 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
             return []
 
+    async def _scroll_payloads(
+        self, batch_size: int, with_payload: bool | list[str]
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Page through the points of this workspace with the scroll API"""
+        offset = None
+        while True:
+            points, offset = self._client.scroll(
+                collection_name=self.final_namespace,
+                scroll_filter=models.Filter(
+                    must=[workspace_filter_condition(self.effective_workspace)]
+                ),
+                limit=batch_size,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=False,
+            )
+            payloads = [dict(point.payload or {}) for point in points]
+            if payloads:
+                yield payloads
+            if offset is None:
+                return
+
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        async for payloads in self._scroll_payloads(batch_size, [ID_FIELD]):
+            yield [payload[ID_FIELD] for payload in payloads if ID_FIELD in payload]
+
+    async def iter_items(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[dict[str, dict[str, Any]]]:
+        """Iterate over point payloads, fetched with the same scroll as the IDs"""
+        async for payloads in self._scroll_payloads(batch_size, True):
+            batch = {}
+            for payload in payloads:
+                if ID_FIELD not in payload:
+                    continue
+                payload.setdefault(CREATED_AT_FIELD, None)
+                batch[payload[ID_FIELD]] = payload
+            if batch:
+                yield batch
+
     async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
         """Get vectors by their IDs, returning only ID and vector data for efficiency
 
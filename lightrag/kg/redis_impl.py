@@ -1,6 +1,6 @@
 import os
 import logging
-from typing import Any, final, Union
+from typing import Any, AsyncIterator, final, Union
 from dataclasses import dataclass
 import pipmaster as pm
 import configparser
@@ -122,6 +122,32 @@ class RedisConnectionManager:
             cls._pool_refs.clear()
 
 
+async def scan_namespace_keys(storage, batch_size: int) -> AsyncIterator[list[str]]:
+    """Page through the keys of a Redis storage namespace with SCAN.
+
+    A connection is checked out only for each SCAN step. The namespace prefix
+    is stripped, and results are regrouped into batches of at most batch_size
+    since COUNT is only a hint. SCAN may report a key more than once when the
+    keyspace is rehashed during the iteration.
+    """
+    prefix = f"{storage.final_namespace}:"
+    cursor = 0
+    pending: list[str] = []
+    while True:
+        async with storage._get_redis_connection() as redis:
+            cursor, keys = await redis.scan(
+                cursor, match=f"{prefix}*", count=batch_size
+            )
+        pending.extend(key[len(prefix) :] for key in keys)
+        while len(pending) >= batch_size:
+            yield pending[:batch_size]
+            pending = pending[batch_size:]
+        if cursor == 0:
+            break
+    if pending:
+        yield pending
+
+
 @final
 @dataclass
 class RedisKVStorage(BaseKVStorage):
@@ -315,6 +341,10 @@ class RedisKVStorage(BaseKVStorage):
             existing_ids = {keys_list[i] for i, exists in enumerate(results) if exists}
             return set(keys) - existing_ids
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        async for keys in scan_namespace_keys(self, batch_size):
+            yield keys
+
     @redis_retry
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         if not data:
@@ -661,6 +691,10 @@ class RedisDocStatusStorage(DocStatusStorage):
             existing_ids = {keys_list[i] for i, exists in enumerate(results) if exists}
             return set(keys) - existing_ids
 
+    async def iter_keys(self, batch_size: int = 1000) -> AsyncIterator[list[str]]:
+        async for keys in scan_namespace_keys(self, batch_size):
+            yield keys
+
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         ordered_results: list[dict[str, Any] | None] = []
         async with self._get_redis_connection() as redis:
@@ -1565,6 +1565,49 @@ def get_namespace_lock(
     return NamespaceLock(namespace, workspace, enable_logging)
 
 
+async def get_data_version(workspace: str | None = None) -> int:
+    """Current data version of a workspace.
+
+    The version increases monotonically every time documents or graph data of the
+    workspace are inserted, deleted or edited, so caches built from query results
+    can compare versions instead of re-reading storage.
+    """
+    data_version = await get_namespace_data("data_version", workspace=workspace)
+    return data_version.get("version", 0)
+
+
+async def bump_data_version(workspace: str | None = None) -> int:
+    """Increase the data version of a workspace and return the new value."""
+    data_version = await get_namespace_data("data_version", workspace=workspace)
+    async with get_namespace_lock("data_version", workspace=workspace):
+        version = data_version.get("version", 0) + 1
+        data_version["version"] = version
+    return version
+
+
+async def get_llm_cache_tier_version(workspace: str | None = None) -> int:
+    """Current invalidation version of the per-process LLM cache memory tiers.
+
+    Every worker compares it with the version its tier was filled under and drops
+    the tier when they differ, so invalidations reach all processes.
+    """
+    tier_version = await get_namespace_data(
+        "llm_cache_tier_version", workspace=workspace
+    )
+    return tier_version.get("version", 0)
+
+
+async def bump_llm_cache_tier_version(workspace: str | None = None) -> int:
+    """Increase the LLM cache memory tier version of a workspace and return it."""
+    tier_version = await get_namespace_data(
+        "llm_cache_tier_version", workspace=workspace
+    )
+    async with get_namespace_lock("llm_cache_tier_version", workspace=workspace):
+        version = tier_version.get("version", 0) + 1
+        tier_version["version"] = version
+    return version
+
+
 def finalize_share_data():
     """
     Release shared resources and clean up.
@@ -1685,6 +1728,11 @@ def get_default_workspace() -> str:
     return _default_workspace
 
 
+def is_multiprocess() -> bool:
+    """Whether shared data is shared across multiple worker processes."""
+    return bool(_is_multiprocess)
+
+
 def get_pipeline_status_lock(
     enable_logging: bool = False, workspace: str = None
 ) -> NamespaceLock:
@@ -7,7 +7,7 @@ import inspect
 import os
 import time
 import warnings
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
 from functools import partial
 from typing import (
@@ -40,9 +40,26 @@ from lightrag.constants import (
     DEFAULT_MIN_RERANK_SCORE,
     DEFAULT_SUMMARY_MAX_TOKENS,
     DEFAULT_SUMMARY_CONTEXT_SIZE,
+    DEFAULT_SUMMARY_BUCKET_SIZE,
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_CHUNKING_EXECUTOR,
+    DEFAULT_CHUNKING_EXECUTOR_WORKERS,
+    DEFAULT_CHUNKING_BATCH_SIZE,
+    DEFAULT_LLM_CACHE_MEMORY_MAX_BYTES,
+    DEFAULT_LLM_CACHE_MEMORY_TTL,
+    DEFAULT_QUERY_CONTEXT_CACHE_SIZE,
+    DEFAULT_SEMANTIC_CACHE_ENABLED,
+    DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    DEFAULT_SEMANTIC_CACHE_TTL,
+    DEFAULT_EMBEDDING_BATCH_WINDOW,
+    DEFAULT_EMBEDDING_CACHE_STORAGE,
+    DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES,
+    DEFAULT_BATCH_MERGE,
+    DEFAULT_REBUILD_BATCH_SIZE,
+    DEFAULT_MERGE_COALESCE_WINDOW,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
     DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
@@ -57,6 +74,7 @@ from lightrag.constants import (
 from lightrag.utils import get_env_value
 
 from lightrag.kg import (
+    EMBEDDING_CACHE_UNSUPPORTED_KV_STORAGES,
     STORAGES,
     verify_storage_implementation,
 )
@@ -68,6 +86,9 @@ from lightrag.kg.shared_storage import (
     get_default_workspace,
     set_default_workspace,
     get_namespace_lock,
+    bump_data_version,
+    get_data_version,
+    is_multiprocess,
 )
 
 from lightrag.base import (
@@ -89,6 +110,7 @@ from lightrag.operate import (
     chunking_by_token_size,
     extract_entities,
     merge_nodes_and_edges,
+    MergeCoalescer,
     kg_query,
     naive_query,
     rebuild_knowledge_from_chunks,
@@ -96,12 +118,14 @@ from lightrag.operate import (
 from lightrag.constants import GRAPH_FIELD_SEP
 from lightrag.utils import (
     Tokenizer,
-    TiktokenTokenizer,
+    get_shared_tokenizer,
+    ChunkingExecutor,
     EmbeddingFunc,
     always_get_an_event_loop,
     compute_mdhash_id,
     lazy_external_import,
     priority_limit_async_func_call,
+    micro_batch_embedding_func,
     get_content_summary,
     sanitize_text_for_encoding,
     check_storage_env_vars,
@@ -111,6 +135,13 @@ from lightrag.utils import (
     subtract_source_ids,
     make_relation_chunk_key,
     normalize_source_ids_limit_method,
+    EmbeddingCache,
+    KVEmbeddingCacheBackend,
+    MmapEmbeddingCacheBackend,
+    QueryContextCache,
+    QueryEmbeddingCache,
+    SemanticQueryCache,
+    invalidate_llm_cache_memory_tier,
 )
 from lightrag.types import KnowledgeGraph
 from dotenv import load_dotenv
@@ -231,7 +262,7 @@ class LightRAG:
     tokenizer: Optional[Tokenizer] = field(default=None)
     """
     A function that returns a Tokenizer instance.
-    If None, and a `tiktoken_model_name` is provided, a TiktokenTokenizer will be created.
+    If None, and a `tiktoken_model_name` is provided, the shared TiktokenTokenizer for that model is used.
     If both are None, the default TiktokenTokenizer is used.
     """
 
@@ -273,6 +304,25 @@ class LightRAG:
     Defaults to `chunking_by_token_size` if not specified.
     """
 
+    chunking_executor: str = field(
+        default=get_env_value("CHUNKING_EXECUTOR", DEFAULT_CHUNKING_EXECUTOR, str)
+    )
+    """Where a synchronous `chunking_func` runs during document processing:
+    'none' (inline on the event loop), 'thread' (thread pool) or 'process' (process pool).
+    Asynchronous chunking functions always run on the event loop."""
+
+    chunking_executor_workers: int = field(
+        default=get_env_value(
+            "CHUNKING_EXECUTOR_WORKERS", DEFAULT_CHUNKING_EXECUTOR_WORKERS, int
+        )
+    )
+    """Number of workers in the chunking thread/process pool."""
+
+    chunking_batch_size: int = field(
+        default=get_env_value("CHUNKING_BATCH_SIZE", DEFAULT_CHUNKING_BATCH_SIZE, int)
+    )
+    """Maximum number of documents chunked in a single worker call."""
+
     # Embedding
     # ---
 
@@ -285,6 +335,32 @@ class LightRAG:
     embedding_batch_num: int = field(default=int(os.getenv("EMBEDDING_BATCH_NUM", 10)))
     """Batch size for embedding computations."""
 
+    embedding_batch_window: float = field(
+        default=get_env_value(
+            "EMBEDDING_BATCH_WINDOW", DEFAULT_EMBEDDING_BATCH_WINDOW, float
+        )
+    )
+    """Seconds concurrent small embedding requests wait to be coalesced into one batch of up to embedding_batch_num texts. 0 disables coalescing."""
+
+    embedding_cache_storage: str = field(
+        default=get_env_value(
+            "EMBEDDING_CACHE_STORAGE", DEFAULT_EMBEDDING_CACHE_STORAGE, str
+        )
+    )
+    """Backend of the persistent embedding cache consulted before the embedding provider.
+    - none: disabled
+    - kv: the configured KV storage (embedding_cache namespace; PGKVStorage is not supported)
+    - mmap: a local memory-mapped file in the working directory (single process only, kv is used with multiple workers)
+    Requires embedding_func.model_name; the cache is disabled without it.
+    """
+
+    embedding_cache_max_entries: int = field(
+        default=get_env_value(
+            "EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES, int
+        )
+    )
+    """Maximum number of vectors kept in the embedding cache. 0 means unbounded."""
+
     embedding_func_max_async: int = field(
         default=int(os.getenv("EMBEDDING_FUNC_MAX_ASYNC", 8))
     )
@@ -292,15 +368,27 @@ class LightRAG:
 
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
-            "enabled": False,
-            "similarity_threshold": 0.95,
+            "enabled": get_env_value(
+                "SEMANTIC_CACHE_ENABLED", DEFAULT_SEMANTIC_CACHE_ENABLED, bool
+            ),
+            "similarity_threshold": get_env_value(
+                "SEMANTIC_CACHE_SIMILARITY_THRESHOLD",
+                DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+                float,
+            ),
             "use_llm_check": False,
+            "max_entries": get_env_value(
+                "SEMANTIC_CACHE_MAX_ENTRIES", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES, int
+            ),
+            "ttl": get_env_value("SEMANTIC_CACHE_TTL", DEFAULT_SEMANTIC_CACHE_TTL, int),
         }
     )
-    """Configuration for embedding cache.
-    - enabled: If True, enables caching to avoid redundant computations.
-    - similarity_threshold: Minimum similarity score to use cached embeddings.
-    - use_llm_check: If True, validates cached embeddings using an LLM.
+    """Configuration for the semantic query cache in front of aquery_llm.
+    - enabled: If True, answers of previous queries with a similar embedding are reused.
+    - similarity_threshold: Minimum cosine similarity between query embeddings for a hit.
+    - use_llm_check: Reserved, LLM validation of cache hits is not implemented.
+    - max_entries: Maximum number of cached answers (least recently used are evicted).
+    - ttl: Seconds a cached answer stays valid, 0 means no expiry.
     """
 
     default_embedding_timeout: int = field(
@@ -333,6 +421,15 @@ class LightRAG:
     )
     """Recommended length of LLM summary output."""
 
+    summary_bucket_size: int = field(
+        default=get_env_value("SUMMARY_BUCKET_SIZE", DEFAULT_SUMMARY_BUCKET_SIZE, int)
+    )
+    """Source chunks per partial-summary bucket. When set, entity and relation descriptions are
+    summarized hierarchically: partial summaries are kept per bucket in the chunk tracking
+    storage, only buckets receiving new descriptions are re-summarized on merge and only those
+    changed buckets are folded into the root description.
+    0 re-summarizes the full description list."""
+
     llm_model_max_async: int = field(
         default=int(os.getenv("MAX_ASYNC", DEFAULT_MAX_ASYNC))
     )
@@ -368,6 +465,25 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    llm_cache_memory_max_bytes: int = field(
+        default=get_env_value(
+            "LLM_CACHE_MEMORY_MAX_BYTES", DEFAULT_LLM_CACHE_MEMORY_MAX_BYTES, int
+        )
+    )
+    """Size bound of the in-process LRU tier in front of the LLM response cache storage. 0 disables the tier."""
+
+    llm_cache_memory_ttl: int = field(
+        default=get_env_value("LLM_CACHE_MEMORY_TTL", DEFAULT_LLM_CACHE_MEMORY_TTL, int)
+    )
+    """Seconds an entry stays in the in-process LLM cache tier. 0 means no expiry."""
+
+    query_context_cache_size: int = field(
+        default=get_env_value(
+            "QUERY_CONTEXT_CACHE_SIZE", DEFAULT_QUERY_CONTEXT_CACHE_SIZE, int
+        )
+    )
+    """Number of query retrieval results (keywords + context) kept in process until the workspace data changes. 0 disables the cache."""
+
     # Extensions
     # ---
 
@@ -376,6 +492,28 @@ class LightRAG:
     )
     """Maximum number of parallel insert operations."""
 
+    batch_merge: bool = field(
+        default=get_env_value("BATCH_MERGE", DEFAULT_BATCH_MERGE, bool)
+    )
+    """Merge the entities and relations of a document with bulk storage reads and writes
+    (prefetch, concurrent LLM summaries, one batch write per storage) instead of
+    per-entity round trips. All entities of the document stay locked during the merge."""
+
+    rebuild_batch_size: int = field(
+        default=get_env_value("REBUILD_BATCH_SIZE", DEFAULT_REBUILD_BATCH_SIZE, int)
+    )
+    """Number of entities or relations rebuilt per batch after a deletion. Each batch is
+    prefetched and written back with bulk storage calls."""
+
+    merge_coalesce_window: float = field(
+        default=get_env_value(
+            "MERGE_COALESCE_WINDOW", DEFAULT_MERGE_COALESCE_WINDOW, float
+        )
+    )
+    """Seconds a document with finished extraction waits for other in-flight documents so
+    their entities and relations are merged in one pass. Entities shared by several documents
+    are then summarized and re-embedded once per window. 0 merges every document on its own."""
+
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
     )
@@ -496,9 +634,38 @@ class LightRAG:
         # Post-initialization hook to handle backward compatabile tokenizer initialization based on provided parameters
         if self.tokenizer is None:
             if self.tiktoken_model_name:
-                self.tokenizer = TiktokenTokenizer(self.tiktoken_model_name)
+                self.tokenizer = get_shared_tokenizer(self.tiktoken_model_name)
             else:
-                self.tokenizer = TiktokenTokenizer()
+                self.tokenizer = get_shared_tokenizer()
+
+        # Chunking executor is created lazily on first use
+        self.chunking_executor = (self.chunking_executor or "none").lower()
+        if self.chunking_executor not in ("none", "thread", "process"):
+            logger.warning(
+                f"Invalid chunking_executor '{self.chunking_executor}', falling back to 'none'"
+            )
+            self.chunking_executor = "none"
+        self._chunking_executor: ChunkingExecutor | None = None
+
+        # Retrieval results of kg queries, invalidated by the workspace data version
+        self._query_context_cache: QueryContextCache | None = (
+            QueryContextCache(self.query_context_cache_size)
+            if self.query_context_cache_size > 0
+            else None
+        )
+
+        # Answers of previous queries, looked up by query embedding similarity
+        self._semantic_query_cache: SemanticQueryCache | None = None
+        if self.embedding_cache_config.get("enabled"):
+            self._semantic_query_cache = SemanticQueryCache(
+                similarity_threshold=self.embedding_cache_config.get(
+                    "similarity_threshold", DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD
+                ),
+                max_entries=self.embedding_cache_config.get(
+                    "max_entries", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES
+                ),
+                ttl=self.embedding_cache_config.get("ttl", DEFAULT_SEMANTIC_CACHE_TTL),
+            )
 
         # Initialize ollama_server_infos if not provided
         if self.ollama_server_infos is None:
@@ -534,6 +701,17 @@ class LightRAG:
             )
         self.embedding_token_limit = embedding_max_token_size
 
+        # Step 1.5: Attach the persistent embedding cache (on a copy, the caller's
+        # EmbeddingFunc may be shared with other instances)
+        self.embedding_cache_kv: BaseKVStorage | None = None
+        self._embedding_cache: EmbeddingCache | None = self._create_embedding_cache(
+            global_config
+        )
+        if self._embedding_cache is not None:
+            self.embedding_func = replace(
+                self.embedding_func, cache=self._embedding_cache
+            )
+
         # Step 2: Apply priority wrapper decorator
         self.embedding_func = priority_limit_async_func_call(
             self.embedding_func_max_async,
@@ -541,6 +719,14 @@ class LightRAG:
             queue_name="Embedding func",
         )(self.embedding_func)
 
+        # Step 3: Coalesce concurrent small requests before they enter the queue
+        if self.embedding_batch_window > 0:
+            self.embedding_func = micro_batch_embedding_func(
+                self.embedding_batch_num,
+                self.embedding_batch_window,
+                queue_name="Embedding func",
+            )(self.embedding_func)
+
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
             self._get_storage_class(self.kv_storage)
@@ -689,18 +875,29 @@ class LightRAG:
                 self.chunks_vdb,
                 self.chunk_entity_relation_graph,
                 self.llm_response_cache,
+                self.embedding_cache_kv,
                 self.doc_status,
             ):
                 if storage:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
 
+            if self._embedding_cache is not None:
+                await self._embedding_cache.initialize()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
     async def finalize_storages(self):
         """Asynchronously finalize the storages with improved error handling"""
         if self._storages_status == StoragesStatus.INITIALIZED:
+            # Persist pending embedding cache writes before its storage is closed
+            if self._embedding_cache is not None:
+                try:
+                    await self._embedding_cache.flush()
+                except Exception as e:
+                    logger.error(f"Failed to flush embedding cache: {e}")
+
             storages = [
                 ("full_docs", self.full_docs),
                 ("text_chunks", self.text_chunks),
@@ -713,6 +910,7 @@ class LightRAG:
                 ("chunks_vdb", self.chunks_vdb),
                 ("chunk_entity_relation_graph", self.chunk_entity_relation_graph),
                 ("llm_response_cache", self.llm_response_cache),
+                ("embedding_cache", self.embedding_cache_kv),
                 ("doc_status", self.doc_status),
             ]
 
@@ -746,6 +944,10 @@ class LightRAG:
 
             self._storages_status = StoragesStatus.FINALIZED
 
+        if self._chunking_executor is not None:
+            self._chunking_executor.shutdown()
+            self._chunking_executor = None
+
     async def check_and_migrate_data(self):
         """Check if data migration is needed and perform migration if necessary"""
         async with get_data_init_lock():
@@ -754,12 +956,15 @@ class LightRAG:
                 # 1. chunk_entity_relation_graph has entities and relations (count > 0)
                 # 2. full_entities and full_relations are empty
 
-                # Get all entity labels from graph
-                all_entity_labels = (
-                    await self.chunk_entity_relation_graph.get_all_labels()
-                )
+                # Fetch a single page of nodes to check whether the graph has entities
+                has_entities = False
+                async for _ in self.chunk_entity_relation_graph.iter_nodes(
+                    batch_size=1
+                ):
+                    has_entities = True
+                    break
 
-                if not all_entity_labels:
+                if not has_entities:
                     logger.debug("No entities found in graph, skipping migration check")
                     return
 
@@ -802,7 +1007,7 @@ class LightRAG:
                         return
 
                     logger.info(
-                        f"Data migration needed: found {len(all_entity_labels)} entities in graph but no full_entities/full_relations data"
+                        "Data migration needed: found entities in graph but no full_entities/full_relations data"
                     )
 
                     # Perform migration
@@ -835,47 +1040,44 @@ class LightRAG:
         doc_entities = {}  # doc_id -> set of entity_names
         doc_relations = {}  # doc_id -> set of relation_pairs (as tuples)
 
-        # Get all nodes and edges from graph
-        all_nodes = await self.chunk_entity_relation_graph.get_all_nodes()
-        all_edges = await self.chunk_entity_relation_graph.get_all_edges()
-
-        # Process all nodes once
-        for node in all_nodes:
-            if "source_id" in node:
-                entity_id = node.get("entity_id") or node.get("id")
-                if not entity_id:
-                    continue
+        # Page through all nodes and edges of the graph once
+        async for nodes in self.chunk_entity_relation_graph.iter_nodes():
+            for node in nodes:
+                if "source_id" in node:
+                    entity_id = node.get("entity_id") or node.get("id")
+                    if not entity_id:
+                        continue
 
-                # Get chunk IDs from source_id
-                source_ids = node["source_id"].split(GRAPH_FIELD_SEP)
-
-                # Find which documents this entity belongs to
-                for chunk_id in source_ids:
-                    doc_id = chunk_to_doc.get(chunk_id)
-                    if doc_id:
-                        if doc_id not in doc_entities:
-                            doc_entities[doc_id] = set()
-                        doc_entities[doc_id].add(entity_id)
-
-        # Process all edges once
-        for edge in all_edges:
-            if "source_id" in edge:
-                src = edge.get("source")
-                tgt = edge.get("target")
-                if not src or not tgt:
-                    continue
+                    # Get chunk IDs from source_id
+                    source_ids = node["source_id"].split(GRAPH_FIELD_SEP)
+
+                    # Find which documents this entity belongs to
+                    for chunk_id in source_ids:
+                        doc_id = chunk_to_doc.get(chunk_id)
+                        if doc_id:
+                            if doc_id not in doc_entities:
+                                doc_entities[doc_id] = set()
+                            doc_entities[doc_id].add(entity_id)
+
+        async for edges in self.chunk_entity_relation_graph.iter_edges():
+            for edge in edges:
+                if "source_id" in edge:
+                    src = edge.get("source")
+                    tgt = edge.get("target")
+                    if not src or not tgt:
+                        continue
 
-                # Get chunk IDs from source_id
-                source_ids = edge["source_id"].split(GRAPH_FIELD_SEP)
+                    # Get chunk IDs from source_id
+                    source_ids = edge["source_id"].split(GRAPH_FIELD_SEP)
 
-                # Find which documents this relation belongs to
-                for chunk_id in source_ids:
-                    doc_id = chunk_to_doc.get(chunk_id)
-                    if doc_id:
-                        if doc_id not in doc_relations:
-                            doc_relations[doc_id] = set()
-                        # Use tuple for set operations, convert to list later
-                        doc_relations[doc_id].add(tuple(sorted((src, tgt))))
+                    # Find which documents this relation belongs to
+                    for chunk_id in source_ids:
+                        doc_id = chunk_to_doc.get(chunk_id)
+                        if doc_id:
+                            if doc_id not in doc_relations:
+                                doc_relations[doc_id] = set()
+                            # Use tuple for set operations, convert to list later
+                            doc_relations[doc_id].add(tuple(sorted((src, tgt))))
 
         # Store the results in full_entities and full_relations
         migration_count = 0
@@ -939,24 +1141,26 @@ class LightRAG:
 
         BATCH_SIZE = 500  # Process 500 records per batch
 
-        if need_entity_migration:
+        async def fetch_pages(pages, kind: str):
+            # Fetch failures end the migration of this kind; errors raised while
+            # processing a page are not affected and still propagate
             try:
-                nodes = await self.chunk_entity_relation_graph.get_all_nodes()
+                async for page in pages:
+                    yield page
             except Exception as exc:
-                logger.error(f"Failed to fetch nodes for chunk migration: {exc}")
-                nodes = []
+                logger.error(f"Failed to fetch {kind} for chunk migration: {exc}")
 
-            logger.info(f"Starting chunk_tracking data migration: {len(nodes)} nodes")
+        if need_entity_migration:
+            logger.info("Starting chunk_tracking data migration for nodes")
 
-            # Process nodes in batches
-            total_nodes = len(nodes)
-            total_batches = (total_nodes + BATCH_SIZE - 1) // BATCH_SIZE
+            # Page through nodes in batches
+            total_nodes = 0
             total_migrated = 0
 
-            for batch_idx in range(total_batches):
-                start_idx = batch_idx * BATCH_SIZE
-                end_idx = min((batch_idx + 1) * BATCH_SIZE, total_nodes)
-                batch_nodes = nodes[start_idx:end_idx]
+            async for batch_nodes in fetch_pages(
+                self.chunk_entity_relation_graph.iter_nodes(BATCH_SIZE), "nodes"
+            ):
+                total_nodes += len(batch_nodes)
 
                 upsert_payload: dict[str, dict[str, object]] = {}
                 for node in batch_nodes:
@@ -982,7 +1186,7 @@ class LightRAG:
                     await self.entity_chunks.upsert(upsert_payload)
                     total_migrated += len(upsert_payload)
                     logger.info(
-                        f"Processed entity batch {batch_idx + 1}/{total_batches}: {len(upsert_payload)} records (total: {total_migrated}/{total_nodes})"
+                        f"Processed entity batch: {len(upsert_payload)} records (total: {total_migrated}/{total_nodes} nodes read)"
                     )
 
             if total_migrated > 0:
@@ -993,23 +1197,16 @@ class LightRAG:
                 )
 
         if need_relation_migration:
-            try:
-                edges = await self.chunk_entity_relation_graph.get_all_edges()
-            except Exception as exc:
-                logger.error(f"Failed to fetch edges for chunk migration: {exc}")
-                edges = []
-
-            logger.info(f"Starting chunk_tracking data migration: {len(edges)} edges")
+            logger.info("Starting chunk_tracking data migration for edges")
 
-            # Process edges in batches
-            total_edges = len(edges)
-            total_batches = (total_edges + BATCH_SIZE - 1) // BATCH_SIZE
+            # Page through edges in batches
+            total_edges = 0
             total_migrated = 0
 
-            for batch_idx in range(total_batches):
-                start_idx = batch_idx * BATCH_SIZE
-                end_idx = min((batch_idx + 1) * BATCH_SIZE, total_edges)
-                batch_edges = edges[start_idx:end_idx]
+            async for batch_edges in fetch_pages(
+                self.chunk_entity_relation_graph.iter_edges(BATCH_SIZE), "edges"
+            ):
+                total_edges += len(batch_edges)
 
                 upsert_payload: dict[str, dict[str, object]] = {}
                 for edge in batch_edges:
@@ -1037,7 +1234,7 @@ class LightRAG:
                     await self.relation_chunks.upsert(upsert_payload)
                     total_migrated += len(upsert_payload)
                     logger.info(
-                        f"Processed relation batch {batch_idx + 1}/{total_batches}: {len(upsert_payload)} records (total: {total_migrated}/{total_edges})"
+                        f"Processed relation batch: {len(upsert_payload)} records (total: {total_migrated}/{total_edges} edges read)"
                     )
 
             if total_migrated > 0:
@@ -1102,6 +1299,68 @@ class LightRAG:
             storage_class = lazy_external_import(import_path, storage_name)
             return storage_class
 
+    def _create_embedding_cache(
+        self, global_config: dict[str, Any]
+    ) -> EmbeddingCache | None:
+        """Build the persistent embedding cache selected by embedding_cache_storage"""
+        cache_storage = (self.embedding_cache_storage or "none").lower()
+        if cache_storage == "none":
+            return None
+        if cache_storage not in ("kv", "mmap"):
+            logger.warning(
+                f"Invalid embedding_cache_storage '{self.embedding_cache_storage}', embedding cache disabled"
+            )
+            return None
+        if not isinstance(self.embedding_func, EmbeddingFunc):
+            logger.warning(
+                "Embedding cache requires embedding_func to be an EmbeddingFunc, embedding cache disabled"
+            )
+            return None
+
+        model_name = self.embedding_func.model_name
+        if not model_name:
+            logger.warning(
+                "Embedding cache requires EmbeddingFunc.model_name to tell models apart, embedding cache disabled"
+            )
+            return None
+        if cache_storage == "mmap" and is_multiprocess():
+            logger.warning(
+                "mmap embedding cache is single process only, falling back to kv embedding cache"
+            )
+            cache_storage = "kv"
+        if (
+            cache_storage == "kv"
+            and self.kv_storage in EMBEDDING_CACHE_UNSUPPORTED_KV_STORAGES
+        ):
+            logger.warning(
+                f"{self.kv_storage} does not support the embedding cache namespace, embedding cache disabled"
+            )
+            return None
+
+        embedding_dim = self.embedding_func.embedding_dim
+        if cache_storage == "kv":
+            self.embedding_cache_kv = self._get_storage_class(self.kv_storage)(
+                namespace=NameSpace.KV_STORE_EMBEDDING_CACHE,
+                workspace=self.workspace,
+                global_config=global_config,
+                embedding_func=None,
+            )
+            backend = KVEmbeddingCacheBackend(
+                self.embedding_cache_kv, self.embedding_cache_max_entries
+            )
+        else:
+            cache_dir = os.path.join(self.working_dir, self.workspace or "")
+            os.makedirs(cache_dir, exist_ok=True)
+            backend = MmapEmbeddingCacheBackend(
+                os.path.join(cache_dir, "embedding_cache"),
+                embedding_dim,
+                self.embedding_cache_max_entries,
+            )
+        logger.info(
+            f"Embedding cache enabled: {cache_storage} (model: {model_name}, dim: {embedding_dim})"
+        )
+        return EmbeddingCache(backend, model_name, embedding_dim)
+
     def insert(
         self,
         input: str | list[str],
@@ -1477,11 +1736,19 @@ class LightRAG:
         failed_docs_to_preserve = []
         successful_deletions = 0
 
+        # Find documents without content in full_docs, one batched lookup per page
+        CHECK_BATCH_SIZE = 1000
+        doc_ids = list(to_process_docs.keys())
+        missing_content: set[str] = set()
+        for start in range(0, len(doc_ids), CHECK_BATCH_SIZE):
+            missing_content |= await self.full_docs.filter_keys(
+                set(doc_ids[start : start + CHECK_BATCH_SIZE])
+            )
+
         # Check each document's data consistency
         for doc_id, status_doc in to_process_docs.items():
             # Check if corresponding content exists in full_docs
-            content_data = await self.full_docs.get_by_id(doc_id)
-            if not content_data:
+            if doc_id in missing_content:
                 # Check if this is a failed document that should be preserved
                 if (
                     hasattr(status_doc, "status")
@@ -1556,8 +1823,7 @@ class LightRAG:
 
         for doc_id, status_doc in to_process_docs.items():
             # Check if document has corresponding content in full_docs (consistency check)
-            content_data = await self.full_docs.get_by_id(doc_id)
-            if content_data:  # Document passes consistency check
+            if doc_id not in missing_content:  # Document passes consistency check
                 # Check if document is in PROCESSING or FAILED status
                 if hasattr(status_doc, "status") and status_doc.status in [
                     DocStatus.PROCESSING,
@@ -1593,6 +1859,51 @@ class LightRAG:
 
         return to_process_docs
 
+    async def _chunk_document(
+        self,
+        content: str,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+    ) -> Any:
+        """Run chunking_func on a document.
+
+        Synchronous chunking functions are offloaded to the chunking executor when
+        `chunking_executor` is 'thread' or 'process', so tokenizing large documents
+        does not block the event loop.
+        """
+        if self.chunking_executor != "none" and not inspect.iscoroutinefunction(
+            self.chunking_func
+        ):
+            if self._chunking_executor is None:
+                self._chunking_executor = ChunkingExecutor(
+                    self.chunking_func,
+                    self.tokenizer,
+                    mode=self.chunking_executor,
+                    max_workers=self.chunking_executor_workers,
+                    batch_size=self.chunking_batch_size,
+                )
+            return await self._chunking_executor.chunk(
+                content,
+                split_by_character,
+                split_by_character_only,
+                self.chunk_overlap_token_size,
+                self.chunk_token_size,
+            )
+
+        chunking_result = self.chunking_func(
+            self.tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            self.chunk_overlap_token_size,
+            self.chunk_token_size,
+        )
+
+        # If result is awaitable, await to get actual result
+        if inspect.isawaitable(chunking_result):
+            chunking_result = await chunking_result
+        return chunking_result
+
     async def apipeline_process_enqueue_documents(
         self,
         split_by_character: str | None = None,
@@ -1730,6 +2041,24 @@ class LightRAG:
                 processed_count = 0
                 # Create a semaphore to limit the number of concurrent file processing
                 semaphore = asyncio.Semaphore(self.max_parallel_insert)
+                # Merge documents finishing extraction close together in one pass
+                merge_coalescer = None
+                if self.merge_coalesce_window > 0:
+                    merge_coalescer = MergeCoalescer(
+                        knowledge_graph_inst=self.chunk_entity_relation_graph,
+                        entity_vdb=self.entities_vdb,
+                        relationships_vdb=self.relationships_vdb,
+                        global_config=asdict(self),
+                        full_entities_storage=self.full_entities,
+                        full_relations_storage=self.full_relations,
+                        pipeline_status=pipeline_status,
+                        pipeline_status_lock=pipeline_status_lock,
+                        llm_response_cache=self.llm_response_cache,
+                        entity_chunks_storage=self.entity_chunks,
+                        relation_chunks_storage=self.relation_chunks,
+                        window=self.merge_coalesce_window,
+                        max_batch=min(self.max_parallel_insert, len(to_process_docs)),
+                    )
 
                 async def process_document(
                     doc_id: str,
@@ -1799,19 +2128,10 @@ class LightRAG:
                             content = content_data["content"]
 
                             # Call chunking function, supporting both sync and async implementations
-                            chunking_result = self.chunking_func(
-                                self.tokenizer,
-                                content,
-                                split_by_character,
-                                split_by_character_only,
-                                self.chunk_overlap_token_size,
-                                self.chunk_token_size,
+                            chunking_result = await self._chunk_document(
+                                content, split_by_character, split_by_character_only
                             )
 
-                            # If result is awaitable, await to get actual result
-                            if inspect.isawaitable(chunking_result):
-                                chunking_result = await chunking_result
-
                             # Validate return type
                             if not isinstance(chunking_result, (list, tuple)):
                                 raise TypeError(
@@ -1974,24 +2294,33 @@ class LightRAG:
                                         )
 
                                 # Use chunk_results from entity_relation_task
-                                await merge_nodes_and_edges(
-                                    chunk_results=chunk_results,  # result collected from entity_relation_task
-                                    knowledge_graph_inst=self.chunk_entity_relation_graph,
-                                    entity_vdb=self.entities_vdb,
-                                    relationships_vdb=self.relationships_vdb,
-                                    global_config=asdict(self),
-                                    full_entities_storage=self.full_entities,
-                                    full_relations_storage=self.full_relations,
-                                    doc_id=doc_id,
-                                    pipeline_status=pipeline_status,
-                                    pipeline_status_lock=pipeline_status_lock,
-                                    llm_response_cache=self.llm_response_cache,
-                                    entity_chunks_storage=self.entity_chunks,
-                                    relation_chunks_storage=self.relation_chunks,
-                                    current_file_number=current_file_number,
-                                    total_files=total_files,
-                                    file_path=file_path,
-                                )
+                                if merge_coalescer is not None:
+                                    await merge_coalescer.merge(
+                                        chunk_results=chunk_results,
+                                        doc_id=doc_id,
+                                        current_file_number=current_file_number,
+                                        total_files=total_files,
+                                        file_path=file_path,
+                                    )
+                                else:
+                                    await merge_nodes_and_edges(
+                                        chunk_results=chunk_results,  # result collected from entity_relation_task
+                                        knowledge_graph_inst=self.chunk_entity_relation_graph,
+                                        entity_vdb=self.entities_vdb,
+                                        relationships_vdb=self.relationships_vdb,
+                                        global_config=asdict(self),
+                                        full_entities_storage=self.full_entities,
+                                        full_relations_storage=self.full_relations,
+                                        doc_id=doc_id,
+                                        pipeline_status=pipeline_status,
+                                        pipeline_status_lock=pipeline_status_lock,
+                                        llm_response_cache=self.llm_response_cache,
+                                        entity_chunks_storage=self.entity_chunks,
+                                        relation_chunks_storage=self.relation_chunks,
+                                        current_file_number=current_file_number,
+                                        total_files=total_files,
+                                        file_path=file_path,
+                                    )
 
                                 # Record processing end time
                                 processing_end_time = int(time.time())
@@ -2198,8 +2527,13 @@ class LightRAG:
             ]
             if storage_inst is not None
         ]
+        if self._embedding_cache is not None:
+            tasks.append(self._embedding_cache.flush())
         await asyncio.gather(*tasks)
 
+        # Invalidate retrieval results cached by queries of this workspace
+        await bump_data_version(self.workspace)
+
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
 
@@ -2600,6 +2934,8 @@ class LightRAG:
         )
 
         query_result = None
+        # Query/keyword embeddings shared by every vector search of this call
+        embedding_cache = QueryEmbeddingCache(self.embedding_func)
 
         if data_param.mode in ["local", "global", "hybrid", "mix"]:
             logger.debug(f"[aquery_data] Using kg_query for mode: {data_param.mode}")
@@ -2614,6 +2950,8 @@ class LightRAG:
                 hashing_kv=self.llm_response_cache,
                 system_prompt=None,
                 chunks_vdb=self.chunks_vdb,
+                embedding_cache=embedding_cache,
+                query_context_cache=self._query_context_cache,
             )
         elif data_param.mode == "naive":
             logger.debug(f"[aquery_data] Using naive_query for mode: {data_param.mode}")
@@ -2624,6 +2962,7 @@ class LightRAG:
                 global_config,
                 hashing_kv=self.llm_response_cache,
                 system_prompt=None,
+                embedding_cache=embedding_cache,
             )
         elif data_param.mode == "bypass":
             logger.debug("[aquery_data] Using bypass mode")
@@ -2698,6 +3037,40 @@ class LightRAG:
 
         try:
             query_result = None
+            # Query/keyword embeddings shared by every vector search of this call
+            embedding_cache = QueryEmbeddingCache(self.embedding_func)
+
+            # Semantic cache: reuse the answer of a similar earlier query
+            semantic_cache = self._semantic_query_cache
+            query_embedding = None
+            if (
+                semantic_cache is not None
+                and param.mode in ["local", "global", "hybrid", "mix", "naive"]
+                and not param.stream
+                and not param.only_need_context
+                and not param.only_need_prompt
+                and not param.conversation_history
+                and system_prompt is None
+                and param.model_func is None
+            ):
+                semantic_scope = SemanticQueryCache.make_scope(param)
+                data_version = await get_data_version(self.workspace)
+                # Also serves the query vector search below
+                await embedding_cache.prefetch([query.strip()])
+                query_embedding = embedding_cache.get(query.strip())
+                if query_embedding is not None:
+                    cached = semantic_cache.lookup(
+                        semantic_scope, query_embedding, data_version
+                    )
+                    if cached is not None:
+                        cached_result, similarity = cached
+                        logger.info(
+                            f"[aquery_llm] Semantic cache hit (mode: {param.mode}, similarity: {similarity:.4f})"
+                        )
+                        metadata = cached_result.setdefault("metadata", {})
+                        metadata["semantic_cache_hit"] = True
+                        metadata["semantic_cache_similarity"] = similarity
+                        return cached_result
 
             if param.mode in ["local", "global", "hybrid", "mix"]:
                 query_result = await kg_query(
@@ -2711,6 +3084,8 @@ class LightRAG:
                     hashing_kv=self.llm_response_cache,
                     system_prompt=system_prompt,
                     chunks_vdb=self.chunks_vdb,
+                    embedding_cache=embedding_cache,
+                    query_context_cache=self._query_context_cache,
                 )
             elif param.mode == "naive":
                 query_result = await naive_query(
@@ -2720,6 +3095,7 @@ class LightRAG:
                     global_config,
                     hashing_kv=self.llm_response_cache,
                     system_prompt=system_prompt,
+                    embedding_cache=embedding_cache,
                 )
             elif param.mode == "bypass":
                 # Bypass mode: directly use LLM without knowledge retrieval
@@ -2793,6 +3169,15 @@ class LightRAG:
                 "is_streaming": query_result.is_streaming,
             }
 
+            if (
+                query_embedding is not None
+                and raw_data.get("status") == "success"
+                and not query_result.is_streaming
+            ):
+                semantic_cache.store(
+                    semantic_scope, query, query_embedding, data_version, raw_data
+                )
+
             return raw_data
 
         except Exception as e:
@@ -2850,6 +3235,9 @@ class LightRAG:
             return
 
         try:
+            # Invalidate the memory tiers of all workers before dropping the backend
+            await invalidate_llm_cache_memory_tier(self.llm_response_cache)
+
             # Clear all cache using drop method
             success = await self.llm_response_cache.drop()
             if success:
@@ -3584,6 +3972,9 @@ class LightRAG:
             if delete_llm_cache and doc_llm_cache_ids and self.llm_response_cache:
                 try:
                     await self.llm_response_cache.delete(doc_llm_cache_ids)
+                    await invalidate_llm_cache_memory_tier(
+                        self.llm_response_cache, doc_llm_cache_ids
+                    )
                     cache_log_message = f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries for document {doc_id}"
                     logger.info(cache_log_message)
                     async with pipeline_status_lock:
@@ -3657,6 +4048,551 @@ class LightRAG:
                     pipeline_status["history_messages"].append(completion_msg)
                     logger.info(completion_msg)
 
+    async def adelete_by_doc_ids(
+        self, doc_ids: list[str], delete_llm_cache: bool = False
+    ) -> list[DeletionResult]:
+        """Delete several documents and their related data in one pass.
+
+        Bulk counterpart of `adelete_by_doc_id`: the union of affected chunks, entities
+        and relationships is computed once, storages are updated with batched calls,
+        partially affected entities and relationships are rebuilt in one consolidated
+        `rebuild_knowledge_from_chunks` run and `_insert_done` is called once at the end.
+        Shared entities are therefore rebuilt once instead of once per document.
+
+        Pipeline handling follows `adelete_by_doc_id`: the pipeline is acquired when idle
+        and joined when a document deletion job already holds it. A cancellation requested
+        before the first storage is modified aborts the whole call.
+
+        Args:
+            doc_ids (list[str]): Identifiers of the documents to delete.
+            delete_llm_cache (bool): Whether to delete cached LLM extraction results
+                associated with the documents. Defaults to False.
+
+        Returns:
+            list[DeletionResult]: One result per unique document ID, in request order.
+        """
+        DELETE_BATCH_SIZE = 1000
+        # collect, delete, rebuild, persist
+        DELETE_PHASES = 4
+
+        def batches(items: list) -> list[list]:
+            return [
+                items[start : start + DELETE_BATCH_SIZE]
+                for start in range(0, len(items), DELETE_BATCH_SIZE)
+            ]
+
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return []
+
+        pipeline_status = await get_namespace_data(
+            "pipeline_status", workspace=self.workspace
+        )
+        pipeline_status_lock = get_namespace_lock(
+            "pipeline_status", workspace=self.workspace
+        )
+
+        async def log_status(message: str, level: str = "info"):
+            getattr(logger, level)(message)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = message
+                pipeline_status["history_messages"].append(message)
+
+        async def log_phase(phase: int, message: str):
+            """Report progress of a long bulk deletion as cur_batch/batchs phases"""
+            message = f"Bulk deletion phase {phase}/{DELETE_PHASES}: {message}"
+            logger.info(message)
+            async with pipeline_status_lock:
+                pipeline_status["batchs"] = DELETE_PHASES
+                pipeline_status["cur_batch"] = phase
+                pipeline_status["latest_message"] = message
+                pipeline_status["history_messages"].append(message)
+
+        we_acquired_pipeline = False
+        async with pipeline_status_lock:
+            if not pipeline_status.get("busy", False):
+                # Not starting with "deleting": single deletions must not join this job
+                we_acquired_pipeline = True
+                pipeline_status.update(
+                    {
+                        "busy": True,
+                        "job_name": "Bulk document deletion",
+                        "job_start": datetime.now(timezone.utc).isoformat(),
+                        "docs": len(doc_ids),
+                        "batchs": DELETE_PHASES,
+                        "cur_batch": 0,
+                        "request_pending": False,
+                        "cancellation_requested": False,
+                        "latest_message": f"Starting bulk deletion of {len(doc_ids)} documents",
+                    }
+                )
+                pipeline_status["history_messages"][:] = [
+                    f"Starting bulk deletion of {len(doc_ids)} documents"
+                ]
+            else:
+                job_name = pipeline_status.get("job_name", "").lower()
+                if not job_name.startswith("deleting") or "document" not in job_name:
+                    message = f"Deletion not allowed: current job '{pipeline_status.get('job_name')}' is not a document deletion job"
+                    return [
+                        DeletionResult(
+                            status="not_allowed",
+                            doc_id=doc_id,
+                            message=message,
+                            status_code=403,
+                            file_path=None,
+                        )
+                        for doc_id in doc_ids
+                    ]
+
+        results: dict[str, DeletionResult] = {}
+        file_paths: dict[str, str | None] = {}
+        deletion_operations_started = False
+
+        try:
+            await log_phase(
+                1,
+                f"collecting chunks and affected graph elements of {len(doc_ids)} documents",
+            )
+
+            # 1. Get the document statuses
+            doc_status_list = []
+            for ids in batches(doc_ids):
+                doc_status_list.extend(await self.doc_status.get_by_ids(ids))
+
+            found_doc_ids = []
+            doc_chunk_ids: dict[str, list[str]] = {}
+            for doc_id, doc_status_data in zip(doc_ids, doc_status_list):
+                if not doc_status_data:
+                    logger.warning(f"Document {doc_id} not found")
+                    results[doc_id] = DeletionResult(
+                        status="not_found",
+                        doc_id=doc_id,
+                        message=f"Document {doc_id} not found.",
+                        status_code=404,
+                        file_path="",
+                    )
+                    continue
+                found_doc_ids.append(doc_id)
+                file_paths[doc_id] = doc_status_data.get("file_path")
+                doc_chunk_ids[doc_id] = doc_status_data.get("chunks_list", []) or []
+
+                raw_status = doc_status_data.get("status")
+                if raw_status != DocStatus.PROCESSED:
+                    status_text = (
+                        raw_status.value
+                        if isinstance(raw_status, DocStatus)
+                        else str(raw_status)
+                    )
+                    logger.info(
+                        f"Deleting {doc_id} {file_paths[doc_id]}(previous status: {status_text.upper()})"
+                    )
+
+            if not found_doc_ids:
+                return [results[doc_id] for doc_id in doc_ids]
+
+            # 2. Union of chunks of all documents
+            chunk_ids = set()
+            for ids in doc_chunk_ids.values():
+                chunk_ids.update(ids)
+            chunk_id_list = list(chunk_ids)
+            await log_status(
+                f"Deleting {len(found_doc_ids)} documents with {len(chunk_ids)} chunks"
+            )
+
+            # 3. Collect LLM cache ids of the chunks
+            doc_llm_cache_ids: list[str] = []
+            if delete_llm_cache and chunk_ids:
+                if not self.llm_response_cache or not self.text_chunks:
+                    logger.info(
+                        "Skipping LLM cache collection because cache or text chunk storage is unavailable"
+                    )
+                else:
+                    seen_cache_ids: set[str] = set()
+                    for ids in batches(chunk_id_list):
+                        for chunk_data in await self.text_chunks.get_by_ids(ids):
+                            if not chunk_data or not isinstance(chunk_data, dict):
+                                continue
+                            cache_ids = chunk_data.get("llm_cache_list", [])
+                            if not isinstance(cache_ids, list):
+                                continue
+                            for cache_id in cache_ids:
+                                if (
+                                    isinstance(cache_id, str)
+                                    and cache_id
+                                    and cache_id not in seen_cache_ids
+                                ):
+                                    doc_llm_cache_ids.append(cache_id)
+                                    seen_cache_ids.add(cache_id)
+                    logger.info(
+                        f"Collected {len(doc_llm_cache_ids)} LLM cache entries for {len(found_doc_ids)} documents"
+                    )
+
+            # 4. Analyze entities and relationships affected by any of the documents
+            entity_names: set[str] = set()
+            relation_pairs: dict[tuple[str, str], tuple[str, str]] = {}
+            for ids in batches(found_doc_ids):
+                for doc_entities_data in await self.full_entities.get_by_ids(ids):
+                    if doc_entities_data:
+                        entity_names.update(
+                            doc_entities_data.get("entity_names", []) or []
+                        )
+                for doc_relations_data in await self.full_relations.get_by_ids(ids):
+                    if doc_relations_data:
+                        for pair in doc_relations_data.get("relation_pairs", []) or []:
+                            relation_pairs.setdefault(
+                                tuple(sorted((pair[0], pair[1]))), (pair[0], pair[1])
+                            )
+
+            entities_to_delete = set()
+            entities_to_rebuild = {}  # entity_name -> remaining chunk id list
+            relationships_to_delete = set()
+            relationships_to_rebuild = {}  # (src, tgt) -> remaining chunk id list
+            entity_chunk_updates: dict[str, list[str]] = {}
+            relation_chunk_updates: dict[tuple[str, str], list[str]] = {}
+
+            def classify(
+                existing_sources: list[str], key, to_delete, to_rebuild, updates
+            ):
+                if not existing_sources:
+                    # No chunk references means the element should be deleted
+                    to_delete.add(key)
+                    updates[key] = []
+                    return
+                remaining_sources = subtract_source_ids(existing_sources, chunk_ids)
+                if not remaining_sources:
+                    to_delete.add(key)
+                    updates[key] = []
+                elif remaining_sources != existing_sources:
+                    to_rebuild[key] = remaining_sources
+                    updates[key] = remaining_sources
+
+            try:
+                for names in batches(sorted(entity_names)):
+                    nodes = await self.chunk_entity_relation_graph.get_nodes_batch(
+                        names
+                    )
+                    tracked = (
+                        await self.entity_chunks.get_by_ids(names)
+                        if self.entity_chunks
+                        else [None] * len(names)
+                    )
+                    for entity_name, stored_chunks in zip(names, tracked):
+                        node_data = nodes.get(entity_name)
+                        if not node_data:
+                            continue
+                        existing_sources = []
+                        if stored_chunks and isinstance(stored_chunks, dict):
+                            existing_sources = [
+                                chunk_id
+                                for chunk_id in stored_chunks.get("chunk_ids", [])
+                                if chunk_id
+                            ]
+                        if not existing_sources and node_data.get("source_id"):
+                            existing_sources = [
+                                chunk_id
+                                for chunk_id in node_data["source_id"].split(
+                                    GRAPH_FIELD_SEP
+                                )
+                                if chunk_id
+                            ]
+                        classify(
+                            existing_sources,
+                            entity_name,
+                            entities_to_delete,
+                            entities_to_rebuild,
+                            entity_chunk_updates,
+                        )
+
+                for keys in batches(sorted(relation_pairs)):
+                    edges = await self.chunk_entity_relation_graph.get_edges_batch(
+                        [
+                            {
+                                "src": relation_pairs[key][0],
+                                "tgt": relation_pairs[key][1],
+                            }
+                            for key in keys
+                        ]
+                    )
+                    tracked = (
+                        await self.relation_chunks.get_by_ids(
+                            [make_relation_chunk_key(*key) for key in keys]
+                        )
+                        if self.relation_chunks
+                        else [None] * len(keys)
+                    )
+                    for edge_tuple, stored_chunks in zip(keys, tracked):
+                        edge_data = edges.get(relation_pairs[edge_tuple])
+                        if not edge_data or "source_id" not in edge_data:
+                            continue
+                        existing_sources = []
+                        if stored_chunks and isinstance(stored_chunks, dict):
+                            existing_sources = [
+                                chunk_id
+                                for chunk_id in stored_chunks.get("chunk_ids", [])
+                                if chunk_id
+                            ]
+                        if not existing_sources:
+                            existing_sources = [
+                                chunk_id
+                                for chunk_id in edge_data["source_id"].split(
+                                    GRAPH_FIELD_SEP
+                                )
+                                if chunk_id
+                            ]
+                        classify(
+                            existing_sources,
+                            edge_tuple,
+                            relationships_to_delete,
+                            relationships_to_rebuild,
+                            relation_chunk_updates,
+                        )
+            except Exception as e:
+                logger.error(f"Failed to analyze affected graph elements: {e}")
+                raise Exception(f"Failed to analyze graph dependencies: {e}") from e
+
+            await log_status(
+                f"Found {len(entities_to_rebuild)} affected entities and {len(relationships_to_rebuild)} affected relations"
+            )
+
+            # Nothing has been modified yet: honour a cancellation request
+            async with pipeline_status_lock:
+                cancelled = pipeline_status.get("cancellation_requested", False)
+            if cancelled:
+                await log_status(
+                    f"Deletion of {len(found_doc_ids)} documents cancelled before any data was removed"
+                )
+                for doc_id in found_doc_ids:
+                    results[doc_id] = DeletionResult(
+                        status="fail",
+                        doc_id=doc_id,
+                        message="Deletion cancelled by user",
+                        status_code=409,
+                        file_path=file_paths[doc_id],
+                    )
+                return [results[doc_id] for doc_id in doc_ids]
+
+            deletion_operations_started = True
+            current_time = int(time.time())
+            await log_phase(
+                2,
+                f"deleting {len(chunk_ids)} chunks, {len(relationships_to_delete)} relations and {len(entities_to_delete)} entities",
+            )
+
+            # 5. Update chunk tracking of partially affected entities and relations
+            if self.entity_chunks:
+                entity_upsert_payload = {
+                    entity_name: {
+                        "chunk_ids": remaining,
+                        "count": len(remaining),
+                        "updated_at": current_time,
+                    }
+                    for entity_name, remaining in entity_chunk_updates.items()
+                    if remaining
+                }
+                for names in batches(list(entity_upsert_payload)):
+                    await self.entity_chunks.upsert(
+                        {name: entity_upsert_payload[name] for name in names}
+                    )
+            if self.relation_chunks:
+                relation_upsert_payload = {
+                    make_relation_chunk_key(*edge_tuple): {
+                        "chunk_ids": remaining,
+                        "count": len(remaining),
+                        "updated_at": current_time,
+                    }
+                    for edge_tuple, remaining in relation_chunk_updates.items()
+                    if remaining
+                }
+                for keys in batches(list(relation_upsert_payload)):
+                    await self.relation_chunks.upsert(
+                        {key: relation_upsert_payload[key] for key in keys}
+                    )
+
+            # 6. Delete chunks from storage
+            try:
+                for ids in batches(chunk_id_list):
+                    await self.chunks_vdb.delete(ids)
+                    await self.text_chunks.delete(ids)
+            except Exception as e:
+                logger.error(f"Failed to delete chunks: {e}")
+                raise Exception(f"Failed to delete document chunks: {e}") from e
+            if chunk_id_list:
+                await log_status(
+                    f"Successfully deleted {len(chunk_id_list)} chunks from storage"
+                )
+
+            async def delete_relations(edge_tuples: list[tuple[str, str]]):
+                for pairs in batches(edge_tuples):
+                    rel_ids = []
+                    for src, tgt in pairs:
+                        rel_ids.extend(
+                            [
+                                compute_mdhash_id(src + tgt, prefix="rel-"),
+                                compute_mdhash_id(tgt + src, prefix="rel-"),
+                            ]
+                        )
+                    await self.relationships_vdb.delete(rel_ids)
+                    if self.relation_chunks:
+                        await self.relation_chunks.delete(
+                            [make_relation_chunk_key(src, tgt) for src, tgt in pairs]
+                        )
+
+            # 7. Delete relationships that have no remaining sources
+            if relationships_to_delete:
+                try:
+                    relation_list = sorted(relationships_to_delete)
+                    await delete_relations(relation_list)
+                    for pairs in batches(relation_list):
+                        await self.chunk_entity_relation_graph.remove_edges(pairs)
+                except Exception as e:
+                    logger.error(f"Failed to delete relationships: {e}")
+                    raise Exception(f"Failed to delete relationships: {e}") from e
+                await log_status(
+                    f"Successfully deleted {len(relationships_to_delete)} relations"
+                )
+
+            # 8. Delete entities that have no remaining sources
+            if entities_to_delete:
+                try:
+                    entity_list = sorted(entities_to_delete)
+                    residual_edges = set()
+                    for names in batches(entity_list):
+                        nodes_edges = await self.chunk_entity_relation_graph.get_nodes_edges_batch(
+                            names
+                        )
+                        for edges in nodes_edges.values():
+                            for src, tgt in edges or []:
+                                residual_edges.add(tuple(sorted((src, tgt))))
+                    if residual_edges:
+                        # Clean residual edges from VDB and chunk tracking before deleting nodes
+                        logger.warning(
+                            f"{len(residual_edges)} edges still attached to deleted entities"
+                        )
+                        await delete_relations(sorted(residual_edges))
+
+                    # Edges are deleted together with their nodes
+                    for names in batches(entity_list):
+                        await self.chunk_entity_relation_graph.remove_nodes(names)
+                        await self.entities_vdb.delete(
+                            [compute_mdhash_id(name, prefix="ent-") for name in names]
+                        )
+                        if self.entity_chunks:
+                            await self.entity_chunks.delete(names)
+                except Exception as e:
+                    logger.error(f"Failed to delete entities: {e}")
+                    raise Exception(f"Failed to delete entities: {e}") from e
+                await log_status(
+                    f"Successfully deleted {len(entities_to_delete)} entities"
+                )
+
+            # 9. One consolidated rebuild for all documents
+            if entities_to_rebuild or relationships_to_rebuild:
+                await log_phase(
+                    3,
+                    f"rebuilding {len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relations",
+                )
+                try:
+                    await rebuild_knowledge_from_chunks(
+                        entities_to_rebuild=entities_to_rebuild,
+                        relationships_to_rebuild=relationships_to_rebuild,
+                        knowledge_graph_inst=self.chunk_entity_relation_graph,
+                        entities_vdb=self.entities_vdb,
+                        relationships_vdb=self.relationships_vdb,
+                        text_chunks_storage=self.text_chunks,
+                        llm_response_cache=self.llm_response_cache,
+                        global_config=asdict(self),
+                        pipeline_status=pipeline_status,
+                        pipeline_status_lock=pipeline_status_lock,
+                        entity_chunks_storage=self.entity_chunks,
+                        relation_chunks_storage=self.relation_chunks,
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to rebuild knowledge from chunks: {e}")
+                    raise Exception(f"Failed to rebuild knowledge graph: {e}") from e
+
+            # 10. Delete entity/relation indexes, documents and statuses
+            try:
+                for ids in batches(found_doc_ids):
+                    await self.full_entities.delete(ids)
+                    await self.full_relations.delete(ids)
+                    await self.full_docs.delete(ids)
+                    await self.doc_status.delete(ids)
+            except Exception as e:
+                logger.error(f"Failed to delete documents and statuses: {e}")
+                raise Exception(f"Failed to delete documents and statuses: {e}") from e
+
+            if doc_llm_cache_ids:
+                try:
+                    for ids in batches(doc_llm_cache_ids):
+                        await self.llm_response_cache.delete(ids)
+                    await invalidate_llm_cache_memory_tier(
+                        self.llm_response_cache, doc_llm_cache_ids
+                    )
+                    await log_status(
+                        f"Successfully deleted {len(doc_llm_cache_ids)} LLM cache entries"
+                    )
+                except Exception as cache_delete_error:
+                    await log_status(
+                        f"Failed to delete LLM cache entries: {cache_delete_error}",
+                        "error",
+                    )
+
+            for doc_id in found_doc_ids:
+                results[doc_id] = DeletionResult(
+                    status="success",
+                    doc_id=doc_id,
+                    message=f"Document {doc_id} deleted with {len(doc_chunk_ids[doc_id])} chunks",
+                    status_code=200,
+                    file_path=file_paths[doc_id],
+                )
+
+        except Exception as e:
+            error_message = f"Error while deleting {len(doc_ids)} documents: {e}"
+            logger.error(error_message)
+            logger.error(traceback.format_exc())
+            for doc_id in doc_ids:
+                if doc_id not in results:
+                    results[doc_id] = DeletionResult(
+                        status="fail",
+                        doc_id=doc_id,
+                        message=error_message,
+                        status_code=500,
+                        file_path=file_paths.get(doc_id),
+                    )
+
+        finally:
+            # Persist all storages once for the whole batch
+            if deletion_operations_started:
+                try:
+                    await log_phase(4, "persisting storages")
+                    await self._insert_done()
+                except Exception as persistence_error:
+                    persistence_error_msg = f"Failed to persist data after bulk deletion: {persistence_error}"
+                    logger.error(persistence_error_msg)
+                    logger.error(traceback.format_exc())
+                    for doc_id, result in results.items():
+                        if result.status == "success":
+                            results[doc_id] = DeletionResult(
+                                status="fail",
+                                doc_id=doc_id,
+                                message=f"Deletion completed but failed to persist changes: {persistence_error}",
+                                status_code=500,
+                                file_path=result.file_path,
+                            )
+
+            if we_acquired_pipeline:
+                async with pipeline_status_lock:
+                    pipeline_status["busy"] = False
+                    pipeline_status["cancellation_requested"] = False
+                    completion_msg = (
+                        f"Bulk deletion completed for {len(doc_ids)} documents"
+                    )
+                    pipeline_status["latest_message"] = completion_msg
+                    pipeline_status["history_messages"].append(completion_msg)
+                    logger.info(completion_msg)
+
+        return [results[doc_id] for doc_id in doc_ids]
+
     async def adelete_by_entity(self, entity_name: str) -> DeletionResult:
         """Asynchronously delete an entity and all its relationships.
 
@@ -3978,20 +4914,23 @@ class LightRAG:
     async def aexport_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "excel", "md", "txt", "jsonl", "parquet"] = "csv",
         include_vector_data: bool = False,
+        batch_size: int = 1000,
     ) -> None:
         """
         Asynchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
+            file_format: Output format - "csv", "excel", "md", "txt", "jsonl", "parquet".
                 - csv: Comma-separated values file
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
-                - table: Print formatted tables to console
+                - jsonl: One JSON object per line with a "type" field
+                - parquet: Apache Parquet file with a "type" column (requires pyarrow)
             include_vector_data: Whether to include data from the vector database.
+            batch_size: Number of graph records fetched and written per page.
         """
         from lightrag.utils import aexport_data as utils_aexport_data
 
@@ -4002,25 +4941,29 @@ class LightRAG:
             output_path,
             file_format,
             include_vector_data,
+            batch_size,
         )
 
     def export_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "excel", "md", "txt", "jsonl", "parquet"] = "csv",
         include_vector_data: bool = False,
+        batch_size: int = 1000,
     ) -> None:
         """
         Synchronously exports all entities, relations, and relationships to various formats.
         Args:
             output_path: The path to the output file (including extension).
-            file_format: Output format - "csv", "excel", "md", "txt".
+            file_format: Output format - "csv", "excel", "md", "txt", "jsonl", "parquet".
                 - csv: Comma-separated values file
                 - excel: Microsoft Excel file with multiple sheets
                 - md: Markdown tables
                 - txt: Plain text formatted output
-                - table: Print formatted tables to console
+                - jsonl: One JSON object per line with a "type" field
+                - parquet: Apache Parquet file with a "type" column (requires pyarrow)
             include_vector_data: Whether to include data from the vector database.
+            batch_size: Number of graph records fetched and written per page.
         """
         try:
             loop = asyncio.get_event_loop()
@@ -4029,5 +4972,5 @@ class LightRAG:
             asyncio.set_event_loop(loop)
 
         loop.run_until_complete(
-            self.aexport_data(output_path, file_format, include_vector_data)
+            self.aexport_data(output_path, file_format, include_vector_data, batch_size)
         )
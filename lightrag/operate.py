@@ -4,9 +4,11 @@ from pathlib import Path
 
 import asyncio
 import json
+from bisect import bisect_left
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
+from typing import Any, AsyncIterator, Callable, overload, Literal
 from collections import Counter, defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from lightrag.exceptions import (
     PipelineCancelledException,
@@ -26,7 +28,7 @@ from lightrag.utils import (
     save_to_cache,
     CacheData,
     use_llm_func_with_cache,
-    update_chunk_cache_list,
+    update_chunk_cache_lists,
     remove_think_tags,
     pick_by_weighted_polling,
     pick_by_vector_similarity,
@@ -39,6 +41,8 @@ from lightrag.utils import (
     apply_source_ids_limit,
     merge_source_ids,
     make_relation_chunk_key,
+    QueryContextCache,
+    QueryEmbeddingCache,
 )
 from lightrag.base import (
     BaseGraphStorage,
@@ -64,8 +68,9 @@ from lightrag.constants import (
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
+    DEFAULT_REBUILD_BATCH_SIZE,
 )
-from lightrag.kg.shared_storage import get_storage_keyed_lock
+from lightrag.kg.shared_storage import get_data_version, get_storage_keyed_lock
 import time
 from dotenv import load_dotenv
 
@@ -104,6 +109,101 @@ def chunking_by_token_size(
     chunk_overlap_token_size: int = 100,
     chunk_token_size: int = 1200,
 ) -> list[dict[str, Any]]:
+    """Split content into token-bounded chunks.
+
+    The document is tokenized once and every token is mapped back to its character
+    offset, so chunks are cut by slicing the original string instead of decoding
+    (overlapping) token windows. Tokenizers that cannot provide character offsets
+    fall back to the decode-based implementation.
+    """
+    encoded = tokenizer.encode_with_offsets(content)
+    if encoded is None:
+        return _chunking_by_token_size_decode(
+            tokenizer,
+            content,
+            split_by_character=split_by_character,
+            split_by_character_only=split_by_character_only,
+            chunk_overlap_token_size=chunk_overlap_token_size,
+            chunk_token_size=chunk_token_size,
+        )
+
+    tokens, offsets = encoded
+    total_tokens = len(tokens)
+    step = chunk_token_size - chunk_overlap_token_size
+    results: list[dict[str, Any]] = []
+
+    if split_by_character:
+        # Character spans equivalent to content.split(split_by_character)
+        spans: list[tuple[int, int]] = []
+        sep_len = len(split_by_character)
+        span_start = 0
+        while True:
+            sep_pos = content.find(split_by_character, span_start)
+            if sep_pos == -1:
+                spans.append((span_start, len(content)))
+                break
+            spans.append((span_start, sep_pos))
+            span_start = sep_pos + sep_len
+
+        new_chunks = []
+        token_cursor = 0
+        for span_start, span_end in spans:
+            # Tokens that start inside the span belong to it
+            first = bisect_left(offsets, span_start, token_cursor, total_tokens)
+            last = bisect_left(offsets, span_end, first, total_tokens)
+            token_cursor = last
+            span_tokens = last - first
+            if span_tokens > chunk_token_size:
+                if split_by_character_only:
+                    chunk = content[span_start:span_end]
+                    logger.warning(
+                        "Chunk split_by_character exceeds token limit: len=%d limit=%d",
+                        span_tokens,
+                        chunk_token_size,
+                    )
+                    raise ChunkTokenLimitExceededError(
+                        chunk_tokens=span_tokens,
+                        chunk_token_limit=chunk_token_size,
+                        chunk_preview=chunk[:120],
+                    )
+                for start in range(first, last, step):
+                    end = min(start + chunk_token_size, last)
+                    chunk_content = content[
+                        max(offsets[start], span_start) : min(offsets[end], span_end)
+                    ]
+                    new_chunks.append((end - start, chunk_content))
+            else:
+                new_chunks.append((span_tokens, content[span_start:span_end]))
+        for index, (_len, chunk) in enumerate(new_chunks):
+            results.append(
+                {
+                    "tokens": _len,
+                    "content": chunk.strip(),
+                    "chunk_order_index": index,
+                }
+            )
+    else:
+        for index, start in enumerate(range(0, total_tokens, step)):
+            end = min(start + chunk_token_size, total_tokens)
+            results.append(
+                {
+                    "tokens": end - start,
+                    "content": content[offsets[start] : offsets[end]].strip(),
+                    "chunk_order_index": index,
+                }
+            )
+    return results
+
+
+def _chunking_by_token_size_decode(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    chunk_overlap_token_size: int = 100,
+    chunk_token_size: int = 1200,
+) -> list[dict[str, Any]]:
+    """Decode-based chunking for tokenizers without character offset support."""
     tokens = tokenizer.encode(content)
     results: list[dict[str, Any]] = []
     if split_by_character:
@@ -208,7 +308,7 @@ async def _handle_entity_relation_summary(
     # Iterative map-reduce process
     while True:
         # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        total_tokens = sum(tokenizer.count_tokens(desc) for desc in current_list)
 
         # If total length is within limits, perform final summarization
         if total_tokens <= summary_context_size or len(current_list) <= 2:
@@ -242,7 +342,7 @@ async def _handle_entity_relation_summary(
 
         # Currently least 3 descriptions in current_list
         for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
+            desc_tokens = tokenizer.count_tokens(desc)
 
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
@@ -376,6 +476,155 @@ async def _summarize_descriptions(
     return summary
 
 
+async def _handle_bucketed_summary(
+    description_type: str,
+    entity_or_relation_name: str,
+    stored_record: dict | None,
+    already_description: list[str],
+    existing_chunk_ids: list[str],
+    new_descriptions: list[tuple[str | None, str]],
+    full_chunk_ids: list[str],
+    global_config: dict,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> tuple[str, bool, list[dict]]:
+    """Summarize descriptions hierarchically with partial summaries kept per bucket.
+
+    Source chunks are assigned, in arrival order, to buckets of at most
+    ``summary_bucket_size`` chunks. A bucket's id derives from its first chunk, so it stays
+    stable as chunks are appended. Each bucket keeps a partial summary of its descriptions.
+    Only buckets that received new descriptions are re-summarized (their partial summary
+    plus the new descriptions). The root description is then updated from the changed
+    bucket summaries only: the previous summaries of those buckets are dropped from it and
+    the new ones appended, and the LLM condenses the root only when it crosses the summary
+    threshold. The cost of a merge thus grows with the new data instead of the number of
+    buckets or the full description history.
+
+    Buckets are discarded, and the current description becomes the first bucket, whenever
+    the stored ``summary_digest`` no longer matches the current description (entity edited,
+    merged or rebuilt since the buckets were written).
+
+    Args:
+        stored_record: Chunk tracking record of the entity or relation
+        already_description: Current description split by GRAPH_FIELD_SEP
+        existing_chunk_ids: Source chunk ids known before this merge
+        new_descriptions: (chunk_id, description) pairs to merge, in description order
+        full_chunk_ids: All source chunk ids after this merge
+
+    Returns:
+        Tuple of (final_description, llm_was_used, summary_buckets)
+    """
+    bucket_size = max(1, int(global_config.get("summary_bucket_size") or 1))
+
+    buckets: list[dict] = []
+    if (
+        stored_record
+        and stored_record.get("summary_buckets")
+        and stored_record.get("summary_digest")
+        == compute_mdhash_id(GRAPH_FIELD_SEP.join(already_description))
+    ):
+        buckets = [
+            {
+                "id": bucket["id"],
+                "chunk_ids": list(bucket.get("chunk_ids", [])),
+                "summary": bucket.get("summary", ""),
+            }
+            for bucket in stored_record["summary_buckets"]
+        ]
+    elif already_description:
+        # Descriptions merged before bucketing was enabled form the first bucket
+        first_chunk = existing_chunk_ids[0] if existing_chunk_ids else "legacy"
+        buckets.append(
+            {
+                "id": compute_mdhash_id(first_chunk, prefix="bkt-"),
+                "chunk_ids": list(existing_chunk_ids),
+                "summary": GRAPH_FIELD_SEP.join(already_description),
+            }
+        )
+
+    bucket_of_chunk = {
+        chunk_id: bucket for bucket in buckets for chunk_id in bucket["chunk_ids"]
+    }
+    new_by_chunk: dict[str | None, list[str]] = defaultdict(list)
+    for chunk_id, description in new_descriptions:
+        new_by_chunk[chunk_id].append(description)
+
+    # Assign unseen chunks to the open bucket, opening a new one when it is full
+    for chunk_id in full_chunk_ids:
+        if chunk_id in bucket_of_chunk:
+            continue
+        if not buckets or len(buckets[-1]["chunk_ids"]) >= bucket_size:
+            buckets.append(
+                {
+                    "id": compute_mdhash_id(chunk_id, prefix="bkt-"),
+                    "chunk_ids": [],
+                    "summary": "",
+                }
+            )
+        buckets[-1]["chunk_ids"].append(chunk_id)
+        bucket_of_chunk[chunk_id] = buckets[-1]
+
+    if new_by_chunk and not buckets:
+        buckets.append({"id": "bkt-unsourced", "chunk_ids": [], "summary": ""})
+
+    dirty: dict[str, tuple[dict, list[str]]] = {}
+    for chunk_id, descriptions in new_by_chunk.items():
+        bucket = bucket_of_chunk.get(chunk_id, buckets[-1])
+        dirty.setdefault(bucket["id"], (bucket, []))[1].extend(descriptions)
+
+    async def _summarize_bucket(bucket: dict, descriptions: list[str]) -> bool:
+        partial = bucket["summary"].split(GRAPH_FIELD_SEP) if bucket["summary"] else []
+        summary, llm_used = await _handle_entity_relation_summary(
+            description_type,
+            entity_or_relation_name,
+            list(dict.fromkeys(partial + descriptions)),
+            GRAPH_FIELD_SEP,
+            global_config,
+            llm_response_cache,
+        )
+        bucket["summary"] = summary
+        return llm_used
+
+    previous_summaries = {
+        bucket_id: bucket["summary"] for bucket_id, (bucket, _) in dirty.items()
+    }
+    bucket_llm_used = await asyncio.gather(
+        *(_summarize_bucket(bucket, descs) for bucket, descs in dirty.values())
+    )
+    changed = [
+        bucket
+        for bucket_id, (bucket, _) in dirty.items()
+        if bucket["summary"] != previous_summaries[bucket_id]
+    ]
+
+    # The current description is the root over the buckets as they were before this merge
+    if already_description and not changed:
+        logger.debug(
+            f"Bucketed summary for {entity_or_relation_name}: bucket summaries unchanged"
+        )
+        return GRAPH_FIELD_SEP.join(already_description), any(bucket_llm_used), buckets
+
+    # Fold only the changed buckets into the root: stale fragments of their previous
+    # summaries are dropped, and the LLM runs only once the root crosses the summary
+    # threshold, as for a plain merge
+    root_fragments = list(already_description)
+    for bucket in changed:
+        for fragment in previous_summaries[bucket["id"]].split(GRAPH_FIELD_SEP):
+            if fragment in root_fragments:
+                root_fragments.remove(fragment)
+    description, root_llm_used = await _handle_entity_relation_summary(
+        description_type,
+        entity_or_relation_name,
+        list(dict.fromkeys(root_fragments + [bucket["summary"] for bucket in changed])),
+        GRAPH_FIELD_SEP,
+        global_config,
+        llm_response_cache,
+    )
+    logger.debug(
+        f"Bucketed summary for {entity_or_relation_name}: {len(changed)}/{len(buckets)} buckets folded into root"
+    )
+    return description, any(bucket_llm_used) or root_llm_used, buckets
+
+
 async def _handle_single_entity_extraction(
     record_attributes: list[str],
     chunk_key: str,
@@ -544,11 +793,15 @@ async def rebuild_knowledge_from_chunks(
     entity_chunks_storage: BaseKVStorage | None = None,
     relation_chunks_storage: BaseKVStorage | None = None,
 ) -> None:
-    """Rebuild entity and relationship descriptions from cached extraction results with parallel processing
+    """Rebuild entity and relationship descriptions from cached extraction results in batches
 
     This method uses cached LLM extraction results instead of calling LLM again,
-    following the same approach as the insert process. Now with parallel processing
-    controlled by llm_model_max_async and using get_storage_keyed_lock for data consistency.
+    following the same approach as the insert process. Affected keys are grouped into
+    batches of rebuild_batch_size: each batch locks its entities with
+    get_storage_keyed_lock, prefetches the graph state in bulk, rebuilds its entities or
+    relationships concurrently (bounded by llm_model_max_async) and writes the results
+    back with one batch call per storage. Entities and relationships whose source chunks
+    did not change are not re-summarized.
 
     Args:
         entities_to_rebuild: Dict mapping entity_name -> list of remaining chunk_ids
@@ -574,7 +827,7 @@ async def rebuild_knowledge_from_chunks(
     for chunk_ids in relationships_to_rebuild.values():
         all_referenced_chunk_ids.update(chunk_ids)
 
-    status_message = f"Rebuilding knowledge from {len(all_referenced_chunk_ids)} cached chunk extractions (parallel processing)"
+    status_message = f"Rebuilding knowledge from {len(all_referenced_chunk_ids)} cached chunk extractions"
     logger.info(status_message)
     if pipeline_status is not None and pipeline_status_lock is not None:
         async with pipeline_status_lock:
@@ -615,6 +868,7 @@ async def rebuild_knowledge_from_chunks(
                     chunk_id=chunk_id,
                     extraction_result=result[0],
                     timestamp=result[1],
+                    file_path=result[2],
                 )
 
                 # Merge entities and relationships from this extraction result
@@ -678,135 +932,203 @@ async def rebuild_knowledge_from_chunks(
     # Get max async tasks limit from global_config for semaphore control
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
+    batch_size = max(
+        1, int(global_config.get("rebuild_batch_size") or DEFAULT_REBUILD_BATCH_SIZE)
+    )
+    workspace = global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
 
     # Counters for tracking progress
     rebuilt_entities_count = 0
     rebuilt_relationships_count = 0
+    skipped_entities_count = 0
+    skipped_relationships_count = 0
     failed_entities_count = 0
     failed_relationships_count = 0
 
-    async def _locked_rebuild_entity(entity_name, chunk_ids):
-        nonlocal rebuilt_entities_count, failed_entities_count
+    async def _report_failure(status_message):
+        logger.info(status_message)  # Per requirement, change to info
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = status_message
+                pipeline_status["history_messages"].append(status_message)
+
+    async def _rebuild_entity(
+        entity_name, chunk_ids, graph, entity_vdb, chunks_kv
+    ) -> str:
         async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
-            ):
-                try:
-                    await _rebuild_single_entity(
-                        knowledge_graph_inst=knowledge_graph_inst,
-                        entities_vdb=entities_vdb,
-                        entity_name=entity_name,
-                        chunk_ids=chunk_ids,
-                        chunk_entities=chunk_entities,
-                        llm_response_cache=llm_response_cache,
-                        global_config=global_config,
-                        entity_chunks_storage=entity_chunks_storage,
-                    )
-                    rebuilt_entities_count += 1
-                except Exception as e:
-                    failed_entities_count += 1
-                    status_message = f"Failed to rebuild `{entity_name}`: {e}"
-                    logger.info(status_message)  # Per requirement, change to info
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-
-    async def _locked_rebuild_relationship(src, tgt, chunk_ids):
-        nonlocal rebuilt_relationships_count, failed_relationships_count
+            try:
+                rebuilt = await _rebuild_single_entity(
+                    knowledge_graph_inst=graph,
+                    entities_vdb=entity_vdb,
+                    entity_name=entity_name,
+                    chunk_ids=chunk_ids,
+                    chunk_entities=chunk_entities,
+                    llm_response_cache=llm_response_cache,
+                    global_config=global_config,
+                    entity_chunks_storage=chunks_kv,
+                )
+                return "rebuilt" if rebuilt else "skipped"
+            except Exception as e:
+                await _report_failure(f"Failed to rebuild `{entity_name}`: {e}")
+                return "failed"
+
+    async def _rebuild_relationship(
+        src, tgt, chunk_ids, graph, entity_vdb, relation_vdb, entity_kv, relation_kv
+    ) -> str:
         async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            # Sort src and tgt to ensure order-independent lock key generation
-            sorted_key_parts = sorted([src, tgt])
-            async with get_storage_keyed_lock(
-                sorted_key_parts,
-                namespace=namespace,
-                enable_logging=False,
-            ):
-                try:
-                    await _rebuild_single_relationship(
-                        knowledge_graph_inst=knowledge_graph_inst,
-                        relationships_vdb=relationships_vdb,
-                        entities_vdb=entities_vdb,
-                        src=src,
-                        tgt=tgt,
-                        chunk_ids=chunk_ids,
-                        chunk_relationships=chunk_relationships,
-                        llm_response_cache=llm_response_cache,
-                        global_config=global_config,
-                        relation_chunks_storage=relation_chunks_storage,
-                        entity_chunks_storage=entity_chunks_storage,
-                        pipeline_status=pipeline_status,
-                        pipeline_status_lock=pipeline_status_lock,
-                    )
-                    rebuilt_relationships_count += 1
-                except Exception as e:
-                    failed_relationships_count += 1
-                    status_message = f"Failed to rebuild `{src}`~`{tgt}`: {e}"
-                    logger.info(status_message)  # Per requirement, change to info
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-
-    # Create tasks for parallel processing
-    tasks = []
+            try:
+                rebuilt = await _rebuild_single_relationship(
+                    knowledge_graph_inst=graph,
+                    relationships_vdb=relation_vdb,
+                    entities_vdb=entity_vdb,
+                    src=src,
+                    tgt=tgt,
+                    chunk_ids=chunk_ids,
+                    chunk_relationships=chunk_relationships,
+                    llm_response_cache=llm_response_cache,
+                    global_config=global_config,
+                    relation_chunks_storage=relation_kv,
+                    entity_chunks_storage=entity_kv,
+                )
+                return "rebuilt" if rebuilt else "skipped"
+            except Exception as e:
+                await _report_failure(f"Failed to rebuild `{src}`~`{tgt}`: {e}")
+                return "failed"
 
-    # Add entity rebuilding tasks
-    for entity_name, chunk_ids in entities_to_rebuild.items():
-        task = asyncio.create_task(_locked_rebuild_entity(entity_name, chunk_ids))
-        tasks.append(task)
+    async def _rebuild_batch(
+        entity_names: list[str], relation_keys: list[tuple[str, str]]
+    ) -> Counter:
+        """Rebuild one batch against prefetched storage views, then write it back in bulk
 
-    # Add relationship rebuilding tasks
-    for (src, tgt), chunk_ids in relationships_to_rebuild.items():
-        task = asyncio.create_task(_locked_rebuild_relationship(src, tgt, chunk_ids))
-        tasks.append(task)
+        Returns the count of rebuilt/skipped/failed keys, which only holds once the
+        batch has been written back.
+        """
+        node_ids = set(entity_names)
+        for src, tgt in relation_keys:
+            node_ids.update((src, tgt))
+        node_ids = sorted(node_ids)
+
+        async with get_storage_keyed_lock(
+            node_ids, namespace=namespace, enable_logging=False
+        ):
+            graph_view = _BatchMergeGraph(knowledge_graph_inst)
+            await graph_view.prefetch(node_ids, relation_keys)
+            entity_chunks_view = (
+                _BatchMergeKV(entity_chunks_storage)
+                if entity_chunks_storage is not None
+                else None
+            )
+            relation_chunks_view = (
+                _BatchMergeKV(relation_chunks_storage)
+                if relation_chunks_storage is not None
+                else None
+            )
+            entities_vdb_view = _BatchMergeVDB(entities_vdb)
+            relationships_vdb_view = _BatchMergeVDB(relationships_vdb)
+
+            tasks = [
+                asyncio.create_task(
+                    _rebuild_entity(
+                        entity_name,
+                        entities_to_rebuild[entity_name],
+                        graph_view,
+                        entities_vdb_view,
+                        entity_chunks_view,
+                    )
+                )
+                for entity_name in entity_names
+            ]
+            tasks.extend(
+                asyncio.create_task(
+                    _rebuild_relationship(
+                        src,
+                        tgt,
+                        relationships_to_rebuild[(src, tgt)],
+                        graph_view,
+                        entities_vdb_view,
+                        relationships_vdb_view,
+                        entity_chunks_view,
+                        relation_chunks_view,
+                    )
+                )
+                for src, tgt in relation_keys
+            )
 
-    # Log parallel processing start
-    status_message = f"Starting parallel rebuild of {len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relationships (async: {graph_max_async})"
+            # Rebuild failures are reported by the tasks, anything escaping
+            # (e.g. cancellation) aborts the whole rebuild
+            done, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_EXCEPTION
+            )
+            first_exception = None
+            for task in done:
+                exception = task.exception()
+                if exception is not None and first_exception is None:
+                    first_exception = exception
+            if first_exception is not None:
+                for pending_task in pending:
+                    pending_task.cancel()
+                if pending:
+                    await asyncio.wait(pending)
+                raise first_exception
+
+            await graph_view.flush()
+            for view in (entity_chunks_view, relation_chunks_view):
+                if view is not None:
+                    await view.flush()
+            await entities_vdb_view.flush("rebuild_entity_upsert")
+            await relationships_vdb_view.flush("rebuild_relationship_upsert")
+            return Counter(task.result() for task in tasks)
+
+    # Entities first, then relationships, each in sorted batches so that
+    # neighbouring keys share prefetches and bulk writes
+    batches = []
+    entity_names = sorted(entities_to_rebuild)
+    for start in range(0, len(entity_names), batch_size):
+        batches.append((entity_names[start : start + batch_size], []))
+    relation_keys = sorted(relationships_to_rebuild)
+    for start in range(0, len(relation_keys), batch_size):
+        batches.append(([], relation_keys[start : start + batch_size]))
+
+    status_message = f"Starting batched rebuild of {len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relationships ({len(batches)} batches of up to {batch_size}, async: {graph_max_async})"
     logger.info(status_message)
     if pipeline_status is not None and pipeline_status_lock is not None:
         async with pipeline_status_lock:
             pipeline_status["latest_message"] = status_message
             pipeline_status["history_messages"].append(status_message)
 
-    # Execute all tasks in parallel with semaphore control and early failure detection
-    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
-
-    # Check if any task raised an exception and ensure all exceptions are retrieved
-    first_exception = None
-
-    for task in done:
+    for batch_index, (batch_entities, batch_relations) in enumerate(batches, 1):
         try:
-            exception = task.exception()
-            if exception is not None:
-                if first_exception is None:
-                    first_exception = exception
-            else:
-                # Task completed successfully, retrieve result to mark as processed
-                task.result()
+            outcomes = await _rebuild_batch(batch_entities, batch_relations)
         except Exception as e:
-            if first_exception is None:
-                first_exception = e
-
-    # If any task failed, cancel all pending tasks and raise the first exception
-    if first_exception is not None:
-        # Cancel all pending tasks
-        for pending_task in pending:
-            pending_task.cancel()
-
-        # Wait for cancellation to complete
-        if pending:
-            await asyncio.wait(pending)
-
-        # Re-raise the first exception to notify the caller
-        raise first_exception
+            # Nothing of a failed batch was committed, so every key in it failed
+            failed_entities_count += len(batch_entities)
+            failed_relationships_count += len(batch_relations)
+            status_message = (
+                f"Failed to write rebuild batch {batch_index}/{len(batches)}: {e}"
+            )
+            logger.error(status_message)
+        else:
+            if batch_entities:
+                rebuilt_entities_count += outcomes["rebuilt"]
+                skipped_entities_count += outcomes["skipped"]
+                failed_entities_count += outcomes["failed"]
+            else:
+                rebuilt_relationships_count += outcomes["rebuilt"]
+                skipped_relationships_count += outcomes["skipped"]
+                failed_relationships_count += outcomes["failed"]
+            kind = "entities" if batch_entities else "relationships"
+            status_message = f"Rebuilt batch {batch_index}/{len(batches)}: {len(batch_entities) or len(batch_relations)} {kind}"
+            logger.info(status_message)
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = status_message
+                pipeline_status["history_messages"].append(status_message)
 
     # Final status report
     status_message = f"KG rebuild completed: {rebuilt_entities_count} entities and {rebuilt_relationships_count} relationships rebuilt successfully."
+    if skipped_entities_count > 0 or skipped_relationships_count > 0:
+        status_message += f" Unchanged: {skipped_entities_count} entities, {skipped_relationships_count} relationships."
     if failed_entities_count > 0 or failed_relationships_count > 0:
         status_message += f" Failed: {failed_entities_count} entities, {failed_relationships_count} relationships."
 
@@ -835,9 +1157,10 @@ async def _get_cached_extraction_results(
         text_chunks_storage: Text chunks storage for retrieving chunk data and LLM cache references
 
     Returns:
-        Dict mapping chunk_id -> list of extraction_result_text, where:
+        Dict mapping chunk_id -> list of (extraction_result, create_time, file_path), where:
         - Keys (chunk_ids) are ordered by the create_time of their first extraction result
         - Values (extraction results) are ordered by create_time within each chunk
+        - file_path comes from the chunk data read in the same batch
     """
     cached_results = {}
 
@@ -845,9 +1168,12 @@ async def _get_cached_extraction_results(
     all_cache_ids = set()
 
     # Read from storage
-    chunk_data_list = await text_chunks_storage.get_by_ids(list(chunk_ids))
-    for chunk_data in chunk_data_list:
+    chunk_file_paths = {}
+    chunk_id_list = list(chunk_ids)
+    chunk_data_list = await text_chunks_storage.get_by_ids(chunk_id_list)
+    for chunk_id, chunk_data in zip(chunk_id_list, chunk_data_list):
         if chunk_data and isinstance(chunk_data, dict):
+            chunk_file_paths[chunk_id] = chunk_data.get("file_path", "unknown_source")
             llm_cache_list = chunk_data.get("llm_cache_list", [])
             if llm_cache_list:
                 all_cache_ids.update(llm_cache_list)
@@ -881,7 +1207,13 @@ async def _get_cached_extraction_results(
             if chunk_id not in cached_results:
                 cached_results[chunk_id] = []
             # Store tuple with extraction result and creation time for sorting
-            cached_results[chunk_id].append((extraction_result, create_time))
+            cached_results[chunk_id].append(
+                (
+                    extraction_result,
+                    create_time,
+                    chunk_file_paths.get(chunk_id, "unknown_source"),
+                )
+            )
 
     # Sort extraction results by create_time for each chunk and collect earliest times
     chunk_earliest_times = {}
@@ -904,7 +1236,7 @@ async def _get_cached_extraction_results(
     logger.info(
         f"Found {valid_entries} valid cache entries, {len(sorted_cached_results)} chunks with results"
     )
-    return sorted_cached_results  # each item: list(extraction_result, create_time)
+    return sorted_cached_results  # each item: list(extraction_result, create_time, file_path)
 
 
 async def _process_extraction_result(
@@ -1037,6 +1369,7 @@ async def _rebuild_from_extraction_result(
     extraction_result: str,
     chunk_id: str,
     timestamp: int,
+    file_path: str | None = None,
 ) -> tuple[dict, dict]:
     """Parse cached extraction result using the same logic as extract_entities
 
@@ -1044,18 +1377,20 @@ async def _rebuild_from_extraction_result(
         text_chunks_storage: Text chunks storage to get chunk data
         extraction_result: The cached LLM extraction result
         chunk_id: The chunk ID for source tracking
+        file_path: File path of the chunk, read from text_chunks_storage when omitted
 
     Returns:
         Tuple of (entities_dict, relationships_dict)
     """
 
-    # Get chunk data for file_path from storage
-    chunk_data = await text_chunks_storage.get_by_id(chunk_id)
-    file_path = (
-        chunk_data.get("file_path", "unknown_source")
-        if chunk_data
-        else "unknown_source"
-    )
+    if file_path is None:
+        # Get chunk data for file_path from storage
+        chunk_data = await text_chunks_storage.get_by_id(chunk_id)
+        file_path = (
+            chunk_data.get("file_path", "unknown_source")
+            if chunk_data
+            else "unknown_source"
+        )
 
     # Call the shared processing function
     return await _process_extraction_result(
@@ -1079,13 +1414,17 @@ async def _rebuild_single_entity(
     entity_chunks_storage: BaseKVStorage | None = None,
     pipeline_status: dict | None = None,
     pipeline_status_lock=None,
-) -> None:
-    """Rebuild a single entity from cached extraction results"""
+) -> bool:
+    """Rebuild a single entity from cached extraction results
+
+    Returns False without re-summarizing when the entity is missing or its limited
+    source chunks (and therefore its cached descriptions) are unchanged.
+    """
 
     # Get current entity data
     current_entity = await knowledge_graph_inst.get_node(entity_name)
     if not current_entity:
-        return
+        return False
 
     # Helper function to update entity in both graph and vector storage
     async def _update_entity_storage(
@@ -1178,7 +1517,7 @@ async def _rebuild_single_entity(
         edges = await knowledge_graph_inst.get_node_edges(entity_name)
         if not edges:
             logger.warning(f"No relations attached to entity `{entity_name}`")
-            return
+            return False
 
         # Collect relationship data to extract entity information
         relationship_descriptions = []
@@ -1218,7 +1557,23 @@ async def _rebuild_single_entity(
             file_paths,
             limited_chunk_ids,
         )
-        return
+        return True
+
+    if len(limited_chunk_ids) < len(normalized_chunk_ids):
+        truncation_info = (
+            f"{limit_method} {len(limited_chunk_ids)}/{len(normalized_chunk_ids)}"
+        )
+    else:
+        truncation_info = ""
+
+    if _has_same_source_ids(current_entity, limited_chunk_ids):
+        # Same source chunks yield the same cached descriptions: skip the summary
+        if current_entity.get("truncate", "") != truncation_info:
+            await knowledge_graph_inst.upsert_node(
+                entity_name, {**current_entity, "truncate": truncation_info}
+            )
+        logger.debug(f"Rebuild `{entity_name}` skipped: source chunks unchanged")
+        return False
 
     # Process cached entity data
     descriptions = []
@@ -1284,13 +1639,6 @@ async def _rebuild_single_entity(
     else:
         final_description = current_entity.get("description", "")
 
-    if len(limited_chunk_ids) < len(normalized_chunk_ids):
-        truncation_info = (
-            f"{limit_method} {len(limited_chunk_ids)}/{len(normalized_chunk_ids)}"
-        )
-    else:
-        truncation_info = ""
-
     await _update_entity_storage(
         final_description,
         entity_type,
@@ -1309,6 +1657,7 @@ async def _rebuild_single_entity(
         async with pipeline_status_lock:
             pipeline_status["latest_message"] = status_message
             pipeline_status["history_messages"].append(status_message)
+    return True
 
 
 async def _rebuild_single_relationship(
@@ -1325,9 +1674,12 @@ async def _rebuild_single_relationship(
     entity_chunks_storage: BaseKVStorage | None = None,
     pipeline_status: dict | None = None,
     pipeline_status_lock=None,
-) -> None:
+) -> bool:
     """Rebuild a single relationship from cached extraction results
 
+    Returns False without re-summarizing when the relationship is missing, has no
+    cached data or its limited source chunks are unchanged.
+
     Note: This function assumes the caller has already acquired the appropriate
     keyed lock for the relationship pair to ensure thread safety.
     """
@@ -1335,7 +1687,7 @@ async def _rebuild_single_relationship(
     # Get current relationship data
     current_relationship = await knowledge_graph_inst.get_edge(src, tgt)
     if not current_relationship:
-        return
+        return False
 
     # normalized_chunk_ids = merge_source_ids([], chunk_ids)
     normalized_chunk_ids = chunk_ids
@@ -1374,7 +1726,23 @@ async def _rebuild_single_relationship(
 
     if not all_relationship_data:
         logger.warning(f"No relation data found for `{src}-{tgt}`")
-        return
+        return False
+
+    if len(limited_chunk_ids) < len(normalized_chunk_ids):
+        truncation_info = (
+            f"{limit_method} {len(limited_chunk_ids)}/{len(normalized_chunk_ids)}"
+        )
+    else:
+        truncation_info = ""
+
+    if _has_same_source_ids(current_relationship, limited_chunk_ids):
+        # Same source chunks yield the same cached descriptions: skip the summary
+        if current_relationship.get("truncate", "") != truncation_info:
+            await knowledge_graph_inst.upsert_edge(
+                src, tgt, {**current_relationship, "truncate": truncation_info}
+            )
+        logger.debug(f"Rebuild `{src}`~`{tgt}` skipped: source chunks unchanged")
+        return False
 
     # Merge descriptions and keywords
     descriptions = []
@@ -1445,13 +1813,6 @@ async def _rebuild_single_relationship(
         # fallback to keep current(unchanged)
         final_description = current_relationship.get("description", "")
 
-    if len(limited_chunk_ids) < len(normalized_chunk_ids):
-        truncation_info = (
-            f"{limit_method} {len(limited_chunk_ids)}/{len(normalized_chunk_ids)}"
-        )
-    else:
-        truncation_info = ""
-
     # Update relationship in graph storage
     updated_relationship_data = {
         **current_relationship,
@@ -1588,6 +1949,13 @@ async def _rebuild_single_relationship(
         async with pipeline_status_lock:
             pipeline_status["latest_message"] = status_message
             pipeline_status["history_messages"].append(status_message)
+    return True
+
+
+def _has_same_source_ids(current: dict, chunk_ids: list[str]) -> bool:
+    """Whether a stored node/edge was built from exactly these source chunks"""
+    source_id = current.get("source_id") or ""
+    return bool(source_id) and set(source_id.split(GRAPH_FIELD_SEP)) == set(chunk_ids)
 
 
 async def _merge_nodes_then_upsert(
@@ -1618,6 +1986,7 @@ async def _merge_nodes_then_upsert(
     new_source_ids = [dp["source_id"] for dp in nodes_data if dp.get("source_id")]
 
     existing_full_source_ids = []
+    stored_chunks = None
     if entity_chunks_storage is not None:
         stored_chunks = await entity_chunks_storage.get_by_id(entity_name)
         if stored_chunks and isinstance(stored_chunks, dict):
@@ -1633,15 +2002,26 @@ async def _merge_nodes_then_upsert(
     # 2. Merging new source ids with existing ones
     full_source_ids = merge_source_ids(existing_full_source_ids, new_source_ids)
 
-    if entity_chunks_storage is not None and full_source_ids:
-        await entity_chunks_storage.upsert(
+    # With bucketed summaries the record is written together with the buckets (step 8)
+    use_summary_buckets = (
+        entity_chunks_storage is not None
+        and global_config.get("summary_bucket_size", 0) > 0
+    )
+    chunk_record = {"chunk_ids": full_source_ids, "count": len(full_source_ids)}
+    if use_summary_buckets and stored_chunks:
+        chunk_record.update(
             {
-                entity_name: {
-                    "chunk_ids": full_source_ids,
-                    "count": len(full_source_ids),
-                }
+                key: stored_chunks[key]
+                for key in ("summary_buckets", "summary_digest")
+                if key in stored_chunks
             }
         )
+    if (
+        entity_chunks_storage is not None
+        and full_source_ids
+        and not use_summary_buckets
+    ):
+        await entity_chunks_storage.upsert({entity_name: chunk_record})
 
     # 3. Finalize source_id by applying source ids limit
     limit_method = global_config.get("source_ids_limit_method")
@@ -1681,6 +2061,8 @@ async def _merge_nodes_then_upsert(
             logger.info(
                 f"Skipped `{entity_name}`: KEEP old chunks {already_source_ids}/{len(full_source_ids)}"
             )
+            if use_summary_buckets and full_source_ids:
+                await entity_chunks_storage.upsert({entity_name: chunk_record})
             existing_node_data = dict(already_node)
             return existing_node_data
         else:
@@ -1730,14 +2112,30 @@ async def _merge_nodes_then_upsert(
                 raise PipelineCancelledException("User cancelled during entity summary")
 
     # 8. Get summary description an LLM usage status
-    description, llm_was_used = await _handle_entity_relation_summary(
-        "Entity",
-        entity_name,
-        description_list,
-        GRAPH_FIELD_SEP,
-        global_config,
-        llm_response_cache,
-    )
+    if use_summary_buckets:
+        description, llm_was_used, summary_buckets = await _handle_bucketed_summary(
+            "Entity",
+            entity_name,
+            stored_chunks,
+            already_description,
+            existing_full_source_ids,
+            [(dp.get("source_id"), dp["description"]) for dp in sorted_nodes],
+            full_source_ids,
+            global_config,
+            llm_response_cache,
+        )
+        chunk_record["summary_buckets"] = summary_buckets
+        chunk_record["summary_digest"] = compute_mdhash_id(description)
+        await entity_chunks_storage.upsert({entity_name: chunk_record})
+    else:
+        description, llm_was_used = await _handle_entity_relation_summary(
+            "Entity",
+            entity_name,
+            description_list,
+            GRAPH_FIELD_SEP,
+            global_config,
+            llm_response_cache,
+        )
 
     # 9. Build file_path within MAX_FILE_PATHS
     file_paths_list = []
@@ -1931,6 +2329,7 @@ async def _merge_edges_then_upsert(
 
     storage_key = make_relation_chunk_key(src_id, tgt_id)
     existing_full_source_ids = []
+    stored_chunks = None
     if relation_chunks_storage is not None:
         stored_chunks = await relation_chunks_storage.get_by_id(storage_key)
         if stored_chunks and isinstance(stored_chunks, dict):
@@ -1946,15 +2345,26 @@ async def _merge_edges_then_upsert(
     # 2. Merge new source ids with existing ones
     full_source_ids = merge_source_ids(existing_full_source_ids, new_source_ids)
 
-    if relation_chunks_storage is not None and full_source_ids:
-        await relation_chunks_storage.upsert(
+    # With bucketed summaries the record is written together with the buckets (step 8)
+    use_summary_buckets = (
+        relation_chunks_storage is not None
+        and global_config.get("summary_bucket_size", 0) > 0
+    )
+    chunk_record = {"chunk_ids": full_source_ids, "count": len(full_source_ids)}
+    if use_summary_buckets and stored_chunks:
+        chunk_record.update(
             {
-                storage_key: {
-                    "chunk_ids": full_source_ids,
-                    "count": len(full_source_ids),
-                }
+                key: stored_chunks[key]
+                for key in ("summary_buckets", "summary_digest")
+                if key in stored_chunks
             }
         )
+    if (
+        relation_chunks_storage is not None
+        and full_source_ids
+        and not use_summary_buckets
+    ):
+        await relation_chunks_storage.upsert({storage_key: chunk_record})
 
     # 3. Finalize source_id by applying source ids limit
     limit_method = global_config.get("source_ids_limit_method")
@@ -1997,6 +2407,8 @@ async def _merge_edges_then_upsert(
             logger.info(
                 f"Skipped `{src_id}`~`{tgt_id}`: KEEP old chunks  {already_source_ids}/{len(full_source_ids)}"
             )
+            if use_summary_buckets and full_source_ids:
+                await relation_chunks_storage.upsert({storage_key: chunk_record})
             existing_edge_data = dict(already_edge)
             return existing_edge_data
         else:
@@ -2059,14 +2471,30 @@ async def _merge_edges_then_upsert(
                 )
 
     # 8. Get summary description an LLM usage status
-    description, llm_was_used = await _handle_entity_relation_summary(
-        "Relation",
-        f"({src_id}, {tgt_id})",
-        description_list,
-        GRAPH_FIELD_SEP,
-        global_config,
-        llm_response_cache,
-    )
+    if use_summary_buckets:
+        description, llm_was_used, summary_buckets = await _handle_bucketed_summary(
+            "Relation",
+            f"({src_id}, {tgt_id})",
+            stored_chunks,
+            already_description,
+            existing_full_source_ids,
+            [(dp.get("source_id"), dp["description"]) for dp in sorted_edges],
+            full_source_ids,
+            global_config,
+            llm_response_cache,
+        )
+        chunk_record["summary_buckets"] = summary_buckets
+        chunk_record["summary_digest"] = compute_mdhash_id(description)
+        await relation_chunks_storage.upsert({storage_key: chunk_record})
+    else:
+        description, llm_was_used = await _handle_entity_relation_summary(
+            "Relation",
+            f"({src_id}, {tgt_id})",
+            description_list,
+            GRAPH_FIELD_SEP,
+            global_config,
+            llm_response_cache,
+        )
 
     # 9. Build file_path within MAX_FILE_PATHS limit
     file_paths_list = []
@@ -2263,14 +2691,20 @@ async def _merge_edges_then_upsert(
                 and merged_full_source_ids != existing_full_source_ids
             ):
                 updated = True
-                await entity_chunks_storage.upsert(
-                    {
-                        need_insert_id: {
-                            "chunk_ids": merged_full_source_ids,
-                            "count": len(merged_full_source_ids),
+                chunk_record = {
+                    "chunk_ids": merged_full_source_ids,
+                    "count": len(merged_full_source_ids),
+                }
+                # Keep bucketed partial summaries, the description is unchanged
+                if stored_chunks and isinstance(stored_chunks, dict):
+                    chunk_record.update(
+                        {
+                            key: stored_chunks[key]
+                            for key in ("summary_buckets", "summary_digest")
+                            if key in stored_chunks
                         }
-                    }
-                )
+                    )
+                await entity_chunks_storage.upsert({need_insert_id: chunk_record})
 
             # 4. Apply source_ids limit for graph and vector db
             limit_method = global_config.get(
@@ -2395,79 +2829,32 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
-async def merge_nodes_and_edges(
-    chunk_results: list,
+async def _merge_entities_and_relations(
+    all_nodes: dict[str, list[dict]],
+    all_edges: dict[tuple[str, str], list[dict]],
     knowledge_graph_inst: BaseGraphStorage,
     entity_vdb: BaseVectorStorage,
     relationships_vdb: BaseVectorStorage,
     global_config: dict[str, str],
-    full_entities_storage: BaseKVStorage = None,
-    full_relations_storage: BaseKVStorage = None,
+    keyed_lock: Callable[[list[str]], Any],
     doc_id: str = None,
     pipeline_status: dict = None,
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     entity_chunks_storage: BaseKVStorage | None = None,
     relation_chunks_storage: BaseKVStorage | None = None,
-    current_file_number: int = 0,
-    total_files: int = 0,
-    file_path: str = "unknown_source",
-) -> None:
-    """Two-phase merge: process all entities first, then all relationships
-
-    This approach ensures data consistency by:
-    1. Phase 1: Process all entities concurrently
-    2. Phase 2: Process all relationships concurrently (may add missing entities)
-    3. Phase 3: Update full_entities and full_relations storage with final results
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Phase 1 and 2 of merge_nodes_and_edges: merge all entities, then all relationships
 
     Args:
-        chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
-        knowledge_graph_inst: Knowledge graph storage
-        entity_vdb: Entity vector database
-        relationships_vdb: Relationship vector database
-        global_config: Global configuration
-        full_entities_storage: Storage for document entity lists
-        full_relations_storage: Storage for document relation lists
-        doc_id: Document ID for storage indexing
-        pipeline_status: Pipeline status dictionary
-        pipeline_status_lock: Lock for pipeline status
-        llm_response_cache: LLM response cache
-        entity_chunks_storage: Storage tracking full chunk lists per entity
-        relation_chunks_storage: Storage tracking full chunk lists per relation
-        current_file_number: Current file number for logging
-        total_files: Total files for logging
-        file_path: File path for logging
-    """
-
-    # Check for cancellation at the start of merge
-    if pipeline_status is not None and pipeline_status_lock is not None:
-        async with pipeline_status_lock:
-            if pipeline_status.get("cancellation_requested", False):
-                raise PipelineCancelledException("User cancelled during merge phase")
-
-    # Collect all nodes and edges from all chunks
-    all_nodes = defaultdict(list)
-    all_edges = defaultdict(list)
-
-    for maybe_nodes, maybe_edges in chunk_results:
-        # Collect nodes
-        for entity_name, entities in maybe_nodes.items():
-            all_nodes[entity_name].extend(entities)
-
-        # Collect edges with sorted keys for undirected graph
-        for edge_key, edges in maybe_edges.items():
-            sorted_edge_key = tuple(sorted(edge_key))
-            all_edges[sorted_edge_key].extend(edges)
+        keyed_lock: Factory returning an async context manager that locks the given entity names
 
+    Returns:
+        Tuple of (processed_entities, processed_edges, entities_added_by_edges)
+    """
     total_entities_count = len(all_nodes)
     total_relations_count = len(all_edges)
 
-    log_message = f"Merging stage {current_file_number}/{total_files}: {file_path}"
-    logger.info(log_message)
-    async with pipeline_status_lock:
-        pipeline_status["latest_message"] = log_message
-        pipeline_status["history_messages"].append(log_message)
-
     # Get max async tasks limit from global_config for semaphore control
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
@@ -2489,11 +2876,7 @@ async def merge_nodes_and_edges(
                             "User cancelled during entity merge"
                         )
 
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
-            ):
+            async with keyed_lock([entity_name]):
                 try:
                     logger.debug(f"Processing entity {entity_name}")
                     entity_data = await _merge_nodes_then_upsert(
@@ -2590,15 +2973,9 @@ async def merge_nodes_and_edges(
                             "User cancelled during relation merge"
                         )
 
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
             sorted_edge_key = sorted([edge_key[0], edge_key[1]])
 
-            async with get_storage_keyed_lock(
-                sorted_edge_key,
-                namespace=namespace,
-                enable_logging=False,
-            ):
+            async with keyed_lock(sorted_edge_key):
                 try:
                     added_entities = []  # Track entities added during edge processing
 
@@ -2693,70 +3070,470 @@ async def merge_nodes_and_edges(
         if first_exception is not None:
             raise first_exception
 
-    # ===== Phase 3: Update full_entities and full_relations storage =====
-    if full_entities_storage and full_relations_storage and doc_id:
-        try:
-            # Merge all entities: original entities + entities added during edge processing
-            final_entity_names = set()
-
-            # Add original processed entities
-            for entity_data in processed_entities:
-                if entity_data and entity_data.get("entity_name"):
-                    final_entity_names.add(entity_data["entity_name"])
-
-            # Add entities that were added during relationship processing
-            for added_entity in all_added_entities:
-                if added_entity and added_entity.get("entity_name"):
-                    final_entity_names.add(added_entity["entity_name"])
-
-            # Collect all relation pairs
-            final_relation_pairs = set()
-            for edge_data in processed_edges:
-                if edge_data:
-                    src_id = edge_data.get("src_id")
-                    tgt_id = edge_data.get("tgt_id")
-                    if src_id and tgt_id:
-                        relation_pair = tuple(sorted([src_id, tgt_id]))
-                        final_relation_pairs.add(relation_pair)
-
-            log_message = f"Phase 3: Updating final {len(final_entity_names)}({len(processed_entities)}+{len(all_added_entities)}) entities and  {len(final_relation_pairs)} relations from {doc_id}"
-            logger.info(log_message)
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+    return processed_entities, processed_edges, all_added_entities
 
-            # Update storage
-            if final_entity_names:
-                await full_entities_storage.upsert(
-                    {
-                        doc_id: {
-                            "entity_names": list(final_entity_names),
-                            "count": len(final_entity_names),
-                        }
-                    }
-                )
 
-            if final_relation_pairs:
-                await full_relations_storage.upsert(
-                    {
-                        doc_id: {
-                            "relation_pairs": [
-                                list(pair) for pair in final_relation_pairs
-                            ],
-                            "count": len(final_relation_pairs),
-                        }
-                    }
-                )
+class _BatchMergeGraph:
+    """Graph storage view for batched merging and rebuilding
 
-            logger.debug(
-                f"Updated entity-relation index for document {doc_id}: {len(final_entity_names)} entities (original: {len(processed_entities)}, added: {len(all_added_entities)}), {len(final_relation_pairs)} relations"
+    Serves get_node/has_edge/get_edge from nodes and edges prefetched in bulk and buffers
+    upserts, which are written back with one upsert_nodes/upsert_edges call on flush.
+    """
+
+    def __init__(self, storage: BaseGraphStorage):
+        self._storage = storage
+        self._nodes: dict[str, dict | None] = {}
+        self._edges: dict[tuple[str, str], dict | None] = {}
+        self._pending_nodes: dict[str, dict] = {}
+        self._pending_edges: dict[tuple[str, str], tuple[str, str, dict]] = {}
+
+    async def prefetch(self, node_ids: list[str], edge_keys: list[tuple[str, str]]):
+        nodes = await self._storage.get_nodes_batch(node_ids) if node_ids else {}
+        for node_id in node_ids:
+            self._nodes[node_id] = nodes.get(node_id)
+        edges = (
+            await self._storage.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in edge_keys]
+            )
+            if edge_keys
+            else {}
+        )
+        for src, tgt in edge_keys:
+            edge = edges.get((src, tgt))
+            if edge is None:
+                edge = edges.get((tgt, src))
+            self._edges[tuple(sorted((src, tgt)))] = edge
+
+    async def get_node(self, node_id: str) -> dict | None:
+        if node_id not in self._nodes:
+            self._nodes[node_id] = await self._storage.get_node(node_id)
+        node = self._nodes[node_id]
+        return dict(node) if node is not None else None
+
+    async def get_edge(self, source_node_id: str, target_node_id: str) -> dict | None:
+        key = tuple(sorted((source_node_id, target_node_id)))
+        if key not in self._edges:
+            self._edges[key] = await self._storage.get_edge(
+                source_node_id, target_node_id
             )
+        edge = self._edges[key]
+        return dict(edge) if edge is not None else None
 
-        except Exception as e:
-            logger.error(
-                f"Failed to update entity-relation index for document {doc_id}: {e}"
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        return await self.get_edge(source_node_id, target_node_id) is not None
+
+    async def has_node(self, node_id: str) -> bool:
+        return await self.get_node(node_id) is not None
+
+    async def get_node_edges(self, source_node_id: str) -> list[tuple[str, str]] | None:
+        # Buffered upserts only touch existing edges, so the storage is authoritative
+        return await self._storage.get_node_edges(source_node_id)
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        self._nodes[node_id] = {**(self._nodes.get(node_id) or {}), **node_data}
+        self._pending_nodes[node_id] = {
+            **self._pending_nodes.get(node_id, {}),
+            **node_data,
+        }
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        key = tuple(sorted((source_node_id, target_node_id)))
+        self._edges[key] = {**(self._edges.get(key) or {}), **edge_data}
+        pending = self._pending_edges.get(key)
+        merged = {**pending[2], **edge_data} if pending else dict(edge_data)
+        self._pending_edges[key] = (source_node_id, target_node_id, merged)
+
+    async def flush(self) -> tuple[int, int]:
+        """Write buffered nodes, then edges; returns (node count, edge count)"""
+        nodes, edges = self._pending_nodes, list(self._pending_edges.values())
+        self._pending_nodes, self._pending_edges = {}, {}
+        if nodes:
+            await self._storage.upsert_nodes(nodes)
+        if edges:
+            await self._storage.upsert_edges(edges)
+        return len(nodes), len(edges)
+
+
+class _BatchMergeKV:
+    """KV storage view for batched merging: bulk prefetch, buffered upserts"""
+
+    def __init__(self, storage: BaseKVStorage):
+        self._storage = storage
+        self._records: dict[str, dict | None] = {}
+        self._pending: dict[str, dict] = {}
+
+    async def prefetch(self, ids: list[str]):
+        if ids:
+            for record_id, record in zip(ids, await self._storage.get_by_ids(ids)):
+                self._records[record_id] = record
+
+    async def get_by_id(self, id: str) -> dict | None:
+        if id not in self._records:
+            self._records[id] = await self._storage.get_by_id(id)
+        return self._records[id]
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        self._records.update(data)
+        self._pending.update(data)
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if pending:
+            await self._storage.upsert(pending)
+
+
+class _BatchMergeVDB:
+    """Vector storage view for batched merging: one delete and one upsert on flush"""
+
+    def __init__(self, storage: BaseVectorStorage):
+        self._storage = storage
+        self._pending_upserts: dict[str, dict] = {}
+        self._pending_deletes: set[str] = set()
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        self._pending_upserts.update(data)
+
+    async def delete(self, ids: list[str]) -> None:
+        for id in ids:
+            self._pending_upserts.pop(id, None)
+            self._pending_deletes.add(id)
+
+    async def flush(self, operation_name: str) -> None:
+        # Deletes first: ids deleted and then upserted again end up upserted
+        deletes, self._pending_deletes = list(self._pending_deletes), set()
+        upserts, self._pending_upserts = self._pending_upserts, {}
+        if deletes:
+            try:
+                await self._storage.delete(deletes)
+            except Exception as e:
+                logger.debug(f"Could not delete old {operation_name} records: {e}")
+        if upserts:
+            await safe_vdb_operation_with_exception(
+                operation=lambda: self._storage.upsert(upserts),
+                operation_name=operation_name,
+                entity_name=f"{len(upserts)} records",
+                max_retries=3,
+                retry_delay=0.2,
+            )
+
+
+class _LocalKeyedLock:
+    """In-process keyed asyncio locks, acquired in sorted key order"""
+
+    def __init__(self):
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @asynccontextmanager
+    async def __call__(self, keys: list[str]):
+        async with AsyncExitStack() as stack:
+            for key in sorted(set(keys)):
+                await stack.enter_async_context(self._locks[key])
+            yield
+
+
+async def _batch_merge_entities_and_relations(
+    all_nodes: dict[str, list[dict]],
+    all_edges: dict[tuple[str, str], list[dict]],
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    global_config: dict[str, str],
+    doc_id: str = None,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Batched variant of phase 1 and 2 of merge_nodes_and_edges
+
+    Existing nodes, edges and chunk tracking rows of the whole document are prefetched
+    in bulk, entities and relations are merged (LLM summaries run concurrently) against
+    in-memory views, and the results are written back with one batch call per storage.
+    All entity names of the document stay locked until the results are written.
+    """
+    node_ids = set(all_nodes)
+    for src_id, tgt_id in all_edges:
+        node_ids.update((src_id, tgt_id))
+    node_ids = sorted(node_ids)
+    edge_keys = list(all_edges)
+
+    workspace = global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+    async with get_storage_keyed_lock(
+        node_ids, namespace=namespace, enable_logging=False
+    ):
+        graph_view = _BatchMergeGraph(knowledge_graph_inst)
+        await graph_view.prefetch(node_ids, edge_keys)
+        entity_chunks_view = relation_chunks_view = None
+        if entity_chunks_storage is not None:
+            entity_chunks_view = _BatchMergeKV(entity_chunks_storage)
+            await entity_chunks_view.prefetch(node_ids)
+        if relation_chunks_storage is not None:
+            relation_chunks_view = _BatchMergeKV(relation_chunks_storage)
+            await relation_chunks_view.prefetch(
+                [make_relation_chunk_key(src, tgt) for src, tgt in edge_keys]
+            )
+        entity_vdb_view = _BatchMergeVDB(entity_vdb) if entity_vdb is not None else None
+        relationships_vdb_view = (
+            _BatchMergeVDB(relationships_vdb) if relationships_vdb is not None else None
+        )
+
+        result = await _merge_entities_and_relations(
+            all_nodes,
+            all_edges,
+            graph_view,
+            entity_vdb_view,
+            relationships_vdb_view,
+            global_config,
+            _LocalKeyedLock(),
+            doc_id,
+            pipeline_status,
+            pipeline_status_lock,
+            llm_response_cache,
+            entity_chunks_view,
+            relation_chunks_view,
+        )
+
+        node_count, edge_count = await graph_view.flush()
+        for view in (entity_chunks_view, relation_chunks_view):
+            if view is not None:
+                await view.flush()
+        if entity_vdb_view is not None:
+            await entity_vdb_view.flush("entity_upsert")
+        if relationships_vdb_view is not None:
+            await relationships_vdb_view.flush("relationship_upsert")
+        logger.info(
+            f"Batch merge wrote {node_count} nodes and {edge_count} edges for {doc_id}"
+        )
+    return result
+
+
+def _collect_chunk_results(
+    chunk_results: list,
+) -> tuple[dict[str, list[dict]], dict[tuple[str, str], list[dict]]]:
+    """Group extracted entities by name and relations by sorted (src, tgt) key"""
+    all_nodes = defaultdict(list)
+    all_edges = defaultdict(list)
+
+    for maybe_nodes, maybe_edges in chunk_results:
+        # Collect nodes
+        for entity_name, entities in maybe_nodes.items():
+            all_nodes[entity_name].extend(entities)
+
+        # Collect edges with sorted keys for undirected graph
+        for edge_key, edges in maybe_edges.items():
+            sorted_edge_key = tuple(sorted(edge_key))
+            all_edges[sorted_edge_key].extend(edges)
+
+    return all_nodes, all_edges
+
+
+async def _run_entity_relation_merge(
+    all_nodes: dict[str, list[dict]],
+    all_edges: dict[tuple[str, str], list[dict]],
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    global_config: dict[str, str],
+    doc_id: str = None,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Run phase 1 and 2 in batch or per-entity mode depending on global_config"""
+    if global_config.get("batch_merge", False):
+        return await _batch_merge_entities_and_relations(
+            all_nodes,
+            all_edges,
+            knowledge_graph_inst,
+            entity_vdb,
+            relationships_vdb,
+            global_config,
+            doc_id,
+            pipeline_status,
+            pipeline_status_lock,
+            llm_response_cache,
+            entity_chunks_storage,
+            relation_chunks_storage,
+        )
+
+    workspace = global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+    return await _merge_entities_and_relations(
+        all_nodes,
+        all_edges,
+        knowledge_graph_inst,
+        entity_vdb,
+        relationships_vdb,
+        global_config,
+        lambda keys: get_storage_keyed_lock(
+            keys, namespace=namespace, enable_logging=False
+        ),
+        doc_id,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+        entity_chunks_storage,
+        relation_chunks_storage,
+    )
+
+
+async def _update_entity_relation_index(
+    full_entities_storage: BaseKVStorage,
+    full_relations_storage: BaseKVStorage,
+    doc_id: str,
+    final_entity_names: set[str],
+    final_relation_pairs: set[tuple[str, str]],
+    pipeline_status: dict,
+    pipeline_status_lock,
+) -> None:
+    """Phase 3: record the entities and relations of a document in full_entities/full_relations"""
+    try:
+        log_message = f"Phase 3: Updating final {len(final_entity_names)} entities and {len(final_relation_pairs)} relations from {doc_id}"
+        logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+
+        # Update storage
+        if final_entity_names:
+            await full_entities_storage.upsert(
+                {
+                    doc_id: {
+                        "entity_names": list(final_entity_names),
+                        "count": len(final_entity_names),
+                    }
+                }
+            )
+
+        if final_relation_pairs:
+            await full_relations_storage.upsert(
+                {
+                    doc_id: {
+                        "relation_pairs": [list(pair) for pair in final_relation_pairs],
+                        "count": len(final_relation_pairs),
+                    }
+                }
             )
-            # Don't raise exception to avoid affecting main flow
+
+        logger.debug(
+            f"Updated entity-relation index for document {doc_id}: {len(final_entity_names)} entities, {len(final_relation_pairs)} relations"
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Failed to update entity-relation index for document {doc_id}: {e}"
+        )
+        # Don't raise exception to avoid affecting main flow
+
+
+async def merge_nodes_and_edges(
+    chunk_results: list,
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    global_config: dict[str, str],
+    full_entities_storage: BaseKVStorage = None,
+    full_relations_storage: BaseKVStorage = None,
+    doc_id: str = None,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
+    current_file_number: int = 0,
+    total_files: int = 0,
+    file_path: str = "unknown_source",
+) -> None:
+    """Two-phase merge: process all entities first, then all relationships
+
+    This approach ensures data consistency by:
+    1. Phase 1: Process all entities concurrently
+    2. Phase 2: Process all relationships concurrently (may add missing entities)
+    3. Phase 3: Update full_entities and full_relations storage with final results
+
+    Args:
+        chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
+        knowledge_graph_inst: Knowledge graph storage
+        entity_vdb: Entity vector database
+        relationships_vdb: Relationship vector database
+        global_config: Global configuration
+        full_entities_storage: Storage for document entity lists
+        full_relations_storage: Storage for document relation lists
+        doc_id: Document ID for storage indexing
+        pipeline_status: Pipeline status dictionary
+        pipeline_status_lock: Lock for pipeline status
+        llm_response_cache: LLM response cache
+        entity_chunks_storage: Storage tracking full chunk lists per entity
+        relation_chunks_storage: Storage tracking full chunk lists per relation
+        current_file_number: Current file number for logging
+        total_files: Total files for logging
+        file_path: File path for logging
+    """
+
+    # Check for cancellation at the start of merge
+    if pipeline_status is not None and pipeline_status_lock is not None:
+        async with pipeline_status_lock:
+            if pipeline_status.get("cancellation_requested", False):
+                raise PipelineCancelledException("User cancelled during merge phase")
+
+    all_nodes, all_edges = _collect_chunk_results(chunk_results)
+
+    log_message = f"Merging stage {current_file_number}/{total_files}: {file_path}"
+    logger.info(log_message)
+    async with pipeline_status_lock:
+        pipeline_status["latest_message"] = log_message
+        pipeline_status["history_messages"].append(log_message)
+
+    (
+        processed_entities,
+        processed_edges,
+        all_added_entities,
+    ) = await _run_entity_relation_merge(
+        all_nodes,
+        all_edges,
+        knowledge_graph_inst,
+        entity_vdb,
+        relationships_vdb,
+        global_config,
+        doc_id,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+        entity_chunks_storage,
+        relation_chunks_storage,
+    )
+
+    # ===== Phase 3: Update full_entities and full_relations storage =====
+    if full_entities_storage and full_relations_storage and doc_id:
+        # Merge all entities: original entities + entities added during edge processing
+        final_entity_names = {
+            entity_data["entity_name"]
+            for entity_data in processed_entities + all_added_entities
+            if entity_data and entity_data.get("entity_name")
+        }
+
+        # Collect all relation pairs
+        final_relation_pairs = {
+            tuple(sorted([edge_data["src_id"], edge_data["tgt_id"]]))
+            for edge_data in processed_edges
+            if edge_data and edge_data.get("src_id") and edge_data.get("tgt_id")
+        }
+
+        await _update_entity_relation_index(
+            full_entities_storage,
+            full_relations_storage,
+            doc_id,
+            final_entity_names,
+            final_relation_pairs,
+            pipeline_status,
+            pipeline_status_lock,
+        )
 
     log_message = f"Completed merging: {len(processed_entities)} entities, {len(all_added_entities)} extra entities, {len(processed_edges)} relations"
     logger.info(log_message)
@@ -2765,6 +3542,195 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
 
+class MergeCoalescer:
+    """Coalesce the merge stage of concurrently processed documents
+
+    Documents whose extraction finished within the same flush window are merged in one
+    pass: the descriptions every document contributes to a shared (hub) entity or relation
+    are combined, so the entity is locked, summarized and re-embedded once per window
+    instead of once per document. A window is flushed early once ``max_batch`` documents
+    are waiting, which is normally every document the pipeline has in flight.
+
+    Each document still gets its own full_entities/full_relations record, and an error
+    raised while merging a window fails every document of that window.
+    """
+
+    def __init__(
+        self,
+        knowledge_graph_inst: BaseGraphStorage,
+        entity_vdb: BaseVectorStorage,
+        relationships_vdb: BaseVectorStorage,
+        global_config: dict[str, str],
+        full_entities_storage: BaseKVStorage = None,
+        full_relations_storage: BaseKVStorage = None,
+        pipeline_status: dict = None,
+        pipeline_status_lock=None,
+        llm_response_cache: BaseKVStorage | None = None,
+        entity_chunks_storage: BaseKVStorage | None = None,
+        relation_chunks_storage: BaseKVStorage | None = None,
+        window: float = 0.5,
+        max_batch: int = 2,
+    ):
+        self.knowledge_graph_inst = knowledge_graph_inst
+        self.entity_vdb = entity_vdb
+        self.relationships_vdb = relationships_vdb
+        self.global_config = global_config
+        self.full_entities_storage = full_entities_storage
+        self.full_relations_storage = full_relations_storage
+        self.pipeline_status = pipeline_status
+        self.pipeline_status_lock = pipeline_status_lock
+        self.llm_response_cache = llm_response_cache
+        self.entity_chunks_storage = entity_chunks_storage
+        self.relation_chunks_storage = relation_chunks_storage
+        self.window = max(0.0, window)
+        self.max_batch = max(1, max_batch)
+
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._batch_full = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        # Windows are merged one after another so a later window sees the earlier results
+        self._merge_lock = asyncio.Lock()
+
+    async def merge(
+        self,
+        chunk_results: list,
+        doc_id: str,
+        current_file_number: int = 0,
+        total_files: int = 0,
+        file_path: str = "unknown_source",
+    ) -> None:
+        """Queue the extraction results of a document and wait until they are merged"""
+        if self.pipeline_status is not None and self.pipeline_status_lock is not None:
+            async with self.pipeline_status_lock:
+                if self.pipeline_status.get("cancellation_requested", False):
+                    raise PipelineCancelledException(
+                        "User cancelled during merge phase"
+                    )
+
+        log_message = f"Merging stage {current_file_number}/{total_files}: {file_path} (queued for coalesced merge)"
+        logger.info(log_message)
+        async with self.pipeline_status_lock:
+            self.pipeline_status["latest_message"] = log_message
+            self.pipeline_status["history_messages"].append(log_message)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(
+            ({"chunk_results": chunk_results, "doc_id": doc_id}, future)
+        )
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_window())
+
+        await future
+
+    async def _flush_window(self) -> None:
+        try:
+            await asyncio.wait_for(self._batch_full.wait(), timeout=self.window)
+        except asyncio.TimeoutError:
+            pass
+
+        # Detach the window so documents arriving during the merge open the next one
+        batch, self._pending = self._pending, []
+        self._batch_full.clear()
+        self._flusher = None
+
+        async with self._merge_lock:
+            try:
+                await self._merge_batch(batch)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def _merge_batch(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        all_nodes = defaultdict(list)
+        all_edges = defaultdict(list)
+        doc_keys = []
+        for request, _ in batch:
+            doc_nodes, doc_edges = _collect_chunk_results(request["chunk_results"])
+            for entity_name, entities in doc_nodes.items():
+                all_nodes[entity_name].extend(entities)
+            for edge_key, edges in doc_edges.items():
+                all_edges[edge_key].extend(edges)
+            doc_keys.append((set(doc_nodes), set(doc_edges)))
+
+        doc_ids = [request["doc_id"] for request, _ in batch]
+        merge_label = doc_ids[0] if len(doc_ids) == 1 else f"{len(doc_ids)} documents"
+        if len(doc_ids) > 1:
+            log_message = f"Coalesced merge of {len(doc_ids)} documents: {len(all_nodes)} entities, {len(all_edges)} relations"
+            logger.info(log_message)
+            async with self.pipeline_status_lock:
+                self.pipeline_status["latest_message"] = log_message
+                self.pipeline_status["history_messages"].append(log_message)
+
+        (
+            processed_entities,
+            processed_edges,
+            all_added_entities,
+        ) = await _run_entity_relation_merge(
+            all_nodes,
+            all_edges,
+            self.knowledge_graph_inst,
+            self.entity_vdb,
+            self.relationships_vdb,
+            self.global_config,
+            merge_label,
+            self.pipeline_status,
+            self.pipeline_status_lock,
+            self.llm_response_cache,
+            self.entity_chunks_storage,
+            self.relation_chunks_storage,
+        )
+
+        if self.full_entities_storage and self.full_relations_storage:
+            merged_names = {
+                entity_data["entity_name"]
+                for entity_data in processed_entities
+                if entity_data and entity_data.get("entity_name")
+            }
+            added_names = {
+                entity_data["entity_name"]
+                for entity_data in all_added_entities
+                if entity_data and entity_data.get("entity_name")
+            }
+            merged_pairs = {
+                tuple(sorted([edge_data["src_id"], edge_data["tgt_id"]]))
+                for edge_data in processed_edges
+                if edge_data and edge_data.get("src_id") and edge_data.get("tgt_id")
+            }
+
+            # Split the window result back into per-document entity/relation lists
+            for doc_id, (node_names, edge_keys) in zip(doc_ids, doc_keys):
+                if not doc_id:
+                    continue
+                endpoints = {name for edge_key in edge_keys for name in edge_key}
+                await _update_entity_relation_index(
+                    self.full_entities_storage,
+                    self.full_relations_storage,
+                    doc_id,
+                    (node_names & merged_names)
+                    | ((endpoints - node_names) & added_names),
+                    edge_keys & merged_pairs,
+                    self.pipeline_status,
+                    self.pipeline_status_lock,
+                )
+
+        log_message = f"Completed merging: {len(processed_entities)} entities, {len(all_added_entities)} extra entities, {len(processed_edges)} relations from {merge_label}"
+        logger.info(log_message)
+        async with self.pipeline_status_lock:
+            self.pipeline_status["latest_message"] = log_message
+            self.pipeline_status["history_messages"].append(log_message)
+
+
 async def extract_entities(
     chunks: dict[str, TextChunkSchema],
     global_config: dict[str, str],
@@ -2920,14 +3886,9 @@ async def extract_entities(
                     # New edge from gleaning stage
                     maybe_edges[edge_key] = list(glean_edges)
 
-        # Batch update chunk's llm_cache_list with all collected cache keys
-        if cache_keys_collector and text_chunks_storage:
-            await update_chunk_cache_list(
-                chunk_key,
-                text_chunks_storage,
-                cache_keys_collector,
-                "entity_extraction",
-            )
+        # Collect cache keys, chunk llm_cache_lists are updated once for all chunks
+        if cache_keys_collector:
+            chunk_cache_keys[chunk_key] = cache_keys_collector
 
         processed_chunks += 1
         entities_count = len(maybe_nodes)
@@ -2945,6 +3906,7 @@ async def extract_entities(
     # Get max async tasks limit from global_config
     chunk_max_async = global_config.get("llm_model_max_async", 4)
     semaphore = asyncio.Semaphore(chunk_max_async)
+    chunk_cache_keys: dict[str, list[str]] = {}
 
     async def _process_with_semaphore(chunk):
         async with semaphore:
@@ -2998,6 +3960,13 @@ async def extract_entities(
         if pending:
             await asyncio.wait(pending)
 
+    # Record LLM cache references of all extracted chunks with one read and one write
+    if chunk_cache_keys and text_chunks_storage:
+        await update_chunk_cache_lists(
+            text_chunks_storage, chunk_cache_keys, "entity_extraction"
+        )
+
+    if first_exception is not None:
         # Add progress prefix to the exception message
         progress_prefix = f"C[{processed_chunks + 1}/{total_chunks}]"
 
@@ -3021,6 +3990,8 @@ async def kg_query(
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
+    embedding_cache: QueryEmbeddingCache | None = None,
+    query_context_cache: QueryContextCache | None = None,
 ) -> QueryResult | None:
     """
     Execute knowledge graph query and return unified QueryResult object.
@@ -3036,6 +4007,8 @@ async def kg_query(
         hashing_kv: Cache storage
         system_prompt: System prompt
         chunks_vdb: Document chunks vector database
+        embedding_cache: Embeddings shared by all vector searches of this query call
+        query_context_cache: Retrieval results reused until the workspace data changes
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -3062,44 +4035,66 @@ async def kg_query(
         # Apply higher priority (5) to query relation LLM function
         use_model_func = partial(use_model_func, _priority=5)
 
-    hl_keywords, ll_keywords = await get_keywords_from_query(
-        query, query_param, global_config, hashing_kv
-    )
+    # Reuse keywords and context of an identical retrieval at the current data version
+    cached_context = None
+    if query_context_cache is not None:
+        context_cache_key = QueryContextCache.make_key(query, query_param)
+        # Read the version before retrieval so data changed meanwhile is never cached as fresh
+        data_version = await get_data_version(global_config.get("workspace"))
+        cached_context = query_context_cache.get(context_cache_key, data_version)
+
+    if cached_context is not None:
+        hl_keywords_str, ll_keywords_str, context_result = cached_context
+        logger.info(f"[kg_query] Query context cache hit (mode: {query_param.mode})")
+    else:
+        hl_keywords, ll_keywords = await get_keywords_from_query(
+            query, query_param, global_config, hashing_kv
+        )
 
-    logger.debug(f"High-level keywords: {hl_keywords}")
-    logger.debug(f"Low-level  keywords: {ll_keywords}")
-
-    # Handle empty keywords
-    if ll_keywords == [] and query_param.mode in ["local", "hybrid", "mix"]:
-        logger.warning("low_level_keywords is empty")
-    if hl_keywords == [] and query_param.mode in ["global", "hybrid", "mix"]:
-        logger.warning("high_level_keywords is empty")
-    if hl_keywords == [] and ll_keywords == []:
-        if len(query) < 50:
-            logger.warning(f"Forced low_level_keywords to origin query: {query}")
-            ll_keywords = [query]
-        else:
-            return QueryResult(content=PROMPTS["fail_response"])
+        logger.debug(f"High-level keywords: {hl_keywords}")
+        logger.debug(f"Low-level  keywords: {ll_keywords}")
+
+        # Handle empty keywords
+        if ll_keywords == [] and query_param.mode in ["local", "hybrid", "mix"]:
+            logger.warning("low_level_keywords is empty")
+        if hl_keywords == [] and query_param.mode in ["global", "hybrid", "mix"]:
+            logger.warning("high_level_keywords is empty")
+        if hl_keywords == [] and ll_keywords == []:
+            if len(query) < 50:
+                logger.warning(f"Forced low_level_keywords to origin query: {query}")
+                ll_keywords = [query]
+            else:
+                return QueryResult(content=PROMPTS["fail_response"])
 
-    ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
-    hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
+        ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
+        hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
-    # Build query context (unified interface)
-    context_result = await _build_query_context(
-        query,
-        ll_keywords_str,
-        hl_keywords_str,
-        knowledge_graph_inst,
-        entities_vdb,
-        relationships_vdb,
-        text_chunks_db,
-        query_param,
-        chunks_vdb,
-    )
+        # Build query context (unified interface)
+        context_result = await _build_query_context(
+            query,
+            ll_keywords_str,
+            hl_keywords_str,
+            knowledge_graph_inst,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks_db,
+            query_param,
+            chunks_vdb,
+            embedding_cache=embedding_cache,
+        )
 
-    if context_result is None:
-        logger.info("[kg_query] No query context could be built; returning no-result.")
-        return None
+        if context_result is None:
+            logger.info(
+                "[kg_query] No query context could be built; returning no-result."
+            )
+            return None
+
+        if query_context_cache is not None:
+            query_context_cache.put(
+                context_cache_key,
+                data_version,
+                (hl_keywords_str, ll_keywords_str, context_result),
+            )
 
     # Return different content based on query parameters
     if query_param.only_need_context and not query_param.only_need_prompt:
@@ -3130,9 +4125,9 @@ async def kg_query(
 
     # Call LLM
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
+    len_of_prompts = tokenizer.count_tokens(query + sys_prompt)
     logger.debug(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {tokenizer.count_tokens(query)}, System: {tokenizer.count_tokens(sys_prompt)})"
     )
 
     # Handle cache
@@ -3428,6 +4423,7 @@ async def _perform_kg_search(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    embedding_cache: QueryEmbeddingCache | None = None,
 ) -> dict[str, Any]:
     """
     Pure search logic that retrieves raw entities, relations, and vector chunks.
@@ -3447,23 +4443,24 @@ async def _perform_kg_search(
     # Track chunk sources and metadata for final logging
     chunk_tracking = {}  # chunk_id -> {source, frequency, order}
 
-    # Pre-compute query embedding once for all vector operations
+    # Pre-compute the query and keyword embeddings for all vector operations
+    # in a single (deduplicated) embedding call
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
-        actual_embedding_func = text_chunks_db.embedding_func
-        if actual_embedding_func:
-            try:
-                query_embedding = await actual_embedding_func([query])
-                query_embedding = query_embedding[
-                    0
-                ]  # Extract first embedding from batch result
-                logger.debug("Pre-computed query embedding for all vector operations")
-            except Exception as e:
-                logger.warning(f"Failed to pre-compute query embedding: {e}")
-                query_embedding = None
+    if embedding_cache is None:
+        embedding_cache = QueryEmbeddingCache(text_chunks_db.embedding_func)
+    use_ll_keywords = query_param.mode != "global" and len(ll_keywords) > 0
+    use_hl_keywords = query_param.mode != "local" and len(hl_keywords) > 0
+    embed_query = bool(query) and (kg_chunk_pick_method == "VECTOR" or chunks_vdb)
+    await embedding_cache.prefetch(
+        [
+            query if embed_query else None,
+            ll_keywords if use_ll_keywords else None,
+            hl_keywords if use_hl_keywords else None,
+        ]
+    )
+    query_embedding = embedding_cache.get(query) if embed_query else None
 
     # Handle local and global modes
     if query_param.mode == "local" and len(ll_keywords) > 0:
@@ -3472,6 +4469,7 @@ async def _perform_kg_search(
             knowledge_graph_inst,
             entities_vdb,
             query_param,
+            query_embedding=embedding_cache.get(ll_keywords),
         )
 
     elif query_param.mode == "global" and len(hl_keywords) > 0:
@@ -3480,6 +4478,7 @@ async def _perform_kg_search(
             knowledge_graph_inst,
             relationships_vdb,
             query_param,
+            query_embedding=embedding_cache.get(hl_keywords),
         )
 
     else:  # hybrid or mix mode
@@ -3489,6 +4488,7 @@ async def _perform_kg_search(
                 knowledge_graph_inst,
                 entities_vdb,
                 query_param,
+                query_embedding=embedding_cache.get(ll_keywords),
             )
         if len(hl_keywords) > 0:
             global_relations, global_entities = await _get_edge_data(
@@ -3496,6 +4496,7 @@ async def _perform_kg_search(
                 knowledge_graph_inst,
                 relationships_vdb,
                 query_param,
+                query_embedding=embedding_cache.get(hl_keywords),
             )
 
         # Get vector chunks for mix mode
@@ -3822,6 +4823,7 @@ async def _merge_all_chunks(
                         "content": chunk["content"],
                         "file_path": chunk.get("file_path", "unknown_source"),
                         "chunk_id": chunk_id,
+                        "tokens": chunk.get("tokens"),
                     }
                 )
 
@@ -3836,6 +4838,7 @@ async def _merge_all_chunks(
                         "content": chunk["content"],
                         "file_path": chunk.get("file_path", "unknown_source"),
                         "chunk_id": chunk_id,
+                        "tokens": chunk.get("tokens"),
                     }
                 )
 
@@ -3850,6 +4853,7 @@ async def _merge_all_chunks(
                         "content": chunk["content"],
                         "file_path": chunk.get("file_path", "unknown_source"),
                         "chunk_id": chunk_id,
+                        "tokens": chunk.get("tokens"),
                     }
                 )
 
@@ -3924,7 +4928,7 @@ async def _build_context_str(
         text_chunks_str="",
         reference_list_str="",
     )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
+    kg_context_tokens = tokenizer.count_tokens(pre_kg_context)
 
     # Calculate preliminary system prompt tokens
     pre_sys_prompt = sys_prompt_template.format(
@@ -3932,10 +4936,10 @@ async def _build_context_str(
         response_type=response_type,
         user_prompt=user_prompt,
     )
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
 
     # Calculate available tokens for text chunks
-    query_tokens = len(tokenizer.encode(query))
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + kg_context_tokens + query_tokens + buffer_tokens
@@ -4053,6 +5057,7 @@ async def _build_query_context(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    embedding_cache: QueryEmbeddingCache | None = None,
 ) -> QueryContextResult | None:
     """
     Main query context building function using the new 4-stage architecture:
@@ -4076,6 +5081,7 @@ async def _build_query_context(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        embedding_cache=embedding_cache,
     )
 
     if not search_result["final_entities"] and not search_result["final_relations"]:
@@ -4168,13 +5174,16 @@ async def _get_node_data(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding=None,
 ):
     # get similar entities
     logger.info(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    results = await entities_vdb.query(
+        query, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -4441,12 +5450,15 @@ async def _get_edge_data(
     knowledge_graph_inst: BaseGraphStorage,
     relationships_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding=None,
 ):
     logger.info(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    results = await relationships_vdb.query(
+        keywords, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -4736,6 +5748,7 @@ async def naive_query(
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
+    embedding_cache: QueryEmbeddingCache | None = None,
     return_raw_data: Literal[True] = True,
 ) -> dict[str, Any]: ...
 
@@ -4748,6 +5761,7 @@ async def naive_query(
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
+    embedding_cache: QueryEmbeddingCache | None = None,
     return_raw_data: Literal[False] = False,
 ) -> str | AsyncIterator[str]: ...
 
@@ -4759,6 +5773,7 @@ async def naive_query(
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
+    embedding_cache: QueryEmbeddingCache | None = None,
 ) -> QueryResult | None:
     """
     Execute naive query and return unified QueryResult object.
@@ -4770,6 +5785,7 @@ async def naive_query(
         global_config: Global configuration
         hashing_kv: Cache storage
         system_prompt: System prompt
+        embedding_cache: Embeddings shared by all vector searches of this query call
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -4796,7 +5812,11 @@ async def naive_query(
         logger.error("Tokenizer not found in global configuration.")
         return QueryResult(content=PROMPTS["fail_response"])
 
-    chunks = await _get_vector_context(query, chunks_vdb, query_param, None)
+    query_embedding = None
+    if embedding_cache is not None:
+        await embedding_cache.prefetch([query])
+        query_embedding = embedding_cache.get(query)
+    chunks = await _get_vector_context(query, chunks_vdb, query_param, query_embedding)
 
     if chunks is None or len(chunks) == 0:
         logger.info(
@@ -4832,8 +5852,8 @@ async def naive_query(
     )
 
     # Calculate available tokens for chunks
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
-    query_tokens = len(tokenizer.encode(query))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + query_tokens + buffer_tokens
@@ -24,6 +24,7 @@ def chunk_documents_for_rerank(
     max_tokens: int = 480,
     overlap_tokens: int = 32,
     tokenizer_model: str = "gpt-4o-mini",
+    token_counts: Optional[List[Optional[int]]] = None,
 ) -> Tuple[List[str], List[int]]:
     """
     Chunk documents that exceed token limit for reranking.
@@ -33,6 +34,8 @@ def chunk_documents_for_rerank(
         max_tokens: Maximum tokens per chunk (default 480 to leave margin for 512 limit)
         overlap_tokens: Number of tokens to overlap between chunks
         tokenizer_model: Model name for tiktoken tokenizer
+        token_counts: Known token counts per document (e.g. the `tokens` stored with text
+            chunks at ingest, None when unknown). Documents known to fit are not re-encoded.
 
     Returns:
         Tuple of (chunked_documents, original_doc_indices)
@@ -52,9 +55,9 @@ def chunk_documents_for_rerank(
         )
 
     try:
-        from .utils import TiktokenTokenizer
+        from .utils import get_shared_tokenizer
 
-        tokenizer = TiktokenTokenizer(model_name=tokenizer_model)
+        tokenizer = get_shared_tokenizer(tokenizer_model)
     except Exception as e:
         logger.warning(
             f"Failed to initialize tokenizer: {e}. Using character-based approximation."
@@ -67,7 +70,10 @@ def chunk_documents_for_rerank(
         doc_indices = []
 
         for idx, doc in enumerate(documents):
-            if len(doc) <= max_chars:
+            known_count = token_counts[idx] if token_counts else None
+            if len(doc) <= max_chars or (
+                known_count is not None and known_count <= max_tokens
+            ):
                 chunked_docs.append(doc)
                 doc_indices.append(idx)
             else:
@@ -90,6 +96,13 @@ def chunk_documents_for_rerank(
     doc_indices = []
 
     for idx, doc in enumerate(documents):
+        known_count = token_counts[idx] if token_counts else None
+        if known_count is not None and known_count <= max_tokens:
+            # Precomputed count fits: no need to tokenize the document again
+            chunked_docs.append(doc)
+            doc_indices.append(idx)
+            continue
+
         tokens = tokenizer.encode(doc)
 
         if len(tokens) <= max_tokens:
@@ -192,6 +205,7 @@ async def generic_rerank_api(
     request_format: str = "standard",  # "standard" (Jina/Cohere) or "aliyun"
     enable_chunking: bool = False,
     max_tokens_per_doc: int = 480,
+    token_counts: Optional[List[Optional[int]]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Generic rerank API call for Jina/Cohere/Aliyun models.
@@ -209,6 +223,7 @@ async def generic_rerank_api(
         request_format: Request format type
         enable_chunking: Whether to chunk documents exceeding token limit
         max_tokens_per_doc: Maximum tokens per document for chunking
+        token_counts: Known token counts per document, used to skip re-tokenizing when chunking
 
     Returns:
         List of dictionary of ["index": int, "relevance_score": float]
@@ -227,7 +242,7 @@ async def generic_rerank_api(
 
     if enable_chunking:
         documents, doc_indices = chunk_documents_for_rerank(
-            documents, max_tokens=max_tokens_per_doc
+            documents, max_tokens=max_tokens_per_doc, token_counts=token_counts
         )
         logger.debug(
             f"Chunked {len(original_documents)} documents into {len(documents)} chunks"
@@ -375,6 +390,7 @@ async def cohere_rerank(
     extra_body: Optional[Dict[str, Any]] = None,
     enable_chunking: bool = False,
     max_tokens_per_doc: int = 4096,
+    token_counts: Optional[List[Optional[int]]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Rerank documents using Cohere API.
@@ -391,6 +407,7 @@ async def cohere_rerank(
         extra_body: Additional body for http request(reserved for extra params)
         enable_chunking: Whether to chunk documents exceeding max_tokens_per_doc
         max_tokens_per_doc: Maximum tokens per document (default: 4096 for Cohere v3.5)
+        token_counts: Known token counts per document, used to skip re-tokenizing when chunking
 
     Returns:
         List of dictionary of ["index": int, "relevance_score": float]
@@ -429,6 +446,7 @@ async def cohere_rerank(
         response_format="standard",
         enable_chunking=enable_chunking,
         max_tokens_per_doc=max_tokens_per_doc,
+        token_counts=token_counts,
     )
 
 
@@ -4,19 +4,28 @@ import weakref
 import sys
 
 import asyncio
+import base64
+import concurrent.futures
+import copy
 import html
+import inspect
 import csv
 import json
 import logging
 import logging.handlers
+import multiprocessing
 import os
+import pickle
 import re
+import threading
 import time
 import uuid
 from dataclasses import dataclass
+from collections import OrderedDict
 from datetime import datetime
-from functools import wraps
-from hashlib import md5
+from functools import partial, wraps
+from itertools import accumulate
+from hashlib import md5, sha256
 from typing import (
     Any,
     Protocol,
@@ -27,6 +36,7 @@ from typing import (
     Iterable,
     Sequence,
     Collection,
+    AsyncIterator,
 )
 import numpy as np
 from dotenv import load_dotenv
@@ -40,6 +50,7 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
 )
 
 # Precompile regex pattern for JSON sanitization (module-level, compiled once)
@@ -417,6 +428,8 @@ class EmbeddingFunc:
         func: The actual embedding function to wrap
         max_token_size: Optional token limit for the embedding model
         send_dimensions: Whether to inject embedding_dim as a keyword argument
+        model_name: Optional embedding model name, part of the embedding cache key
+        cache: Optional EmbeddingCache consulted before calling func
     """
 
     embedding_dim: int
@@ -425,8 +438,30 @@ class EmbeddingFunc:
     send_dimensions: bool = (
         False  # Control whether to send embedding_dim to the function
     )
+    model_name: str | None = None
+    cache: EmbeddingCache | None = None
 
     async def __call__(self, *args, **kwargs) -> np.ndarray:
+        texts = args[0] if args else None
+        if (
+            self.cache is None
+            or not isinstance(texts, (list, tuple))
+            or not texts
+            or not all(isinstance(t, str) for t in texts)
+        ):
+            return await self._embed(*args, **kwargs)
+
+        # Only texts without a cached vector reach the provider
+        vectors = await self.cache.get_many(texts)
+        missing = [t for t in dict.fromkeys(texts) if t not in vectors]
+        if missing:
+            result = await self._embed(missing, *args[1:], **kwargs)
+            computed = dict(zip(missing, result.reshape(len(missing), -1)))
+            await self.cache.put_many(computed)
+            vectors.update(computed)
+        return np.stack([vectors[t] for t in texts])
+
+    async def _embed(self, *args, **kwargs) -> np.ndarray:
         # Only inject embedding_dim when send_dimensions is True
         if self.send_dimensions:
             # Check if user provided embedding_dim parameter
@@ -1004,6 +1039,120 @@ def priority_limit_async_func_call(
     return final_decro
 
 
+def micro_batch_embedding_func(
+    max_batch_size: int,
+    window: float,
+    queue_name: str = "Embedding func",
+):
+    """
+    Micro-batching decorator that coalesces concurrent small embedding calls
+
+    Calls of the form `func(texts, _priority=...)` arriving within `window` seconds are
+    merged into one `func` call of at most `max_batch_size` distinct texts. Identical
+    texts are embedded once and every caller receives the rows of its own texts, in
+    order. A batch is dispatched as soon as it is full, or when the window of its
+    first request elapses, with the highest priority (lowest value) of its callers.
+
+    Calls that already fill a batch, or pass extra arguments (e.g. `_timeout`), are
+    forwarded to `func` unchanged.
+
+    Args:
+        max_batch_size: Maximum number of distinct texts per coalesced call
+        window: Seconds a request waits for other requests to join its batch
+        queue_name: Optional name for logging identification
+
+    Returns:
+        Decorator function
+    """
+
+    def final_decro(func):
+        if not callable(func):
+            raise TypeError(f"Expected a callable object, got {type(func)}")
+
+        # (texts, future) of the requests waiting in the open batch
+        pending: list[tuple[list[str], asyncio.Future]] = []
+        # distinct texts of the open batch, in insertion order
+        pending_texts: dict[str, None] = {}
+        pending_priority: int | None = None
+        flush_handle: asyncio.TimerHandle | None = None
+        batch_tasks: set[asyncio.Task] = set()
+
+        async def run_batch(requests, texts, priority):
+            try:
+                embeddings = np.asarray(await func(texts, _priority=priority))
+            except asyncio.CancelledError:
+                for _, future in requests:
+                    if not future.done():
+                        future.cancel()
+                raise
+            except Exception as e:
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            row_of = {text: i for i, text in enumerate(texts)}
+            for request_texts, future in requests:
+                if not future.done():
+                    future.set_result(embeddings[[row_of[t] for t in request_texts]])
+            logger.debug(
+                f"{queue_name}: coalesced {len(requests)} request(s) into one batch of {len(texts)} text(s)"
+            )
+
+        def flush():
+            nonlocal pending, pending_texts, pending_priority, flush_handle
+            if flush_handle is not None:
+                flush_handle.cancel()
+                flush_handle = None
+            if not pending:
+                return
+            requests, texts, priority = pending, list(pending_texts), pending_priority
+            pending, pending_texts, pending_priority = [], {}, None
+            task = asyncio.ensure_future(run_batch(requests, texts, priority))
+            batch_tasks.add(task)
+            task.add_done_callback(batch_tasks.discard)
+
+        @wraps(func)
+        async def batched_func(*args, _priority=10, **kwargs):
+            nonlocal pending_priority, flush_handle
+            texts = args[0] if len(args) == 1 else None
+            if (
+                window <= 0
+                or kwargs
+                or not isinstance(texts, (list, tuple))
+                or not texts
+                or len(texts) >= max_batch_size
+            ):
+                return await func(*args, _priority=_priority, **kwargs)
+
+            new_texts = [t for t in dict.fromkeys(texts) if t not in pending_texts]
+            if len(pending_texts) + len(new_texts) > max_batch_size:
+                # Does not fit the open batch: dispatch it and start a new one
+                flush()
+                new_texts = list(dict.fromkeys(texts))
+
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            pending.append((list(texts), future))
+            pending_texts.update(dict.fromkeys(new_texts))
+            pending_priority = (
+                _priority
+                if pending_priority is None
+                else min(pending_priority, _priority)
+            )
+
+            if len(pending_texts) >= max_batch_size:
+                flush()
+            elif flush_handle is None:
+                flush_handle = loop.call_later(window, flush)
+
+            return await future
+
+        return batched_func
+
+    return final_decro
+
+
 def wrap_embedding_func_with_attrs(**kwargs):
     """Decorator to add embedding dimension and token limit attributes to embedding functions.
 
@@ -1238,6 +1387,48 @@ class Tokenizer:
         """
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        self._token_char_counts: dict[int, int] = {}
+        self._token_counts: OrderedDict[bytes, int] = OrderedDict()
+        self.token_count_cache_size: int = DEFAULT_TOKEN_COUNT_CACHE_SIZE
+
+    def __deepcopy__(self, memo) -> "Tokenizer":
+        # Tokenizers are shared, not copied: asdict(LightRAG) deep-copies its fields into
+        # global_config on every call, which would drop the memoized token counts
+        return self
+
+    def __getstate__(self) -> dict:
+        # Memoized counts stay in the process that computed them
+        state = self.__dict__.copy()
+        state["_token_counts"] = OrderedDict()
+        return state
+
+    def count_tokens(self, content: str) -> int:
+        """
+        Returns the number of tokens of a string, memoized by content digest.
+
+        Repeated counts of the same text (entity/relation descriptions and chunk bodies during
+        query-time truncation) are served from a bounded LRU of the most recent
+        `token_count_cache_size` distinct strings instead of re-encoding the text.
+
+        Args:
+            content: The string to count tokens for.
+
+        Returns:
+            The number of tokens `encode(content)` produces.
+        """
+        key = md5(content.encode("utf-8", errors="surrogatepass")).digest()
+        counts = self._token_counts
+        count = counts.get(key)
+        if count is not None:
+            counts.move_to_end(key)
+            return count
+
+        count = len(self.encode(content))
+        if self.token_count_cache_size > 0:
+            counts[key] = count
+            if len(counts) > self.token_count_cache_size:
+                counts.popitem(last=False)
+        return count
 
     def encode(self, content: str) -> List[int]:
         """
@@ -1263,6 +1454,46 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def encode_with_offsets(self, content: str) -> tuple[List[int], List[int]] | None:
+        """
+        Encodes a string and maps every token back to its character offset in the input.
+
+        Token boundaries that fall inside a multi-byte character are rounded up to the next
+        character boundary, so slicing the input between two offsets never yields a partial
+        character.
+
+        Args:
+            content: The string to encode.
+
+        Returns:
+            A tuple of (tokens, offsets) where offsets[i] is the character index at which
+            tokens[i] starts and offsets[-1] == len(content), or None if the underlying
+            tokenizer cannot map its tokens back onto the original string.
+        """
+        tokens = self.tokenizer.encode(content)
+
+        decode_tokens_bytes = getattr(self.tokenizer, "decode_tokens_bytes", None)
+        if decode_tokens_bytes is not None:
+            # Byte-level BPE (tiktoken): a token starts as many characters as it has
+            # bytes that are not UTF-8 continuation bytes. This only depends on the
+            # token id, so the counts are cached across documents.
+            char_counts = self._token_char_counts
+            missing = list(set(tokens).difference(char_counts))
+            for token, token_bytes in zip(missing, decode_tokens_bytes(missing)):
+                char_counts[token] = sum(1 for b in token_bytes if not 0x80 <= b < 0xC0)
+            offsets = [0, *accumulate(map(char_counts.__getitem__, tokens))]
+        else:
+            # Generic tokenizers: only usable if single-token decodes concatenate back
+            # to the original string
+            pieces = [self.tokenizer.decode([token]) for token in tokens]
+            if "".join(pieces) != content:
+                return None
+            offsets = [0, *accumulate(map(len, pieces))]
+
+        if offsets[-1] != len(content):
+            return None
+        return tokens, offsets
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -1294,6 +1525,685 @@ class TiktokenTokenizer(Tokenizer):
             raise ValueError(f"Invalid model_name: {model_name}.")
 
 
+# Process-wide tokenizer registry: tiktoken encodings are expensive to build
+_shared_tokenizers: dict[str, TiktokenTokenizer] = {}
+_shared_tokenizers_lock = threading.Lock()
+
+
+def get_shared_tokenizer(model_name: str = "gpt-4o-mini") -> TiktokenTokenizer:
+    """Return the process-wide TiktokenTokenizer for a model, creating it on first use
+
+    Tokenizers are stateless apart from their caches, so one instance per model is shared
+    by ingestion, query-time truncation and rerank chunking.
+
+    Raises:
+        ImportError: If tiktoken is not installed.
+        ValueError: If the model_name is invalid.
+    """
+    tokenizer = _shared_tokenizers.get(model_name)
+    if tokenizer is None:
+        with _shared_tokenizers_lock:
+            tokenizer = _shared_tokenizers.get(model_name)
+            if tokenizer is None:
+                tokenizer = TiktokenTokenizer(model_name)
+                _shared_tokenizers[model_name] = tokenizer
+    return tokenizer
+
+
+# Chunking function and tokenizer installed in each chunking process pool worker
+_chunking_worker_state: tuple[Callable[..., Any], Tokenizer] | None = None
+
+
+def _init_chunking_worker(chunking_func: Callable[..., Any], tokenizer: Tokenizer):
+    """Process pool initializer: ship the chunking function and tokenizer once per worker."""
+    global _chunking_worker_state
+    _chunking_worker_state = (chunking_func, tokenizer)
+
+
+def _run_chunking_batch(
+    jobs: list[tuple[str, str | None, bool, int, int]],
+    chunking_func: Callable[..., Any] | None = None,
+    tokenizer: Tokenizer | None = None,
+) -> list[tuple[bool, Any]]:
+    """Chunk several documents in a single executor call.
+
+    Returns one (ok, result_or_exception) pair per job so that a failing document
+    does not fail the other documents of the batch.
+    """
+    in_process_worker = chunking_func is None
+    if in_process_worker:
+        chunking_func, tokenizer = _chunking_worker_state
+
+    results: list[tuple[bool, Any]] = []
+    for content, split_by_character, split_by_character_only, overlap, size in jobs:
+        try:
+            results.append(
+                (
+                    True,
+                    chunking_func(
+                        tokenizer,
+                        content,
+                        split_by_character,
+                        split_by_character_only,
+                        overlap,
+                        size,
+                    ),
+                )
+            )
+        except Exception as e:
+            if in_process_worker:
+                # Exceptions must survive the trip back to the parent process
+                try:
+                    pickle.loads(pickle.dumps(e))
+                except Exception:
+                    e = RuntimeError(f"{type(e).__name__}: {e}")
+            results.append((False, e))
+    return results
+
+
+class ChunkingExecutor:
+    """
+    Runs a synchronous chunking function in a thread or process pool, off the event loop.
+
+    Concurrent `chunk` calls are collected for up to `batch_window` seconds (or until
+    `batch_size` documents are waiting) and sent to the pool as one batch; each caller
+    gets back the result for its own document.
+    """
+
+    def __init__(
+        self,
+        chunking_func: Callable[..., Any],
+        tokenizer: Tokenizer,
+        mode: str = "thread",
+        max_workers: int = 4,
+        batch_size: int = 4,
+        batch_window: float = 0.01,
+    ):
+        """
+        Args:
+            chunking_func: Synchronous chunking function with the `LightRAG.chunking_func` signature.
+            tokenizer: Tokenizer passed to the chunking function.
+            mode: "thread" for a thread pool or "process" for a process pool.
+            max_workers: Number of pool workers.
+            batch_size: Maximum number of documents per worker call.
+            batch_window: Seconds to wait for more documents before dispatching a partial batch.
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(
+                f"Invalid chunking executor mode: {mode}. Expected 'thread' or 'process'."
+            )
+        if mode == "process":
+            try:
+                pickle.dumps((chunking_func, tokenizer))
+            except Exception as e:
+                logger.warning(
+                    f"Chunking function or tokenizer cannot be sent to worker processes ({e}), using thread pool instead"
+                )
+                mode = "thread"
+
+        self.chunking_func = chunking_func
+        self.tokenizer = tokenizer
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self._executor: concurrent.futures.Executor | None = None
+        self._pending: list[tuple[tuple, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._dispatch_tasks: set[asyncio.Task] = set()
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # fork is unsafe once the event loop and its threads are running
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_chunking_worker,
+                    initargs=(self.chunking_func, self.tokenizer),
+                )
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="lightrag-chunking",
+                )
+            logger.info(
+                f"Chunking executor started: {self.mode} pool with {self.max_workers} workers"
+            )
+        return self._executor
+
+    async def chunk(
+        self,
+        content: str,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+        chunk_overlap_token_size: int,
+        chunk_token_size: int,
+    ) -> Any:
+        """Chunk one document in the pool, batched with other concurrent calls."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(
+            (
+                (
+                    content,
+                    split_by_character,
+                    split_by_character_only,
+                    chunk_overlap_token_size,
+                    chunk_token_size,
+                ),
+                future,
+            )
+        )
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: list[tuple[tuple, asyncio.Future]]) -> None:
+        jobs = [job for job, _ in batch]
+        if self.mode == "process":
+            call = partial(_run_chunking_batch, jobs)
+        else:
+            call = partial(
+                _run_chunking_batch, jobs, self.chunking_func, self.tokenizer
+            )
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), call
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), (ok, value) in zip(batch, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def shutdown(self) -> None:
+        """Stop the pool; pending batches are cancelled."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending:
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class QueryEmbeddingCache:
+    """
+    Embeddings computed during a single query call, keyed by text.
+
+    `prefetch` embeds every text that is not cached yet in one embedding_func call,
+    deduplicating identical strings, so the query and the keyword vector searches of
+    one query share a single embedding round trip.
+    """
+
+    def __init__(self, embedding_func: Callable[..., Any] | None):
+        self.embedding_func = embedding_func
+        self._embeddings: dict[str, Any] = {}
+
+    async def prefetch(self, texts: Iterable[str]) -> None:
+        """Embed all missing texts with a single embedding_func call."""
+        missing = list(
+            dict.fromkeys(t for t in texts if t and t not in self._embeddings)
+        )
+        if not missing or self.embedding_func is None:
+            return
+        try:
+            # Higher priority for query embeddings
+            embeddings = await self.embedding_func(missing, _priority=5)
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embeddings: {e}")
+            return
+        for text, embedding in zip(missing, embeddings):
+            self._embeddings[text] = embedding
+        logger.debug(f"Pre-computed {len(missing)} query embedding(s) in one batch")
+
+    def get(self, text: str) -> Any | None:
+        """Cached embedding of text, or None if it was not (successfully) prefetched."""
+        return self._embeddings.get(text)
+
+
+class QueryContextCache:
+    """Bounded in-process LRU of retrieval results, invalidated by the data version
+
+    Entries hold whatever the query path stores for a retrieval key (for kg_query the
+    extracted keywords and the `_build_query_context` result) together with the
+    workspace data version they were built at. An entry built at an older version is
+    dropped on lookup, so any insert, delete or edit of the workspace invalidates the
+    whole cache without an explicit flush.
+
+    Values are deep-copied on `put` and `get`, so callers may keep mutating what they
+    stored or received.
+
+    Args:
+        max_entries: Maximum number of cached retrieval results
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # key -> (data_version, value)
+        self._entries: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(query: str, query_param: Any) -> str:
+        """Hash of the normalized query and the QueryParam fields that shape retrieval
+
+        response_type and user_prompt are part of the system prompt that sizes the
+        chunk token budget, so they change the built context as well.
+        """
+        return compute_args_hash(
+            " ".join(query.split()),
+            query_param.mode,
+            query_param.response_type,
+            query_param.user_prompt or "",
+            query_param.top_k,
+            query_param.chunk_top_k,
+            query_param.max_entity_tokens,
+            query_param.max_relation_tokens,
+            query_param.max_total_tokens,
+            query_param.enable_rerank,
+            ", ".join(query_param.hl_keywords or []),
+            ", ".join(query_param.ll_keywords or []),
+        )
+
+    def get(self, key: str, version: int) -> Any | None:
+        """Return a copy of the value cached for key at version, or None"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: str, version: int, value: Any) -> None:
+        """Store value for key at version, evicting least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (version, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries (hit/miss counters are kept)"""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class SemanticQueryCache:
+    """Bounded in-process cache of query answers looked up by query embedding similarity
+
+    Each entry holds the normalized query embedding, the cached answer (the aquery_llm
+    result), the workspace data version it was built at and its insertion time. Entries
+    are grouped in scopes (see `make_scope`) so only answers produced by the same mode
+    and response-shaping QueryParam fields can match. Per scope the embeddings are
+    stacked in one matrix that is rebuilt lazily after the scope changes, so a lookup is
+    a single matrix-vector product.
+
+    Entries expire after `ttl` seconds (0 disables expiry), are dropped once the data
+    version moves on, and the least recently used entry is evicted beyond `max_entries`.
+
+    Args:
+        similarity_threshold: Minimum cosine similarity for a cached answer to be reused
+        max_entries: Maximum number of cached answers over all scopes
+        ttl: Seconds an entry stays valid; 0 disables expiry
+    """
+
+    def __init__(self, similarity_threshold: float, max_entries: int, ttl: float = 0):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # (scope, normalized query) -> (unit embedding, value, data_version, inserted_at)
+        self._entries: OrderedDict[
+            tuple[str, str], tuple[np.ndarray, Any, int, float]
+        ] = OrderedDict()
+        # scope -> (entry keys, stacked unit embeddings)
+        self._index: dict[str, tuple[list[tuple[str, str]], np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_scope(query_param: Any) -> str:
+        """Scope of the mode and the QueryParam fields that shape the answer"""
+        return f"{query_param.mode}:" + compute_args_hash(
+            query_param.response_type,
+            query_param.user_prompt or "",
+            query_param.top_k,
+            query_param.chunk_top_k,
+            query_param.max_entity_tokens,
+            query_param.max_relation_tokens,
+            query_param.max_total_tokens,
+            query_param.enable_rerank,
+            ", ".join(query_param.hl_keywords or []),
+            ", ".join(query_param.ll_keywords or []),
+        )
+
+    @staticmethod
+    def _unit_vector(embedding: Any) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def _scope_index(self, scope: str) -> tuple[list[tuple[str, str]], np.ndarray]:
+        index = self._index.get(scope)
+        if index is None:
+            keys = [key for key in self._entries if key[0] == scope]
+            matrix = (
+                np.stack([self._entries[key][0] for key in keys])
+                if keys
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            index = self._index[scope] = (keys, matrix)
+        return index
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._index.pop(key[0], None)
+
+    def lookup(
+        self, scope: str, embedding: Any, version: int
+    ) -> tuple[Any, float] | None:
+        """Return (copy of the cached value, similarity) of the closest valid entry, or None"""
+        query_vector = self._unit_vector(embedding)
+        keys, matrix = self._scope_index(scope)
+        if query_vector is None or not keys or matrix.shape[1] != query_vector.shape[0]:
+            self.misses += 1
+            return None
+
+        scores = matrix @ query_vector
+        now = time.monotonic()
+        for i in np.argsort(-scores):
+            score = float(scores[i])
+            if score < self.similarity_threshold:
+                break
+            key = keys[i]
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if entry[2] != version or (self.ttl > 0 and now - entry[3] > self.ttl):
+                self._remove(key)
+                continue
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1]), score
+
+        self.misses += 1
+        return None
+
+    def store(
+        self, scope: str, query: str, embedding: Any, version: int, value: Any
+    ) -> None:
+        """Cache value for query, evicting least recently used entries beyond capacity"""
+        if self.max_entries <= 0:
+            return
+        vector = self._unit_vector(embedding)
+        if vector is None:
+            return
+        key = (scope, " ".join(query.split()))
+        self._entries[key] = (vector, copy.deepcopy(value), version, time.monotonic())
+        self._entries.move_to_end(key)
+        self._index.pop(scope, None)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._index.pop(evicted_key[0], None)
+
+    def clear(self) -> None:
+        """Drop all entries (hit/miss counters are kept)"""
+        self._entries.clear()
+        self._index.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class EmbeddingCache:
+    """Persistent content-addressed cache of embedding vectors
+
+    Vectors are keyed by `(model_name, embedding_dim, sha256(text))`, so re-embedding
+    text whose vector is already known (re-ingesting a modified document, rebuilding
+    after a partial delete, migrating vector backends) never reaches the provider.
+    The vectors live in a backend (`KVEmbeddingCacheBackend` or
+    `MmapEmbeddingCacheBackend`) that also enforces the size cap.
+
+    Args:
+        backend: Storage backend of the cached vectors
+        model_name: Embedding model name
+        embedding_dim: Embedding dimension
+    """
+
+    def __init__(self, backend: Any, model_name: str, embedding_dim: int):
+        self.backend = backend
+        self.model_name = model_name
+        self.embedding_dim = embedding_dim
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, text: str) -> str:
+        digest = sha256(text.encode("utf-8", errors="replace")).hexdigest()
+        return f"{self.model_name}:{self.embedding_dim}:{digest}"
+
+    async def get_many(self, texts: Iterable[str]) -> dict[str, np.ndarray]:
+        """Cached vectors of the given texts, keyed by text (misses are left out)"""
+        keys = {text: self.make_key(text) for text in dict.fromkeys(texts)}
+        try:
+            found = await self.backend.get(list(keys.values()))
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            found = {}
+        vectors = {text: found[key] for text, key in keys.items() if key in found}
+        self.hits += len(vectors)
+        self.misses += len(keys) - len(vectors)
+        return vectors
+
+    async def put_many(self, vectors: dict[str, np.ndarray]) -> None:
+        """Cache vectors keyed by their text"""
+        if not vectors:
+            return
+        try:
+            await self.backend.put(
+                {
+                    self.make_key(text): np.asarray(vector, dtype=np.float32)
+                    for text, vector in vectors.items()
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Embedding cache update failed: {e}")
+
+    async def initialize(self) -> None:
+        """Load the backend state persisted by earlier runs"""
+        await self.backend.initialize()
+
+    async def flush(self) -> None:
+        """Persist pending cache writes"""
+        await self.backend.flush()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "model_name": self.model_name,
+            "embedding_dim": self.embedding_dim,
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class KVEmbeddingCacheBackend:
+    """EmbeddingCache backend storing base64 float32 vectors in a BaseKVStorage
+
+    The size cap evicts the least recently used entries. `initialize` seeds the
+    recency order with the entries persisted by earlier runs (as the least recently
+    used ones), so they count against the cap as well.
+
+    Args:
+        kv_storage: KV storage of the `embedding_cache` namespace
+        max_entries: Maximum number of cached vectors; 0 means unbounded
+    """
+
+    def __init__(self, kv_storage: Any, max_entries: int = 0):
+        self.kv_storage = kv_storage
+        self.max_entries = max_entries
+        self._recent: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    async def initialize(self) -> None:
+        """Load the keys persisted by earlier runs and enforce the size cap on them"""
+        touched = list(self._recent)
+        self._recent.clear()
+        async for keys in self.kv_storage.iter_keys():
+            self._recent.update(dict.fromkeys(keys))
+        evicted = self._touch(touched)
+        if evicted:
+            await self.kv_storage.delete(evicted)
+
+    def _touch(self, keys: Iterable[str]) -> list[str]:
+        for key in keys:
+            self._recent[key] = None
+            self._recent.move_to_end(key)
+        evicted = []
+        while self.max_entries > 0 and len(self._recent) > self.max_entries:
+            evicted.append(self._recent.popitem(last=False)[0])
+        return evicted
+
+    async def get(self, keys: list[str]) -> dict[str, np.ndarray]:
+        records = await self.kv_storage.get_by_ids(keys)
+        found = {
+            key: np.frombuffer(base64.b64decode(record["vector"]), dtype=np.float32)
+            for key, record in zip(keys, records)
+            if record and record.get("vector")
+        }
+        evicted = self._touch(found)
+        if evicted:
+            await self.kv_storage.delete(evicted)
+        return found
+
+    async def put(self, vectors: dict[str, np.ndarray]) -> None:
+        await self.kv_storage.upsert(
+            {
+                key: {"vector": base64.b64encode(vector.tobytes()).decode("ascii")}
+                for key, vector in vectors.items()
+            }
+        )
+        evicted = self._touch(vectors)
+        if evicted:
+            await self.kv_storage.delete(evicted)
+
+    async def flush(self) -> None:
+        await self.kv_storage.index_done_callback()
+
+
+class MmapEmbeddingCacheBackend:
+    """EmbeddingCache backend in a local memory-mapped float32 file
+
+    Uses the append-only MmapVectorDB layout without normalization. Beyond
+    `max_entries` the least recently used vectors are dropped and reclaimed by
+    compaction on flush. Recency starts from the write order of the loaded store.
+    The files are not shared safely between processes; use the KV backend for
+    multi-worker deployments.
+
+    Args:
+        storage_prefix: File prefix of the memory-mapped store
+        embedding_dim: Embedding dimension
+        max_entries: Maximum number of cached vectors; 0 means unbounded
+    """
+
+    def __init__(self, storage_prefix: str, embedding_dim: int, max_entries: int = 0):
+        from lightrag.kg.nano_vector_db_impl import MmapVectorDB
+
+        self.max_entries = max_entries
+        self._db = MmapVectorDB(embedding_dim, storage_prefix, normalize=False)
+        self._recent: OrderedDict[str, None] = OrderedDict.fromkeys(self._db.ids())
+
+    def __len__(self) -> int:
+        return len(self._db)
+
+    async def initialize(self) -> None:
+        pass
+
+    async def get(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found = {
+            key: np.array(vector) for key, vector in self._db.get_vectors(keys).items()
+        }
+        for key in found:
+            self._recent.move_to_end(key)
+        return found
+
+    async def put(self, vectors: dict[str, np.ndarray]) -> None:
+        self._db.upsert(
+            [{"__id__": key, "__vector__": vector} for key, vector in vectors.items()]
+        )
+        for key in vectors:
+            self._recent[key] = None
+            self._recent.move_to_end(key)
+        evicted = []
+        while self.max_entries > 0 and len(self._recent) > self.max_entries:
+            evicted.append(self._recent.popitem(last=False)[0])
+        if evicted:
+            self._db.delete(evicted)
+
+    async def flush(self) -> None:
+        self._db.save()
+        if self._db.needs_compaction:
+            self._db.compact()
+
+
 def pack_user_ass_to_openai_messages(*args: str):
     roles = ["user", "assistant"]
     return [
@@ -1323,9 +2233,12 @@ def truncate_list_by_token_size(
     """Truncate a list of data by token size"""
     if max_token_size <= 0:
         return []
+    count_tokens = getattr(tokenizer, "count_tokens", None) or (
+        lambda content: len(tokenizer.encode(content))
+    )
     tokens = 0
     for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+        tokens += count_tokens(key(data))
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
@@ -1339,6 +2252,203 @@ def cosine_similarity(v1, v2):
     return dot_product / (norm1 * norm2)
 
 
+def batch_cosine_similarity(query_vector, vectors) -> np.ndarray:
+    """Calculate cosine similarity between one query vector and many vectors at once
+
+    Args:
+        query_vector: Query embedding, shape (dim,)
+        vectors: Candidate embeddings, a sequence of vectors or an array of shape (n, dim)
+
+    Returns:
+        Array of n similarities (0 for zero-length vectors)
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.size == 0:
+        return np.empty(0, dtype=np.float32)
+    query = np.asarray(query_vector, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    dot_products = matrix @ query
+    return np.divide(
+        dot_products, norms, out=np.zeros_like(dot_products), where=norms != 0
+    )
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, highest first (argpartition + sort of the k winners)"""
+    if k <= 0 or len(scores) == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    # Stable sort keeps candidate order for equal scores
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class LLMCacheMemoryTier:
+    """Bounded in-process LRU/TTL tier in front of the LLM response cache storage
+
+    Entries are keyed by the flattened `{mode}:{cache_type}:{hash}` cache key and hold
+    (content, create_time). The tier is write-through: `save_to_cache` always writes the
+    storage backend as well, so dropping the tier never loses data.
+
+    Args:
+        max_bytes: Upper bound for the accounted size (keys + contents, UTF-8 bytes)
+        ttl: Seconds an entry stays valid; 0 disables expiry
+    """
+
+    def __init__(self, max_bytes: int, ttl: float = 0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Shared invalidation version the entries were filled under (None: not synced yet)
+        self.version: int | None = None
+        # key -> (content, create_time, size, inserted_at)
+        self._entries: OrderedDict[str, tuple[Any, int, int, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_size(key: str, content: Any) -> int:
+        if isinstance(content, str):
+            content_size = len(content.encode("utf-8", errors="replace"))
+        else:
+            content_size = len(json.dumps(content, ensure_ascii=False, default=str))
+        return len(key.encode("utf-8")) + content_size
+
+    def get(self, key: str) -> tuple[Any, int] | None:
+        """Return (content, create_time) and mark the entry as recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self.ttl > 0 and time.monotonic() - entry[3] > self.ttl:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def peek(self, key: str) -> Any | None:
+        """Return the cached content without touching recency or hit/miss counters"""
+        entry = self._entries.get(key)
+        if entry is None or (self.ttl > 0 and time.monotonic() - entry[3] > self.ttl):
+            return None
+        return entry[0]
+
+    def put(self, key: str, content: Any, create_time: int | None = None) -> None:
+        """Insert or replace an entry, evicting least recently used entries if needed"""
+        size = self._entry_size(key, content)
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+        if create_time is None:
+            create_time = int(time.time())
+        self._entries[key] = (content, create_time, size, time.monotonic())
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= evicted[2]
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[2]
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """Drop the given keys from the tier"""
+        for key in keys:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries (hit/miss counters are kept)"""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def get_llm_cache_memory_tier(hashing_kv) -> LLMCacheMemoryTier | None:
+    """Return the in-process tier of an LLM response cache storage, creating it on first use
+
+    The tier is enabled by `llm_cache_memory_max_bytes` > 0 in the storage's global_config.
+    """
+    if hashing_kv is None:
+        return None
+    tier = getattr(hashing_kv, "_llm_cache_memory_tier", None)
+    if tier is not None:
+        return tier
+    global_config = getattr(hashing_kv, "global_config", None) or {}
+    max_bytes = global_config.get("llm_cache_memory_max_bytes", 0) or 0
+    if max_bytes <= 0:
+        return None
+    tier = LLMCacheMemoryTier(
+        max_bytes, global_config.get("llm_cache_memory_ttl", 0) or 0
+    )
+    hashing_kv._llm_cache_memory_tier = tier
+    return tier
+
+
+async def sync_llm_cache_memory_tier(hashing_kv) -> LLMCacheMemoryTier | None:
+    """Return the memory tier of a cache storage after dropping it if another process
+    invalidated the cache since the tier was last synced
+
+    Without initialized shared data the tier is purely process local and returned as is.
+    """
+    tier = get_llm_cache_memory_tier(hashing_kv)
+    if tier is None:
+        return None
+    from lightrag.kg.shared_storage import get_llm_cache_tier_version
+
+    try:
+        version = await get_llm_cache_tier_version(
+            getattr(hashing_kv, "workspace", None)
+        )
+    except ValueError:
+        return tier
+    if tier.version != version:
+        if tier.version is not None:
+            tier.clear()
+        tier.version = version
+    return tier
+
+
+async def invalidate_llm_cache_memory_tier(
+    hashing_kv, keys: Iterable[str] | None = None
+) -> None:
+    """Drop cache keys (or everything when keys is None) from the memory tier of every worker
+
+    The local tier is updated directly; other workers drop their whole tier on their next
+    lookup because the shared tier version moves.
+    """
+    tier = get_llm_cache_memory_tier(hashing_kv)
+    if tier is None:
+        return
+    if keys is None:
+        tier.clear()
+    else:
+        tier.invalidate(keys)
+    from lightrag.kg.shared_storage import bump_llm_cache_tier_version
+
+    try:
+        await bump_llm_cache_tier_version(getattr(hashing_kv, "workspace", None))
+    except ValueError:
+        pass
+
+
 async def handle_cache(
     hashing_kv,
     args_hash,
@@ -1363,11 +2473,21 @@ async def handle_cache(
 
     # Use flattened cache key format: {mode}:{cache_type}:{hash}
     flattened_key = generate_cache_key(mode, cache_type, args_hash)
+
+    memory_tier = await sync_llm_cache_memory_tier(hashing_kv)
+    if memory_tier is not None:
+        cached = memory_tier.get(flattened_key)
+        if cached is not None:
+            logger.debug(f"Memory cache hit(key:{flattened_key})")
+            return cached
+
     cache_entry = await hashing_kv.get_by_id(flattened_key)
     if cache_entry:
         logger.debug(f"Flattened cache hit(key:{flattened_key})")
         content = cache_entry["return"]
         timestamp = cache_entry.get("create_time", 0)
+        if memory_tier is not None:
+            memory_tier.put(flattened_key, content, timestamp)
         return content, timestamp
 
     logger.debug(f"Cache missed(mode:{mode} type:{cache_type})")
@@ -1406,15 +2526,19 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
         cache_data.mode, cache_data.cache_type, cache_data.args_hash
     )
 
-    # Check if we already have identical content cached
-    existing_cache = await hashing_kv.get_by_id(flattened_key)
-    if existing_cache:
-        existing_content = existing_cache.get("return")
-        if existing_content == cache_data.content:
-            logger.warning(
-                f"Cache duplication detected for {flattened_key}, skipping update"
-            )
-            return
+    # Check if we already have identical content cached. With the memory tier enabled
+    # the tier answers this check; a key missing from it is simply (re)written.
+    memory_tier = await sync_llm_cache_memory_tier(hashing_kv)
+    if memory_tier is not None:
+        existing_content = memory_tier.peek(flattened_key)
+    else:
+        existing_cache = await hashing_kv.get_by_id(flattened_key)
+        existing_content = existing_cache.get("return") if existing_cache else None
+    if existing_content is not None and existing_content == cache_data.content:
+        logger.warning(
+            f"Cache duplication detected for {flattened_key}, skipping update"
+        )
+        return
 
     # Create cache entry with flattened structure
     cache_entry = {
@@ -1429,8 +2553,10 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
 
     logger.info(f" == LLM cache == saving: {flattened_key}")
 
-    # Save using flattened key
+    # Save using flattened key (write-through)
     await hashing_kv.upsert({flattened_key: cache_entry})
+    if memory_tier is not None:
+        memory_tier.put(flattened_key, cache_data.content)
 
 
 def safe_unicode_decode(content):
@@ -1487,307 +2613,367 @@ def always_get_an_event_loop() -> asyncio.AbstractEventLoop:
         return new_loop
 
 
-async def aexport_data(
-    chunk_entity_relation_graph,
-    entities_vdb,
-    relationships_vdb,
-    output_path: str,
-    file_format: str = "csv",
-    include_vector_data: bool = False,
-) -> None:
-    """
-    Asynchronously exports all entities, relations, and relationships to various formats.
+EXPORT_FILE_FORMATS = ("csv", "excel", "md", "txt", "jsonl", "parquet")
+
+# Row type written to JSONL/Parquet output for each export section
+_EXPORT_SECTION_TYPES = {
+    "entities": "entity",
+    "relations": "relation",
+    "relationships": "relationship",
+}
+
+_EXPORT_COLUMNS = (
+    "type",
+    "entity_name",
+    "src_entity",
+    "tgt_entity",
+    "relationship_id",
+    "source_id",
+    "graph_data",
+    "vector_data",
+    "data",
+)
 
-    Args:
-        chunk_entity_relation_graph: Graph storage instance for entities and relations
-        entities_vdb: Vector database storage for entities
-        relationships_vdb: Vector database storage for relationships
-        output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
-            - csv: Comma-separated values file
-            - excel: Microsoft Excel file with multiple sheets
-            - md: Markdown tables
-            - txt: Plain text formatted output
-        include_vector_data: Whether to include data from the vector database.
-    """
-    # Collect data
-    entities_data = []
-    relations_data = []
-    relationships_data = []
-
-    # --- Entities ---
-    all_entities = await chunk_entity_relation_graph.get_all_labels()
-    for entity_name in all_entities:
-        # Get entity information from graph
-        node_data = await chunk_entity_relation_graph.get_node(entity_name)
-        source_id = node_data.get("source_id") if node_data else None
-
-        entity_info = {
-            "graph_data": node_data,
-            "source_id": source_id,
-        }
+# Excel limits a worksheet to 1,048,576 rows including the header row
+_EXCEL_MAX_DATA_ROWS = 1_048_575
 
-        # Optional: Get vector database information
-        if include_vector_data:
-            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
-            vector_data = await entities_vdb.get_by_id(entity_id)
-            entity_info["vector_data"] = vector_data
-
-        entity_row = {
-            "entity_name": entity_name,
-            "source_id": source_id,
-            "graph_data": str(
-                entity_info["graph_data"]
-            ),  # Convert to string to ensure compatibility
-        }
-        if include_vector_data and "vector_data" in entity_info:
-            entity_row["vector_data"] = str(entity_info["vector_data"])
-        entities_data.append(entity_row)
-
-    # --- Relations ---
-    for src_entity in all_entities:
-        for tgt_entity in all_entities:
-            if src_entity == tgt_entity:
-                continue
 
-            edge_exists = await chunk_entity_relation_graph.has_edge(
-                src_entity, tgt_entity
+def _relation_vdb_ids(edge: dict) -> tuple[str, str]:
+    """Vector ids a relation may be stored under (either endpoint order)"""
+    src, tgt = edge["source"], edge["target"]
+    return (
+        compute_mdhash_id(src + tgt, prefix="rel-"),
+        compute_mdhash_id(tgt + src, prefix="rel-"),
+    )
+
+
+async def _fetch_relation_vectors(relationships_vdb, edges: list[dict]) -> list:
+    """Fetch the vector row of each edge with a single get_by_ids call"""
+    ids = []
+    for edge in edges:
+        ids.extend(_relation_vdb_ids(edge))
+    rows = await relationships_vdb.get_by_ids(ids) if ids else []
+    return [rows[i] or rows[i + 1] for i in range(0, len(rows), 2)]
+
+
+async def _iter_export_entities(
+    graph, entities_vdb, include_vector_data: bool, batch_size: int
+) -> AsyncIterator[list[dict]]:
+    async for nodes in graph.iter_nodes(batch_size):
+        names = [node.get("id") or node.get("entity_id") for node in nodes]
+        vectors = [None] * len(nodes)
+        if include_vector_data and nodes:
+            vectors = await entities_vdb.get_by_ids(
+                [compute_mdhash_id(name, prefix="ent-") for name in names]
             )
-            if edge_exists:
-                # Get edge information from graph
-                edge_data = await chunk_entity_relation_graph.get_edge(
-                    src_entity, tgt_entity
-                )
-                source_id = edge_data.get("source_id") if edge_data else None
 
-                relation_info = {
-                    "graph_data": edge_data,
-                    "source_id": source_id,
-                }
+        rows = []
+        for name, node, vector_data in zip(names, nodes, vectors):
+            graph_data = {k: v for k, v in node.items() if k != "id"}
+            row = {
+                "entity_name": name,
+                "source_id": graph_data.get("source_id"),
+                "graph_data": graph_data,
+            }
+            if include_vector_data:
+                row["vector_data"] = vector_data
+            rows.append(row)
+        yield rows
 
-                # Optional: Get vector database information
-                if include_vector_data:
-                    rel_id = compute_mdhash_id(src_entity + tgt_entity, prefix="rel-")
-                    vector_data = await relationships_vdb.get_by_id(rel_id)
-                    relation_info["vector_data"] = vector_data
-
-                relation_row = {
-                    "src_entity": src_entity,
-                    "tgt_entity": tgt_entity,
-                    "source_id": relation_info["source_id"],
-                    "graph_data": str(relation_info["graph_data"]),  # Convert to string
-                }
-                if include_vector_data and "vector_data" in relation_info:
-                    relation_row["vector_data"] = str(relation_info["vector_data"])
-                relations_data.append(relation_row)
-
-    # --- Relationships (from VectorDB) ---
-    all_relationships = await relationships_vdb.client_storage
-    for rel in all_relationships["data"]:
-        relationships_data.append(
-            {
-                "relationship_id": rel["__id__"],
-                "data": str(rel),  # Convert to string for compatibility
+
+async def _iter_export_relations(
+    graph, relationships_vdb, include_vector_data: bool, batch_size: int
+) -> AsyncIterator[list[dict]]:
+    async for edges in graph.iter_edges(batch_size):
+        vectors = [None] * len(edges)
+        if include_vector_data:
+            vectors = await _fetch_relation_vectors(relationships_vdb, edges)
+
+        rows = []
+        for edge, vector_data in zip(edges, vectors):
+            graph_data = {
+                k: v for k, v in edge.items() if k not in ("source", "target")
             }
-        )
+            row = {
+                "src_entity": edge["source"],
+                "tgt_entity": edge["target"],
+                "source_id": graph_data.get("source_id"),
+                "graph_data": graph_data,
+            }
+            if include_vector_data:
+                row["vector_data"] = vector_data
+            rows.append(row)
+        yield rows
+
+
+async def _iter_export_relationships(
+    relationships_vdb, batch_size: int
+) -> AsyncIterator[list[dict]]:
+    async for records in relationships_vdb.iter_items(batch_size):
+        yield [
+            {"relationship_id": rel_id, "data": record}
+            for rel_id, record in records.items()
+        ]
 
-    # Export based on format
-    if file_format == "csv":
-        # CSV export
-        with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            # Entities
-            if entities_data:
-                csvfile.write("# ENTITIES\n")
-                writer = csv.DictWriter(csvfile, fieldnames=entities_data[0].keys())
-                writer.writeheader()
-                writer.writerows(entities_data)
-                csvfile.write("\n\n")
 
-            # Relations
-            if relations_data:
-                csvfile.write("# RELATIONS\n")
-                writer = csv.DictWriter(csvfile, fieldnames=relations_data[0].keys())
+class _CsvExportWriter:
+    def __init__(self, output_path: str):
+        self._file = open(output_path, "w", newline="", encoding="utf-8")
+        self._sections_written = 0
+
+    async def write_section(self, name: str, make_rows) -> None:
+        writer = None
+        async for rows in make_rows():
+            if not rows:
+                continue
+            if writer is None:
+                if self._sections_written:
+                    self._file.write("\n\n")
+                self._file.write(f"# {name.upper()}\n")
+                writer = csv.DictWriter(self._file, fieldnames=rows[0].keys())
                 writer.writeheader()
-                writer.writerows(relations_data)
-                csvfile.write("\n\n")
-
-            # Relationships
-            if relationships_data:
-                csvfile.write("# RELATIONSHIPS\n")
-                writer = csv.DictWriter(
-                    csvfile, fieldnames=relationships_data[0].keys()
+                self._sections_written += 1
+            writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _MarkdownExportWriter:
+    def __init__(self, output_path: str):
+        self._file = open(output_path, "w", encoding="utf-8")
+        self._file.write("# LightRAG Data Export\n\n")
+
+    async def write_section(self, name: str, make_rows) -> None:
+        self._file.write(f"## {name.capitalize()}\n\n")
+        has_rows = False
+        async for rows in make_rows():
+            for row in rows:
+                if not has_rows:
+                    self._file.write("| " + " | ".join(row.keys()) + " |\n")
+                    self._file.write("| " + " | ".join(["---"] * len(row)) + " |\n")
+                    has_rows = True
+                self._file.write(
+                    "| " + " | ".join(str(v) for v in row.values()) + " |\n"
                 )
-                writer.writeheader()
-                writer.writerows(relationships_data)
+        if has_rows:
+            self._file.write("\n\n")
+        else:
+            self._file.write(f"*No {_EXPORT_SECTION_TYPES[name]} data available*\n\n")
 
-    elif file_format == "excel":
-        # Excel export
-        import pandas as pd
+    def close(self) -> None:
+        self._file.close()
 
-        entities_df = pd.DataFrame(entities_data) if entities_data else pd.DataFrame()
-        relations_df = (
-            pd.DataFrame(relations_data) if relations_data else pd.DataFrame()
-        )
-        relationships_df = (
-            pd.DataFrame(relationships_data) if relationships_data else pd.DataFrame()
-        )
 
-        with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-            if not entities_df.empty:
-                entities_df.to_excel(writer, sheet_name="Entities", index=False)
-            if not relations_df.empty:
-                relations_df.to_excel(writer, sheet_name="Relations", index=False)
-            if not relationships_df.empty:
-                relationships_df.to_excel(
-                    writer, sheet_name="Relationships", index=False
-                )
+class _TextExportWriter:
+    """Fixed-width text tables; each section is read twice to size its columns"""
 
-    elif file_format == "md":
-        # Markdown export
-        with open(output_path, "w", encoding="utf-8") as mdfile:
-            mdfile.write("# LightRAG Data Export\n\n")
-
-            # Entities
-            mdfile.write("## Entities\n\n")
-            if entities_data:
-                # Write header
-                mdfile.write("| " + " | ".join(entities_data[0].keys()) + " |\n")
-                mdfile.write(
-                    "| " + " | ".join(["---"] * len(entities_data[0].keys())) + " |\n"
-                )
+    def __init__(self, output_path: str):
+        self._file = open(output_path, "w", encoding="utf-8")
+        self._file.write("LIGHTRAG DATA EXPORT\n")
+        self._file.write("=" * 80 + "\n\n")
 
-                # Write rows
-                for entity in entities_data:
-                    mdfile.write(
-                        "| " + " | ".join(str(v) for v in entity.values()) + " |\n"
-                    )
-                mdfile.write("\n\n")
-            else:
-                mdfile.write("*No entity data available*\n\n")
-
-            # Relations
-            mdfile.write("## Relations\n\n")
-            if relations_data:
-                # Write header
-                mdfile.write("| " + " | ".join(relations_data[0].keys()) + " |\n")
-                mdfile.write(
-                    "| " + " | ".join(["---"] * len(relations_data[0].keys())) + " |\n"
-                )
+    async def write_section(self, name: str, make_rows) -> None:
+        self._file.write(f"{name.upper()}\n")
+        self._file.write("-" * 80 + "\n")
 
-                # Write rows
-                for relation in relations_data:
-                    mdfile.write(
-                        "| " + " | ".join(str(v) for v in relation.values()) + " |\n"
-                    )
-                mdfile.write("\n\n")
-            else:
-                mdfile.write("*No relation data available*\n\n")
-
-            # Relationships
-            mdfile.write("## Relationships\n\n")
-            if relationships_data:
-                # Write header
-                mdfile.write("| " + " | ".join(relationships_data[0].keys()) + " |\n")
-                mdfile.write(
-                    "| "
-                    + " | ".join(["---"] * len(relationships_data[0].keys()))
-                    + " |\n"
+        col_widths: dict[str, int] = {}
+        async for rows in make_rows():
+            for row in rows:
+                for k, v in row.items():
+                    col_widths[k] = max(col_widths.get(k, len(k)), len(str(v)))
+        if not col_widths:
+            self._file.write(f"No {_EXPORT_SECTION_TYPES[name]} data available\n\n")
+            return
+
+        header = "  ".join(k.ljust(width) for k, width in col_widths.items())
+        self._file.write(header + "\n")
+        self._file.write("-" * len(header) + "\n")
+        async for rows in make_rows():
+            for row in rows:
+                line = "  ".join(str(v).ljust(col_widths[k]) for k, v in row.items())
+                self._file.write(line + "\n")
+        self._file.write("\n\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ExcelExportWriter:
+    """One worksheet per section, written row by row in constant-memory mode"""
+
+    def __init__(self, output_path: str):
+        import xlsxwriter
+
+        self._workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+
+    async def write_section(self, name: str, make_rows) -> None:
+        worksheet = None
+        row_index = 0
+        sheet_count = 0
+        async for rows in make_rows():
+            for row in rows:
+                if worksheet is None or row_index > _EXCEL_MAX_DATA_ROWS:
+                    sheet_count += 1
+                    sheet_name = name.capitalize()
+                    if sheet_count > 1:
+                        sheet_name = f"{sheet_name} ({sheet_count})"
+                    worksheet = self._workbook.add_worksheet(sheet_name)
+                    worksheet.write_row(0, 0, list(row.keys()))
+                    row_index = 1
+                worksheet.write_row(
+                    row_index,
+                    0,
+                    ["" if v is None else str(v) for v in row.values()],
                 )
+                row_index += 1
 
-                # Write rows
-                for relationship in relationships_data:
-                    mdfile.write(
-                        "| "
-                        + " | ".join(str(v) for v in relationship.values())
-                        + " |\n"
-                    )
-            else:
-                mdfile.write("*No relationship data available*\n\n")
-
-    elif file_format == "txt":
-        # Plain text export
-        with open(output_path, "w", encoding="utf-8") as txtfile:
-            txtfile.write("LIGHTRAG DATA EXPORT\n")
-            txtfile.write("=" * 80 + "\n\n")
-
-            # Entities
-            txtfile.write("ENTITIES\n")
-            txtfile.write("-" * 80 + "\n")
-            if entities_data:
-                # Create fixed width columns
-                col_widths = {
-                    k: max(len(k), max(len(str(e[k])) for e in entities_data))
-                    for k in entities_data[0]
-                }
-                header = "  ".join(k.ljust(col_widths[k]) for k in entities_data[0])
-                txtfile.write(header + "\n")
-                txtfile.write("-" * len(header) + "\n")
-
-                # Write rows
-                for entity in entities_data:
-                    row = "  ".join(
-                        str(v).ljust(col_widths[k]) for k, v in entity.items()
-                    )
-                    txtfile.write(row + "\n")
-                txtfile.write("\n\n")
-            else:
-                txtfile.write("No entity data available\n\n")
-
-            # Relations
-            txtfile.write("RELATIONS\n")
-            txtfile.write("-" * 80 + "\n")
-            if relations_data:
-                # Create fixed width columns
-                col_widths = {
-                    k: max(len(k), max(len(str(r[k])) for r in relations_data))
-                    for k in relations_data[0]
-                }
-                header = "  ".join(k.ljust(col_widths[k]) for k in relations_data[0])
-                txtfile.write(header + "\n")
-                txtfile.write("-" * len(header) + "\n")
-
-                # Write rows
-                for relation in relations_data:
-                    row = "  ".join(
-                        str(v).ljust(col_widths[k]) for k, v in relation.items()
+    def close(self) -> None:
+        self._workbook.close()
+
+
+class _JsonlExportWriter:
+    """One JSON object per line, tagged with its row type"""
+
+    def __init__(self, output_path: str):
+        self._file = open(output_path, "w", encoding="utf-8")
+
+    async def write_section(self, name: str, make_rows) -> None:
+        row_type = _EXPORT_SECTION_TYPES[name]
+        async for rows in make_rows():
+            for row in rows:
+                self._file.write(
+                    json.dumps(
+                        {"type": row_type, **row}, ensure_ascii=False, default=str
                     )
-                    txtfile.write(row + "\n")
-                txtfile.write("\n\n")
-            else:
-                txtfile.write("No relation data available\n\n")
-
-            # Relationships
-            txtfile.write("RELATIONSHIPS\n")
-            txtfile.write("-" * 80 + "\n")
-            if relationships_data:
-                # Create fixed width columns
-                col_widths = {
-                    k: max(len(k), max(len(str(r[k])) for r in relationships_data))
-                    for k in relationships_data[0]
-                }
-                header = "  ".join(
-                    k.ljust(col_widths[k]) for k in relationships_data[0]
+                    + "\n"
                 )
-                txtfile.write(header + "\n")
-                txtfile.write("-" * len(header) + "\n")
 
-                # Write rows
-                for relationship in relationships_data:
-                    row = "  ".join(
-                        str(v).ljust(col_widths[k]) for k, v in relationship.items()
-                    )
-                    txtfile.write(row + "\n")
-            else:
-                txtfile.write("No relationship data available\n\n")
+    def close(self) -> None:
+        self._file.close()
 
-    else:
+
+class _ParquetExportWriter:
+    """Single Parquet file with a shared string schema and a row type column.
+
+    Nested graph and vector data are stored as JSON strings; each exported
+    batch becomes one row group.
+    """
+
+    def __init__(self, output_path: str):
+        import pipmaster as pm
+
+        if not pm.is_installed("pyarrow"):
+            pm.install("pyarrow")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in _EXPORT_COLUMNS])
+        self._writer = pq.ParquetWriter(output_path, self._schema)
+
+    async def write_section(self, name: str, make_rows) -> None:
+        row_type = _EXPORT_SECTION_TYPES[name]
+        async for rows in make_rows():
+            if not rows:
+                continue
+            columns = {column: [] for column in _EXPORT_COLUMNS}
+            for row in rows:
+                columns["type"].append(row_type)
+                for column in _EXPORT_COLUMNS[1:]:
+                    value = row.get(column)
+                    if value is not None and not isinstance(value, str):
+                        value = json.dumps(value, ensure_ascii=False, default=str)
+                    columns[column].append(value)
+            self._writer.write_table(
+                self._pa.Table.from_pydict(columns, schema=self._schema)
+            )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_EXPORT_WRITERS = {
+    "csv": _CsvExportWriter,
+    "excel": _ExcelExportWriter,
+    "md": _MarkdownExportWriter,
+    "txt": _TextExportWriter,
+    "jsonl": _JsonlExportWriter,
+    "parquet": _ParquetExportWriter,
+}
+
+
+async def aexport_data(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    output_path: str,
+    file_format: str = "csv",
+    include_vector_data: bool = False,
+    batch_size: int = 1000,
+) -> None:
+    """
+    Asynchronously exports all entities, relations, and relationships to various formats.
+
+    Nodes and edges are paged from the graph storage with iter_nodes/iter_edges,
+    their vector rows are fetched with one get_by_ids call per page, relationship
+    records are paged with iter_items, and each page is written out before the
+    next is read, so memory use is bounded by batch_size.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance for entities and relations
+        entities_vdb: Vector database storage for entities
+        relationships_vdb: Vector database storage for relationships
+        output_path: The path to the output file (including extension).
+        file_format: Output format - "csv", "excel", "md", "txt", "jsonl", "parquet".
+            - csv: Comma-separated values file
+            - excel: Microsoft Excel file with multiple sheets
+            - md: Markdown tables
+            - txt: Plain text formatted output
+            - jsonl: One JSON object per line with a "type" field
+            - parquet: Apache Parquet file with a "type" column (requires pyarrow)
+        include_vector_data: Whether to include data from the vector database.
+        batch_size: Number of graph records fetched and written per page.
+    """
+    writer_cls = _EXPORT_WRITERS.get(file_format)
+    if writer_cls is None:
         raise ValueError(
-            f"Unsupported file format: {file_format}. Choose from: csv, excel, md, txt"
+            f"Unsupported file format: {file_format}. "
+            f"Choose from: {', '.join(EXPORT_FILE_FORMATS)}"
         )
-    if file_format is not None:
-        print(f"Data exported to: {output_path} with format: {file_format}")
-    else:
-        print("Data displayed as table format")
+
+    sections = (
+        (
+            "entities",
+            lambda: _iter_export_entities(
+                chunk_entity_relation_graph,
+                entities_vdb,
+                include_vector_data,
+                batch_size,
+            ),
+        ),
+        (
+            "relations",
+            lambda: _iter_export_relations(
+                chunk_entity_relation_graph,
+                relationships_vdb,
+                include_vector_data,
+                batch_size,
+            ),
+        ),
+        (
+            "relationships",
+            lambda: _iter_export_relationships(relationships_vdb, batch_size),
+        ),
+    )
+
+    writer = writer_cls(output_path)
+    try:
+        for name, make_rows in sections:
+            await writer.write_section(name, make_rows)
+    finally:
+        writer.close()
+    print(f"Data exported to: {output_path} with format: {file_format}")
 
 
 def export_data(
@@ -1797,6 +2983,7 @@ def export_data(
     output_path: str,
     file_format: str = "csv",
     include_vector_data: bool = False,
+    batch_size: int = 1000,
 ) -> None:
     """
     Synchronously exports all entities, relations, and relationships to various formats.
@@ -1806,12 +2993,15 @@ def export_data(
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
+        file_format: Output format - "csv", "excel", "md", "txt", "jsonl", "parquet".
             - csv: Comma-separated values file
             - excel: Microsoft Excel file with multiple sheets
             - md: Markdown tables
             - txt: Plain text formatted output
+            - jsonl: One JSON object per line with a "type" field
+            - parquet: Apache Parquet file with a "type" column (requires pyarrow)
         include_vector_data: Whether to include data from the vector database.
+        batch_size: Number of graph records fetched and written per page.
     """
     try:
         loop = asyncio.get_event_loop()
@@ -1827,6 +3017,7 @@ def export_data(
             output_path,
             file_format,
             include_vector_data,
+            batch_size,
         )
     )
 
@@ -1864,31 +3055,61 @@ async def update_chunk_cache_list(
         cache_keys: List of cache keys to add to the list
         cache_scenario: Description of the cache scenario for logging
     """
-    if not cache_keys:
+    await update_chunk_cache_lists(
+        text_chunks_storage, {chunk_id: cache_keys}, cache_scenario
+    )
+
+
+async def update_chunk_cache_lists(
+    text_chunks_storage: "BaseKVStorage",
+    chunk_cache_keys: dict[str, list[str]],
+    cache_scenario: str = "batch_update",
+) -> None:
+    """Add cache keys to the llm_cache_list of many chunks with one read and one write
+
+    Args:
+        text_chunks_storage: Text chunks storage instance
+        chunk_cache_keys: Mapping of chunk_id -> cache keys to add to its list
+        cache_scenario: Description of the cache scenario for logging
+    """
+    chunk_cache_keys = {
+        chunk_id: cache_keys
+        for chunk_id, cache_keys in chunk_cache_keys.items()
+        if cache_keys
+    }
+    if not chunk_cache_keys:
         return
 
     try:
-        chunk_data = await text_chunks_storage.get_by_id(chunk_id)
-        if chunk_data:
+        chunk_ids = list(chunk_cache_keys)
+        chunk_data_list = await text_chunks_storage.get_by_ids(chunk_ids)
+
+        updates = {}
+        for chunk_id, chunk_data in zip(chunk_ids, chunk_data_list):
+            if not chunk_data:
+                continue
             # Ensure llm_cache_list exists
             if "llm_cache_list" not in chunk_data:
                 chunk_data["llm_cache_list"] = []
 
             # Add cache keys to the list if not already present
             existing_keys = set(chunk_data["llm_cache_list"])
-            new_keys = [key for key in cache_keys if key not in existing_keys]
-
+            new_keys = [
+                key for key in chunk_cache_keys[chunk_id] if key not in existing_keys
+            ]
             if new_keys:
                 chunk_data["llm_cache_list"].extend(new_keys)
+                updates[chunk_id] = chunk_data
 
-                # Update the chunk in storage
-                await text_chunks_storage.upsert({chunk_id: chunk_data})
-                logger.debug(
-                    f"Updated chunk {chunk_id} with {len(new_keys)} cache keys ({cache_scenario})"
-                )
+        if updates:
+            # Update all chunks in storage at once
+            await text_chunks_storage.upsert(updates)
+            logger.debug(
+                f"Updated {len(updates)} chunks with cache keys ({cache_scenario})"
+            )
     except Exception as e:
         logger.warning(
-            f"Failed to update chunk {chunk_id} with cache references on {cache_scenario}: {e}"
+            f"Failed to update {len(chunk_cache_keys)} chunks with cache references on {cache_scenario}: {e}"
         )
 
 
@@ -2468,46 +3689,32 @@ async def pick_by_vector_similarity(
                 "Using pre-computed query embedding for vector similarity chunk selection"
             )
 
-        # Get chunk embeddings from vector database
-        chunk_vectors = await chunks_vdb.get_vectors_by_ids(all_chunk_ids)
+        # Score all candidates in one batch; backends that support it compute the
+        # similarities server-side instead of returning the vectors
+        similarities = await chunks_vdb.get_similarities_by_ids(
+            all_chunk_ids, query_embedding
+        )
         logger.debug(
-            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors Retrieved"
+            f"Vector similarity chunk selection: {len(similarities)} chunk similarities retrieved"
         )
 
-        if not chunk_vectors or len(chunk_vectors) != len(all_chunk_ids):
-            if not chunk_vectors:
+        if not similarities or len(similarities) != len(all_chunk_ids):
+            if not similarities:
                 logger.warning(
                     "Vector similarity chunk selection: no vectors retrieved from chunks_vdb"
                 )
             else:
                 logger.warning(
-                    f"Vector similarity chunk selection: found {len(chunk_vectors)} but expecting {len(all_chunk_ids)}"
+                    f"Vector similarity chunk selection: found {len(similarities)} but expecting {len(all_chunk_ids)}"
                 )
             return []
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
-
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Select top num_of_chunks by similarity (highest first)
+        scored_ids = list(similarities.keys())
+        scores = np.fromiter(
+            similarities.values(), dtype=np.float64, count=len(scored_ids)
+        )
+        selected_chunks = [scored_ids[i] for i in top_k_indices(scores, num_of_chunks)]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
@@ -2582,6 +3789,22 @@ class TokenTracker:
         )
 
 
+def _accepts_keyword(func: Callable[..., Any], name: str) -> bool:
+    """Check whether a callable declares the given keyword argument by name
+
+    `**kwargs` alone does not count: wrappers commonly forward their kwargs to
+    provider functions (e.g. jina_rerank) that would reject an unknown keyword.
+    """
+    try:
+        parameter = inspect.signature(func).parameters.get(name)
+    except (TypeError, ValueError):
+        return False
+    return parameter is not None and parameter.kind in (
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        inspect.Parameter.KEYWORD_ONLY,
+    )
+
+
 async def apply_rerank_if_enabled(
     query: str,
     retrieved_docs: list[dict],
@@ -2626,11 +3849,20 @@ async def apply_rerank_if_enabled(
             )
             document_texts.append(content)
 
+        # Token counts stored with text chunks at ingest spare the reranker re-tokenizing
+        rerank_kwargs = {}
+        token_counts = [doc.get("tokens") for doc in retrieved_docs]
+        if any(count is not None for count in token_counts) and _accepts_keyword(
+            rerank_func, "token_counts"
+        ):
+            rerank_kwargs["token_counts"] = token_counts
+
         # Call the new rerank function that returns index-based results
         rerank_results = await rerank_func(
             query=query,
             documents=document_texts,
             top_n=top_n,
+            **rerank_kwargs,
         )
 
         # Process rerank results based on return format
@@ -2753,8 +3985,8 @@ async def process_chunks_unified(
 
         unique_chunks = truncate_list_by_token_size(
             unique_chunks,
-            key=lambda x: "\n".join(
-                json.dumps(item, ensure_ascii=False) for item in [x]
+            key=lambda x: json.dumps(
+                {k: v for k, v in x.items() if k != "tokens"}, ensure_ascii=False
             ),
             max_token_size=chunk_token_limit,
             tokenizer=tokenizer,
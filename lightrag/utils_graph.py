@@ -5,7 +5,7 @@ import asyncio
 from typing import Any, cast
 
 from .base import DeletionResult
-from .kg.shared_storage import get_storage_keyed_lock
+from .kg.shared_storage import bump_data_version, get_storage_keyed_lock
 from .constants import GRAPH_FIELD_SEP
 from .utils import compute_mdhash_id, logger
 from .base import StorageNameSpace
@@ -53,6 +53,9 @@ async def _persist_graph_updates(
             ]
         )
 
+        # Invalidate retrieval results cached by queries of this workspace
+        await bump_data_version(storages[0].global_config.get("workspace"))
+
 
 async def adelete_by_entity(
     chunk_entity_relation_graph,
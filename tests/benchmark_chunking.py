@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark for chunking_by_token_size
+
+Compares the offset-slicing chunker (single tokenization pass) against the
+decode-based implementation on multi-MB synthetic documents.
+
+Usage:
+    python tests/benchmark_chunking.py
+    python tests/benchmark_chunking.py --size-mb 8 --split-by-character "\\n\\n"
+"""
+
+import argparse
+import random
+import time
+
+from lightrag.operate import _chunking_by_token_size_decode, chunking_by_token_size
+from lightrag.utils import TiktokenTokenizer
+
+WORDS = (
+    "retrieval augmented generation knowledge graph entity relation chunk "
+    "embedding vector storage 检索 增强 生成 知识 图谱 Ünïcödé émoji 🚀"
+).split()
+
+
+def make_document(size_mb: float, seed: int = 42) -> str:
+    """Build a synthetic document of roughly size_mb megabytes."""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    paragraphs = []
+    total = 0
+    while total < target:
+        paragraph = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 400)))
+        paragraphs.append(paragraph)
+        total += len(paragraph.encode("utf-8")) + 2
+    return "\n\n".join(paragraphs)
+
+
+def bench(func, tokenizer, content, repeat, **kwargs):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(tokenizer, content, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document chunking")
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[1, 4])
+    parser.add_argument("--chunk-token-size", type=int, default=1200)
+    parser.add_argument("--chunk-overlap-token-size", type=int, default=100)
+    parser.add_argument("--split-by-character", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    split_by_character = (
+        args.split_by_character.encode().decode("unicode_escape")
+        if args.split_by_character
+        else None
+    )
+    tokenizer = TiktokenTokenizer()
+    kwargs = dict(
+        split_by_character=split_by_character,
+        chunk_overlap_token_size=args.chunk_overlap_token_size,
+        chunk_token_size=args.chunk_token_size,
+    )
+
+    print(
+        f"{'size':>8} {'chunks':>8} {'decode (s)':>12} {'offsets (s)':>12} {'speedup':>8}"
+    )
+    for size_mb in args.size_mb:
+        content = make_document(size_mb)
+        legacy_time, legacy_chunks = bench(
+            _chunking_by_token_size_decode, tokenizer, content, args.repeat, **kwargs
+        )
+        fast_time, fast_chunks = bench(
+            chunking_by_token_size, tokenizer, content, args.repeat, **kwargs
+        )
+        if not split_by_character:
+            # Without separators both chunkers cut the exact same token windows
+            assert [c["tokens"] for c in fast_chunks] == [
+                c["tokens"] for c in legacy_chunks
+            ], "token counts diverged"
+        print(
+            f"{size_mb:>6.1f}MB {len(fast_chunks):>8} {legacy_time:>12.3f} "
+            f"{fast_time:>12.3f} {legacy_time / fast_time:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
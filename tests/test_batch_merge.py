@@ -0,0 +1,200 @@
+"""
+Tests for the batched merge mode of merge_nodes_and_edges
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import merge_nodes_and_edges
+from lightrag.utils import Tokenizer, TokenizerInterface
+
+
+class CharTokenizer(TokenizerInterface):
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+class CountingKV:
+    def __init__(self):
+        self.data = {}
+        self.calls = 0
+
+    async def get_by_id(self, id):
+        self.calls += 1
+        return self.data.get(id)
+
+    async def get_by_ids(self, ids):
+        self.calls += 1
+        return [self.data.get(id) for id in ids]
+
+    async def upsert(self, data):
+        self.calls += 1
+        self.data.update(data)
+
+
+class CountingVDB:
+    def __init__(self):
+        self.data = {}
+        self.upsert_calls = 0
+
+    async def upsert(self, data):
+        self.upsert_calls += 1
+        self.data.update(data)
+
+    async def delete(self, ids):
+        for id in ids:
+            self.data.pop(id, None)
+
+
+def make_config(batch_merge: bool) -> dict:
+    return {
+        "workspace": "",
+        "batch_merge": batch_merge,
+        "llm_model_max_async": 4,
+        "tokenizer": Tokenizer("char", CharTokenizer()),
+        "summary_context_size": 10000,
+        "summary_max_tokens": 10000,
+        "force_llm_summary_on_merge": 100,
+        "source_ids_limit_method": "FIFO",
+        "max_source_ids_per_entity": 300,
+        "max_source_ids_per_relation": 300,
+        "max_file_paths": 100,
+    }
+
+
+def node(desc: str, chunk: str) -> dict:
+    return {
+        "entity_type": "Person",
+        "description": desc,
+        "source_id": chunk,
+        "file_path": "doc.txt",
+    }
+
+
+def edge(src: str, tgt: str, desc: str, chunk: str) -> dict:
+    return {
+        "src_id": src,
+        "tgt_id": tgt,
+        "weight": 1.0,
+        "description": desc,
+        "keywords": "knows",
+        "source_id": chunk,
+        "file_path": "doc.txt",
+    }
+
+
+CHUNK_RESULTS = [
+    (
+        {
+            "Alice": [node("Alice is a doctor", "chunk-1")],
+            "Bob": [node("Bob", "chunk-1")],
+        },
+        {("Alice", "Bob"): [edge("Alice", "Bob", "Alice knows Bob", "chunk-1")]},
+    ),
+    (
+        {"Alice": [node("Alice lives in Paris", "chunk-2")]},
+        {
+            ("Bob", "Alice"): [edge("Bob", "Alice", "Bob met Alice", "chunk-2")],
+            ("Alice", "Carol"): [
+                edge("Alice", "Carol", "Alice helps Carol", "chunk-2")
+            ],
+        },
+    ),
+]
+
+
+async def run_merge(tmp_path, batch_merge: bool):
+    graph = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await graph.initialize()
+    # Pre-existing knowledge from an earlier document
+    await graph.upsert_node(
+        "Alice",
+        {
+            "entity_id": "Alice",
+            "entity_type": "Person",
+            "description": "Alice from doc 0",
+            "source_id": "chunk-0",
+            "file_path": "old.txt",
+        },
+    )
+    entity_chunks, relation_chunks = CountingKV(), CountingKV()
+    entity_vdb, relation_vdb = CountingVDB(), CountingVDB()
+    pipeline_status = {"latest_message": "", "history_messages": []}
+
+    await merge_nodes_and_edges(
+        chunk_results=CHUNK_RESULTS,
+        knowledge_graph_inst=graph,
+        entity_vdb=entity_vdb,
+        relationships_vdb=relation_vdb,
+        global_config=make_config(batch_merge),
+        doc_id="doc-1",
+        pipeline_status=pipeline_status,
+        pipeline_status_lock=asyncio.Lock(),
+        entity_chunks_storage=entity_chunks,
+        relation_chunks_storage=relation_chunks,
+    )
+
+    def strip(data):
+        return {k: v for k, v in data.items() if k != "created_at"}
+
+    nodes = {n["entity_id"]: strip(n) for n in await graph.get_all_nodes()}
+    edges = {
+        tuple(sorted((e["source"], e["target"]))): strip(e)
+        for e in await graph.get_all_edges()
+    }
+    return (
+        nodes,
+        edges,
+        entity_chunks,
+        relation_chunks,
+        entity_vdb,
+        relation_vdb,
+    )
+
+
+@pytest.fixture(autouse=True)
+async def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.offline
+async def test_batch_merge_matches_per_entity_merge(tmp_path):
+    reference = await run_merge(tmp_path / "reference", batch_merge=False)
+    batched = await run_merge(tmp_path / "batched", batch_merge=True)
+
+    ref_nodes, ref_edges, ref_ec, ref_rc, ref_evdb, ref_rvdb = reference
+    nodes, edges, ec, rc, evdb, rvdb = batched
+
+    assert nodes == ref_nodes
+    assert edges == ref_edges
+    assert ec.data == ref_ec.data
+    assert rc.data == ref_rc.data
+    assert evdb.data.keys() == ref_evdb.data.keys()
+    assert rvdb.data == ref_rvdb.data
+    assert set(nodes["Alice"]["description"].split(GRAPH_FIELD_SEP)) == {
+        "Alice from doc 0",
+        "Alice is a doctor",
+        "Alice lives in Paris",
+    }
+    # Carol is created by the relation merge
+    assert "Carol" in nodes
+
+    # One write per vector namespace and far fewer chunk-tracking round trips
+    assert evdb.upsert_calls == 1
+    assert rvdb.upsert_calls == 1
+    assert ec.calls == 2  # one bulk prefetch, one bulk write
+    assert ref_ec.calls > ec.calls
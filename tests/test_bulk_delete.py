@@ -0,0 +1,144 @@
+"""
+Tests for the bulk adelete_by_doc_ids deletion path
+"""
+
+import numpy as np
+import pytest
+
+from lightrag import LightRAG
+from lightrag import lightrag as lightrag_module
+from lightrag.kg.shared_storage import finalize_share_data
+from lightrag.utils import EmbeddingFunc, Tokenizer, TokenizerInterface
+
+DOCS = {
+    "doc-a": "Document about Alpha and the Hub.",
+    "doc-b": "Document about Beta and the Hub.",
+    "doc-c": "Document about Gamma and the Hub.",
+}
+
+
+class CharTokenizer(TokenizerInterface):
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+async def mock_llm_func(prompt, system_prompt=None, history_messages=[], **kwargs):
+    text = f"{system_prompt or ''}\n{prompt}"
+    for name in ["Alpha", "Beta", "Gamma"]:
+        if f"Document about {name}" in text:
+            return (
+                f"entity<|#|>{name}<|#|>concept<|#|>{name} is a topic\n"
+                f"entity<|#|>Hub<|#|>concept<|#|>Hub seen with {name}\n"
+                f"relation<|#|>Hub<|#|>{name}<|#|>covers<|#|>Hub covers {name}\n"
+                "<|COMPLETE|>"
+            )
+    return "<|COMPLETE|>"
+
+
+async def mock_embedding_func(texts, **kwargs):
+    return np.array([[float(len(t)), 1.0, 0.5] for t in texts])
+
+
+@pytest.fixture
+async def rag(tmp_path):
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        llm_model_func=mock_llm_func,
+        embedding_func=EmbeddingFunc(
+            embedding_dim=3, max_token_size=8192, func=mock_embedding_func
+        ),
+        tokenizer=Tokenizer("char", CharTokenizer()),
+        entity_extract_max_gleaning=0,
+    )
+    await rag.initialize_storages()
+    await rag.ainsert(list(DOCS.values()), ids=list(DOCS))
+    yield rag
+    await rag.finalize_storages()
+    finalize_share_data()
+
+
+@pytest.mark.offline
+async def test_bulk_delete_rebuilds_shared_entities_once(rag, monkeypatch):
+    rebuild_calls = []
+    original_rebuild = lightrag_module.rebuild_knowledge_from_chunks
+
+    async def recording_rebuild(**kwargs):
+        rebuild_calls.append(kwargs)
+        await original_rebuild(**kwargs)
+
+    monkeypatch.setattr(
+        lightrag_module, "rebuild_knowledge_from_chunks", recording_rebuild
+    )
+    insert_done_calls = []
+    original_insert_done = rag._insert_done
+
+    async def recording_insert_done(*args, **kwargs):
+        insert_done_calls.append(1)
+        await original_insert_done(*args, **kwargs)
+
+    monkeypatch.setattr(rag, "_insert_done", recording_insert_done)
+
+    results = await rag.adelete_by_doc_ids(["doc-a", "missing", "doc-b", "doc-a"])
+
+    assert [(r.doc_id, r.status) for r in results] == [
+        ("doc-a", "success"),
+        ("missing", "not_found"),
+        ("doc-b", "success"),
+    ]
+    assert len(rebuild_calls) == 1
+    assert set(rebuild_calls[0]["entities_to_rebuild"]) == {"Hub"}
+    assert len(insert_done_calls) == 1
+
+    graph = rag.chunk_entity_relation_graph
+    assert await graph.get_node("Alpha") is None
+    assert await graph.get_node("Beta") is None
+    hub = await graph.get_node("Hub")
+    assert hub["description"] == "Hub seen with Gamma"
+    assert await graph.get_edge("Hub", "Gamma") is not None
+    assert await graph.get_edge("Hub", "Alpha") is None
+
+    assert await rag.doc_status.get_by_ids(["doc-a", "doc-b"]) == [None, None]
+    assert await rag.doc_status.get_by_id("doc-c") is not None
+    assert await rag.full_entities.get_by_id("doc-a") is None
+
+
+@pytest.mark.offline
+async def test_bulk_delete_requires_a_deletion_job(rag):
+    from lightrag.kg.shared_storage import get_namespace_data
+
+    pipeline_status = await get_namespace_data("pipeline_status", workspace="")
+    pipeline_status.update({"busy": True, "job_name": "Indexing files"})
+    try:
+        results = await rag.adelete_by_doc_ids(["doc-a"])
+    finally:
+        pipeline_status["busy"] = False
+
+    assert [r.status for r in results] == ["not_allowed"]
+    assert await rag.doc_status.get_by_id("doc-a") is not None
+
+
+@pytest.mark.offline
+async def test_background_delete_reports_phases_and_unique_docs(rag, monkeypatch):
+    # The API config parses the command line on import
+    monkeypatch.setattr("sys.argv", ["lightrag-server"])
+    from lightrag.api.routers.document_routes import background_delete_documents
+    from lightrag.kg.shared_storage import get_namespace_data
+
+    await background_delete_documents(rag, None, ["doc-a", "doc-b", "doc-a"])
+
+    pipeline_status = await get_namespace_data("pipeline_status", workspace="")
+    history = pipeline_status["history_messages"]
+    phases = [m for m in history if m.startswith("Bulk deletion phase")]
+    assert [m.split(":")[0] for m in phases] == [
+        f"Bulk deletion phase {phase}/4" for phase in range(1, 5)
+    ]
+    assert (pipeline_status["cur_batch"], pipeline_status["batchs"]) == (4, 4)
+    assert pipeline_status["job_name"] == "Deleting 2 Documents"
+    assert [m for m in history if m.startswith("Document deleted")] == [
+        "Document deleted 1/2: doc-a[unknown_source]",
+        "Document deleted 2/2: doc-b[unknown_source]",
+    ]
+    assert history[-1] == "Deletion completed: 2 successful, 0 failed"
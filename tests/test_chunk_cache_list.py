@@ -0,0 +1,68 @@
+"""
+Tests for batched chunk llm_cache_list updates
+"""
+
+import pytest
+
+from lightrag.utils import update_chunk_cache_list, update_chunk_cache_lists
+
+
+class CountingKV:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+        self.fail = False
+
+    async def get_by_ids(self, ids):
+        self.calls.append(("get_by_ids", list(ids)))
+        if self.fail:
+            raise RuntimeError("storage unavailable")
+        return [dict(self.data[id]) if id in self.data else None for id in ids]
+
+    async def upsert(self, data):
+        self.calls.append(("upsert", sorted(data)))
+        self.data.update(data)
+
+
+@pytest.mark.offline
+async def test_update_many_chunks_with_one_read_and_one_write():
+    storage = CountingKV(
+        {
+            "chunk-1": {"content": "a", "llm_cache_list": ["k1"]},
+            "chunk-2": {"content": "b"},
+            "chunk-3": {"content": "c", "llm_cache_list": ["k3"]},
+        }
+    )
+
+    await update_chunk_cache_lists(
+        storage,
+        {
+            "chunk-1": ["k1", "k1b"],
+            "chunk-2": ["k2"],
+            "chunk-3": ["k3"],  # already recorded, nothing to write
+            "chunk-4": ["k4"],  # unknown chunk is skipped
+            "chunk-5": [],
+        },
+        "entity_extraction",
+    )
+
+    assert storage.calls == [
+        ("get_by_ids", ["chunk-1", "chunk-2", "chunk-3", "chunk-4"]),
+        ("upsert", ["chunk-1", "chunk-2"]),
+    ]
+    assert storage.data["chunk-1"]["llm_cache_list"] == ["k1", "k1b"]
+    assert storage.data["chunk-2"]["llm_cache_list"] == ["k2"]
+    assert "chunk-4" not in storage.data
+
+
+@pytest.mark.offline
+async def test_single_chunk_update_and_storage_failure():
+    storage = CountingKV({"chunk-1": {"content": "a"}})
+
+    await update_chunk_cache_list("chunk-1", storage, ["k1"])
+    assert storage.data["chunk-1"]["llm_cache_list"] == ["k1"]
+
+    storage.fail = True
+    # Failures are logged, extraction is not interrupted
+    await update_chunk_cache_lists(storage, {"chunk-1": ["k2"]})
+    assert storage.data["chunk-1"]["llm_cache_list"] == ["k1"]
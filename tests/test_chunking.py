@@ -1064,3 +1064,83 @@ def test_decode_preserves_content():
         tokens = tokenizer.encode(original)
         decoded = tokenizer.decode(tokens)
         assert decoded == original, f"Failed to decode: {original}"
+
+
+# ============================================================================
+# Tests for offset-based slicing (single tokenization pass)
+# ============================================================================
+
+
+@pytest.mark.offline
+def test_encode_with_offsets_round_trips_dummy_tokenizer():
+    """Offsets of a 1:1 tokenizer are the character positions."""
+    tokenizer = make_tokenizer()
+
+    tokens, offsets = tokenizer.encode_with_offsets("abc")
+
+    assert tokens == [ord("a"), ord("b"), ord("c")]
+    assert offsets == [0, 1, 2, 3]
+
+
+@pytest.mark.offline
+def test_encode_with_offsets_unsupported_tokenizer_returns_none():
+    """Tokenizers whose single tokens don't decode to text fall back to decoding."""
+    tokenizer = make_multi_token_tokenizer()
+
+    assert tokenizer.encode_with_offsets("ABC") is None
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize(
+    "split_by_character,overlap",
+    [(None, 0), (None, 3), ("\n\n", 0), ("\n\n", 2)],
+)
+def test_offset_chunking_matches_decode_chunking(split_by_character, overlap):
+    """Slicing by offsets must produce the same chunks as decoding token windows."""
+    from lightrag.operate import _chunking_by_token_size_decode
+
+    tokenizer = make_tokenizer()
+    content = "first paragraph here\n\nsecond\n\n" + "z" * 37 + "\n\nlast one"
+
+    kwargs = dict(
+        split_by_character=split_by_character,
+        chunk_overlap_token_size=overlap,
+        chunk_token_size=10,
+    )
+    assert chunking_by_token_size(
+        tokenizer, content, **kwargs
+    ) == _chunking_by_token_size_decode(tokenizer, content, **kwargs)
+
+
+class ByteTokenizer(TokenizerInterface):
+    """Byte-level tokenizer (one token per UTF-8 byte), like tiktoken's BPE."""
+
+    def encode(self, content: str):
+        return list(content.encode("utf-8"))
+
+    def decode(self, tokens):
+        return bytes(tokens).decode("utf-8", errors="replace")
+
+    def decode_tokens_bytes(self, tokens):
+        return [bytes([token]) for token in tokens]
+
+
+@pytest.mark.offline
+def test_offset_chunking_byte_tokenizer_multibyte():
+    """Chunks never split a multi-byte character when sliced by offsets."""
+    tokenizer = Tokenizer(model_name="bytes", tokenizer=ByteTokenizer())
+    content = "数据检索增强生成。" * 5 + "Ünïcödé with émojis 🚀🚀 " * 3
+
+    tokens, offsets = tokenizer.encode_with_offsets(content)
+    assert offsets[-1] == len(content)
+    assert offsets == sorted(offsets)
+
+    chunks = chunking_by_token_size(
+        tokenizer, content, chunk_token_size=16, chunk_overlap_token_size=0
+    )
+
+    assert sum(chunk["tokens"] for chunk in chunks) == len(tokens)
+    assert all("\ufffd" not in chunk["content"] for chunk in chunks)
+    assert "".join(chunk["content"] for chunk in chunks).replace(
+        " ", ""
+    ) == content.replace(" ", "")
@@ -0,0 +1,114 @@
+"""
+Tests for ChunkingExecutor
+
+Verifies that synchronous chunking functions run in a thread/process pool,
+that concurrent documents are batched per worker call, and that errors are
+delivered to the caller of the failing document only.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from lightrag.exceptions import ChunkTokenLimitExceededError
+from lightrag.operate import chunking_by_token_size
+from lightrag.utils import ChunkingExecutor, Tokenizer, TokenizerInterface
+
+
+class CharTokenizer(TokenizerInterface):
+    """Simple 1:1 character-to-token mapping."""
+
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+def make_tokenizer() -> Tokenizer:
+    return Tokenizer(model_name="dummy", tokenizer=CharTokenizer())
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("mode", ["thread", "process"])
+async def test_executor_matches_inline_chunking(mode):
+    """Chunks produced in the pool are identical to inline chunking."""
+    tokenizer = make_tokenizer()
+    executor = ChunkingExecutor(
+        chunking_by_token_size, tokenizer, mode=mode, max_workers=2, batch_size=3
+    )
+    documents = [f"document {i} " * (i + 5) for i in range(7)]
+    try:
+        results = await asyncio.gather(
+            *[executor.chunk(doc, None, False, 2, 10) for doc in documents]
+        )
+    finally:
+        executor.shutdown()
+
+    assert results == [
+        chunking_by_token_size(tokenizer, doc, None, False, 2, 10) for doc in documents
+    ]
+
+
+@pytest.mark.offline
+async def test_executor_batches_concurrent_documents():
+    """Concurrent documents are sent to the pool in batches of batch_size."""
+    calls = []
+
+    def recording_chunker(tokenizer, content, *args):
+        calls.append(threading.current_thread().name)
+        return chunking_by_token_size(tokenizer, content, *args)
+
+    executor = ChunkingExecutor(
+        recording_chunker, make_tokenizer(), mode="thread", batch_size=4
+    )
+    try:
+        await asyncio.gather(
+            *[executor.chunk(f"doc {i}", None, False, 0, 10) for i in range(4)]
+        )
+    finally:
+        executor.shutdown()
+
+    assert len(calls) == 4
+    # A full batch is processed by a single worker call
+    assert len(set(calls)) == 1
+    assert calls[0].startswith("lightrag-chunking")
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("mode", ["thread", "process"])
+async def test_executor_error_only_affects_failing_document(mode):
+    """A document exceeding the limit fails alone; its batch siblings succeed."""
+    executor = ChunkingExecutor(
+        chunking_by_token_size, make_tokenizer(), mode=mode, batch_size=2
+    )
+    try:
+        ok, failed = await asyncio.gather(
+            executor.chunk("short", "\n\n", True, 0, 10),
+            executor.chunk("x" * 20, "\n\n", True, 0, 10),
+            return_exceptions=True,
+        )
+    finally:
+        executor.shutdown()
+
+    assert ok[0]["content"] == "short"
+    assert isinstance(failed, ChunkTokenLimitExceededError)
+    assert failed.chunk_tokens == 20
+    assert failed.chunk_token_limit == 10
+
+
+@pytest.mark.offline
+def test_process_mode_falls_back_to_threads_for_unpicklable_function():
+    """Lambdas cannot be sent to worker processes, so a thread pool is used."""
+    executor = ChunkingExecutor(
+        lambda *args: chunking_by_token_size(*args), make_tokenizer(), mode="process"
+    )
+
+    assert executor.mode == "thread"
+
+
+@pytest.mark.offline
+def test_invalid_mode_rejected():
+    with pytest.raises(ValueError):
+        ChunkingExecutor(chunking_by_token_size, make_tokenizer(), mode="gpu")
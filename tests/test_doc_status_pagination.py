@@ -0,0 +1,92 @@
+"""
+Tests for the index-backed pagination of JsonDocStatusStorage
+"""
+
+import random
+
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import get_pinyin_sort_key
+
+STATUSES = [DocStatus.PENDING, DocStatus.PROCESSED, DocStatus.FAILED]
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+def make_doc(i: int, rng: random.Random) -> dict:
+    return {
+        "status": rng.choice(STATUSES).value,
+        "content_summary": f"doc {i}",
+        "content_length": i,
+        "file_path": rng.choice(["a.txt", "B.pdf", "中文.md", "z.md"]) + str(i),
+        "created_at": f"2025-01-{rng.randint(1, 28):02d}T00:00:{i % 60:02d}",
+        "updated_at": f"2025-02-{rng.randint(1, 28):02d}T00:00:{i % 60:02d}",
+    }
+
+
+def expected_page(docs, status, sort_field, direction, page, page_size):
+    """Reference implementation: filter and sort everything."""
+    rows = [
+        (doc_id, doc)
+        for doc_id, doc in docs.items()
+        if status is None or doc["status"] == status.value
+    ]
+
+    def key(row):
+        doc_id, doc = row
+        if sort_field == "id":
+            return (doc_id, doc_id)
+        if sort_field == "file_path":
+            return (get_pinyin_sort_key(doc["file_path"]), doc_id)
+        return (doc[sort_field], doc_id)
+
+    rows.sort(key=key, reverse=direction == "desc")
+    start = (page - 1) * page_size
+    return [doc_id for doc_id, _ in rows[start : start + page_size]], len(rows)
+
+
+@pytest.mark.offline
+async def test_paginated_pages_match_full_sort(tmp_path):
+    storage = JsonDocStatusStorage(
+        namespace="doc_status",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    rng = random.Random(7)
+    docs = {f"doc-{i}": make_doc(i, rng) for i in range(120)}
+    await storage.upsert({k: dict(v) for k, v in docs.items()})
+
+    # Incremental index updates: status change and deletions
+    docs["doc-5"]["status"] = DocStatus.FAILED.value
+    docs["doc-5"]["updated_at"] = "2025-03-01T00:00:00"
+    await storage.upsert({"doc-5": dict(docs["doc-5"])})
+    await storage.delete(["doc-7", "doc-8"])
+    del docs["doc-7"], docs["doc-8"]
+
+    for status in [None, *STATUSES]:
+        for sort_field in ["created_at", "updated_at", "id", "file_path"]:
+            for direction in ["asc", "desc"]:
+                for page in [1, 2, 5]:
+                    rows, total = await storage.get_docs_paginated(
+                        status, page, 10, sort_field, direction
+                    )
+                    assert ([doc_id for doc_id, _ in rows], total) == expected_page(
+                        docs, status, sort_field, direction, page, 10
+                    )
+
+    counts = await storage.get_all_status_counts()
+    for status in STATUSES:
+        assert counts[status.value] == sum(
+            doc["status"] == status.value for doc in docs.values()
+        )
+    assert counts["all"] == len(docs)
@@ -0,0 +1,227 @@
+"""
+Tests for the persistent embedding cache consulted by EmbeddingFunc
+"""
+
+import numpy as np
+import pytest
+
+from lightrag import LightRAG
+from lightrag import lightrag as lightrag_module
+from lightrag.kg.shared_storage import finalize_share_data
+from lightrag.utils import (
+    EmbeddingCache,
+    EmbeddingFunc,
+    KVEmbeddingCacheBackend,
+    MmapEmbeddingCacheBackend,
+    Tokenizer,
+    TokenizerInterface,
+)
+
+
+class RecordingProvider:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[float(len(t)), 0.5, -1.0] for t in texts])
+
+
+class DictKVStorage:
+    """Minimal BaseKVStorage stand-in"""
+
+    def __init__(self):
+        self.data = {}
+        self.flushes = 0
+
+    async def get_by_ids(self, ids):
+        return [self.data.get(id) for id in ids]
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+    async def delete(self, ids):
+        for id in ids:
+            self.data.pop(id, None)
+
+    async def index_done_callback(self):
+        self.flushes += 1
+
+    async def iter_keys(self, batch_size=1000):
+        keys = list(self.data)
+        for start in range(0, len(keys), batch_size):
+            yield keys[start : start + batch_size]
+
+
+def make_func(provider, backend, model_name="test-model"):
+    cache = EmbeddingCache(backend, model_name, 3)
+    return EmbeddingFunc(embedding_dim=3, func=provider, cache=cache), cache
+
+
+@pytest.mark.offline
+async def test_only_missing_texts_reach_the_provider():
+    provider = RecordingProvider()
+    func, cache = make_func(provider, KVEmbeddingCacheBackend(DictKVStorage()))
+
+    first = await func(["a", "bb", "a"])
+    second = await func(["bb", "ccc", "a"])
+
+    assert provider.calls == [["a", "bb"], ["ccc"]]
+    assert first.tolist() == [[1.0, 0.5, -1.0], [2.0, 0.5, -1.0], [1.0, 0.5, -1.0]]
+    assert second.tolist() == [[2.0, 0.5, -1.0], [3.0, 0.5, -1.0], [1.0, 0.5, -1.0]]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 3)
+    assert stats["hit_rate"] == pytest.approx(0.4)
+
+
+@pytest.mark.offline
+async def test_key_includes_model_and_dimension():
+    kv = DictKVStorage()
+    provider = RecordingProvider()
+    func_a, cache_a = make_func(provider, KVEmbeddingCacheBackend(kv), "model-a")
+    func_b, cache_b = make_func(provider, KVEmbeddingCacheBackend(kv), "model-b")
+
+    await func_a(["text"])
+    await func_b(["text"])
+
+    assert provider.calls == [["text"], ["text"]]
+    assert cache_a.make_key("text").startswith("model-a:3:")
+    assert cache_a.make_key("text") != cache_b.make_key("text")
+
+
+@pytest.mark.offline
+async def test_kv_backend_evicts_least_recently_used():
+    kv = DictKVStorage()
+    func, cache = make_func(RecordingProvider(), KVEmbeddingCacheBackend(kv, 2))
+
+    await func(["a", "b"])
+    await func(["a"])
+    await func(["c"])
+
+    assert sorted(kv.data) == sorted([cache.make_key("a"), cache.make_key("c")])
+    await cache.flush()
+    assert kv.flushes == 1
+
+
+@pytest.mark.offline
+async def test_kv_backend_cap_holds_across_restarts():
+    kv = DictKVStorage()
+    func, cache = make_func(RecordingProvider(), KVEmbeddingCacheBackend(kv, 2))
+    await func(["a", "b"])
+
+    for texts in (["c"], ["d", "e"]):
+        reopened, cache = make_func(RecordingProvider(), KVEmbeddingCacheBackend(kv, 2))
+        await cache.initialize()
+        await reopened(texts)
+        assert len(kv.data) == 2
+
+    assert sorted(kv.data) == sorted([cache.make_key("d"), cache.make_key("e")])
+
+
+@pytest.mark.offline
+async def test_mmap_backend_persists_vectors(tmp_path):
+    prefix = str(tmp_path / "embedding_cache")
+    provider = RecordingProvider()
+    func, cache = make_func(provider, MmapEmbeddingCacheBackend(prefix, 3))
+
+    expected = await func(["alpha", "beta"])
+    await cache.flush()
+
+    reopened, _ = make_func(provider, MmapEmbeddingCacheBackend(prefix, 3))
+    result = await reopened(["beta", "alpha"])
+
+    assert provider.calls == [["alpha", "beta"]]
+    # Vectors are stored as given, not normalized
+    assert result.tolist() == expected[::-1].tolist()
+
+
+@pytest.mark.offline
+async def test_mmap_backend_caps_entries(tmp_path):
+    backend = MmapEmbeddingCacheBackend(str(tmp_path / "cache"), 3, max_entries=2)
+    func, cache = make_func(RecordingProvider(), backend)
+
+    await func(["a", "b", "c"])
+
+    assert len(backend) == 2
+    assert await cache.get_many(["a"]) == {}
+    assert set(await cache.get_many(["b", "c"])) == {"b", "c"}
+
+
+@pytest.mark.offline
+async def test_mmap_backend_hit_refreshes_recency(tmp_path):
+    prefix = str(tmp_path / "cache")
+    func, cache = make_func(
+        RecordingProvider(), MmapEmbeddingCacheBackend(prefix, 3, max_entries=2)
+    )
+    await func(["a", "b"])
+    await cache.flush()
+
+    reopened, cache = make_func(
+        RecordingProvider(), MmapEmbeddingCacheBackend(prefix, 3, max_entries=2)
+    )
+    await reopened(["a"])  # hit: "b" is now the least recently used
+    await reopened(["c"])
+
+    assert set(await cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+class CharTokenizer(TokenizerInterface):
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+async def mock_llm_func(prompt, system_prompt=None, history_messages=[], **kwargs):
+    return ""
+
+
+def make_rag(working_dir, storage, model_name="test-model"):
+    return LightRAG(
+        working_dir=str(working_dir),
+        llm_model_func=mock_llm_func,
+        embedding_func=EmbeddingFunc(
+            embedding_dim=3, func=RecordingProvider(), model_name=model_name
+        ),
+        tokenizer=Tokenizer("char", CharTokenizer()),
+        embedding_cache_storage=storage,
+    )
+
+
+@pytest.mark.offline
+def test_cache_disabled_without_model_name(tmp_path):
+    rag = make_rag(tmp_path, "kv", model_name=None)
+    assert rag._embedding_cache is None
+
+
+@pytest.mark.offline
+def test_cache_disabled_for_unsupported_kv_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        lightrag_module, "EMBEDDING_CACHE_UNSUPPORTED_KV_STORAGES", {"JsonKVStorage"}
+    )
+    rag = make_rag(tmp_path, "kv")
+    assert rag._embedding_cache is None
+    assert rag.embedding_cache_kv is None
+
+
+@pytest.mark.offline
+def test_mmap_cache_falls_back_to_kv_with_multiple_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(lightrag_module, "is_multiprocess", lambda: True)
+    rag = make_rag(tmp_path, "mmap")
+    assert isinstance(rag._embedding_cache.backend, KVEmbeddingCacheBackend)
+
+
+@pytest.mark.offline
+async def test_finalize_storages_flushes_embedding_cache(tmp_path):
+    rag = make_rag(tmp_path, "mmap")
+    await rag.initialize_storages()
+    try:
+        await rag.embedding_func(["persist me"])
+        await rag.finalize_storages()
+    finally:
+        finalize_share_data()
+
+    backend = MmapEmbeddingCacheBackend(str(tmp_path / "embedding_cache"), 3)
+    key = EmbeddingCache(backend, "test-model", 3).make_key("persist me")
+    assert key in await backend.get([key])
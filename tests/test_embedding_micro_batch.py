@@ -0,0 +1,89 @@
+"""
+Tests for the micro-batching embedding scheduler
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.utils import micro_batch_embedding_func
+
+
+class RecordingEmbeddingFunc:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, texts, _priority=10, **kwargs):
+        self.calls.append((list(texts), _priority, kwargs))
+        if self.fail:
+            raise RuntimeError("embedding service unavailable")
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+@pytest.mark.offline
+async def test_concurrent_requests_are_coalesced_and_deduped():
+    func = RecordingEmbeddingFunc()
+    batched = micro_batch_embedding_func(max_batch_size=10, window=0.01)(func)
+
+    results = await asyncio.gather(
+        batched(["a", "bb"]),
+        batched(["bb", "ccc"], _priority=5),
+        batched(["a"]),
+    )
+
+    assert func.calls == [(["a", "bb", "ccc"], 5, {})]
+    assert results[0].tolist() == [[1.0, 1.0], [2.0, 1.0]]
+    assert results[1].tolist() == [[2.0, 1.0], [3.0, 1.0]]
+    assert results[2].tolist() == [[1.0, 1.0]]
+
+
+@pytest.mark.offline
+async def test_full_batch_is_dispatched_without_waiting():
+    func = RecordingEmbeddingFunc()
+    batched = micro_batch_embedding_func(max_batch_size=3, window=60)(func)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batched(["a", "b"]), batched(["c"])), timeout=1
+    )
+
+    assert [texts for texts, _, _ in func.calls] == [["a", "b", "c"]]
+    assert [len(r) for r in results] == [2, 1]
+
+
+@pytest.mark.offline
+async def test_overflowing_request_starts_new_batch():
+    func = RecordingEmbeddingFunc()
+    batched = micro_batch_embedding_func(max_batch_size=3, window=0.01)(func)
+
+    await asyncio.gather(batched(["a", "b"]), batched(["c", "d"]))
+
+    assert [texts for texts, _, _ in func.calls] == [["a", "b"], ["c", "d"]]
+
+
+@pytest.mark.offline
+async def test_large_and_custom_calls_bypass_batching():
+    func = RecordingEmbeddingFunc()
+    batched = micro_batch_embedding_func(max_batch_size=2, window=60)(func)
+
+    await asyncio.wait_for(batched(["a", "b", "c"]), timeout=1)
+    await asyncio.wait_for(batched(["a"], _timeout=5), timeout=1)
+
+    assert func.calls == [
+        (["a", "b", "c"], 10, {}),
+        (["a"], 10, {"_timeout": 5}),
+    ]
+
+
+@pytest.mark.offline
+async def test_failure_is_propagated_to_every_caller():
+    batched = micro_batch_embedding_func(max_batch_size=10, window=0.01)(
+        RecordingEmbeddingFunc(fail=True)
+    )
+
+    results = await asyncio.gather(
+        batched(["a"]), batched(["b"]), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
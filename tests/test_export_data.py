@@ -0,0 +1,174 @@
+"""
+Tests for the streaming aexport_data pipeline
+"""
+
+import csv
+import json
+
+import pytest
+
+from lightrag.base import BaseGraphStorage, BaseVectorStorage
+from lightrag.utils import aexport_data, compute_mdhash_id
+
+
+class FakeGraph:
+    """Graph storage stand-in using the BaseGraphStorage paging defaults"""
+
+    iter_nodes = BaseGraphStorage.iter_nodes
+    iter_edges = BaseGraphStorage.iter_edges
+
+    def __init__(self, nodes, edges):
+        self.nodes = nodes
+        self.edges = edges
+
+    async def get_all_nodes(self):
+        return [{"id": name, **data} for name, data in self.nodes.items()]
+
+    async def get_all_edges(self):
+        return [{"source": src, "target": tgt, **data} for src, tgt, data in self.edges]
+
+    async def get_node(self, node_id):
+        raise AssertionError("export must not fetch nodes one by one")
+
+
+class FakeVectorStorage:
+    iter_items = BaseVectorStorage.iter_items
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def iter_keys(self, batch_size=1000):
+        keys = list(self.rows)
+        for start in range(0, len(keys), batch_size):
+            yield keys[start : start + batch_size]
+
+    async def get_by_ids(self, ids):
+        self.calls.append(list(ids))
+        return [self.rows.get(id) for id in ids]
+
+    async def get_by_id(self, id):
+        raise AssertionError("export must not fetch vectors one by one")
+
+
+def make_storages(entity_count=5):
+    names = [f"E{i}" for i in range(entity_count)]
+    nodes = {name: {"entity_id": name, "source_id": f"chunk-{name}"} for name in names}
+    edges = [
+        (names[i], names[i + 1], {"source_id": f"chunk-{i}", "weight": 1.0})
+        for i in range(entity_count - 1)
+    ]
+    # Some backends list undirected edges in both directions
+    edges.append((names[1], names[0], dict(edges[0][2])))
+
+    entity_rows = {
+        compute_mdhash_id(name, prefix="ent-"): {"id": name, "content": name}
+        for name in names
+    }
+    relation_rows = {}
+    for src, tgt, _ in edges[:-1]:
+        rel_id = compute_mdhash_id(src + tgt, prefix="rel-")
+        relation_rows[rel_id] = {"id": rel_id, "src_id": src, "tgt_id": tgt}
+    return (
+        FakeGraph(nodes, edges),
+        FakeVectorStorage(entity_rows),
+        FakeVectorStorage(relation_rows),
+    )
+
+
+@pytest.mark.offline
+async def test_jsonl_export_pages_vector_lookups(tmp_path):
+    graph, entities_vdb, relationships_vdb = make_storages(entity_count=5)
+    output = tmp_path / "export.jsonl"
+
+    await aexport_data(
+        graph,
+        entities_vdb,
+        relationships_vdb,
+        str(output),
+        "jsonl",
+        include_vector_data=True,
+        batch_size=2,
+    )
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    by_type = {}
+    for record in records:
+        by_type.setdefault(record["type"], []).append(record)
+
+    assert [r["entity_name"] for r in by_type["entity"]] == [
+        "E0",
+        "E1",
+        "E2",
+        "E3",
+        "E4",
+    ]
+    assert by_type["entity"][0]["graph_data"] == {
+        "entity_id": "E0",
+        "source_id": "chunk-E0",
+    }
+    assert by_type["entity"][0]["vector_data"] == {"id": "E0", "content": "E0"}
+    # The reversed duplicate edge is exported once
+    assert [(r["src_entity"], r["tgt_entity"]) for r in by_type["relation"]] == [
+        ("E0", "E1"),
+        ("E1", "E2"),
+        ("E2", "E3"),
+        ("E3", "E4"),
+    ]
+    assert all(r["vector_data"] for r in by_type["relation"])
+    assert len(by_type["relationship"]) == 4
+
+    # One get_by_ids call per page instead of one get_by_id per record
+    assert [len(ids) for ids in entities_vdb.calls] == [2, 2, 1]
+    assert all(len(ids) <= 4 for ids in relationships_vdb.calls)
+
+
+@pytest.mark.offline
+async def test_csv_export_writes_each_section(tmp_path):
+    graph, entities_vdb, relationships_vdb = make_storages(entity_count=3)
+    output = tmp_path / "export.csv"
+
+    await aexport_data(
+        graph, entities_vdb, relationships_vdb, str(output), "csv", batch_size=2
+    )
+
+    sections = output.read_text(encoding="utf-8").split("\n\n\n")
+    assert [s.splitlines()[0] for s in sections] == [
+        "# ENTITIES",
+        "# RELATIONS",
+        "# RELATIONSHIPS",
+    ]
+    entities = list(csv.DictReader(sections[0].splitlines()[1:]))
+    assert [e["entity_name"] for e in entities] == ["E0", "E1", "E2"]
+    assert "vector_data" not in entities[0]
+    relations = list(csv.DictReader(sections[1].strip().splitlines()[1:]))
+    assert [(r["src_entity"], r["tgt_entity"]) for r in relations] == [
+        ("E0", "E1"),
+        ("E1", "E2"),
+    ]
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("file_format", ["md", "txt", "excel"])
+async def test_other_formats_export_all_entities(tmp_path, file_format):
+    graph, entities_vdb, relationships_vdb = make_storages(entity_count=4)
+    output = tmp_path / f"export.{file_format}"
+
+    await aexport_data(
+        graph, entities_vdb, relationships_vdb, str(output), file_format, batch_size=3
+    )
+
+    assert output.stat().st_size > 0
+    if file_format != "excel":
+        text = output.read_text(encoding="utf-8")
+        assert all(f"E{i}" in text for i in range(4))
+
+
+@pytest.mark.offline
+async def test_unsupported_format_is_rejected_before_writing(tmp_path):
+    graph, entities_vdb, relationships_vdb = make_storages()
+    output = tmp_path / "export.xml"
+
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        await aexport_data(graph, entities_vdb, relationships_vdb, str(output), "xml")
+    assert not output.exists()
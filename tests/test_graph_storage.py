@@ -16,6 +16,7 @@ Supported graph storage types include:
 import asyncio
 import os
 import sys
+import time
 import importlib
 import numpy as np
 import pytest
@@ -25,6 +26,7 @@ from ascii_colors import ASCIIColors
 # Add the project root directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from lightrag.base import BaseGraphStorage
 from lightrag.types import KnowledgeGraph
 from lightrag.kg import (
     STORAGE_IMPLEMENTATIONS,
@@ -1207,6 +1209,206 @@ async def test_graph_undirected_property(storage):
         return False
 
 
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_graph_batch_conformance(storage):
+    """
+    Cross-backend conformance and latency test of the five batch read methods:
+    1. Build a hub-and-spoke graph with some edges stored in reverse direction.
+    2. Verify each batch method returns the same data as its per-item counterpart,
+       including missing nodes and edges.
+    3. Time batch calls against sequential per-item calls; backends with native
+       batch implementations must not be slower than the sequential path.
+    """
+    try:
+        leaf_count = 40
+        hub_id = "Batch Hub"
+        leaf_ids = [f"Batch Leaf {i}" for i in range(leaf_count)]
+        missing_id = "Batch Missing Node"
+
+        # 1. Insert test data
+        await storage.upsert_node(
+            hub_id,
+            {"entity_id": hub_id, "description": "Hub", "entity_type": "Test"},
+        )
+        for i, leaf_id in enumerate(leaf_ids):
+            await storage.upsert_node(
+                leaf_id,
+                {
+                    "entity_id": leaf_id,
+                    "description": f"Leaf {i}",
+                    "entity_type": "Test",
+                },
+            )
+            edge_data = {
+                "relationship": "links",
+                "weight": float(i),
+                "description": f"Hub links leaf {i}",
+                "keywords": "batch",
+                "source_id": str(i),
+            }
+            # Every other edge is stored leaf -> hub to exercise direction handling
+            if i % 2:
+                await storage.upsert_edge(leaf_id, hub_id, edge_data)
+            else:
+                await storage.upsert_edge(hub_id, leaf_id, edge_data)
+        # Chain neighbouring leaves so leaf degrees differ
+        for left, right in zip(leaf_ids[:10], leaf_ids[1:11]):
+            await storage.upsert_edge(
+                left,
+                right,
+                {"relationship": "next", "weight": 1.0, "description": "chain"},
+            )
+
+        node_ids = [hub_id, *leaf_ids, missing_id]
+        pairs = [{"src": hub_id, "tgt": leaf_id} for leaf_id in leaf_ids]
+        pairs.append({"src": leaf_ids[0], "tgt": leaf_ids[20]})  # no such edge
+        edge_pairs = [(pair["src"], pair["tgt"]) for pair in pairs]
+
+        # 2. Conformance with per-item methods
+        nodes = await storage.get_nodes_batch(node_ids)
+        assert set(nodes) == set(node_ids) - {missing_id}, "get_nodes_batch keys"
+        for node_id in leaf_ids[:5]:
+            single = await storage.get_node(node_id)
+            assert (
+                nodes[node_id]["description"] == single["description"]
+            ), f"get_nodes_batch data of {node_id}"
+
+        degrees = await storage.node_degrees_batch(node_ids)
+        for node_id in node_ids[:-1]:
+            assert degrees.get(node_id, 0) == await storage.node_degree(
+                node_id
+            ), f"node_degrees_batch of {node_id}"
+        assert degrees.get(hub_id) == leaf_count, "hub degree"
+        assert not degrees.get(missing_id), "missing node degree"
+
+        edge_degrees = await storage.edge_degrees_batch(edge_pairs)
+        for src, tgt in edge_pairs:
+            assert edge_degrees[(src, tgt)] == await storage.edge_degree(
+                src, tgt
+            ), f"edge_degrees_batch of {src}-{tgt}"
+
+        edges = await storage.get_edges_batch(pairs)
+        for src, tgt in edge_pairs:
+            single = await storage.get_edge(src, tgt)
+            if single is None:
+                assert (src, tgt) not in edges, f"unexpected edge {src}-{tgt}"
+                continue
+            assert (
+                edges[(src, tgt)]["description"] == single["description"]
+            ), f"get_edges_batch data of {src}-{tgt}"
+            assert float(edges[(src, tgt)]["weight"]) == float(single["weight"])
+
+        nodes_edges = await storage.get_nodes_edges_batch(node_ids)
+        for node_id in node_ids:
+            single = await storage.get_node_edges(node_id) or []
+            # Compare undirected: backends differ in how they orient the tuples
+            assert {frozenset(e) for e in nodes_edges.get(node_id, [])} == {
+                frozenset(e) for e in single
+            }, f"get_nodes_edges_batch of {node_id}"
+
+        # 3. Latency of batch vs sequential per-item reads
+        start = time.perf_counter()
+        await storage.get_nodes_batch(node_ids)
+        await storage.node_degrees_batch(node_ids)
+        await storage.edge_degrees_batch(edge_pairs)
+        await storage.get_edges_batch(pairs)
+        await storage.get_nodes_edges_batch(node_ids)
+        batch_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await BaseGraphStorage.get_nodes_batch(storage, node_ids)
+        await BaseGraphStorage.node_degrees_batch(storage, node_ids)
+        await BaseGraphStorage.edge_degrees_batch(storage, edge_pairs)
+        await BaseGraphStorage.get_edges_batch(storage, pairs)
+        await BaseGraphStorage.get_nodes_edges_batch(storage, node_ids)
+        sequential_elapsed = time.perf_counter() - start
+
+        print(
+            f"Batch reads: {batch_elapsed * 1000:.1f} ms, "
+            f"sequential reads: {sequential_elapsed * 1000:.1f} ms"
+        )
+        native_batch = all(
+            getattr(type(storage), name) is not getattr(BaseGraphStorage, name)
+            for name in (
+                "get_nodes_batch",
+                "node_degrees_batch",
+                "edge_degrees_batch",
+                "get_edges_batch",
+                "get_nodes_edges_batch",
+            )
+        )
+        if native_batch:
+            assert (
+                batch_elapsed <= sequential_elapsed
+            ), "native batch reads should not be slower than sequential reads"
+
+        print("\nBatch conformance tests completed.")
+        return True
+
+    except Exception as e:
+        ASCIIColors.red(f"An error occurred during the test: {str(e)}")
+        return False
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_graph_paged_iteration(storage):
+    """
+    Test the paged iteration API:
+    1. Insert more nodes and edges than fit in one page.
+    2. Verify iter_nodes and iter_edges respect batch_size and return every node
+       and edge exactly once, matching get_all_nodes/get_all_edges.
+    """
+    try:
+        node_count = 25
+        node_ids = [f"Page Node {i:02d}" for i in range(node_count)]
+        for node_id in node_ids:
+            await storage.upsert_node(
+                node_id,
+                {"entity_id": node_id, "description": "Paged", "entity_type": "Test"},
+            )
+        expected_pairs = set()
+        for left, right in zip(node_ids, node_ids[1:]):
+            await storage.upsert_edge(
+                left,
+                right,
+                {"relationship": "next", "weight": 1.0, "description": "chain"},
+            )
+            expected_pairs.add(tuple(sorted((left, right))))
+
+        batch_size = 7
+        seen_nodes = []
+        async for nodes in storage.iter_nodes(batch_size=batch_size):
+            assert 0 < len(nodes) <= batch_size, f"node page size {len(nodes)}"
+            seen_nodes.extend(node["id"] for node in nodes)
+        assert len(seen_nodes) == len(set(seen_nodes)), "nodes returned twice"
+        all_node_ids = {node["id"] for node in await storage.get_all_nodes()}
+        assert set(seen_nodes) == all_node_ids, "iter_nodes differs from get_all_nodes"
+        assert set(node_ids) <= set(seen_nodes)
+
+        seen_pairs = []
+        async for edges in storage.iter_edges(batch_size=batch_size):
+            assert edges, "empty edge page"
+            seen_pairs.extend(
+                tuple(sorted((edge["source"], edge["target"]))) for edge in edges
+            )
+        assert len(seen_pairs) == len(set(seen_pairs)), "edges returned twice"
+        all_pairs = {
+            tuple(sorted((edge["source"], edge["target"])))
+            for edge in await storage.get_all_edges()
+        }
+        assert set(seen_pairs) == all_pairs, "iter_edges differs from get_all_edges"
+        assert expected_pairs <= set(seen_pairs)
+
+        print("\nPaged iteration tests completed.")
+        return True
+
+    except Exception as e:
+        ASCIIColors.red(f"An error occurred during the test: {str(e)}")
+        return False
+
+
 async def main():
     """Main function"""
     # Display program title
@@ -1254,12 +1456,18 @@ async def main():
         ASCIIColors.white(
             "5. Special Characters Test (Verify handling of single/double quotes, backslashes, etc.)"
         )
-        ASCIIColors.white("6. All Tests")
+        ASCIIColors.white(
+            "6. Batch Conformance Test (Batch reads match per-item reads, latency)"
+        )
+        ASCIIColors.white(
+            "7. Paged Iteration Test (iter_nodes/iter_edges page through the graph)"
+        )
+        ASCIIColors.white("8. All Tests")
 
-        choice = input("\nEnter your choice (1/2/3/4/5/6): ")
+        choice = input("\nEnter your choice (1/2/3/4/5/6/7/8): ")
 
         # Clean data before running tests
-        if choice in ["1", "2", "3", "4", "5", "6"]:
+        if choice in ["1", "2", "3", "4", "5", "6", "7", "8"]:
             ASCIIColors.yellow("\nCleaning data before running tests...")
             await storage.drop()
             ASCIIColors.green("Data cleanup complete\n")
@@ -1275,6 +1483,10 @@ async def main():
         elif choice == "5":
             await test_graph_special_characters(storage)
         elif choice == "6":
+            await test_graph_batch_conformance(storage)
+        elif choice == "7":
+            await test_graph_paged_iteration(storage)
+        elif choice == "8":
             ASCIIColors.cyan("\n=== Starting Basic Test ===")
             basic_result = await test_graph_basic(storage)
 
@@ -1296,7 +1508,23 @@ async def main():
                             ASCIIColors.cyan(
                                 "\n=== Starting Special Characters Test ==="
                             )
-                            await test_graph_special_characters(storage)
+                            special_result = await test_graph_special_characters(
+                                storage
+                            )
+
+                            if special_result:
+                                ASCIIColors.cyan(
+                                    "\n=== Starting Batch Conformance Test ==="
+                                )
+                                conformance_result = await test_graph_batch_conformance(
+                                    storage
+                                )
+
+                                if conformance_result:
+                                    ASCIIColors.cyan(
+                                        "\n=== Starting Paged Iteration Test ==="
+                                    )
+                                    await test_graph_paged_iteration(storage)
         else:
             ASCIIColors.red("Invalid choice")
 
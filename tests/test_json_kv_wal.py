@@ -0,0 +1,125 @@
+"""
+Tests for the write-ahead log persistence mode of JsonKVStorage
+
+Covers append-only persistence, replay on initialize, torn-tail recovery,
+compaction into the JSON snapshot and switching back to the JSON mode.
+"""
+
+import json
+import os
+
+import pytest
+
+from lightrag.kg import json_kv_impl
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+def make_storage(working_dir: str) -> JsonKVStorage:
+    return JsonKVStorage(
+        namespace="text_chunks",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+
+
+async def reopen(working_dir: str) -> JsonKVStorage:
+    """Simulate a process restart: fresh shared data, then load from disk."""
+    finalize_share_data()
+    initialize_share_data()
+    storage = make_storage(working_dir)
+    await storage.initialize()
+    return storage
+
+
+@pytest.fixture(autouse=True)
+def wal_mode(monkeypatch):
+    monkeypatch.setenv("JSON_KV_STORAGE_MODE", "wal")
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+def wal_file(tmp_path) -> str:
+    return os.path.join(str(tmp_path), "kv_store_text_chunks.wal.jsonl")
+
+
+@pytest.mark.offline
+async def test_wal_appends_only_changes(tmp_path):
+    storage = make_storage(str(tmp_path))
+    await storage.initialize()
+    await storage.upsert({f"k{i}": {"content": f"v{i}"} for i in range(5)})
+    await storage.index_done_callback()
+    size_before = os.path.getsize(wal_file(tmp_path))
+
+    await storage.upsert({"k1": {"content": "updated"}})
+    await storage.delete(["k2"])
+    await storage.index_done_callback()
+
+    with open(wal_file(tmp_path), encoding="utf-8") as f:
+        f.seek(size_before)
+        records = [json.loads(line) for line in f]
+    assert [(r["op"], r["key"]) for r in records] == [
+        ("upsert", "k1"),
+        ("delete", "k2"),
+    ]
+    # No snapshot is written until the log is compacted
+    assert not os.path.exists(os.path.join(str(tmp_path), "kv_store_text_chunks.json"))
+
+    reloaded = await reopen(str(tmp_path))
+    assert (await reloaded.get_by_id("k1"))["content"] == "updated"
+    assert await reloaded.get_by_id("k2") is None
+    assert len(await reloaded.get_by_ids([f"k{i}" for i in range(5)])) == 5
+
+
+@pytest.mark.offline
+async def test_wal_replay_ignores_torn_tail(tmp_path):
+    storage = make_storage(str(tmp_path))
+    await storage.initialize()
+    await storage.upsert({"a": {"content": "A"}})
+    await storage.index_done_callback()
+    # Simulate a crash in the middle of appending a record
+    with open(wal_file(tmp_path), "ab") as f:
+        f.write(b'{"op": "upsert", "key": "b", "val')
+
+    reloaded = await reopen(str(tmp_path))
+    assert (await reloaded.get_by_id("a"))["content"] == "A"
+    assert await reloaded.get_by_id("b") is None
+
+    await reloaded.upsert({"c": {"content": "C"}})
+    await reloaded.index_done_callback()
+    again = await reopen(str(tmp_path))
+    assert (await again.get_by_id("c"))["content"] == "C"
+
+
+@pytest.mark.offline
+async def test_wal_compaction_writes_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_kv_impl, "WAL_COMPACTION_MIN_BYTES", 0)
+    storage = make_storage(str(tmp_path))
+    await storage.initialize()
+    await storage.upsert({"a": {"content": "A"}, "b": {"content": "B"}})
+    await storage.delete(["b"])
+    await storage.index_done_callback()
+
+    assert os.path.getsize(wal_file(tmp_path)) == 0
+    with open(os.path.join(str(tmp_path), "kv_store_text_chunks.json")) as f:
+        assert list(json.load(f)) == ["a"]
+    reloaded = await reopen(str(tmp_path))
+    assert (await reloaded.get_by_id("a"))["content"] == "A"
+
+
+@pytest.mark.offline
+async def test_json_mode_folds_existing_wal(tmp_path, monkeypatch):
+    storage = make_storage(str(tmp_path))
+    await storage.initialize()
+    await storage.upsert({"a": {"content": "A"}})
+    await storage.index_done_callback()
+
+    monkeypatch.setenv("JSON_KV_STORAGE_MODE", "json")
+    reloaded = await reopen(str(tmp_path))
+
+    assert (await reloaded.get_by_id("a"))["content"] == "A"
+    assert os.path.getsize(wal_file(tmp_path)) == 0
+    with open(os.path.join(str(tmp_path), "kv_store_text_chunks.json")) as f:
+        assert "a" in json.load(f)
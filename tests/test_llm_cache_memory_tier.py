@@ -0,0 +1,136 @@
+"""
+Tests for the in-process LRU tier in front of the LLM response cache
+"""
+
+import pytest
+
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import (
+    CacheData,
+    LLMCacheMemoryTier,
+    get_llm_cache_memory_tier,
+    handle_cache,
+    invalidate_llm_cache_memory_tier,
+    save_to_cache,
+)
+
+
+class CountingKV:
+    """Minimal LLM response cache storage that counts backend round trips."""
+
+    def __init__(self, max_bytes: int = 1024, ttl: int = 0):
+        self.global_config = {
+            "enable_llm_cache": True,
+            "enable_llm_cache_for_entity_extract": True,
+            "llm_cache_memory_max_bytes": max_bytes,
+            "llm_cache_memory_ttl": ttl,
+        }
+        self.workspace = ""
+        self.data = {}
+        self.reads = 0
+        self.writes = 0
+
+    async def get_by_id(self, id):
+        self.reads += 1
+        return self.data.get(id)
+
+    async def upsert(self, data):
+        self.writes += 1
+        for key, value in data.items():
+            self.data[key] = {**value, "create_time": 123}
+
+
+@pytest.mark.offline
+def test_lru_eviction_by_size():
+    tier = LLMCacheMemoryTier(max_bytes=30)
+    tier.put("a", "x" * 9)  # 10 bytes
+    tier.put("b", "y" * 9)
+    tier.get("a")  # "a" becomes most recently used
+    tier.put("c", "z" * 9)
+    tier.put("d", "w" * 9)
+
+    assert tier.get("b") is None
+    assert tier.get("a") is not None
+    assert tier.size_bytes <= 30
+    # Oversized entries are never cached
+    tier.put("huge", "h" * 100)
+    assert tier.peek("huge") is None
+
+
+@pytest.mark.offline
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("lightrag.utils.time.monotonic", lambda: now[0])
+    tier = LLMCacheMemoryTier(max_bytes=1024, ttl=10)
+    tier.put("k", "v", 1)
+
+    assert tier.get("k") == ("v", 1)
+    now[0] += 11
+    assert tier.get("k") is None
+    assert len(tier) == 0
+
+
+@pytest.mark.offline
+async def test_write_through_and_hit_without_backend_read():
+    kv = CountingKV()
+
+    await save_to_cache(kv, CacheData("hash", "answer", "prompt", mode="local"))
+    assert kv.writes == 1
+    assert kv.reads == 0  # duplicate check is answered by the tier
+
+    content, _ = await handle_cache(kv, "hash", "prompt", "local", "query")
+    assert content == "answer"
+    assert kv.reads == 0
+
+    # Identical content is not written again
+    await save_to_cache(kv, CacheData("hash", "answer", "prompt", mode="local"))
+    assert kv.writes == 1
+
+    stats = get_llm_cache_memory_tier(kv).stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 0
+
+
+@pytest.mark.offline
+async def test_backend_hit_populates_tier():
+    kv = CountingKV()
+    kv.data["default:extract:h"] = {"return": "result", "create_time": 42}
+
+    assert await handle_cache(kv, "h", "p", "default", "extract") == ("result", 42)
+    assert await handle_cache(kv, "h", "p", "default", "extract") == ("result", 42)
+    assert kv.reads == 1
+
+    get_llm_cache_memory_tier(kv).clear()
+    assert await handle_cache(kv, "h", "p", "default", "extract") == ("result", 42)
+    assert kv.reads == 2
+
+
+@pytest.mark.offline
+async def test_tier_disabled_by_default():
+    kv = CountingKV(max_bytes=0)
+    kv.data["local:query:h"] = {"return": "r", "create_time": 1}
+
+    assert get_llm_cache_memory_tier(kv) is None
+    assert await handle_cache(kv, "h", "p", "local", "query") == ("r", 1)
+    assert await handle_cache(kv, "h", "p", "local", "query") == ("r", 1)
+    assert kv.reads == 2
+
+
+@pytest.mark.offline
+async def test_invalidation_reaches_other_workers():
+    initialize_share_data()
+    try:
+        worker_a, worker_b = CountingKV(), CountingKV()
+        worker_b.data = worker_a.data  # both workers share one backend
+        worker_a.data["local:query:h"] = {"return": "old", "create_time": 1}
+
+        assert await handle_cache(worker_a, "h", "p", "local", "query") == ("old", 1)
+        assert await handle_cache(worker_b, "h", "p", "local", "query") == ("old", 1)
+
+        del worker_a.data["local:query:h"]
+        await invalidate_llm_cache_memory_tier(worker_a, ["local:query:h"])
+
+        assert await handle_cache(worker_a, "h", "p", "local", "query") is None
+        assert await handle_cache(worker_b, "h", "p", "local", "query") is None
+    finally:
+        finalize_share_data()
@@ -0,0 +1,189 @@
+"""
+Tests for MergeCoalescer cross-document merge coalescing
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import MergeCoalescer
+from lightrag.utils import Tokenizer, TokenizerInterface
+
+
+class CharTokenizer(TokenizerInterface):
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+class FakeKV:
+    def __init__(self):
+        self.data = {}
+
+    async def get_by_id(self, id):
+        return self.data.get(id)
+
+    async def get_by_ids(self, ids):
+        return [self.data.get(id) for id in ids]
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+
+class CountingVDB:
+    def __init__(self):
+        self.data = {}
+        self.upserted = Counter()
+
+    async def upsert(self, data):
+        self.data.update(data)
+        self.upserted.update(data.keys())
+
+    async def delete(self, ids):
+        for id in ids:
+            self.data.pop(id, None)
+
+
+def node(name: str, chunk: str, file_path: str) -> dict:
+    return {
+        "entity_type": "Organization",
+        "description": f"{name} seen in {chunk}",
+        "source_id": chunk,
+        "file_path": file_path,
+    }
+
+
+def edge(src: str, tgt: str, chunk: str, file_path: str) -> dict:
+    return {
+        "src_id": src,
+        "tgt_id": tgt,
+        "weight": 1.0,
+        "description": f"{src} works with {tgt}",
+        "keywords": "partner",
+        "source_id": chunk,
+        "file_path": file_path,
+    }
+
+
+def doc_results(index: int) -> list:
+    chunk, file_path, own = f"chunk-{index}", f"doc-{index}.txt", f"Team{index}"
+    return [
+        (
+            {
+                "Acme": [node("Acme", chunk, file_path)],
+                own: [node(own, chunk, file_path)],
+            },
+            {("Acme", own): [edge("Acme", own, chunk, file_path)]},
+        )
+    ]
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def make_coalescer(tmp_path, window: float, max_batch: int):
+    graph = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await graph.initialize()
+    global_config = {
+        "workspace": "",
+        "llm_model_max_async": 4,
+        "tokenizer": Tokenizer("char", CharTokenizer()),
+        "summary_context_size": 10000,
+        "summary_max_tokens": 10000,
+        "force_llm_summary_on_merge": 100,
+        "source_ids_limit_method": "FIFO",
+        "max_source_ids_per_entity": 300,
+        "max_source_ids_per_relation": 300,
+        "max_file_paths": 100,
+    }
+    return MergeCoalescer(
+        knowledge_graph_inst=graph,
+        entity_vdb=CountingVDB(),
+        relationships_vdb=CountingVDB(),
+        global_config=global_config,
+        full_entities_storage=FakeKV(),
+        full_relations_storage=FakeKV(),
+        pipeline_status={"latest_message": "", "history_messages": []},
+        pipeline_status_lock=asyncio.Lock(),
+        entity_chunks_storage=FakeKV(),
+        relation_chunks_storage=FakeKV(),
+        window=window,
+        max_batch=max_batch,
+    )
+
+
+@pytest.mark.offline
+async def test_hub_entity_merged_once_per_window(tmp_path):
+    coalescer = await make_coalescer(tmp_path, window=10.0, max_batch=3)
+
+    # A full batch flushes immediately instead of waiting for the window
+    await asyncio.wait_for(
+        asyncio.gather(
+            *(coalescer.merge(doc_results(i), doc_id=f"doc-{i}") for i in range(3))
+        ),
+        timeout=5,
+    )
+
+    graph = coalescer.knowledge_graph_inst
+    acme = await graph.get_node("Acme")
+    assert sorted(acme["source_id"].split("<SEP>")) == [
+        "chunk-0",
+        "chunk-1",
+        "chunk-2",
+    ]
+    assert max(coalescer.entity_vdb.upserted.values()) == 1
+    assert sum(coalescer.entity_vdb.upserted.values()) == 4
+
+    # Every document still gets its own entity/relation index
+    full_entities = coalescer.full_entities_storage.data
+    full_relations = coalescer.full_relations_storage.data
+    for i in range(3):
+        assert set(full_entities[f"doc-{i}"]["entity_names"]) == {"Acme", f"Team{i}"}
+        assert full_relations[f"doc-{i}"]["relation_pairs"] == [
+            sorted(["Acme", f"Team{i}"])
+        ]
+
+
+@pytest.mark.offline
+async def test_window_timeout_flushes_partial_batch(tmp_path):
+    coalescer = await make_coalescer(tmp_path, window=0.05, max_batch=10)
+
+    await asyncio.wait_for(coalescer.merge(doc_results(0), doc_id="doc-0"), timeout=5)
+    await asyncio.wait_for(coalescer.merge(doc_results(1), doc_id="doc-1"), timeout=5)
+
+    # Two sequential windows: the hub entity is merged twice
+    assert max(coalescer.entity_vdb.upserted.values()) == 2
+    assert set(coalescer.full_entities_storage.data) == {"doc-0", "doc-1"}
+
+
+@pytest.mark.offline
+async def test_merge_error_fails_every_document_of_the_window(tmp_path):
+    coalescer = await make_coalescer(tmp_path, window=10.0, max_batch=2)
+
+    async def broken_upsert(data):
+        raise RuntimeError("vector store down")
+
+    coalescer.entity_vdb.upsert = broken_upsert
+
+    results = await asyncio.gather(
+        coalescer.merge(doc_results(0), doc_id="doc-0"),
+        coalescer.merge(doc_results(1), doc_id="doc-1"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, Exception) for result in results)
+    assert coalescer.full_entities_storage.data == {}
@@ -0,0 +1,188 @@
+"""
+Tests for the memory-mapped storage mode of NanoVectorDBStorage
+
+Covers append-only persistence, tombstoned deletes, compaction, crash-safe
+replay of a torn index file and migration from the NanoVectorDB JSON file.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from lightrag.kg.nano_vector_db_impl import (
+    MmapVectorDB,
+    NanoVectorDBStorage,
+    _normalize,
+)
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+DIM = 8
+
+
+def embed(text: str) -> np.ndarray:
+    """Deterministic embedding so that queries can find their own text."""
+    rng = np.random.default_rng(abs(hash(text)) % (2**32))
+    return rng.random(DIM).astype(np.float32)
+
+
+async def mock_embedding_func(texts: list[str], **kwargs) -> np.ndarray:
+    return np.stack([embed(t) for t in texts])
+
+
+def make_storage(working_dir: str, storage_mode: str) -> NanoVectorDBStorage:
+    global_config = {
+        "working_dir": working_dir,
+        "embedding_batch_num": 4,
+        "vector_db_storage_cls_kwargs": {
+            "cosine_better_than_threshold": 0.0,
+            "storage_mode": storage_mode,
+        },
+    }
+    return NanoVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config=global_config,
+        embedding_func=EmbeddingFunc(embedding_dim=DIM, func=mock_embedding_func),
+        meta_fields={"content"},
+    )
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+
+
+@pytest.mark.offline
+async def test_mmap_round_trip(tmp_path):
+    storage = make_storage(str(tmp_path), "mmap")
+    await storage.initialize()
+    await storage.upsert({f"id-{i}": {"content": f"text {i}"} for i in range(10)})
+    await storage.delete(["id-3"])
+    await storage.upsert({"id-4": {"content": "text 4 updated"}})
+    assert await storage.index_done_callback()
+
+    reloaded = make_storage(str(tmp_path), "mmap")
+    await reloaded.initialize()
+
+    assert await reloaded.get_by_id("id-3") is None
+    assert (await reloaded.get_by_id("id-4"))["content"] == "text 4 updated"
+    results = await reloaded.query("text 7", top_k=3)
+    assert results[0]["id"] == "id-7"
+    assert results[0]["distance"] == pytest.approx(1.0, abs=1e-5)
+
+    vectors = await reloaded.get_vectors_by_ids(["id-7"])
+    expected = embed("text 7") / np.linalg.norm(embed("text 7"))
+    assert np.allclose(vectors["id-7"], expected, atol=1e-6)
+
+
+@pytest.mark.offline
+async def test_mmap_save_appends_only_changes(tmp_path):
+    storage = make_storage(str(tmp_path), "mmap")
+    await storage.initialize()
+    await storage.upsert({f"id-{i}": {"content": f"text {i}"} for i in range(5)})
+    await storage.index_done_callback()
+    vector_file = os.path.join(str(tmp_path), "vdb_chunks.0.f32")
+    size_before = os.path.getsize(vector_file)
+
+    await storage.upsert({"id-new": {"content": "new text"}})
+    await storage.index_done_callback()
+
+    assert os.path.getsize(vector_file) == size_before + DIM * 4
+
+
+@pytest.mark.offline
+def test_mmap_compaction_drops_tombstones(tmp_path):
+    prefix = str(tmp_path / "vdb_test")
+    db = MmapVectorDB(DIM, prefix, compaction_ratio=0.3, compaction_min_rows=4)
+    db.upsert([{"__id__": f"id-{i}", "__vector__": embed(str(i))} for i in range(6)])
+    db.delete(["id-0", "id-1", "id-2"])
+    db.save()
+    assert db.needs_compaction
+
+    db.compact()
+
+    assert not db.needs_compaction
+    assert not os.path.exists(f"{prefix}.0.f32")
+    assert os.path.getsize(f"{prefix}.1.f32") == 3 * DIM * 4
+    reloaded = MmapVectorDB(DIM, prefix)
+    assert sorted(d["__id__"] for d in reloaded.storage["data"]) == [
+        "id-3",
+        "id-4",
+        "id-5",
+    ]
+    assert reloaded.query(embed("4"), top_k=1)[0]["__id__"] == "id-4"
+
+
+@pytest.mark.offline
+def test_mmap_replay_ignores_torn_index_tail(tmp_path):
+    prefix = str(tmp_path / "vdb_test")
+    db = MmapVectorDB(DIM, prefix)
+    db.upsert([{"__id__": "a", "__vector__": embed("a")}])
+    db.save()
+    # Simulate a crash in the middle of appending an index record
+    with open(f"{prefix}.0.jsonl", "ab") as f:
+        f.write(b'{"op": "upsert", "row": 1, "da')
+
+    reloaded = MmapVectorDB(DIM, prefix)
+    assert len(reloaded) == 1
+    reloaded.upsert([{"__id__": "b", "__vector__": embed("b")}])
+    reloaded.save()
+
+    assert sorted(d["__id__"] for d in MmapVectorDB(DIM, prefix).storage["data"]) == [
+        "a",
+        "b",
+    ]
+
+
+@pytest.mark.offline
+async def test_json_storage_migrates_to_mmap(tmp_path):
+    legacy = make_storage(str(tmp_path), "json")
+    await legacy.initialize()
+    await legacy.upsert({f"id-{i}": {"content": f"text {i}"} for i in range(5)})
+    await legacy.index_done_callback()
+
+    migrated = make_storage(str(tmp_path), "mmap")
+    await migrated.initialize()
+
+    assert len((await migrated.client_storage)["data"]) == 5
+    assert (await migrated.query("text 2", top_k=1))[0]["id"] == "id-2"
+
+
+@pytest.mark.offline
+async def test_migrated_json_file_is_not_imported_again(tmp_path):
+    legacy = make_storage(str(tmp_path), "json")
+    await legacy.initialize()
+    await legacy.upsert({f"id-{i}": {"content": f"text {i}"} for i in range(3)})
+    await legacy.index_done_callback()
+
+    migrated = make_storage(str(tmp_path), "mmap")
+    await migrated.initialize()
+    await migrated.delete([f"id-{i}" for i in range(3)])
+    await migrated.index_done_callback()
+
+    assert not os.path.exists(tmp_path / "vdb_chunks.json")
+    assert os.path.exists(tmp_path / "vdb_chunks.json.migrated")
+    restarted = make_storage(str(tmp_path), "mmap")
+    await restarted.initialize()
+    assert (await restarted.client_storage)["data"] == []
+
+
+@pytest.mark.offline
+def test_mmap_save_drops_torn_vector_row(tmp_path):
+    prefix = str(tmp_path / "vdb_test")
+    db = MmapVectorDB(DIM, prefix)
+    db.upsert([{"__id__": "a", "__vector__": embed("a")}])
+    db.save()
+    # Simulate a crash in the middle of appending a vector row
+    with open(f"{prefix}.0.f32", "ab") as f:
+        f.write(b"\x00" * 5)
+
+    reloaded = MmapVectorDB(DIM, prefix)
+    reloaded.upsert([{"__id__": "b", "__vector__": embed("b")}])
+    reloaded.save()
+
+    vectors = MmapVectorDB(DIM, prefix).get_vectors(["a", "b"])
+    assert np.allclose(vectors["b"], _normalize(embed("b")))
+    assert np.allclose(vectors["a"], _normalize(embed("a")))
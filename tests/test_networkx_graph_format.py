@@ -0,0 +1,150 @@
+"""
+Tests for the pickle snapshot + delta persistence format of NetworkXStorage
+"""
+
+import os
+
+import pytest
+
+from lightrag.kg import networkx_impl
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+async def make_storage(working_dir: str) -> NetworkXStorage:
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def graph_file(tmp_path, suffix: str) -> str:
+    return os.path.join(str(tmp_path), f"graph_chunk_entity_relation{suffix}")
+
+
+@pytest.fixture(autouse=True)
+def pickle_format(monkeypatch):
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "pickle")
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def build_sample(storage: NetworkXStorage):
+    await storage.upsert_node("A", {"entity_id": "A", "description": "a"})
+    await storage.upsert_node("B", {"entity_id": "B", "description": "b"})
+    await storage.upsert_node("C", {"entity_id": "C", "description": "c"})
+    await storage.upsert_edge("A", "B", {"weight": 1.0})
+    await storage.upsert_edge("B", "C", {"weight": 2.0})
+
+
+@pytest.mark.offline
+async def test_small_changes_are_appended_as_deltas(tmp_path):
+    storage = await make_storage(str(tmp_path))
+    await build_sample(storage)
+    assert await storage.index_done_callback()
+    snapshot_mtime = os.path.getmtime(graph_file(tmp_path, ".pkl"))
+    assert not os.path.exists(graph_file(tmp_path, ".delta.pkl"))
+
+    await storage.upsert_node("A", {"entity_id": "A", "description": "a2"})
+    await storage.delete_node("C")
+    await storage.upsert_node("C", {"entity_id": "C", "description": "c2"})
+    await storage.upsert_edge("A", "C", {"weight": 3.0})
+    await storage.remove_edges([("A", "B")])
+    assert await storage.index_done_callback()
+
+    assert os.path.getmtime(graph_file(tmp_path, ".pkl")) == snapshot_mtime
+    assert os.path.exists(graph_file(tmp_path, ".delta.pkl"))
+
+    reloaded = await make_storage(str(tmp_path))
+    assert (await reloaded.get_node("A"))["description"] == "a2"
+    assert (await reloaded.get_node("C"))["description"] == "c2"
+    assert await reloaded.has_edge("A", "C")
+    assert not await reloaded.has_edge("A", "B")
+    # The B-C edge was removed together with node C
+    assert not await reloaded.has_edge("B", "C")
+
+
+@pytest.mark.offline
+async def test_torn_delta_tail_is_ignored(tmp_path):
+    storage = await make_storage(str(tmp_path))
+    await build_sample(storage)
+    await storage.index_done_callback()
+    await storage.upsert_node("D", {"entity_id": "D"})
+    await storage.index_done_callback()
+    with open(graph_file(tmp_path, ".delta.pkl"), "ab") as f:
+        f.write(b"\x80\x05\x95garbage")
+
+    reloaded = await make_storage(str(tmp_path))
+    assert await reloaded.has_node("D")
+    await reloaded.upsert_node("E", {"entity_id": "E"})
+    await reloaded.index_done_callback()
+
+    again = await make_storage(str(tmp_path))
+    assert await again.has_node("E")
+
+
+@pytest.mark.offline
+async def test_deltas_are_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(networkx_impl, "DELTA_COMPACTION_MIN_BYTES", 0)
+    storage = await make_storage(str(tmp_path))
+    await build_sample(storage)
+    await storage.index_done_callback()
+    await storage.upsert_node("D", {"entity_id": "D", "description": "x" * 1000})
+    await storage.index_done_callback()
+
+    assert not os.path.exists(graph_file(tmp_path, ".delta.pkl"))
+    reloaded = await make_storage(str(tmp_path))
+    assert await reloaded.has_node("D")
+
+
+@pytest.mark.offline
+async def test_migration_between_formats(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "graphml")
+    storage = await make_storage(str(tmp_path))
+    await build_sample(storage)
+    await storage.index_done_callback()
+
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "pickle")
+    migrated = await make_storage(str(tmp_path))
+    assert os.path.exists(graph_file(tmp_path, ".pkl"))
+    assert os.path.exists(graph_file(tmp_path, ".graphml.bak"))
+    assert (await migrated.get_node("B"))["description"] == "b"
+    await migrated.upsert_node("D", {"entity_id": "D"})
+    await migrated.index_done_callback()
+
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "graphml")
+    back = await make_storage(str(tmp_path))
+    assert not os.path.exists(graph_file(tmp_path, ".pkl"))
+    assert await back.has_node("D")
+    assert await back.has_edge("B", "C")
+
+
+@pytest.mark.offline
+async def test_concurrent_workers_migrate_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "graphml")
+    storage = await make_storage(str(tmp_path))
+    await build_sample(storage)
+    await storage.index_done_callback()
+
+    monkeypatch.setenv("NETWORKX_GRAPH_FORMAT", "pickle")
+    # Both workers are created before either one initializes
+    workers = [
+        NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        await worker.initialize()
+
+    for worker in workers:
+        assert (await worker.get_node("B"))["description"] == "b"
+    assert os.path.exists(graph_file(tmp_path, ".graphml.bak"))
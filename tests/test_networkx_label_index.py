@@ -0,0 +1,88 @@
+"""
+Tests for the label index behind NetworkXStorage.search_labels / get_popular_labels
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from lightrag.kg.networkx_impl import LabelIndex, NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+WORDS = ["apple", "Apple Pie", "pineapple", "app_store", "banana", "ban", "nap"]
+
+
+def reference_search(graph: nx.Graph, query: str, limit: int) -> list[str]:
+    """The original full-scan implementation."""
+    query_lower = query.lower().strip()
+    matches = []
+    for node in graph.nodes():
+        node_str = str(node)
+        node_lower = node_str.lower()
+        if query_lower not in node_lower:
+            continue
+        if node_lower == query_lower:
+            score = 1000
+        elif node_lower.startswith(query_lower):
+            score = 500
+        else:
+            score = 100 - len(node_str)
+            if f" {query_lower}" in node_lower or f"_{query_lower}" in node_lower:
+                score += 50
+        matches.append((node_str, score))
+    matches.sort(key=lambda x: (-x[1], x[0]))
+    return [m[0] for m in matches[:limit]]
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.offline
+def test_search_matches_full_scan():
+    rng = random.Random(3)
+    graph = nx.Graph()
+    for i in range(300):
+        graph.add_node(f"{rng.choice(WORDS)} {i}")
+    graph.add_node("apple")
+    index = LabelIndex(graph)
+
+    for query in ["a", "ap", "app", "apple", "APPLE", "e 1", "pie", "zzz", "na"]:
+        for limit in [5, 50]:
+            assert index.search(query.lower(), limit) == reference_search(
+                graph, query, limit
+            )
+
+
+@pytest.mark.offline
+async def test_index_follows_graph_changes(tmp_path):
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    for name in ["Hub", "Alpha", "Beta", "Gamma"]:
+        await storage.upsert_node(name, {"entity_id": name})
+    # Build the index before further changes so they are applied incrementally
+    assert await storage.search_labels("alp") == ["Alpha"]
+
+    for name in ["Alpha", "Beta", "Gamma"]:
+        await storage.upsert_edge("Hub", name, {"weight": 1.0})
+    await storage.upsert_edge("Alpha", "Beta", {"weight": 1.0})
+    assert await storage.get_popular_labels(2) == ["Hub", "Alpha"]
+
+    await storage.delete_node("Hub")
+    await storage.upsert_node("Alphabet", {"entity_id": "Alphabet"})
+    assert await storage.get_popular_labels(3) == ["Alpha", "Beta", "Alphabet"]
+    assert await storage.search_labels("alp") == ["Alpha", "Alphabet"]
+    assert await storage.search_labels("hub") == []
+
+    await storage.remove_edges([("Alpha", "Beta")])
+    await storage.remove_nodes(["Gamma"])
+    assert await storage.get_popular_labels(10) == ["Alpha", "Alphabet", "Beta"]
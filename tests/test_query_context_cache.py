@@ -0,0 +1,142 @@
+"""
+Tests for the version-invalidated query context cache
+"""
+
+import pytest
+
+from lightrag import operate
+from lightrag.base import QueryContextResult, QueryParam
+from lightrag.kg.shared_storage import (
+    bump_data_version,
+    finalize_share_data,
+    get_data_version,
+    initialize_share_data,
+)
+from lightrag.utils import QueryContextCache
+
+
+@pytest.fixture
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.offline
+def test_get_returns_copy_for_matching_version():
+    cache = QueryContextCache(max_entries=4)
+    value = {"data": {"entities": [1, 2]}}
+
+    cache.put("key", 3, value)
+    value["data"]["entities"].append(3)
+
+    cached = cache.get("key", 3)
+    assert cached == {"data": {"entities": [1, 2]}}
+    cached["llm_response"] = "mutated"
+    assert cache.get("key", 3) == {"data": {"entities": [1, 2]}}
+
+
+@pytest.mark.offline
+def test_stale_version_is_dropped():
+    cache = QueryContextCache(max_entries=4)
+    cache.put("key", 1, "context")
+
+    assert cache.get("key", 2) is None
+    assert len(cache) == 0
+    assert cache.get("key", 1) is None
+
+
+@pytest.mark.offline
+def test_lru_eviction():
+    cache = QueryContextCache(max_entries=2)
+    cache.put("a", 0, "A")
+    cache.put("b", 0, "B")
+    cache.get("a", 0)
+    cache.put("c", 0, "C")
+
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) == "A"
+    assert cache.get("c", 0) == "C"
+
+
+@pytest.mark.offline
+def test_key_normalizes_whitespace_and_tracks_retrieval_fields():
+    param = QueryParam(mode="mix", top_k=10)
+    key = QueryContextCache.make_key("what  is\nLightRAG ", param)
+
+    assert key == QueryContextCache.make_key("what is LightRAG", param)
+    # Both are formatted into the system prompt that sizes the chunk budget
+    assert key != QueryContextCache.make_key(
+        "what is LightRAG", QueryParam(mode="mix", top_k=10, response_type="Bullets")
+    )
+    assert key != QueryContextCache.make_key(
+        "what is LightRAG",
+        QueryParam(mode="mix", top_k=10, user_prompt="Answer in great detail"),
+    )
+    assert key != QueryContextCache.make_key(
+        "what is LightRAG", QueryParam(mode="mix", top_k=20)
+    )
+    assert key != QueryContextCache.make_key(
+        "what is LightRAG", QueryParam(mode="local", top_k=10)
+    )
+
+
+@pytest.mark.offline
+async def test_data_version_is_per_workspace(shared_data):
+    assert await get_data_version("ws1") == 0
+    assert await bump_data_version("ws1") == 1
+    assert await bump_data_version("ws1") == 2
+    assert await get_data_version("ws1") == 2
+    assert await get_data_version("ws2") == 0
+
+
+@pytest.mark.offline
+async def test_kg_query_reuses_context_until_data_changes(shared_data, monkeypatch):
+    calls = {"keywords": 0, "context": 0}
+
+    async def fake_keywords(query, query_param, global_config, hashing_kv):
+        calls["keywords"] += 1
+        return ["topic"], ["entity"]
+
+    async def fake_build_context(query, ll_keywords, hl_keywords, *args, **kwargs):
+        calls["context"] += 1
+        return QueryContextResult(
+            context=f"context {calls['context']}",
+            raw_data={"keywords": [hl_keywords, ll_keywords]},
+        )
+
+    monkeypatch.setattr(operate, "get_keywords_from_query", fake_keywords)
+    monkeypatch.setattr(operate, "_build_query_context", fake_build_context)
+
+    cache = QueryContextCache(max_entries=8)
+
+    async def unused_llm(*args, **kwargs):
+        raise AssertionError("only_need_context must not call the LLM")
+
+    global_config = {"workspace": "ws", "llm_model_func": unused_llm}
+    param = QueryParam(mode="hybrid", only_need_context=True)
+
+    async def run(query):
+        return await operate.kg_query(
+            query,
+            None,
+            None,
+            None,
+            None,
+            param,
+            global_config,
+            query_context_cache=cache,
+        )
+
+    first = await run("Who founded the company?")
+    second = await run("Who  founded the company? ")
+
+    assert calls == {"keywords": 1, "context": 1}
+    assert first.content == second.content == "context 1"
+    assert second.raw_data == {"keywords": ["topic", "entity"]}
+
+    await bump_data_version("ws")
+    third = await run("Who founded the company?")
+
+    assert calls == {"keywords": 2, "context": 2}
+    assert third.content == "context 2"
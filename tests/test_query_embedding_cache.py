@@ -0,0 +1,53 @@
+"""
+Tests for QueryEmbeddingCache
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.utils import QueryEmbeddingCache
+
+
+class RecordingEmbeddingFunc:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, texts, **kwargs):
+        self.calls.append((list(texts), kwargs))
+        if self.fail:
+            raise RuntimeError("embedding service unavailable")
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+@pytest.mark.offline
+async def test_prefetch_batches_and_dedupes():
+    func = RecordingEmbeddingFunc()
+    cache = QueryEmbeddingCache(func)
+
+    await cache.prefetch(["query", "kw1, kw2", None, "query", "kw1, kw2"])
+
+    assert func.calls == [(["query", "kw1, kw2"], {"_priority": 5})]
+    assert cache.get("query").tolist() == [5.0, 1.0]
+    assert cache.get("kw1, kw2").tolist() == [8.0, 1.0]
+
+
+@pytest.mark.offline
+async def test_prefetch_skips_cached_texts():
+    func = RecordingEmbeddingFunc()
+    cache = QueryEmbeddingCache(func)
+
+    await cache.prefetch(["query"])
+    await cache.prefetch(["query"])
+    await cache.prefetch(["query", "other"])
+
+    assert [texts for texts, _ in func.calls] == [["query"], ["other"]]
+
+
+@pytest.mark.offline
+async def test_prefetch_failure_leaves_entries_missing():
+    cache = QueryEmbeddingCache(RecordingEmbeddingFunc(fail=True))
+
+    await cache.prefetch(["query"])
+
+    assert cache.get("query") is None
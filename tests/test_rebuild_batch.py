@@ -0,0 +1,245 @@
+"""
+Tests for the batched rebuild_knowledge_from_chunks engine
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import rebuild_knowledge_from_chunks
+from lightrag.utils import Tokenizer, TokenizerInterface, compute_mdhash_id
+
+
+class CharTokenizer(TokenizerInterface):
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+class DictKV:
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+        self.upsert_calls = 0
+
+    async def get_by_id(self, id):
+        return self.data.get(id)
+
+    async def get_by_ids(self, ids):
+        return [self.data.get(id) for id in ids]
+
+    async def upsert(self, data):
+        self.upsert_calls += 1
+        self.data.update(data)
+
+
+class CountingVDB:
+    def __init__(self):
+        self.data = {}
+        self.upsert_calls = 0
+
+    async def upsert(self, data):
+        self.upsert_calls += 1
+        self.data.update(data)
+
+    async def delete(self, ids):
+        for id in ids:
+            self.data.pop(id, None)
+
+
+def extraction(*records: str) -> str:
+    return "\n".join(records) + "\n<|COMPLETE|>"
+
+
+EXTRACTIONS = {
+    "chunk-1": extraction(
+        "entity<|#|>Alice<|#|>Person<|#|>Alice is a doctor",
+        "entity<|#|>Bob<|#|>Person<|#|>Bob is a chef",
+        "relation<|#|>Alice<|#|>Bob<|#|>knows<|#|>Alice knows Bob",
+    ),
+    "chunk-2": extraction(
+        "entity<|#|>Alice<|#|>Person<|#|>Alice lives in Paris",
+        "relation<|#|>Alice<|#|>Bob<|#|>met<|#|>Alice met Bob",
+    ),
+    "chunk-3": extraction(
+        "entity<|#|>Bob<|#|>Person<|#|>Bob cooks pasta",
+        "entity<|#|>Carol<|#|>Person<|#|>Carol is a pilot",
+        "relation<|#|>Bob<|#|>Carol<|#|>friends<|#|>Bob befriends Carol",
+    ),
+}
+
+
+def make_config(batch_size: int) -> dict:
+    return {
+        "workspace": "",
+        "llm_model_max_async": 4,
+        "rebuild_batch_size": batch_size,
+        "tokenizer": Tokenizer("char", CharTokenizer()),
+        "summary_context_size": 10000,
+        "summary_max_tokens": 10000,
+        "force_llm_summary_on_merge": 100,
+        "source_ids_limit_method": "FIFO",
+        "max_source_ids_per_entity": 300,
+        "max_source_ids_per_relation": 300,
+        "max_file_paths": 100,
+    }
+
+
+async def make_graph(tmp_path) -> NetworkXStorage:
+    graph = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await graph.initialize()
+    for name, chunks in [
+        ("Alice", ["chunk-1", "chunk-2"]),
+        ("Bob", ["chunk-1", "chunk-3"]),
+        ("Carol", ["chunk-3"]),
+    ]:
+        await graph.upsert_node(
+            name,
+            {
+                "entity_id": name,
+                "entity_type": "Person",
+                "description": f"{name} summary",
+                "source_id": GRAPH_FIELD_SEP.join(chunks),
+                "file_path": "doc.txt",
+            },
+        )
+    await graph.upsert_edge(
+        "Alice",
+        "Bob",
+        {
+            "description": "Alice and Bob summary",
+            "keywords": "knows,met",
+            "weight": 2.0,
+            "source_id": f"chunk-1{GRAPH_FIELD_SEP}chunk-2",
+            "file_path": "doc.txt",
+        },
+    )
+    return graph
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.offline
+async def test_rebuild_in_batches_skips_unchanged_entities(tmp_path):
+    graph = await make_graph(tmp_path)
+    # chunk-2 has been deleted
+    text_chunks = DictKV(
+        {
+            chunk_id: {"llm_cache_list": [f"cache-{chunk_id}"], "file_path": "doc.txt"}
+            for chunk_id in ["chunk-1", "chunk-3"]
+        }
+    )
+    llm_cache = DictKV(
+        {
+            f"cache-{chunk_id}": {
+                "cache_type": "extract",
+                "chunk_id": chunk_id,
+                "return": EXTRACTIONS[chunk_id],
+                "create_time": index,
+            }
+            for index, chunk_id in enumerate(["chunk-1", "chunk-3"])
+        }
+    )
+    entity_chunks, relation_chunks = DictKV(), DictKV()
+    entities_vdb, relationships_vdb = CountingVDB(), CountingVDB()
+    pipeline_status = {"latest_message": "", "history_messages": []}
+
+    await rebuild_knowledge_from_chunks(
+        entities_to_rebuild={"Alice": ["chunk-1"], "Bob": ["chunk-1", "chunk-3"]},
+        relationships_to_rebuild={("Alice", "Bob"): ["chunk-1"]},
+        knowledge_graph_inst=graph,
+        entities_vdb=entities_vdb,
+        relationships_vdb=relationships_vdb,
+        text_chunks_storage=text_chunks,
+        llm_response_cache=llm_cache,
+        global_config=make_config(batch_size=1),
+        pipeline_status=pipeline_status,
+        pipeline_status_lock=asyncio.Lock(),
+        entity_chunks_storage=entity_chunks,
+        relation_chunks_storage=relation_chunks,
+    )
+
+    alice = await graph.get_node("Alice")
+    assert alice["description"] == "Alice is a doctor"
+    assert alice["source_id"] == "chunk-1"
+    # Bob still has the same source chunks, so it is not re-summarized
+    assert (await graph.get_node("Bob"))["description"] == "Bob summary"
+    edge = await graph.get_edge("Alice", "Bob")
+    assert edge["description"] == "Alice knows Bob"
+    assert edge["source_id"] == "chunk-1"
+
+    assert set(entities_vdb.data) == {compute_mdhash_id("Alice", prefix="ent-")}
+    assert set(relationships_vdb.data) == {compute_mdhash_id("AliceBob", prefix="rel-")}
+    # One bulk write per storage and batch
+    assert entities_vdb.upsert_calls == 1
+    assert relationships_vdb.upsert_calls == 1
+    assert entity_chunks.upsert_calls == 2
+    assert entity_chunks.data["Bob"]["chunk_ids"] == ["chunk-1", "chunk-3"]
+
+    history = pipeline_status["history_messages"]
+    assert [m for m in history if m.startswith("Rebuilt batch")] == [
+        "Rebuilt batch 1/3: 1 entities",
+        "Rebuilt batch 2/3: 1 entities",
+        "Rebuilt batch 3/3: 1 relationships",
+    ]
+    assert "Unchanged: 1 entities, 0 relationships" in history[-1]
+
+
+class FailingVDB(CountingVDB):
+    async def upsert(self, data):
+        raise RuntimeError("vector storage unavailable")
+
+
+@pytest.mark.offline
+async def test_failed_batch_is_not_counted_as_rebuilt(tmp_path):
+    graph = await make_graph(tmp_path)
+    text_chunks = DictKV(
+        {"chunk-1": {"llm_cache_list": ["cache-chunk-1"], "file_path": "doc.txt"}}
+    )
+    llm_cache = DictKV(
+        {
+            "cache-chunk-1": {
+                "cache_type": "extract",
+                "chunk_id": "chunk-1",
+                "return": EXTRACTIONS["chunk-1"],
+                "create_time": 0,
+            }
+        }
+    )
+    pipeline_status = {"latest_message": "", "history_messages": []}
+
+    await rebuild_knowledge_from_chunks(
+        entities_to_rebuild={"Alice": ["chunk-1"], "Bob": ["chunk-1", "chunk-3"]},
+        relationships_to_rebuild={},
+        knowledge_graph_inst=graph,
+        entities_vdb=FailingVDB(),
+        relationships_vdb=CountingVDB(),
+        text_chunks_storage=text_chunks,
+        llm_response_cache=llm_cache,
+        global_config=make_config(batch_size=2),
+        pipeline_status=pipeline_status,
+        pipeline_status_lock=asyncio.Lock(),
+        entity_chunks_storage=DictKV(),
+        relation_chunks_storage=DictKV(),
+    )
+
+    final_message = pipeline_status["history_messages"][-1]
+    assert final_message.startswith(
+        "KG rebuild completed: 0 entities and 0 relationships rebuilt successfully."
+    )
+    assert "Unchanged" not in final_message
+    assert "Failed: 2 entities, 0 relationships." in final_message
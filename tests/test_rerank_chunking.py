@@ -103,6 +103,76 @@ class TestChunkDocumentsForRerank:
         assert all(idx == 0 for idx in doc_indices)
 
 
+@pytest.mark.offline
+class TestPrecomputedTokenCounts:
+    """Token counts stored with text chunks at ingest avoid re-tokenizing"""
+
+    class CountingTokenizer:
+        def __init__(self):
+            self.encoded = []
+
+        def encode(self, content):
+            self.encoded.append(content)
+            return list(content)
+
+        def decode(self, tokens):
+            return "".join(tokens)
+
+    def test_known_fitting_documents_are_not_encoded(self):
+        tokenizer = self.CountingTokenizer()
+        documents = ["a" * 20, "b" * 20, "c" * 20]
+
+        with patch.dict(
+            "lightrag.utils._shared_tokenizers", {"gpt-4o-mini": tokenizer}
+        ):
+            chunked_docs, doc_indices = chunk_documents_for_rerank(
+                documents,
+                max_tokens=10,
+                overlap_tokens=2,
+                token_counts=[5, None, 12],
+            )
+
+        # Only the documents without a count or exceeding the limit are tokenized
+        assert tokenizer.encoded == ["b" * 20, "c" * 20]
+        assert chunked_docs[0] == "a" * 20
+        assert doc_indices.count(0) == 1
+        assert doc_indices.count(1) > 1
+
+    def test_shared_tokenizer_is_reused(self):
+        from lightrag.utils import get_shared_tokenizer
+
+        tokenizer = self.CountingTokenizer()
+        with patch.dict("lightrag.utils._shared_tokenizers", {"model-x": tokenizer}):
+            assert get_shared_tokenizer("model-x") is tokenizer
+
+    @pytest.mark.asyncio
+    async def test_apply_rerank_passes_token_counts_when_supported(self):
+        from lightrag.utils import apply_rerank_if_enabled
+
+        calls = []
+
+        async def rerank_with_counts(query, documents, top_n=None, token_counts=None):
+            calls.append(token_counts)
+            return [{"index": 0, "relevance_score": 0.9}]
+
+        async def legacy_rerank(query, documents, top_n=None):
+            calls.append("legacy")
+            return [{"index": 0, "relevance_score": 0.9}]
+
+        async def forwarding_rerank(query, documents, top_n=None, **kwargs):
+            # e.g. a user wrapper forwarding kwargs to jina_rerank
+            calls.append(kwargs)
+            return [{"index": 0, "relevance_score": 0.9}]
+
+        docs = [{"content": "x", "tokens": 3}, {"content": "y"}]
+        for func in (rerank_with_counts, legacy_rerank, forwarding_rerank):
+            await apply_rerank_if_enabled(
+                "q", docs, {"rerank_model_func": func}, top_n=1
+            )
+
+        assert calls == [[3, None], "legacy", {}]
+
+
 class TestAggregateChunkScores:
     """Test suite for aggregate_chunk_scores function"""
 
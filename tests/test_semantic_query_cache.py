@@ -0,0 +1,97 @@
+"""
+Tests for SemanticQueryCache
+"""
+
+import pytest
+
+from lightrag import utils
+from lightrag.base import QueryParam
+from lightrag.utils import SemanticQueryCache
+
+
+def answer(text):
+    return {"status": "success", "data": {}, "llm_response": {"content": text}}
+
+
+@pytest.mark.offline
+def test_similar_query_hits_above_threshold():
+    cache = SemanticQueryCache(similarity_threshold=0.9, max_entries=10)
+    cache.store("mix:a", "how do I reset my password", [1.0, 0.0, 0.0], 0, answer("A"))
+
+    hit = cache.lookup("mix:a", [0.99, 0.05, 0.0], 0)
+    assert hit is not None
+    value, similarity = hit
+    assert value == answer("A")
+    assert similarity > 0.9
+
+    assert cache.lookup("mix:a", [0.5, 0.5, 0.0], 0) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.offline
+def test_returns_closest_entry_and_copies_values():
+    cache = SemanticQueryCache(similarity_threshold=0.8, max_entries=10)
+    cache.store("mix:a", "q1", [1.0, 0.0], 0, answer("first"))
+    cache.store("mix:a", "q2", [0.9, 0.1], 0, answer("second"))
+
+    value, _ = cache.lookup("mix:a", [0.9, 0.12], 0)
+    assert value["llm_response"]["content"] == "second"
+
+    value["metadata"] = {"semantic_cache_hit": True}
+    value, _ = cache.lookup("mix:a", [0.9, 0.12], 0)
+    assert "metadata" not in value
+
+
+@pytest.mark.offline
+def test_scopes_are_isolated():
+    cache = SemanticQueryCache(similarity_threshold=0.9, max_entries=10)
+    cache.store("local:a", "q", [1.0, 0.0], 0, answer("local"))
+
+    assert cache.lookup("global:a", [1.0, 0.0], 0) is None
+    assert cache.lookup("local:a", [1.0, 0.0], 0) is not None
+
+
+@pytest.mark.offline
+def test_scope_tracks_mode_and_response_settings():
+    base = SemanticQueryCache.make_scope(QueryParam(mode="mix"))
+
+    assert base == SemanticQueryCache.make_scope(QueryParam(mode="mix"))
+    assert base.startswith("mix:")
+    assert base != SemanticQueryCache.make_scope(QueryParam(mode="local"))
+    assert base != SemanticQueryCache.make_scope(
+        QueryParam(mode="mix", response_type="Bullet Points")
+    )
+
+
+@pytest.mark.offline
+def test_stale_version_and_ttl_expire_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: now[0])
+    cache = SemanticQueryCache(similarity_threshold=0.9, max_entries=10, ttl=60)
+
+    cache.store("mix:a", "q1", [1.0, 0.0], 1, answer("v1"))
+    assert cache.lookup("mix:a", [1.0, 0.0], 2) is None
+    assert len(cache) == 0
+
+    cache.store("mix:a", "q1", [1.0, 0.0], 2, answer("v2"))
+    now[0] += 30
+    assert cache.lookup("mix:a", [1.0, 0.0], 2) is not None
+    now[0] += 31
+    assert cache.lookup("mix:a", [1.0, 0.0], 2) is None
+    assert len(cache) == 0
+
+
+@pytest.mark.offline
+def test_capacity_evicts_least_recently_used():
+    cache = SemanticQueryCache(similarity_threshold=0.99, max_entries=2)
+    cache.store("mix:a", "q1", [1.0, 0.0, 0.0], 0, answer("1"))
+    cache.store("mix:a", "q2", [0.0, 1.0, 0.0], 0, answer("2"))
+    assert cache.lookup("mix:a", [1.0, 0.0, 0.0], 0) is not None
+
+    cache.store("mix:a", "q3", [0.0, 0.0, 1.0], 0, answer("3"))
+
+    assert len(cache) == 2
+    assert cache.lookup("mix:a", [0.0, 1.0, 0.0], 0) is None
+    assert cache.lookup("mix:a", [1.0, 0.0, 0.0], 0) is not None
+    assert cache.lookup("mix:a", [0.0, 0.0, 1.0], 0) is not None
@@ -0,0 +1,229 @@
+"""
+Tests for the paged iteration API of the storage base classes
+
+Covers iter_keys/iter_items on the JSON KV, JSON doc status and Nano vector
+storages, iter_nodes/iter_edges on NetworkX and the BaseGraphStorage defaults,
+and the chunk tracking migration that is built on top of them.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from lightrag.base import BaseGraphStorage
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.lightrag import LightRAG
+from lightrag.utils import EmbeddingFunc, make_relation_chunk_key
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def collect(pages):
+    return [page async for page in pages]
+
+
+async def mock_embedding_func(texts, **kwargs):
+    return np.array([[float(len(t)), 1.0, 0.5] for t in texts])
+
+
+@pytest.mark.offline
+async def test_json_kv_iter_keys_and_items(tmp_path):
+    storage = JsonKVStorage(
+        namespace="full_docs",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    await storage.upsert({f"doc-{i}": {"content": f"text {i}"} for i in range(5)})
+
+    pages = await collect(storage.iter_keys(batch_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert sorted(key for page in pages for key in page) == [
+        f"doc-{i}" for i in range(5)
+    ]
+
+    items = {}
+    for page in await collect(storage.iter_items(batch_size=3)):
+        items.update(page)
+    assert set(items) == {f"doc-{i}" for i in range(5)}
+    assert items["doc-3"]["content"] == "text 3"
+
+
+@pytest.mark.offline
+async def test_json_kv_allows_writes_between_batches(tmp_path):
+    storage = JsonKVStorage(
+        namespace="full_docs",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    await storage.upsert({f"doc-{i}": {"content": "x"} for i in range(4)})
+
+    seen = []
+    async for keys in storage.iter_keys(batch_size=2):
+        seen.extend(keys)
+        # Writing to the storage being iterated must not deadlock
+        await storage.delete(keys)
+
+    assert len(seen) == 4
+    assert await storage.is_empty()
+
+
+@pytest.mark.offline
+async def test_json_doc_status_iter_keys(tmp_path):
+    storage = JsonDocStatusStorage(
+        namespace="doc_status",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    await storage.upsert(
+        {
+            f"doc-{i}": {
+                "status": "pending",
+                "content_summary": "",
+                "content_length": 0,
+                "file_path": f"file-{i}.txt",
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "updated_at": "2025-01-01T00:00:00+00:00",
+            }
+            for i in range(3)
+        }
+    )
+
+    keys = [
+        key for page in await collect(storage.iter_keys(batch_size=2)) for key in page
+    ]
+    assert sorted(keys) == ["doc-0", "doc-1", "doc-2"]
+
+
+@pytest.mark.offline
+async def test_nano_vector_iter_items(tmp_path):
+    storage = NanoVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": str(tmp_path),
+            "embedding_batch_num": 4,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.0},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=3, func=mock_embedding_func),
+        meta_fields={"content"},
+    )
+    await storage.initialize()
+    await storage.upsert({f"chunk-{i}": {"content": "c" * (i + 1)} for i in range(5)})
+
+    pages = await collect(storage.iter_items(batch_size=2))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    items = {key: record for page in pages for key, record in page.items()}
+    assert set(items) == {f"chunk-{i}" for i in range(5)}
+    assert items["chunk-2"]["content"] == "ccc"
+    assert "vector" not in items["chunk-2"]
+
+
+async def make_graph(tmp_path) -> NetworkXStorage:
+    graph = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await graph.initialize()
+    for name in ["A", "B", "C", "D"]:
+        await graph.upsert_node(name, {"entity_id": name, "source_id": f"chunk-{name}"})
+    for src, tgt in [("A", "B"), ("B", "C"), ("C", "D")]:
+        await graph.upsert_edge(src, tgt, {"source_id": f"chunk-{src}{tgt}"})
+    return graph
+
+
+@pytest.mark.offline
+async def test_networkx_iter_nodes_and_edges(tmp_path):
+    graph = await make_graph(tmp_path)
+
+    node_pages = await collect(graph.iter_nodes(batch_size=3))
+    edge_pages = await collect(graph.iter_edges(batch_size=2))
+
+    assert [len(page) for page in node_pages] == [3, 1]
+    nodes = {node["id"]: node for page in node_pages for node in page}
+    assert nodes["B"]["source_id"] == "chunk-B"
+    assert [len(page) for page in edge_pages] == [2, 1]
+    pairs = {
+        tuple(sorted((edge["source"], edge["target"])))
+        for page in edge_pages
+        for edge in page
+    }
+    assert pairs == {("A", "B"), ("B", "C"), ("C", "D")}
+
+
+@pytest.mark.offline
+async def test_networkx_iteration_skips_removed_nodes(tmp_path):
+    graph = await make_graph(tmp_path)
+
+    seen = []
+    async for nodes in graph.iter_nodes(batch_size=2):
+        seen.extend(node["id"] for node in nodes)
+        await graph.remove_nodes(["C", "D"])
+
+    assert sorted(seen) == ["A", "B"]
+
+
+@pytest.mark.offline
+async def test_default_iter_edges_drops_reverse_duplicates():
+    class BidirectionalGraph:
+        iter_edges = BaseGraphStorage.iter_edges
+
+        async def get_all_edges(self):
+            return [
+                {"source": "A", "target": "B"},
+                {"source": "B", "target": "A"},
+                {"source": "B", "target": "C"},
+            ]
+
+    pages = await collect(BidirectionalGraph().iter_edges(batch_size=1))
+
+    assert [(e["source"], e["target"]) for page in pages for e in page] == [
+        ("A", "B"),
+        ("B", "C"),
+    ]
+
+
+@pytest.mark.offline
+async def test_chunk_tracking_migration_pages_the_graph(tmp_path):
+    def make_kv(namespace):
+        return JsonKVStorage(
+            namespace=namespace,
+            workspace="",
+            global_config={"working_dir": str(tmp_path)},
+            embedding_func=None,
+        )
+
+    graph = await make_graph(tmp_path)
+    graph.get_all_nodes = graph.get_all_edges = None  # must not be materialized
+    rag = SimpleNamespace(
+        chunk_entity_relation_graph=graph,
+        entity_chunks=make_kv("entity_chunks"),
+        relation_chunks=make_kv("relation_chunks"),
+    )
+    await rag.entity_chunks.initialize()
+    await rag.relation_chunks.initialize()
+
+    await LightRAG._migrate_chunk_tracking_storage(rag)
+
+    entity = await rag.entity_chunks.get_by_id("C")
+    assert entity["chunk_ids"] == ["chunk-C"]
+    relation = await rag.relation_chunks.get_by_id(make_relation_chunk_key("B", "C"))
+    assert relation["chunk_ids"] == ["chunk-BC"]
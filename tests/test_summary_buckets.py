@@ -0,0 +1,167 @@
+"""
+Tests for hierarchical (bucketed) entity/relation description summaries
+"""
+
+import json
+
+import pytest
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.operate import _handle_bucketed_summary
+from lightrag.utils import Tokenizer, TokenizerInterface, compute_mdhash_id
+
+
+class CharTokenizer(TokenizerInterface):
+    def encode(self, content: str):
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+class RecordingLLM:
+    """Returns a summary naming the number of summarized descriptions"""
+
+    def __init__(self):
+        self.inputs = []
+
+    async def __call__(self, prompt, **kwargs):
+        descriptions = [
+            json.loads(line)["Description"]
+            for line in prompt.splitlines()
+            if line.startswith('{"Description"')
+        ]
+        self.inputs.append(descriptions)
+        return f"summary of {len(descriptions)}"
+
+
+def make_config(llm: RecordingLLM) -> dict:
+    return {
+        "llm_model_func": llm,
+        "addon_params": {},
+        "summary_length_recommended": 100,
+        "tokenizer": Tokenizer("char", CharTokenizer()),
+        "summary_context_size": 100000,
+        "summary_max_tokens": 100000,
+        "force_llm_summary_on_merge": 3,
+        "summary_bucket_size": 2,
+    }
+
+
+async def merge_round(record, description, chunk_ids, new_chunk, config):
+    already = description.split(GRAPH_FIELD_SEP) if description else []
+    full_chunk_ids = chunk_ids + [new_chunk]
+    description, _, buckets = await _handle_bucketed_summary(
+        "Entity",
+        "Acme",
+        record,
+        already,
+        chunk_ids,
+        [(new_chunk, f"Acme fact from {new_chunk}")],
+        full_chunk_ids,
+        config,
+    )
+    record = {
+        "chunk_ids": full_chunk_ids,
+        "summary_buckets": buckets,
+        "summary_digest": compute_mdhash_id(description),
+    }
+    return record, description, full_chunk_ids
+
+
+@pytest.mark.offline
+async def test_only_dirty_bucket_is_folded_into_root():
+    llm = RecordingLLM()
+    config = make_config(llm)
+    record, description, chunk_ids = None, "", []
+
+    for i in range(12):
+        llm.inputs.clear()
+        record, description, chunk_ids = await merge_round(
+            record, description, chunk_ids, f"chunk-{i}", config
+        )
+        # Every LLM call reads at most the root fragments below the summary threshold
+        # plus one bucket, however many buckets exist
+        max_inputs = config["force_llm_summary_on_merge"] - 1 + 2
+        assert all(len(inputs) <= max_inputs for inputs in llm.inputs)
+
+    buckets = record["summary_buckets"]
+    assert [bucket["chunk_ids"] for bucket in buckets] == [
+        [f"chunk-{i}", f"chunk-{i + 1}"] for i in range(0, 12, 2)
+    ]
+    # Bucket ids derive from their first chunk and never change
+    assert [bucket["id"] for bucket in buckets] == [
+        compute_mdhash_id(f"chunk-{i}", prefix="bkt-") for i in range(0, 12, 2)
+    ]
+    assert description.startswith("summary of")
+
+
+@pytest.mark.offline
+async def test_clean_buckets_are_reused():
+    llm = RecordingLLM()
+    config = make_config(llm)
+    record, description, chunk_ids = None, "", []
+    for i in range(4):
+        record, description, chunk_ids = await merge_round(
+            record, description, chunk_ids, f"chunk-{i}", config
+        )
+    first_buckets = [dict(bucket) for bucket in record["summary_buckets"]]
+
+    record, description, chunk_ids = await merge_round(
+        record, description, chunk_ids, "chunk-4", config
+    )
+
+    assert record["summary_buckets"][:2] == first_buckets
+    assert record["summary_buckets"][2]["chunk_ids"] == ["chunk-4"]
+
+
+@pytest.mark.offline
+async def test_edited_description_restarts_from_legacy_bucket():
+    llm = RecordingLLM()
+    config = make_config(llm)
+    record, description, chunk_ids = None, "", []
+    for i in range(3):
+        record, description, chunk_ids = await merge_round(
+            record, description, chunk_ids, f"chunk-{i}", config
+        )
+
+    # Description changed outside the merge (e.g. entity edit): stored buckets are stale
+    record, description, chunk_ids = await merge_round(
+        record, "Edited description", chunk_ids, "chunk-3", config
+    )
+
+    buckets = record["summary_buckets"]
+    assert buckets[0]["summary"] == "Edited description"
+    assert buckets[0]["chunk_ids"] == ["chunk-0", "chunk-1", "chunk-2"]
+    assert buckets[1]["chunk_ids"] == ["chunk-3"]
+    assert description == GRAPH_FIELD_SEP.join(
+        ["Edited description", "Acme fact from chunk-3"]
+    )
+
+
+@pytest.mark.offline
+async def test_unchanged_buckets_keep_root():
+    llm = RecordingLLM()
+    config = make_config(llm)
+    record, description, chunk_ids = None, "", []
+    for i in range(5):
+        record, description, chunk_ids = await merge_round(
+            record, description, chunk_ids, f"chunk-{i}", config
+        )
+    llm.inputs.clear()
+
+    # Replaying a known description leaves its bucket summary, and so the root, as is
+    replayed, llm_used, _ = await _handle_bucketed_summary(
+        "Entity",
+        "Acme",
+        record,
+        description.split(GRAPH_FIELD_SEP),
+        chunk_ids,
+        [("chunk-4", "Acme fact from chunk-4")],
+        chunk_ids,
+        config,
+    )
+
+    assert replayed == description
+    assert not llm_used
+    assert llm.inputs == []
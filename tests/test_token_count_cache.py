@@ -0,0 +1,82 @@
+"""
+Tests for memoized token counting on Tokenizer
+"""
+
+import copy
+import pickle
+from dataclasses import asdict, dataclass
+
+import pytest
+
+from lightrag.utils import Tokenizer, truncate_list_by_token_size
+
+
+class CountingCharTokenizer:
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, content: str):
+        self.encoded += 1
+        return [ord(ch) for ch in content]
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+@pytest.mark.offline
+def test_count_tokens_is_memoized_and_bounded():
+    inner = CountingCharTokenizer()
+    tokenizer = Tokenizer("char", inner)
+    tokenizer.token_count_cache_size = 2
+
+    assert tokenizer.count_tokens("alpha") == 5
+    assert tokenizer.count_tokens("alpha") == 5
+    assert inner.encoded == 1
+
+    tokenizer.count_tokens("beta")
+    tokenizer.count_tokens("alpha")  # refresh, "beta" is now least recent
+    tokenizer.count_tokens("gamma")
+    assert inner.encoded == 3
+
+    tokenizer.count_tokens("alpha")
+    assert inner.encoded == 3
+    tokenizer.count_tokens("beta")
+    assert inner.encoded == 4
+
+
+@pytest.mark.offline
+def test_truncation_reuses_counts_across_calls():
+    inner = CountingCharTokenizer()
+    tokenizer = Tokenizer("char", inner)
+    items = [{"description": f"entity {i} " * 5} for i in range(10)]
+
+    for _ in range(3):
+        kept = truncate_list_by_token_size(
+            items,
+            key=lambda x: x["description"],
+            max_token_size=200,
+            tokenizer=tokenizer,
+        )
+
+    assert len(kept) == 4
+    # Each distinct description is encoded once, then served from the cache
+    assert inner.encoded == 5
+
+
+@pytest.mark.offline
+def test_tokenizer_survives_asdict_and_pickle():
+    @dataclass
+    class Config:
+        tokenizer: Tokenizer
+
+    tokenizer = Tokenizer("char", CountingCharTokenizer())
+    tokenizer.count_tokens("cached text")
+
+    # asdict() deep-copies field values; the tokenizer and its cache are shared instead
+    assert asdict(Config(tokenizer))["tokenizer"] is tokenizer
+    assert copy.deepcopy(tokenizer) is tokenizer
+
+    restored = pickle.loads(pickle.dumps(tokenizer))
+    assert restored.model_name == "char"
+    assert len(restored._token_counts) == 0
+    assert restored.count_tokens("cached text") == 11
@@ -0,0 +1,88 @@
+"""
+Tests for batched vector similarity chunk selection
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.utils import (
+    batch_cosine_similarity,
+    cosine_similarity,
+    pick_by_vector_similarity,
+    top_k_indices,
+)
+
+
+class FakeChunksVDB:
+    """Vector storage stub relying on the default BaseVectorStorage scoring."""
+
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = vectors
+        self.vector_calls = 0
+
+    async def get_vectors_by_ids(self, ids):
+        self.vector_calls += 1
+        return {id: self.vectors[id] for id in ids if id in self.vectors}
+
+    async def get_similarities_by_ids(self, ids, query_embedding):
+        from lightrag.base import BaseVectorStorage
+
+        return await BaseVectorStorage.get_similarities_by_ids(
+            self, ids, query_embedding
+        )
+
+
+@pytest.mark.offline
+def test_batch_cosine_similarity_matches_scalar():
+    rng = np.random.default_rng(0)
+    query = rng.random(16)
+    vectors = rng.random((50, 16))
+
+    scores = batch_cosine_similarity(query, vectors)
+
+    expected = [cosine_similarity(query, v) for v in vectors]
+    assert np.allclose(scores, expected, atol=1e-6)
+
+
+@pytest.mark.offline
+def test_batch_cosine_similarity_zero_vector():
+    scores = batch_cosine_similarity([1.0, 0.0], [[0.0, 0.0], [2.0, 0.0]])
+
+    assert scores.tolist() == [0.0, 1.0]
+
+
+@pytest.mark.offline
+def test_top_k_indices_sorted_highest_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.7, 0.3])
+
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0]
+    assert top_k_indices(scores, 0).tolist() == []
+
+
+@pytest.mark.offline
+async def test_pick_by_vector_similarity_selects_top_chunks():
+    vdb = FakeChunksVDB(
+        {
+            "chunk-a": [1.0, 0.0],
+            "chunk-b": [0.0, 1.0],
+            "chunk-c": [0.8, 0.2],
+        }
+    )
+    entity_info = [
+        {"sorted_chunks": ["chunk-a", "chunk-b"]},
+        {"sorted_chunks": ["chunk-c"]},
+    ]
+
+    selected = await pick_by_vector_similarity(
+        query="q",
+        text_chunks_storage=None,
+        chunks_vdb=vdb,
+        num_of_chunks=2,
+        entity_info=entity_info,
+        embedding_func=None,
+        query_embedding=[1.0, 0.0],
+    )
+
+    assert selected == ["chunk-a", "chunk-c"]
+    assert vdb.vector_calls == 1